@@ -0,0 +1,197 @@
+"""
+Database operations at scale: latency percentiles and throughput
+
+For every size of --sizes (default 1k, 100k and 1M tasks), seeds a synthetic
+agenda in a temporary SQLite database with database.seed (reproducible from
+--seed, centred on today) and measures each operation of database.operations:
+   - cold: the first call after the cached engines are disposed (new
+     connection, empty SQLite page cache; the OS file cache stays warm)
+   - warm: --repeat more calls (fewer if they exceed --budget-s), reported as
+     p50/p95/p99/max latency and calls per second
+
+create_task and delete_task run in pairs on new tasks, so every read sees
+the seeded size. Results go to --output as JSON.
+
+Comparison: --baseline compares the warm p50 of every (size, operation)
+with a previous output and flags those slower by more than --tolerance
+(relative) and --min-delta-ms (absolute, to ignore noise on sub-millisecond
+calls). Exits with status 1 if any regressed.
+
+Usage:
+   python benchmarks/db_operations.py --sizes 1000 100000
+   python benchmarks/db_operations.py --output logs/db_baseline.json
+   python benchmarks/db_operations.py --baseline logs/db_baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+
+from database import operations
+from database.models import dispose_engine, dispose_engines
+from database.seed import SeedConfig, seed_database
+from utils.stats import summarize_latencies
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def operation_calls(database_url: str, size: int, rng: random.Random) -> dict[str, Callable[[], object]]:
+    """
+    One call of each benchmarked operation (create and delete share a queue of new ids)
+    """
+    created: list[int] = []
+
+    def create():
+        task = operations.create_task("Benchmark task", "", datetime.now() + timedelta(days=1), database_url=database_url)
+        created.append(task["id"])
+        return task
+
+    def delete():
+        if not created:
+            create()
+        return operations.delete_task(created.pop(), database_url=database_url)
+
+    return {
+        "get_task_by_id": lambda: operations.get_task_by_id(rng.randint(1, size), database_url=database_url),
+        "get_tasks_for_today": lambda: operations.get_tasks_for_today(database_url=database_url),
+        "get_upcoming_tasks": lambda: operations.get_upcoming_tasks(7, database_url=database_url),
+        "get_all_tasks": lambda: operations.get_all_tasks(database_url=database_url),
+        "create_task": create,
+        "delete_task": delete,
+    }
+
+
+def _rows(result) -> int:
+    return len(result) if isinstance(result, list) else 1
+
+
+def measure(call: Callable[[], object], repeat: int, budget_s: float) -> dict:
+    dispose_engines()
+    started = time.perf_counter()
+    result = call()
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    deadline = time.perf_counter() + budget_s
+    while len(samples) < repeat and (not samples or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    warm = summarize_latencies(samples)
+    return {
+        "cold_ms": cold_ms,
+        "warm_ms": warm,
+        "throughput_ops_s": 1000 / warm["mean"] if warm["mean"] else None,
+        "rows": _rows(result),
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float, min_delta_ms: float) -> list[dict]:
+    """
+    Warm p50 of every (size, operation) against the baseline; `regression` is set on the slower ones
+    """
+    previous = {(row["size"], row["operation"]): row for row in baseline}
+    rows = []
+    for row in results:
+        before = previous.get((row["size"], row["operation"]))
+        if before is None:
+            continue
+        old, new = before["warm_ms"]["p50"], row["warm_ms"]["p50"]
+        rows.append({
+            "size": row["size"],
+            "operation": row["operation"],
+            "baseline_p50_ms": old,
+            "p50_ms": new,
+            "change": (new - old) / old if old else None,
+            "regression": new > old * (1 + tolerance) and new - old > min_delta_ms,
+        })
+    return rows
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Database operations benchmark at several agenda sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Tasks in the database")
+    parser.add_argument("--operations", nargs="+", default=None, help="Subset of operations to run")
+    parser.add_argument("--repeat", type=int, default=50, help="Warm calls per operation")
+    parser.add_argument("--budget-s", type=float, default=10.0, help="Stop the warm calls of an operation after this long")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic agenda and the looked-up ids")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    parser.add_argument("--baseline", default=None, help="Previous JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative p50 slowdown flagged as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore p50 slowdowns smaller than this")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    results = []
+    directory = tempfile.mkdtemp(prefix="aigenda_db_bench_")
+    for size in args.sizes:
+        database_url = f"sqlite:///{os.path.join(directory, f'tareas_{size}.db')}"
+        seeded = seed_database(database_url, SeedConfig(rows=size, seed=args.seed))
+        print(f"🌱 Seeded {size} tasks in {seeded['seconds']:.1f} s")
+
+        calls = operation_calls(database_url, size, random.Random(args.seed))
+        for name, call in calls.items():
+            if args.operations and name not in args.operations:
+                continue
+            row = {"size": size, "operation": name, **measure(call, args.repeat, args.budget_s)}
+            results.append(row)
+            warm = row["warm_ms"]
+            print(
+                f"   {name:<20} cold {row['cold_ms']:>9.2f} ms | p50 {warm['p50']:>9.2f} p95 {warm['p95']:>9.2f} "
+                f"p99 {warm['p99']:>9.2f} ms | {row['throughput_ops_s']:>9.1f} ops/s | {row['rows']} rows"
+            )
+        dispose_engine(database_url)
+        os.remove(database_url[len("sqlite:///"):])
+
+    report = {"settings": vars(args), "environment": environment(), "results": results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        report["comparison"] = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        print(f"\n📏 Compared with {args.baseline} (p50, tolerance {args.tolerance:.0%})")
+        for row in report["comparison"]:
+            icon = "❌" if row["regression"] else "✅"
+            change = f"{row['change']:+.0%}" if row["change"] is not None else "n/a"
+            print(f"   {icon} {row['size']:>9} {row['operation']:<20} {row['baseline_p50_ms']:>9.2f} -> {row['p50_ms']:>9.2f} ms ({change})")
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    if args.output:
+        output_directory = os.path.dirname(args.output)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if regressions:
+        print(f"⚠️ {len(regressions)} regressions")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
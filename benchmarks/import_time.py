@@ -0,0 +1,122 @@
+"""
+Cold start of the agent modules
+
+Every measurement runs in a fresh interpreter started from a temporary
+working directory (the prompt files must be found next to the package, not
+relative to the CWD). Reports, as the median of --repeat processes:
+   - import: time to import each module of --modules
+   - first_get: agent_factory.get() of the starting agent (builds it and its
+     handoff targets, loading the Agents SDK, the tools and the prompt files)
+   - cached_get: a second get() of the same agent
+
+With --importtime, the slowest imports of chatbot.agent_agenda according to
+`python -X importtime` are listed as well.
+
+Usage:
+   python benchmarks/import_time.py
+   python benchmarks/import_time.py --repeat 10 --importtime
+   python benchmarks/import_time.py --output logs/import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+from chatbot.agent_agenda import agent_factory
+before_get = time.perf_counter()
+agent_factory.get("translator")
+first = time.perf_counter()
+agent_factory.get("translator")
+cached = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_get_ms": (first - before_get) * 1000,
+    "cached_get_ms": (cached - first) * 1000,
+    "modules_loaded": len(sys.modules),
+}}))
+"""
+
+
+def run_probe(module: str, cwd: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(src=SRC, module=module)],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(module: str, repeat: int, cwd: str) -> dict:
+    runs = [run_probe(module, cwd) for _ in range(repeat)]
+    return {
+        "module": module,
+        **{key: statistics.median(run[key] for run in runs) for key in runs[0]},
+    }
+
+
+def slowest_imports(module: str, cwd: str, top: int) -> list[tuple[str, float]]:
+    """
+    Cumulative import time (ms) of the slowest modules, from python -X importtime
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {SRC!r}); import {module}"],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(cumulative) / 1000))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time and first build of the agents")
+    parser.add_argument("--modules", nargs="+", default=["chatbot.agent_agenda", "chatbot.pipeline"], help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per module")
+    parser.add_argument("--importtime", action="store_true", help="List the slowest imports of chatbot.agent_agenda")
+    parser.add_argument("--top", type=int, default=10, help="Imports listed by --importtime")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    cwd = tempfile.mkdtemp(prefix="aigenda_import_")
+    results = [measure(module, args.repeat, cwd) for module in args.modules]
+
+    print(f"🧊 Cold start, median of {args.repeat} processes")
+    print(f"{'module':<24} {'import ms':>10} {'first get ms':>13} {'cached get ms':>14} {'modules':>8}")
+    for result in results:
+        print(
+            f"{result['module']:<24} {result['import_ms']:>10.1f} {result['first_get_ms']:>13.1f} "
+            f"{result['cached_get_ms']:>14.3f} {result['modules_loaded']:>8.0f}"
+        )
+
+    report = {"settings": vars(args), "results": results}
+    if args.importtime:
+        report["slowest_imports"] = slowest_imports("chatbot.agent_agenda", cwd, args.top)
+        print("\n🐢 Slowest imports of chatbot.agent_agenda (cumulative)")
+        for name, ms in report["slowest_imports"]:
+            print(f"   {ms:>8.1f} ms  {name}")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
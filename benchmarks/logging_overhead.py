@@ -0,0 +1,144 @@
+"""
+Per-call logging overhead of the database operations
+
+Replays the log calls of one create_task() call, without the database, under
+each logging profile and reports the time the caller spends in logging per
+operation (the same loop without any sink is subtracted):
+   - steps: the previous step-by-step logs (three ERROR-level debug lines,
+     eight progress lines and two DEBUG dumps formatted eagerly)
+   - summary: the current ones (one summary record and a lazy, sampled DEBUG dump)
+
+Profiles: "dev" is utils.logger.logs_config() (synchronous text file and
+console), "production" is utils.logger.production_logs_config() (JSON lines
+written by a background thread, sampled DEBUG) and "enqueue" the same
+profile through loguru's enqueue=True. Console output goes to /dev/null. For
+the background sinks, the time to drain their queue after the loop is
+reported separately, since it is spent off the caller's thread.
+
+Usage:
+   python benchmarks/logging_overhead.py
+   python benchmarks/logging_overhead.py --calls 20000 --output logs/logging_overhead.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+
+from database.operations import _log_operation
+from utils.logger import logs_config, production_logs_config
+
+TASK = {"title": "Comprar leche", "description": "", "due_date": datetime(2030, 1, 1, 9, 30)}
+
+
+def steps_pattern(i: int) -> None:
+    due_date = TASK["due_date"]
+    logger.error(f"🔍 DEBUG - Received due_date: {due_date}")
+    logger.error(f"🔍 DEBUG - Type: {type(due_date)}")
+    logger.error(f"🔍 DEBUG - String representation: {str(due_date)}")
+    logger.info("1️⃣ Validating input data for task creation")
+    logger.success("✅ Input data validated successfully")
+    logger.debug(f"Task data: {TASK}")
+    logger.info("2️⃣ Creating new task instance")
+    logger.success("✅ New task instance created successfully")
+    logger.debug(f"New task: {TASK}")
+    logger.info("3️⃣ Adding new task to the session")
+    logger.success("✅ Task added to the session and committed successfully")
+    logger.info("4️⃣ Closing session")
+
+
+def summary_pattern(i: int) -> None:
+    started = time.perf_counter()
+    logger.opt(lazy=True).debug("Task data: {} (due_date {!r})", lambda: TASK, lambda: TASK["due_date"])
+    _log_operation("create_task", started, 1, task_id=i)
+
+
+def timed_loop(pattern, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        pattern(i)
+    return time.perf_counter() - started
+
+
+def configure(profile: str, root: str) -> None:
+    os.makedirs(os.path.join(root, "logs"), exist_ok=True)
+    if profile == "dev":
+        logs_config(root, "bench.log")
+    elif profile == "production":
+        production_logs_config(root, "bench.jsonl", level="DEBUG", debug_sample_every=100)
+    elif profile == "enqueue":
+        production_logs_config(root, "bench.jsonl", level="DEBUG", debug_sample_every=100, enqueue=True)
+    else:
+        logger.remove()
+
+
+def measure(pattern_name: str, profile: str, calls: int) -> dict:
+    pattern = {"steps": steps_pattern, "summary": summary_pattern}[pattern_name]
+    configure("none", "")
+    baseline_s = timed_loop(pattern, calls)
+
+    root = tempfile.mkdtemp(prefix="aigenda_logging_")
+    configure(profile, root)
+    logged_s = timed_loop(pattern, calls)
+    drain_started = time.perf_counter()
+    logger.complete()
+    logger.remove()  # also waits for the background sinks
+    drain_s = time.perf_counter() - drain_started
+
+    log_dir = os.path.join(root, "logs")
+    log_bytes = sum(os.path.getsize(os.path.join(log_dir, name)) for name in os.listdir(log_dir))
+    return {
+        "pattern": pattern_name,
+        "profile": profile,
+        "caller_us_per_call": (logged_s - baseline_s) / calls * 1e6,
+        "drain_ms": drain_s * 1000,
+        "bytes_per_call": log_bytes / calls,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Logging overhead per database operation")
+    parser.add_argument("--calls", type=int, default=5000, help="Operations replayed per measurement")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    # Console sinks write here; the report goes to the real stdout
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = open(os.devnull, "w", encoding="utf-8")
+    try:
+        results = [
+            measure(pattern, profile, args.calls)
+            for pattern in ("steps", "summary")
+            for profile in ("dev", "production", "enqueue")
+        ]
+    finally:
+        sys.stdout.close()
+        sys.stdout, sys.stderr = stdout, stderr
+
+    print(f"🪵 Logging overhead of create_task(), {args.calls} calls")
+    print(f"{'pattern':>8} {'profile':>11} {'caller µs/call':>15} {'drain ms':>9} {'bytes/call':>11}")
+    for result in results:
+        print(
+            f"{result['pattern']:>8} {result['profile']:>11} {result['caller_us_per_call']:>15.1f} "
+            f"{result['drain_ms']:>9.1f} {result['bytes_per_call']:>11.0f}"
+        )
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
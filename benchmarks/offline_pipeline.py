@@ -0,0 +1,100 @@
+"""
+Offline throughput and latency benchmark of the agent pipeline
+
+Runs the main.py scenarios through the real Runner, handoffs and database
+tools with the scripted offline model, so no API key or network is needed
+and results are repeatable. With --first-token-ms 0 the numbers measure pure
+orchestration and tool overhead; a synthetic latency shows how concurrency
+hides model time.
+
+Usage:
+   python benchmarks/offline_pipeline.py
+   python benchmarks/offline_pipeline.py --repeat 5 --concurrency 1 4 16 --first-token-ms 300
+   python benchmarks/offline_pipeline.py --output logs/offline_benchmark.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+
+from chatbot.mock_model import LatencyProfile, offline_run_config
+from chatbot.scenarios import Scenario, run_scenarios_sync
+from main import all_scenarios
+
+
+def build_scenarios(repeat: int) -> list[Scenario]:
+    """
+    The main.py scenarios, repeated with unique names
+    """
+    return [
+        Scenario(f"{scenario.name}#{i}", scenario.steps, scenario.category, scenario.max_turns)
+        for i in range(repeat)
+        for scenario in all_scenarios()
+    ]
+
+
+def run_benchmark(repeat: int, concurrency_levels: list[int], latency: LatencyProfile) -> list[dict]:
+    """
+    Run the scenarios once per concurrency level.
+
+    Returns:
+    - list[dict]: One summary per level, with throughput in requests per second.
+    """
+    results = []
+    for concurrency in concurrency_levels:
+        # A fresh provider per level keeps the jitter sequence identical
+        report = run_scenarios_sync(
+            build_scenarios(repeat),
+            concurrency=concurrency,
+            run_config=offline_run_config(latency=latency),
+        )
+        summary = report.summary()
+        summary["throughput_rps"] = summary["requests"] / summary["wall_time_s"] if summary["wall_time_s"] else 0.0
+        results.append(summary)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline agent pipeline benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Times each main.py scenario is run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels")
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Synthetic time to first token")
+    parser.add_argument("--per-token-ms", type=float, default=0.0, help="Synthetic time per output token")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Maximum random extra latency per call")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency jitter")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    # Per-call logs of the tools would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    latency = LatencyProfile(args.first_token_ms, args.per_token_ms, args.jitter_ms, args.seed)
+    results = run_benchmark(args.repeat, args.concurrency, latency)
+
+    print(f"{'concurrency':>11} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'turns':>6}")
+    for summary in results:
+        latency_ms = summary["latency_ms"]
+        print(
+            f"{summary['concurrency']:>11} {summary['requests']:>8} {summary['throughput_rps']:>8.1f} "
+            f"{latency_ms['p50']:>8.1f} {latency_ms['p95']:>8.1f} {latency_ms['p99']:>8.1f} "
+            f"{summary['turns']['total']:>6}"
+        )
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"latency_profile": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Idle cost of the reminder scheduler with many pending tasks
+
+Seeds a temporary database with --tasks pending tasks (due over the next
+--days days, none of them within the measured period), then measures for
+--idle-s seconds the CPU time of the process:
+   - heap: reminders.ReminderScheduler sleeping until its next deadline
+   - polling: a loop calling get_tasks_due_before() every --poll-s seconds,
+     the approach the scheduler replaces
+
+Also reports the start-up time (first window read from the due_date index)
+and the wakeups of the scheduler thread.
+
+Usage:
+   python benchmarks/reminder_idle.py
+   python benchmarks/reminder_idle.py --tasks 100000 --idle-s 10 --poll-s 1
+   python benchmarks/reminder_idle.py --output logs/reminder_idle.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+
+from database import operations
+from database.models import Tarea, create_database
+from reminders import MemorySink, ReminderScheduler
+
+
+def seed(database_url: str, tasks: int, days: int, quiet_s: float) -> None:
+    """
+    Insert the pending tasks in one transaction, none due in the next quiet_s seconds
+    """
+    rng = random.Random(0)
+    start = datetime.now() + timedelta(seconds=quiet_s)
+    span_s = days * 24 * 3600
+    rows = [
+        {"title": f"Task {i}", "description": "", "due_date": start + timedelta(seconds=rng.uniform(0, span_s))}
+        for i in range(tasks)
+    ]
+    engine = create_database(database_url)
+    with engine.begin() as connection:
+        connection.execute(Tarea.__table__.insert(), rows)
+    engine.dispose()
+
+
+def measure_heap(database_url: str, idle_s: float, window_size: int) -> dict:
+    started = time.perf_counter()
+    scheduler = ReminderScheduler([MemorySink()], database_url=database_url, window_size=window_size).start()
+    startup_ms = (time.perf_counter() - started) * 1000
+    try:
+        cpu_before = time.process_time()
+        time.sleep(idle_s)
+        cpu_s = time.process_time() - cpu_before
+        metrics = scheduler.metrics()
+    finally:
+        scheduler.stop()
+    return {"mode": "heap", "startup_ms": startup_ms, "cpu_s": cpu_s, "wakeups": metrics["wakeups"], "loaded": metrics["loaded"]}
+
+
+def measure_polling(database_url: str, idle_s: float, poll_s: float) -> dict:
+    stop = threading.Event()
+    polls = 0
+
+    def poll():
+        nonlocal polls
+        while not stop.is_set():
+            operations.get_tasks_due_before(datetime.now() + timedelta(seconds=poll_s), database_url=database_url)
+            polls += 1
+            stop.wait(poll_s)
+
+    thread = threading.Thread(target=poll, daemon=True)
+    cpu_before = time.process_time()
+    thread.start()
+    time.sleep(idle_s)
+    cpu_s = time.process_time() - cpu_before
+    stop.set()
+    thread.join()
+    return {"mode": "polling", "startup_ms": 0.0, "cpu_s": cpu_s, "wakeups": polls, "loaded": 0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Idle CPU of the reminder scheduler vs polling")
+    parser.add_argument("--tasks", type=int, default=100_000, help="Pending tasks in the database")
+    parser.add_argument("--days", type=int, default=365, help="Due dates are spread over this many days")
+    parser.add_argument("--idle-s", type=float, default=10.0, help="Measured idle period")
+    parser.add_argument("--poll-s", type=float, default=1.0, help="Interval of the polling baseline")
+    parser.add_argument("--window", type=int, default=1000, help="Window size of the scheduler")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    # Per-query logs of the operations would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aigenda_reminders_'), 'tareas.db')}"
+    started = time.perf_counter()
+    seed(database_url, args.tasks, args.days, quiet_s=args.idle_s * 3 + 60)
+    print(f"🌱 Seeded {args.tasks} tasks in {time.perf_counter() - started:.1f} s")
+
+    results = [
+        measure_heap(database_url, args.idle_s, args.window),
+        measure_polling(database_url, args.idle_s, args.poll_s),
+    ]
+
+    print(f"💤 {args.idle_s:.0f} s idle with {args.tasks} pending tasks")
+    print(f"{'mode':>8} {'startup ms':>11} {'CPU ms':>8} {'CPU %':>6} {'wakeups':>8}")
+    for result in results:
+        print(
+            f"{result['mode']:>8} {result['startup_ms']:>11.1f} {result['cpu_s'] * 1000:>8.1f} "
+            f"{result['cpu_s'] / args.idle_s * 100:>6.2f} {result['wakeups']:>8}"
+        )
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Cost of SQL echo versus statement timing hooks per database operation
+
+Runs get_task_by_id() --calls times against a temporary database under:
+   - echo: the previous setup, a new engine with echo=True (and the schema
+     check of create_database) for every session
+   - hooks: the cached engine of models.get_session(), echo off, with the
+     database.query_log timing hooks
+   - bare: a long-lived engine without the hooks (cost of the hooks)
+
+Echo output goes to /dev/null. Prints the time per call (median of the
+interleaved rounds for the cached modes) and the statement report of the
+query log.
+
+Usage:
+   python benchmarks/sql_echo_overhead.py
+   python benchmarks/sql_echo_overhead.py --calls 5000 --output logs/sql_echo_overhead.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, Tarea, create_database, get_session
+from database.query_log import query_log
+
+
+def timed(calls: int, session_factory, task_id: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        session = session_factory()
+        try:
+            session.query(Tarea).filter_by(id=task_id).first().to_dict()
+        finally:
+            session.close()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQL echo vs timing hooks")
+    parser.add_argument("--calls", type=int, default=2000, help="Lookups per mode")
+    parser.add_argument("--rounds", type=int, default=10, help="Interleaved rounds of the cached modes")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks in the database")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aigenda_echo_'), 'tareas.db')}"
+    engine = create_database(database_url)
+    due = datetime.now() + timedelta(days=1)
+    with engine.begin() as connection:
+        connection.execute(Tarea.__table__.insert(), [
+            {"title": f"Task {i}", "description": "", "due_date": due + timedelta(minutes=i)} for i in range(args.tasks)
+        ])
+    task_id = args.tasks // 2
+
+    def echo_session():
+        # What create_database() used to do for every session: a new engine and the schema check
+        echo_engine = create_engine(database_url, echo=True)
+        Base.metadata.create_all(echo_engine)
+        return sessionmaker(bind=echo_engine)()
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")  # echo handler binds to the current stdout
+    try:
+        echo_us = timed(args.calls, echo_session, task_id)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    # Interleaved rounds: the two cached modes differ by a few µs, less than the drift between runs
+    query_log.reset()
+    bare_factory = sessionmaker(bind=create_engine(database_url))
+    hooks_rounds, bare_rounds = [], []
+    for _ in range(args.rounds):
+        hooks_rounds.append(timed(args.calls // args.rounds, lambda: get_session(database_url), task_id))
+        bare_rounds.append(timed(args.calls // args.rounds, bare_factory, task_id))
+    hooks_us, bare_us = statistics.median(hooks_rounds), statistics.median(bare_rounds)
+
+    results = {"echo_us": echo_us, "hooks_us": hooks_us, "bare_us": bare_us}
+    print(f"🔎 get_task_by_id, {args.calls} calls on {args.tasks} tasks")
+    print(f"   echo, engine per session : {echo_us:>9.1f} µs/call")
+    print(f"   cached engine + hooks    : {hooks_us:>9.1f} µs/call")
+    print(f"   cached engine, no hooks  : {bare_us:>9.1f} µs/call")
+    print("\n📊 Statements (ms)")
+    print(query_log.format_report(top=5))
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results, "statements": query_log.statement_stats()},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
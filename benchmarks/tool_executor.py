@@ -0,0 +1,129 @@
+"""
+Concurrent-run throughput with inline vs thread-pool database tools
+
+Runs the main.py scenarios offline (scripted model, see
+benchmarks/offline_pipeline.py) once with the tools executed inline on the
+event loop and once per --workers value through chatbot.tool_executor.
+--stall-ms adds a blocking sleep to every database operation to emulate a
+slow disk (SQLite fsync, log file writes); inline, that sleep stops every
+other run of the process.
+
+Usage:
+   python benchmarks/tool_executor.py
+   python benchmarks/tool_executor.py --stall-ms 50 --first-token-ms 100 --workers 2 8
+   python benchmarks/tool_executor.py --output logs/tool_executor_benchmark.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from loguru import logger
+
+from chatbot.mock_model import LatencyProfile, offline_run_config
+from chatbot.scenarios import run_scenarios_sync
+from chatbot.tool_executor import ToolExecutor, set_tool_executor
+from chatbot.tools import DATABASE_TOOLS
+from database import operations
+from offline_pipeline import build_scenarios
+
+
+@contextmanager
+def stalled_operations(stall_ms: float):
+    """
+    Add a blocking sleep to the database operations behind the tools
+    """
+    originals = {tool.name: getattr(operations, tool.name) for tool in DATABASE_TOOLS}
+
+    def stalled(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            time.sleep(stall_ms / 1000)
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(operations, name, stalled(func))
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(operations, name, func)
+
+
+def run_mode(label: str, executor: ToolExecutor | None, args) -> dict:
+    """
+    Run the scenarios with the given executor (None for inline tools)
+    """
+    previous = set_tool_executor(executor)
+    try:
+        report = run_scenarios_sync(
+            build_scenarios(args.repeat),
+            concurrency=args.concurrency,
+            run_config=offline_run_config(latency=LatencyProfile(first_token_ms=args.first_token_ms, seed=0)),
+        )
+    finally:
+        set_tool_executor(previous)
+
+    summary = report.summary()
+    result = {
+        "mode": label,
+        "requests": summary["requests"],
+        "wall_time_s": summary["wall_time_s"],
+        "throughput_rps": summary["requests"] / summary["wall_time_s"] if summary["wall_time_s"] else 0.0,
+        "latency_ms": summary["latency_ms"],
+    }
+    if executor is not None:
+        executor.shutdown()
+        result["executor"] = executor.metrics()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inline vs thread-pool tool execution benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Times each main.py scenario is run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Scenarios run at the same time")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 16], help="Thread pool sizes to compare")
+    parser.add_argument("--stall-ms", type=float, default=20.0, help="Blocking time added to every database operation")
+    parser.add_argument("--first-token-ms", type=float, default=50.0, help="Synthetic model latency")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    # Per-call logs of the tools would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    with stalled_operations(args.stall_ms):
+        results = [run_mode("inline", None, args)]
+        for workers in args.workers:
+            results.append(run_mode(f"pool({workers})", ToolExecutor(max_workers=workers, default_timeout_s=None), args))
+
+    print(f"🧵 {args.concurrency} concurrent scenarios, {args.stall_ms} ms stall per operation, "
+          f"{args.first_token_ms} ms per model call")
+    print(f"{'mode':>10} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'peak queue':>10}")
+    for result in results:
+        latency_ms = result["latency_ms"]
+        peak = result["executor"]["peak_queued"] if "executor" in result else "-"
+        print(
+            f"{result['mode']:>10} {result['requests']:>8} {result['throughput_rps']:>8.1f} "
+            f"{latency_ms['p50']:>8.1f} {latency_ms['p95']:>8.1f} {peak:>10}"
+        )
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Prompt tokens of the DatabaseAgent tool schemas
+
+Every DatabaseAgent turn sends the instructions plus the JSON schema of each
+tool. This compares the tools as they were (database_url exposed as a model
+parameter, i.e. function_tool over the plain database.operations functions)
+with the context-injected tools of chatbot.tools, and prints the prompt
+tokens per turn of both.
+
+Tokens are counted with tiktoken (o200k_base, the gpt-4o encoding) when it is
+installed, and estimated at ~4 characters per token otherwise.
+
+Usage:
+   python benchmarks/tool_schema_tokens.py
+"""
+
+import json
+import os
+import sys
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from agents import FunctionTool, function_tool
+
+from chatbot.agent_agenda import DATABASE_INSTRUCTIONS
+from chatbot.mock_model import estimate_tokens
+from chatbot.tools import DATABASE_TOOLS
+from database import operations
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+    TOKENIZER = "tiktoken o200k_base"
+except ImportError:
+    count_tokens = estimate_tokens
+    TOKENIZER = "estimate (~4 chars/token)"
+
+
+def schema_text(tool: FunctionTool) -> str:
+    """
+    Tool definition as sent to the Responses API
+    """
+    return json.dumps({
+        "type": "function",
+        "name": tool.name,
+        "description": tool.description,
+        "parameters": tool.params_json_schema,
+        "strict": tool.strict_json_schema,
+    }, ensure_ascii=False)
+
+
+def main() -> None:
+    before = [function_tool(getattr(operations, tool.name)) for tool in DATABASE_TOOLS]
+    after = DATABASE_TOOLS
+    instructions = count_tokens(DATABASE_INSTRUCTIONS)
+
+    print(f"🔢 Tokenizer: {TOKENIZER}")
+    print(f"{'tool':<22} {'before':>7} {'after':>7} {'saved':>7}")
+    total_before = total_after = 0
+    for old, new in zip(before, after):
+        old_tokens, new_tokens = count_tokens(schema_text(old)), count_tokens(schema_text(new))
+        assert "database_url" not in new.params_json_schema["properties"]
+        total_before += old_tokens
+        total_after += new_tokens
+        print(f"{new.name:<22} {old_tokens:>7} {new_tokens:>7} {old_tokens - new_tokens:>7}")
+    print(f"{'all tools':<22} {total_before:>7} {total_after:>7} {total_before - total_after:>7}")
+
+    turn_before, turn_after = instructions + total_before, instructions + total_after
+    print()
+    print("📨 Prompt tokens per DatabaseAgent turn (instructions + tools, without conversation):")
+    print(f"   before {turn_before}, after {turn_after}: "
+          f"-{turn_before - turn_after} ({(turn_before - turn_after) / turn_before:.1%})")
+
+
+if __name__ == "__main__":
+    main()
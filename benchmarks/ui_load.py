@@ -0,0 +1,143 @@
+"""
+Load test of the Gradio chat interface with the offline model
+
+Starts src/ui/interface.py in-process with the scripted offline model (no
+API key or network) on a temporary database, then simulates browser
+sessions with gradio_client: every session is its own client, so it gets
+its own gr.State and goes through Gradio's queue like a real user.
+
+Reports requests per second and per-message latency percentiles. With a
+synthetic model latency, throughput should grow with --ui-concurrency until
+the sessions or the queue run out, showing that slow calls do not block
+each other.
+
+Usage:
+   python benchmarks/ui_load.py
+   python benchmarks/ui_load.py --users 32 --messages 3 --ui-concurrency 4 16 --first-token-ms 200
+   python benchmarks/ui_load.py --output logs/ui_load.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from gradio_client import Client
+from loguru import logger
+
+from chatbot.mock_model import LatencyProfile, offline_run_config
+from database.models import create_database
+from database.registry import database_registry
+from ui.interface import UIConfig, build_interface
+from utils.stats import summarize_latencies
+
+MESSAGES = [
+    "Show me all my tasks",
+    "Create a task for tomorrow at 10:00: call the dentist",
+    "What do I have this week?",
+    "Muéstrame mis tareas de hoy",
+]
+
+
+def simulate_user(url: str, user: int, messages: int) -> list[float]:
+    """
+    One browser session sending messages one after another
+
+    Returns:
+    - list[float]: Latency of every message in milliseconds (until the final answer).
+    """
+    client = Client(url, verbose=False)
+    history: list = []
+    latencies = []
+    for i in range(messages):
+        message = MESSAGES[(user + i) % len(MESSAGES)]
+        started = time.perf_counter()
+        history, _ = client.predict(message, history, api_name="/chat")
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not history or not history[-1]["content"]:
+            raise RuntimeError(f"Empty answer for '{message}'")
+    client.close()
+    return latencies
+
+
+def run_level(ui_concurrency: int, args) -> dict:
+    """
+    Serve the UI with a concurrency limit and drive it with all the users at once
+    """
+    temp_dir = tempfile.mkdtemp(prefix="aigenda_ui_load_")
+    database_name = f"ui_load:{os.path.basename(temp_dir)}"
+    database_url = f"sqlite:///{os.path.join(temp_dir, 'tareas.db')}"
+    create_database(database_url)
+    database_registry.register(database_name, database_url)
+
+    config = UIConfig(
+        concurrency_limit=ui_concurrency,
+        max_queue_size=args.users * 2,
+        database=database_name,
+        run_config=offline_run_config(latency=LatencyProfile(first_token_ms=args.first_token_ms, seed=0)),
+    )
+    demo = build_interface(config)
+    _, url, _ = demo.launch(prevent_thread_lock=True, quiet=True, server_name="127.0.0.1")
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [pool.submit(simulate_user, url, user, args.messages) for user in range(args.users)]
+            latencies = [latency for future in futures for latency in future.result()]
+        wall_time_s = time.perf_counter() - started
+    finally:
+        demo.close()
+        database_registry.unregister(database_name)
+
+    return {
+        "ui_concurrency": ui_concurrency,
+        "users": args.users,
+        "requests": len(latencies),
+        "wall_time_s": wall_time_s,
+        "throughput_rps": len(latencies) / wall_time_s if wall_time_s else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of the Gradio chat interface")
+    parser.add_argument("--users", type=int, default=16, help="Simultaneous browser sessions")
+    parser.add_argument("--messages", type=int, default=3, help="Messages sent by every session")
+    parser.add_argument("--ui-concurrency", type=int, nargs="+", default=[1, 8], help="Concurrency limits to compare")
+    parser.add_argument("--first-token-ms", type=float, default=200.0, help="Synthetic model latency")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args()
+
+    # Per-call logs of the tools would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    results = [run_level(level, args) for level in args.ui_concurrency]
+
+    print(f"👥 {args.users} sessions x {args.messages} messages, {args.first_token_ms} ms per model call")
+    print(f"{'limit':>6} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for result in results:
+        latency_ms = result["latency_ms"]
+        print(
+            f"{result['ui_concurrency']:>6} {result['requests']:>8} {result['throughput_rps']:>8.1f} "
+            f"{latency_ms['p50']:>8.0f} {latency_ms['p95']:>8.0f} {latency_ms['max']:>8.0f}"
+        )
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
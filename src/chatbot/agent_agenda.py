@@ -1,60 +1,154 @@
+"""
+Agents of the agenda, built on first use
+
+Importing this module is cheap: the Agents SDK, the database tools and the
+.env file are only loaded when the first agent is requested. AgentFactory
+builds each agent once and caches it; the handoff targets are built (and
+shared) on the way.
+
+The instructions are rendered from chatbot.prompt_registry on every run, so
+the cached agents follow prompt edits after agent_factory.reload() (or with
+AIGENDA_PROMPT_RELOAD_S set) without a restart.
+
+The previous module attributes (database_agent, TRANSLATOR_INSTRUCTIONS, ...)
+are still available and resolved lazily.
+
+Usage Example:
+   from chatbot.agent_agenda import agent_factory
+
+   agent = agent_factory.get("translator")
+   agent_factory.reload()  # pick up edited prompt files
+"""
+
 import os
-from dotenv import load_dotenv
-from agents import Agent, ModelSettings
 import sys
-from datetime import datetime, timedelta
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
-from src.database.operations import (
-    create_task,
-    get_all_tasks,
-    get_task_by_id,
-    delete_task,
-    get_tasks_for_today,
-    get_upcoming_tasks
-)
-
-load_dotenv()
-
-with open("src/chatbot/prompts/translator_prompt.txt", "r", encoding='utf-8') as f:
-    TRANSLATOR_INSTRUCTIONS = f.read()
-
-with open("src/chatbot/prompts/dateParser_prompt.txt", "r", encoding='utf-8') as f:
-    DATEPARSER_INSTRUCTIONS = f.read()
-
-with open("src/chatbot/prompts/database_prompt.txt", "r", encoding='utf-8') as f:
-    DATABASE_INSTRUCTIONS = f.read()
-
-tools = [
-    create_task,
-    get_all_tasks,
-    get_task_by_id,
-    delete_task,
-    get_tasks_for_today,
-    get_upcoming_tasks
-    ]
-
-database_agent = Agent(
-    name="DatabaseAgent",
-    instructions=DATABASE_INSTRUCTIONS,
-    model="gpt-4o-mini",
-    model_settings=ModelSettings(temperature=0.0, max_tokens=1000),
-    tools=tools # type: ignore
-)
-
-date_parser_agent = Agent(
-    name="DateParserAgent",
-    instructions=DATEPARSER_INSTRUCTIONS + "\n\nCRITICAL OVERRIDE: Today is 2025-06-07. Tomorrow is 2025-06-08. Use ONLY 2025 dates.",
-    model="gpt-4o-mini",
-    model_settings=ModelSettings(temperature=0.0, max_tokens=1000),
-    handoffs=[database_agent] 
-)
-
-translator_agent = Agent(
-    name="TranslatorAgent",
-    instructions=TRANSLATOR_INSTRUCTIONS,
-    model="gpt-4o-mini",
-    model_settings=ModelSettings(temperature=0.0, max_tokens=1000),
-    handoffs=[date_parser_agent] 
-)
\ No newline at end of file
+import threading
+import time
+from typing import Any, Callable
+
+from loguru import logger
+
+# Add src to the system path (same import root as main.py and the tests)
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from .prompt_registry import PromptRegistry, prompt_registry
+
+MODEL = "gpt-4o-mini"
+
+
+class AgentFactory:
+    """
+    Lazily built, cached agents of the agenda
+
+    Args:
+    - registry (PromptRegistry): Prompts rendered as the instructions of the agents.
+    - model (str): Model of every agent.
+    """
+
+    # Agent key -> (agent name, prompt, handoff keys)
+    SPECS = {
+        "database": ("DatabaseAgent", "database", ()),
+        "date_parser": ("DateParserAgent", "date_parser", ("database",)),
+        "translator": ("TranslatorAgent", "translator", ("date_parser",)),
+        # Used by chatbot.pipeline when the dates were resolved locally (or there are
+        # none to resolve): the DateParserAgent hop is skipped.
+        "translator_direct": ("TranslatorAgent", "translator_direct", ("database",)),
+    }
+
+    def __init__(self, registry: PromptRegistry = prompt_registry, model: str = MODEL):
+        self.registry = registry
+        self.model = model
+        self._agents: dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.build_ms: dict[str, float] = {}
+
+    def names(self) -> list[str]:
+        return list(self.SPECS)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def get(self, name: str):
+        """
+        Agent by key, built on first use
+
+        Args:
+        - name (str): One of names().
+
+        Returns:
+        - Agent: The cached agent.
+        """
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        if name not in self.SPECS:
+            raise KeyError(f"Unknown agent: {name}")
+        with self._lock:
+            if name not in self._agents:
+                self._agents[name] = self._build(name)
+            return self._agents[name]
+
+    def _build(self, name: str):
+        # Heavy imports are deferred to the first agent
+        from agents import Agent, ModelSettings
+        from dotenv import load_dotenv
+
+        from .tools import DATABASE_TOOLS
+
+        load_dotenv()
+        started = time.perf_counter()
+        agent_name, prompt, handoffs = self.SPECS[name]
+        agent = Agent(
+            name=agent_name,
+            instructions=self.registry.instructions(prompt),
+            model=self.model,
+            model_settings=ModelSettings(temperature=0.0, max_tokens=1000),
+            tools=DATABASE_TOOLS if name == "database" else [],  # type: ignore
+            handoffs=[self.get(handoff) for handoff in handoffs],
+        )
+        self.build_ms[name] = (time.perf_counter() - started) * 1000
+        logger.debug(f"🏗️ Built {agent_name} ({name}) in {self.build_ms[name]:.1f} ms")
+        return agent
+
+    def reload(self) -> None:
+        """
+        Re-read the prompt files; the cached agents render the new text on their next run
+        """
+        self.registry.reload()
+
+    def clear(self) -> None:
+        """
+        Drop the cached agents (they are rebuilt on next use)
+        """
+        with self._lock:
+            self._agents.clear()
+
+
+agent_factory = AgentFactory()
+
+date_parser_instructions: Callable[[Any, Any], str] = prompt_registry.instructions("date_parser")
+
+# Module attributes resolved on first access (PEP 562)
+_LAZY_AGENTS = {
+    "database_agent": "database",
+    "date_parser_agent": "date_parser",
+    "translator_agent": "translator",
+    "translator_direct_agent": "translator_direct",
+}
+# Static prefixes; the date, timezone and user are appended on every run
+_LAZY_INSTRUCTIONS = {
+    "TRANSLATOR_INSTRUCTIONS": "translator",
+    "DATEPARSER_INSTRUCTIONS": "date_parser",
+    "DATABASE_INSTRUCTIONS": "database",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_AGENTS:
+        return agent_factory.get(_LAZY_AGENTS[name])
+    if name in _LAZY_INSTRUCTIONS:
+        return prompt_registry.get(_LAZY_INSTRUCTIONS[name]).static
+    if name == "tools":
+        from .tools import DATABASE_TOOLS
+        return DATABASE_TOOLS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,130 @@
+"""
+Response cache for read-only agent runs
+
+Identical read questions ("Show me all my tasks") do not need a new trip
+through the agents while the database is unchanged. Answers are cached under
+a key made of the normalized query, the detected intent, the user's current
+date, the data version of the database (see database.events) and the user
+(the instructions name them, so answers can be user-specific), so any write
+makes older entries unreachable and users never see each other's answers.
+Entries are evicted in LRU order.
+
+Usage Example:
+   from chatbot.cache import ResponseCache, make_cache_key
+
+   cache = ResponseCache(max_entries=128)
+   key = make_cache_key(query, intent, today, version)
+   answer = cache.get(key)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from .intent import Intent
+from .text import normalize_text
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """
+    Identity of a cached answer
+
+    Fields:
+    - query: Normalized user query
+    - intent: Detected intent
+    - day: User's current date (answers about "today" change every day)
+    - data_version: Data version of the database when the answer was produced
+    - database_url: Database the answer was read from
+    - user: User the answer was produced for (None without a user)
+    """
+    query: str
+    intent: Intent
+    day: date
+    data_version: int
+    database_url: str = ""
+    user: Optional[str] = None
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query: normalized text without punctuation
+    """
+    return re.sub(r"[^\w\s]", "", normalize_text(query)).strip()
+
+
+def make_cache_key(
+    query: str,
+    intent: Intent,
+    day: date,
+    data_version: int,
+    database_url: str = "",
+    user: Optional[str] = None,
+) -> CacheKey:
+    """
+    Build the cache key of a request
+    """
+    return CacheKey(normalize_query(query), intent, day, data_version, database_url, user)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of final answers
+
+    Args:
+    - max_entries (int): Number of answers kept before evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """
+        Cached answer for a key, or None
+        """
+        with self._lock:
+            answer = self._entries.get(key)
+            if answer is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, key: CacheKey, answer: str) -> None:
+        """
+        Store an answer, evicting the least recently used entry if full
+        """
+        if key.intent.is_write:
+            return
+        with self._lock:
+            self._entries[key] = answer
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop every cached answer and reset the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide cache used by the pipeline
+response_cache = ResponseCache()
@@ -0,0 +1,484 @@
+"""
+Record/replay cassettes for agent model traffic
+
+A cassette stores real model responses so a scenario run can be replayed
+later through the agents Model interface, without paying for or waiting on
+the API. Entries are keyed by agent name, a hash of the system instructions
+and a hash of the input items. Volatile parts are masked before hashing:
+dates, times, weekday names, call ids and tool output timestamps. That way a
+replay on another day, or against a fresh database, still finds its entries.
+
+Modes of CassetteModel:
+   - record: call the real model and store every response.
+   - replay: answer only from the cassette; a miss raises CassetteMiss, or
+     StaleCassette when the entry exists for another version of the prompt.
+   - auto: replay what is recorded and record the rest.
+
+stale_entries() is the diff mode: it lists the entries whose instructions no
+longer match the current agent prompts, so stale cassettes are flagged before
+a replay silently measures an outdated conversation.
+
+Usage Example:
+   from chatbot.cassettes import Cassette, cassette_run_config
+
+   cassette = Cassette("cassettes/main.json")
+   run_config = cassette_run_config(cassette, mode="record")
+   ...  # run the scenarios with run_config
+   cassette.save()
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Iterable, Optional, Union
+
+from agents import Agent, Handoff, ModelProvider, ModelResponse, ModelSettings, ModelTracing, RunConfig, RunContextWrapper, Tool, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.models.interface import Model
+from agents.tracing import generation_span
+from loguru import logger
+from openai.types.responses import ResponseCompletedEvent, ResponseOutputMessage
+from openai.types.responses.response_output_item import ResponseOutputItem
+from pydantic import TypeAdapter
+
+from .hops import DEFAULT_AGENT, current_agent_name
+from .mock_model import response_completed_event, text_chunks, text_delta_event
+from .prompt_registry import static_prefix
+
+CASSETTE_VERSION = 1
+
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+MODES = (RECORD, REPLAY, AUTO)
+
+_DATE_TIME = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?")
+_WEEKDAY = re.compile(r"\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b", re.IGNORECASE)
+_OUTPUT_ITEMS = TypeAdapter(list[ResponseOutputItem])
+
+
+class CassetteMiss(LookupError):
+    """
+    The cassette has no response for a model call
+    """
+
+
+class StaleCassette(CassetteMiss):
+    """
+    The cassette has a response for the call, but recorded with other instructions
+    """
+
+
+def mask_volatile(text: str) -> str:
+    """
+    Replace dates, times and weekday names, which change from one run to the next
+    """
+    return _WEEKDAY.sub("<weekday>", _DATE_TIME.sub("<date>", text))
+
+
+def _digest(value: Any) -> str:
+    data = value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def _get(item: Any, key: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(_get(part, "text") or "" for part in content or [])
+
+
+def instructions_hash(instructions: Optional[str]) -> str:
+    """
+    Hash of the system instructions, ignoring the dynamic context and the current date
+    """
+    return _digest(mask_volatile(static_prefix(instructions or "")))
+
+
+def input_fingerprint(input: Union[str, list[TResponseInputItem]]) -> list[dict]:
+    """
+    The parts of the input items that define the conversation, without ids or dates
+    """
+    items = [{"role": "user", "content": input}] if isinstance(input, str) else input
+    fingerprint = []
+    for item in items:
+        kind = _get(item, "type")
+        if kind == "function_call":
+            fingerprint.append({"call": _get(item, "name"), "arguments": mask_volatile(_get(item, "arguments") or "")})
+        elif kind == "function_call_output":
+            fingerprint.append({"output": mask_volatile(str(_get(item, "output")))})
+        elif _get(item, "role") is not None:
+            fingerprint.append({"role": _get(item, "role"), "content": mask_volatile(_content_text(_get(item, "content")))})
+        else:
+            fingerprint.append({"type": kind})
+    return fingerprint
+
+
+def input_hash(input: Union[str, list[TResponseInputItem]]) -> str:
+    """
+    Hash of input_fingerprint()
+    """
+    return _digest(input_fingerprint(input))
+
+
+@dataclass(frozen=True)
+class CassetteKey:
+    """
+    Identity of a model call
+    """
+    agent_name: str
+    instructions_hash: str
+    input_hash: str
+
+    def as_string(self) -> str:
+        return f"{self.agent_name}:{self.instructions_hash}:{self.input_hash}"
+
+
+@dataclass
+class CassetteEntry:
+    """
+    A recorded model response
+
+    Fields:
+    - agent_name, instructions_hash, input_hash: The CassetteKey
+    - output: Output items, as dumped by the OpenAI types
+    - usage: input_tokens, output_tokens and total_tokens of the call
+    - latency_ms: Duration of the real call
+    - query: Latest user message, to make the cassette readable
+    """
+    agent_name: str
+    instructions_hash: str
+    input_hash: str
+    output: list[dict]
+    usage: dict
+    latency_ms: float
+    query: str = ""
+
+    @property
+    def key(self) -> CassetteKey:
+        return CassetteKey(self.agent_name, self.instructions_hash, self.input_hash)
+
+    def output_items(self) -> list:
+        return _OUTPUT_ITEMS.validate_python(self.output)
+
+    def as_usage(self) -> Usage:
+        return Usage(requests=1, **self.usage)
+
+
+class Cassette:
+    """
+    JSON file of recorded model responses
+
+    Args:
+    - path (Optional[str]): File to load from (if it exists) and save to.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: dict[str, CassetteEntry] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {data.get('version')} in {path}")
+            for entry in data["entries"]:
+                self.put(CassetteEntry(**entry))
+            logger.info(f"📼 Loaded {len(self.entries)} cassette entries from {path}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: CassetteKey) -> Optional[CassetteEntry]:
+        with self._lock:
+            return self.entries.get(key.as_string())
+
+    def find_stale(self, key: CassetteKey) -> Optional[CassetteEntry]:
+        """
+        Entry for the same agent and input recorded with other instructions
+        """
+        with self._lock:
+            return next((
+                entry for entry in self.entries.values()
+                if entry.agent_name == key.agent_name
+                and entry.input_hash == key.input_hash
+                and entry.instructions_hash != key.instructions_hash
+            ), None)
+
+    def put(self, entry: CassetteEntry) -> None:
+        with self._lock:
+            self.entries[entry.key.as_string()] = entry
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the cassette as JSON (to its own path by default)
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("The cassette has no path to save to")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = [asdict(entry) for entry in self.entries.values()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": CASSETTE_VERSION, "entries": entries}, f, ensure_ascii=False, indent=2)
+        logger.success(f"📼 Saved {len(entries)} cassette entries to {path}")
+
+
+async def current_instruction_hashes(agents: Iterable[Agent]) -> dict[str, set[str]]:
+    """
+    Instructions hash of every agent, by agent name (clones share their name)
+    """
+    context = RunContextWrapper(context=None)
+    hashes: dict[str, set[str]] = {}
+    for agent in agents:
+        hashes.setdefault(agent.name, set()).add(instructions_hash(await agent.get_system_prompt(context)))
+    return hashes
+
+
+def stale_entries(cassette: Cassette, current: dict[str, set[str]]) -> list[CassetteEntry]:
+    """
+    Diff mode: entries recorded with instructions that no agent uses anymore.
+
+    Args:
+    - cassette (Cassette): Recorded responses.
+    - current (dict[str, set[str]]): Output of current_instruction_hashes().
+
+    Returns:
+    - list[CassetteEntry]: Stale entries of the agents in `current`.
+    """
+    return [
+        entry for entry in cassette.entries.values()
+        if entry.agent_name in current and entry.instructions_hash not in current[entry.agent_name]
+    ]
+
+
+class CassetteModel(Model):
+    """
+    agents Model that records and replays responses of another model
+
+    Args:
+    - cassette (Cassette): Where responses are stored.
+    - mode (str): "record", "replay" or "auto".
+    - inner (Optional[Model]): Real model, required unless the mode is "replay".
+    - replay_latency (bool): Wait the recorded latency when replaying.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = REPLAY, inner: Optional[Model] = None, replay_latency: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {MODES}")
+        if mode != REPLAY and inner is None:
+            raise ValueError(f"Cassette mode '{mode}' needs the real model to record from")
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self.replay_latency = replay_latency
+
+    def _key(self, system_instructions: Optional[str], input) -> CassetteKey:
+        return CassetteKey(
+            agent_name=current_agent_name() or DEFAULT_AGENT,
+            instructions_hash=instructions_hash(system_instructions),
+            input_hash=input_hash(input),
+        )
+
+    def _lookup(self, key: CassetteKey) -> Optional[CassetteEntry]:
+        if self.mode == RECORD:
+            return None
+        entry = self.cassette.get(key)
+        if entry is None and self.mode == REPLAY:
+            if self.cassette.find_stale(key) is not None:
+                raise StaleCassette(f"Cassette entry for '{key.agent_name}' was recorded with other instructions; re-record it")
+            raise CassetteMiss(f"No cassette entry for '{key.agent_name}' ({key.as_string()})")
+        return entry
+
+    def _record(self, key: CassetteKey, input, output: list, usage: Usage, started: float) -> None:
+        if isinstance(input, str):
+            query = input
+        else:
+            query = next((_content_text(_get(item, "content")) for item in reversed(input) if _get(item, "role") == "user"), "")
+        self.cassette.put(CassetteEntry(
+            agent_name=key.agent_name,
+            instructions_hash=key.instructions_hash,
+            input_hash=key.input_hash,
+            output=[item.model_dump(mode="json") for item in output],
+            usage={
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "total_tokens": usage.total_tokens,
+            },
+            latency_ms=(time.perf_counter() - started) * 1000,
+            query=mask_volatile(query)[:200],
+        ))
+
+    async def _wait_recorded(self, entry: CassetteEntry) -> None:
+        if self.replay_latency and entry.latency_ms:
+            await asyncio.sleep(entry.latency_ms / 1000)
+
+    async def get_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> ModelResponse:
+        key = self._key(system_instructions, input)
+        entry = self._lookup(key)
+        if entry is not None:
+            with generation_span(model="cassette", disabled=tracing.is_disabled()) as span:
+                await self._wait_recorded(entry)
+                span.span_data.usage = {"input_tokens": entry.usage["input_tokens"], "output_tokens": entry.usage["output_tokens"]}
+                return ModelResponse(output=entry.output_items(), usage=entry.as_usage(), response_id=None)
+
+        started = time.perf_counter()
+        response = await self.inner.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+        )
+        self._record(key, input, response.output, response.usage, started)
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = self._key(system_instructions, input)
+        entry = self._lookup(key)
+        if entry is not None:
+            with generation_span(model="cassette", disabled=tracing.is_disabled()) as span:
+                await self._wait_recorded(entry)
+                output = entry.output_items()
+                sequence = 0
+                if output and isinstance(output[0], ResponseOutputMessage):
+                    text = "".join(getattr(part, "text", "") for part in output[0].content)
+                    for chunk in text_chunks(text):
+                        yield text_delta_event(chunk, output[0].id, sequence)
+                        sequence += 1
+                span.span_data.usage = {"input_tokens": entry.usage["input_tokens"], "output_tokens": entry.usage["output_tokens"]}
+                yield response_completed_event(output, entry.as_usage(), "cassette", f"resp_{key.input_hash}", sequence)
+            return
+
+        started = time.perf_counter()
+        async for event in self.inner.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+        ):
+            if isinstance(event, ResponseCompletedEvent):
+                usage = event.response.usage
+                self._record(key, input, event.response.output, Usage(
+                    requests=1,
+                    input_tokens=usage.input_tokens if usage else 0,
+                    output_tokens=usage.output_tokens if usage else 0,
+                    total_tokens=usage.total_tokens if usage else 0,
+                ), started)
+            yield event
+
+
+class CassetteModelProvider(ModelProvider):
+    """
+    ModelProvider that wraps the models of another provider in CassetteModels
+
+    Args:
+    - cassette (Cassette): Where responses are stored.
+    - mode (str): "record", "replay" or "auto".
+    - inner_provider (Optional[ModelProvider]): Real provider (the shared pooled provider by default when recording).
+    - replay_latency (bool): Wait the recorded latency when replaying.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = REPLAY,
+        inner_provider: Optional[ModelProvider] = None,
+        replay_latency: bool = False,
+    ):
+        if inner_provider is None and mode != REPLAY:
+            from .openai_client import shared_model_provider
+            inner_provider = shared_model_provider()
+        self.cassette = cassette
+        self.mode = mode
+        self.inner_provider = inner_provider
+        self.replay_latency = replay_latency
+        # Per event loop, like PooledOpenAIProvider: the inner models hold a client bound to their loop
+        self._models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Optional[str], CassetteModel]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _build(self, model_name: Optional[str]) -> "CassetteModel":
+        inner = self.inner_provider.get_model(model_name) if self.inner_provider else None
+        return CassetteModel(self.cassette, self.mode, inner, self.replay_latency)
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._build(model_name)
+        with self._lock:
+            models = self._models.setdefault(loop, {})
+            if model_name not in models:
+                models[model_name] = self._build(model_name)
+            return models[model_name]
+
+
+def cassette_run_config(
+    cassette: Cassette,
+    mode: str = REPLAY,
+    inner_provider: Optional[ModelProvider] = None,
+    replay_latency: bool = False,
+    tracing_disabled: Optional[bool] = None,
+) -> RunConfig:
+    """
+    RunConfig that records or replays model traffic through a cassette.
+
+    Args:
+    - cassette (Cassette): Where responses are stored.
+    - mode (str): "record", "replay" or "auto".
+    - inner_provider (Optional[ModelProvider]): Real provider used to record.
+    - replay_latency (bool): Wait the recorded latency when replaying.
+    - tracing_disabled (Optional[bool]): Skip tracing. Defaults to True for pure replays only.
+
+    Returns:
+    - RunConfig: Configuration for Runner.run / run_agenda_query.
+    """
+    return RunConfig(
+        model_provider=CassetteModelProvider(cassette, mode, inner_provider, replay_latency),
+        tracing_disabled=mode == REPLAY if tracing_disabled is None else tracing_disabled,
+        workflow_name=f"AIgenda cassette {mode}",
+    )
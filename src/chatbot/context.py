@@ -0,0 +1,45 @@
+"""
+Run context shared by the agenda agents and their tools
+
+The context travels with every Runner.run (RunContextWrapper.context) and is
+never shown to the model, so it carries what the tools need but the model
+must not choose, such as the target database.
+
+Usage Example:
+   from chatbot.context import AgendaContext
+
+   result = await run_agenda_query("Show me all my tasks", context=AgendaContext(database="demo"))
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class AgendaContext:
+    """
+    Local state of an agenda run
+
+    Fields:
+    - database: Name of the target database in database.registry (None for the default one)
+    - user: Who is asking (UI session or client id); identical requests of different users are never shared
+    """
+    database: Optional[str] = None
+    user: Optional[str] = None
+
+
+def context_database_url(context: Any) -> str:
+    """
+    Database URL for a run context (AgendaContext or None)
+    """
+    # Imported here: the prompts only need context_user, not SQLAlchemy
+    from database.registry import database_registry
+
+    return database_registry.resolve(getattr(context, "database", None))
+
+
+def context_user(context: Any) -> Optional[str]:
+    """
+    User of a run context (AgendaContext or None)
+    """
+    return getattr(context, "user", None)
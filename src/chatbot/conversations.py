@@ -0,0 +1,423 @@
+"""
+Conversation sessions stored in SQLite
+
+Gives follow-ups ("delete the second one", "borra la última") the context of
+the earlier turns without resending the whole transcript:
+   - Window: every run gets a running summary of the old turns, the most
+     recent turns that fit in a token budget and the tasks listed by the last
+     tool results, as input items before the new message.
+   - Compaction: when the stored turns exceed the budget, the oldest ones are
+     folded into the running summary (itself capped) and deleted, so the
+     input and the table stay bounded however long the conversation is.
+   - References: the last task lists returned by the tools are cached per
+     session; resolve_task_reference() turns ordinals ("the second one",
+     "la última") into the id of the task the user saw.
+
+Sessions are keyed by an id chosen by the caller (the UI conversation id, a
+CLI --session name...). The store is safe to share between threads.
+
+Usage Example:
+   from chatbot.conversations import ConversationStore
+
+   store = ConversationStore("data/conversations.db")
+   session = store.session("conv_123")
+   await run_agenda_query("Show me all my tasks", session=session)
+   await run_agenda_query("Delete the second one", session=session)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from agents.items import ToolCallItem, ToolCallOutputItem
+from agents.result import RunResultBase
+from loguru import logger
+
+from .text import estimate_tokens, normalize_text
+
+DEFAULT_CONVERSATIONS_PATH = "data/conversations.db"
+# Tokens of the recent turns kept verbatim in the window
+DEFAULT_HISTORY_BUDGET = 600
+# Tokens of the running summary of the older turns
+DEFAULT_SUMMARY_BUDGET = 300
+# Tool results kept per session for reference resolution
+DEFAULT_TOOL_RESULTS = 5
+# Characters of a message kept in a summary line
+SUMMARY_LINE_CHARS = 120
+
+
+@dataclass(frozen=True)
+class Turn:
+    """
+    One exchange of a conversation
+
+    Fields:
+    - user: Message of the user
+    - assistant: Final answer
+    - tokens: Estimated tokens of both messages
+    """
+    user: str
+    assistant: str
+    tokens: int
+
+
+Summarizer = Callable[[str, list[Turn]], str]
+
+
+def _clip(text: str, limit: int = SUMMARY_LINE_CHARS) -> str:
+    line = " ".join(text.split())
+    return line if len(line) <= limit else line[:limit - 1] + "…"
+
+
+def extractive_summary(summary: str, turns: list[Turn]) -> str:
+    """
+    Default summarizer: one clipped "user → answer" line per folded turn, appended to the summary
+    """
+    lines = [f"- {_clip(turn.user)} → {_clip(turn.assistant)}" for turn in turns]
+    return "\n".join(([summary] if summary else []) + lines)
+
+
+def _cap_summary(summary: str, budget: int) -> str:
+    # Drop the oldest lines first; the latest context matters most for follow-ups
+    lines = summary.splitlines()
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > budget:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def tasks_in_output(output: Any) -> list[dict]:
+    """
+    Tasks ({"id", "title", ...}) listed by a tool output, in the order the user sees them
+
+    Single tasks (create_task, get_task_by_id) are not listings: they do not
+    replace the list that ordinals refer to.
+    """
+    if isinstance(output, str):
+        try:
+            output = json.loads(output)
+        except ValueError:
+            return []
+    if isinstance(output, dict):
+        # agenda_snapshot: overdue, today and upcoming groups
+        return [task for key in ("overdue", "today", "upcoming") for task in tasks_in_output(output.get(key, []))]
+    if isinstance(output, list):
+        return [task for task in output if isinstance(task, dict) and "id" in task and "title" in task]
+    return []
+
+
+def tool_results(result: Optional[RunResultBase]) -> list[tuple[str, list[dict]]]:
+    """
+    (tool name, tasks) of the tool outputs of a run that returned tasks
+    """
+    if result is None:
+        return []
+    names = {}
+    results = []
+    for item in result.new_items:
+        if isinstance(item, ToolCallItem):
+            names[getattr(item.raw_item, "call_id", None)] = getattr(item.raw_item, "name", None)
+        elif isinstance(item, ToolCallOutputItem):
+            tasks = tasks_in_output(item.output)
+            if tasks:
+                results.append((names.get(item.raw_item.get("call_id")) or "tool", tasks))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reference resolution
+# ---------------------------------------------------------------------------
+
+_ORDINALS = {
+    "first": 1, "1st": 1, "primera": 1, "primero": 1, "primer": 1,
+    "second": 2, "2nd": 2, "segunda": 2, "segundo": 2,
+    "third": 3, "3rd": 3, "tercera": 3, "tercero": 3, "tercer": 3,
+    "fourth": 4, "4th": 4, "cuarta": 4, "cuarto": 4,
+    "fifth": 5, "5th": 5, "quinta": 5, "quinto": 5,
+    "last": -1, "ultima": -1, "ultimo": -1,
+}
+_ORDINAL_WORDS = "|".join(_ORDINALS)
+# Only reference phrases: an article, the ordinal, and a noun, the end of the
+# phrase or "of the list" after it ("the second one", "borra la segunda"), so
+# "first thing tomorrow", "last week" or "the last reminder" are not references
+_ORDINAL_PATTERN = re.compile(
+    r"\b(?:the|la|el|lo) (" + _ORDINAL_WORDS + r")"
+    r"(?: (?:one|task|item|uno|una|tarea)\b| (?:of|on|in|de|en) (?:the|la) lista?\b|\s*(?=[.,;:!?]|$))"
+)
+# "la número 3", "the number 3": a position in the listing, not an id
+_POSITION_PATTERN = re.compile(r"\b(?:the|la|el) (?:numero|number) (\d+)\b")
+# A number that is not part of an ordinal ("1st")
+_EXPLICIT_ID = re.compile(r"\b\d+\b")
+
+
+def resolve_task_reference(query: str, recent_tasks: list[dict]) -> Optional[dict]:
+    """
+    Task referred to by position in a follow-up ("delete the second one", "borra la última",
+    "la número 3").
+
+    Args:
+    - query (str): User message.
+    - recent_tasks (list[dict]): Tasks of the last listing, in the order they were shown.
+
+    Returns:
+    - Optional[dict]: The referred task, or None if the message has no reference phrase,
+      names an explicit id ("task 2"), or the position is out of range.
+    """
+    text = normalize_text(query)
+    if not recent_tasks:
+        return None
+    match = _POSITION_PATTERN.search(text)
+    if match is not None:
+        position = int(match.group(1))
+    else:
+        match = _ORDINAL_PATTERN.search(text)
+        if match is None or _EXPLICIT_ID.search(text):
+            return None
+        position = _ORDINALS[match.group(1)]
+    if position == 0 or position > len(recent_tasks):
+        return None
+    return recent_tasks[position - 1] if position > 0 else recent_tasks[-1]
+
+
+def annotate_task_reference(query: str, task: dict) -> str:
+    """
+    Append the resolved task so downstream agents use its id verbatim
+    """
+    return f"{query}\n\n[Resolved task reference: ID {task['id']} ('{task['title']}')]"
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ConversationWindow:
+    """
+    Context of a session sent with a new message
+
+    Fields:
+    - summary: Running summary of the compacted turns
+    - turns: Most recent turns that fit in the history budget, oldest first
+    - recent_tasks: Tasks of the last tool result that listed tasks
+    - tokens: Estimated tokens of the window
+    """
+    summary: str = ""
+    turns: list[Turn] = field(default_factory=list)
+    recent_tasks: list[dict] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.summary or self.turns or self.recent_tasks)
+
+    def context_message(self) -> Optional[str]:
+        """
+        Summary and recent tasks as one system message (None when there are neither)
+        """
+        parts = []
+        if self.summary:
+            parts.append(f"Earlier in this conversation:\n{self.summary}")
+        if self.recent_tasks:
+            listed = "\n".join(
+                f"{position}. ID {task['id']}: {task['title']} (due {task.get('due_date', '?')})"
+                for position, task in enumerate(self.recent_tasks, 1)
+            )
+            parts.append(f"Tasks last shown to the user, in order:\n{listed}")
+        return "\n\n".join(parts) or None
+
+    def input_items(self, message: str) -> list[dict]:
+        """
+        Agent input: context message, recent turns and the new user message
+        """
+        items: list[dict] = []
+        context = self.context_message()
+        if context:
+            items.append({"role": "system", "content": context})
+        for turn in self.turns:
+            items.append({"role": "user", "content": turn.user})
+            items.append({"role": "assistant", "content": turn.assistant})
+        items.append({"role": "user", "content": message})
+        return items
+
+
+class ConversationStore:
+    """
+    SQLite store of conversation sessions (tables conversations, turns and tool_results)
+
+    Args:
+    - path (str): SQLite database file.
+    - history_budget (int): Tokens of recent turns kept verbatim; older turns are compacted.
+    - summary_budget (int): Tokens of the running summary.
+    - max_tool_results (int): Tool results kept per session.
+    - summarizer (Summarizer): Folds turns into the summary. Defaults to extractive_summary
+      (no model call); any callable (summary, turns) -> summary can replace it.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CONVERSATIONS_PATH,
+        history_budget: int = DEFAULT_HISTORY_BUDGET,
+        summary_budget: int = DEFAULT_SUMMARY_BUDGET,
+        max_tool_results: int = DEFAULT_TOOL_RESULTS,
+        summarizer: Summarizer = extractive_summary,
+    ):
+        self.path = path
+        self.history_budget = history_budget
+        self.summary_budget = summary_budget
+        self.max_tool_results = max_tool_results
+        self.summarizer = summarizer
+        self.compactions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS conversations (session_id TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+                "turns_compacted INTEGER NOT NULL, updated_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS turns (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                "user TEXT NOT NULL, assistant TEXT NOT NULL, tokens INTEGER NOT NULL, created_at REAL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_turns_session ON turns (session_id, id)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                "tool TEXT NOT NULL, tasks TEXT NOT NULL, created_at REAL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_tool_results_session ON tool_results (session_id, id)")
+
+    def session(self, session_id: str) -> "ConversationSession":
+        return ConversationSession(self, session_id)
+
+    def window(self, session_id: str) -> ConversationWindow:
+        """
+        Summary, the recent turns within the history budget and the last listed tasks of a session
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT summary FROM conversations WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            rows = self._connection.execute(
+                "SELECT user, assistant, tokens FROM turns WHERE session_id = ? ORDER BY id DESC", (session_id,)
+            ).fetchall()
+            tool_row = self._connection.execute(
+                "SELECT tasks FROM tool_results WHERE session_id = ? ORDER BY id DESC LIMIT 1", (session_id,)
+            ).fetchone()
+
+        summary = row[0] if row else ""
+        tokens = estimate_tokens(summary)
+        turns: list[Turn] = []
+        for user, assistant, turn_tokens in rows:
+            # The latest turn is always kept, even alone over budget
+            if turns and tokens + turn_tokens > self.history_budget + self.summary_budget:
+                break
+            turns.append(Turn(user, assistant, turn_tokens))
+            tokens += turn_tokens
+        turns.reverse()
+        recent_tasks = json.loads(tool_row[0]) if tool_row else []
+        return ConversationWindow(summary=summary, turns=turns, recent_tasks=recent_tasks, tokens=tokens)
+
+    def add_turn(self, session_id: str, user: str, assistant: str, results: list[tuple[str, list[dict]]] = ()) -> None:
+        """
+        Store a finished turn and its tool results, compacting the oldest turns if over budget
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO turns (session_id, user, assistant, tokens, created_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, user, assistant, estimate_tokens(user) + estimate_tokens(assistant), now),
+            )
+            for tool, tasks in results:
+                compact_tasks = [{key: task.get(key) for key in ("id", "title", "due_date")} for task in tasks]
+                self._connection.execute(
+                    "INSERT INTO tool_results (session_id, tool, tasks, created_at) VALUES (?, ?, ?, ?)",
+                    (session_id, tool, json.dumps(compact_tasks, ensure_ascii=False), now),
+                )
+            if results:
+                self._connection.execute(
+                    "DELETE FROM tool_results WHERE session_id = ? AND id NOT IN "
+                    "(SELECT id FROM tool_results WHERE session_id = ? ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_tool_results),
+                )
+            self._compact(session_id, now)
+
+    def _compact(self, session_id: str, now: float) -> None:
+        rows = self._connection.execute(
+            "SELECT id, user, assistant, tokens FROM turns WHERE session_id = ? ORDER BY id", (session_id,)
+        ).fetchall()
+        total = sum(row[3] for row in rows)
+        folded = []
+        # Keep at least the latest turn verbatim
+        while total > self.history_budget and len(rows) - len(folded) > 1:
+            folded.append(rows[len(folded)])
+            total -= folded[-1][3]
+        if not folded:
+            return
+
+        row = self._connection.execute(
+            "SELECT summary, turns_compacted FROM conversations WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        summary, compacted = row if row else ("", 0)
+        summary = self.summarizer(summary, [Turn(user, assistant, tokens) for _, user, assistant, tokens in folded])
+        summary = _cap_summary(summary, self.summary_budget)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?)",
+            (session_id, summary, compacted + len(folded), now),
+        )
+        self._connection.execute(
+            "DELETE FROM turns WHERE session_id = ? AND id <= ?", (session_id, folded[-1][0])
+        )
+        self.compactions += 1
+        logger.debug(f"🗜️ Compacted {len(folded)} turns of {session_id} into the summary")
+
+    def clear(self, session_id: str) -> None:
+        """
+        Forget a session
+        """
+        with self._lock, self._connection:
+            for table in ("conversations", "turns", "tool_results"):
+                self._connection.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+
+    def stats(self, session_id: str) -> dict:
+        with self._lock:
+            turns = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM turns WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            row = self._connection.execute(
+                "SELECT turns_compacted FROM conversations WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return {"stored_turns": turns[0], "stored_tokens": turns[1], "compacted_turns": row[0] if row else 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass(frozen=True)
+class ConversationSession:
+    """
+    Handle of one conversation of a ConversationStore, passed to the pipeline
+
+    Fields:
+    - store: Where the session is stored
+    - session_id: Conversation key
+    """
+    store: ConversationStore
+    session_id: str
+
+    def window(self) -> ConversationWindow:
+        return self.store.window(self.session_id)
+
+    def add_turn(self, user: str, assistant: str, results: list[tuple[str, list[dict]]] = ()) -> None:
+        self.store.add_turn(self.session_id, user, assistant, results)
+
+    def clear(self) -> None:
+        self.store.clear(self.session_id)
@@ -0,0 +1,332 @@
+"""
+Local natural-language date parser for the agenda chatbot.
+
+Resolves Spanish and English date expressions ("mañana", "next Monday",
+"en 3 días", "15 de junio a las 17:00") into concrete datetimes using the
+real current date in the user's timezone. The agent pipeline runs it as a
+pre-processing step and only falls back to the DateParserAgent hop when the
+local parse is not confident enough.
+
+Returned datetimes are naive wall-clock times in the user's timezone, the
+same convention used by the `due_date` column of the tasks table.
+
+Usage Example:
+   from chatbot.date_parser import parse_date
+
+   parsed = parse_date("Crea una tarea para mañana: comprar leche")
+   if parsed.is_confident():
+       print(parsed.as_db_string())  # e.g. '2025-06-08 09:00:00'
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from typing import Optional, Union
+
+from dateutil import parser as dateutil_parser
+from dateutil import tz
+from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
+
+from .text import normalize_text
+
+# Hour used when the expression names a day but no time ("mañana" -> 09:00)
+DEFAULT_TIME = time(9, 0)
+
+# Minimum confidence for the pipeline to trust the local parse
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# Environment variable with the IANA name of the user's timezone
+TIMEZONE_ENV_VAR = "AIGENDA_TIMEZONE"
+
+DB_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass(frozen=True)
+class ParsedDate:
+    """
+    Result of parsing a natural-language date expression
+
+    Fields:
+    - value: Resolved datetime (naive, user's local time) or None
+    - confidence: 0.0 (nothing found) to 1.0 (unambiguous expression)
+    - matched: Text fragment that produced the date, if any
+    """
+    value: Optional[datetime]
+    confidence: float
+    matched: Optional[str] = None
+
+    def is_confident(self, threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> bool:
+        """
+        Whether the parse can be used without asking the DateParserAgent
+        """
+        return self.value is not None and self.confidence >= threshold
+
+    def as_db_string(self) -> Optional[str]:
+        """
+        Format the value the way the DatabaseAgent commands expect it
+        """
+        return self.value.strftime(DB_DATETIME_FORMAT) if self.value else None
+
+
+NOT_FOUND = ParsedDate(value=None, confidence=0.0)
+
+
+# ---------------------------------------------------------------------------
+# Vocabulary (accent-free, lowercase: see normalize_text)
+# ---------------------------------------------------------------------------
+
+WEEKDAYS = {
+    "lunes": MO, "monday": MO,
+    "martes": TU, "tuesday": TU,
+    "miercoles": WE, "wednesday": WE,
+    "jueves": TH, "thursday": TH,
+    "viernes": FR, "friday": FR,
+    "sabado": SA, "saturday": SA,
+    "domingo": SU, "sunday": SU,
+}
+
+NUMBER_WORDS = {
+    "un": 1, "una": 1, "uno": 1, "one": 1, "a": 1, "an": 1,
+    "dos": 2, "two": 2,
+    "tres": 3, "three": 3,
+    "cuatro": 4, "four": 4,
+    "cinco": 5, "five": 5,
+    "seis": 6, "six": 6,
+    "siete": 7, "seven": 7,
+    "ocho": 8, "eight": 8,
+    "nueve": 9, "nine": 9,
+    "diez": 10, "ten": 10,
+}
+
+# Default hour for a part of the day mentioned without an explicit time
+DAY_PARTS = {
+    "por la manana": 9, "de manana": 9, "in the morning": 9, "this morning": 9,
+    "por la tarde": 16, "esta tarde": 16, "in the afternoon": 16, "this afternoon": 16,
+    "por la noche": 20, "esta noche": 20, "in the evening": 20, "tonight": 20,
+}
+
+
+class _BilingualParserInfo(dateutil_parser.parserinfo):
+    """
+    dateutil parser vocabulary extended with Spanish month and weekday names
+    """
+    JUMP = dateutil_parser.parserinfo.JUMP + ["de", "del", "el", "la", "las"]
+    MONTHS = [
+        ("Jan", "January", "ene", "enero"),
+        ("Feb", "February", "feb", "febrero"),
+        ("Mar", "March", "mar", "marzo"),
+        ("Apr", "April", "abr", "abril"),
+        ("May", "May", "mayo"),
+        ("Jun", "June", "junio"),
+        ("Jul", "July", "julio"),
+        ("Aug", "August", "ago", "agosto"),
+        ("Sep", "Sept", "September", "septiembre", "setiembre"),
+        ("Oct", "October", "octubre"),
+        ("Nov", "November", "noviembre"),
+        ("Dec", "December", "dic", "diciembre"),
+    ]
+
+
+_PARSER_INFO = _BilingualParserInfo()
+
+_NUMBER = r"(\d{1,3}|" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")"
+_WEEKDAY = "(" + "|".join(WEEKDAYS) + ")"
+_MONTH = "(" + "|".join(
+    name.lower() for names in _BilingualParserInfo.MONTHS for name in names
+) + r")\.?"
+
+def _slash_confidence(match: re.Match) -> float:
+    # 05/06 is read day first, but could be May 6th: the agent decides unless
+    # one part only fits as the day (13/05) or both orders give the same date
+    day, month = (int(part) for part in match.group(0).split("/")[:2])
+    return 0.85 if day > 12 or month > 12 or day == month else 0.6
+
+
+# (pattern, confidence or confidence(match), resolver) tried in order; the first match wins
+_DAY_PATTERNS = [
+    (re.compile(r"\bpasado manana\b|\bday after tomorrow\b"), 1.0,
+     lambda m, today: today + timedelta(days=2)),
+    # "mañana" also means "morning" ("por la mañana", "esta mañana")
+    (re.compile(r"(?<!la )(?<!esta )(?<!de )\bmanana\b|\btomorrow\b"), 1.0,
+     lambda m, today: today + timedelta(days=1)),
+    (re.compile(r"\b(hoy|today|tonight|esta noche|esta tarde)\b"), 1.0,
+     lambda m, today: today),
+    (re.compile(r"\b(ayer|yesterday)\b"), 1.0,
+     lambda m, today: today - timedelta(days=1)),
+    (re.compile(r"\b(?:en|dentro de|in)\s+" + _NUMBER + r"\s+(dias?|days?)\b|\b"
+                + _NUMBER + r"\s+days?\s+from\s+now\b"), 1.0,
+     lambda m, today: today + timedelta(days=_to_int(m.group(1) or m.group(3)))),
+    (re.compile(r"\b(?:en|dentro de|in)\s+" + _NUMBER + r"\s+(semanas?|weeks?)\b"), 1.0,
+     lambda m, today: today + timedelta(weeks=_to_int(m.group(1)))),
+    (re.compile(r"\b(next week|la proxima semana|la semana que viene|la semana proxima)\b"), 1.0,
+     lambda m, today: today + timedelta(days=7)),
+    (re.compile(r"\b(next month|el proximo mes|el mes que viene|el mes proximo)\b"), 1.0,
+     lambda m, today: today + relativedelta(months=1)),
+    (re.compile(r"\b\d{4}-\d{1,2}-\d{1,2}\b"), 0.95,
+     lambda m, today: _parse_explicit(m.group(0), today)),
+    (re.compile(r"\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b"), _slash_confidence,
+     lambda m, today: _parse_explicit(m.group(0), today)),
+    (re.compile(r"\b\d{1,2}\s+(?:de\s+)?" + _MONTH + r"(?:\s+(?:de\s+)?\d{4})?\b"), 0.9,
+     lambda m, today: _parse_explicit(m.group(0), today)),
+    (re.compile(r"\b" + _MONTH + r"\s+\d{1,2}(?:st|nd|rd|th)?(?:,?\s+\d{4})?\b"), 0.9,
+     lambda m, today: _parse_explicit(m.group(0), today)),
+    # Weekdays always resolve to the next occurrence strictly after today
+    (re.compile(r"\b" + _WEEKDAY + r"\b"), 0.9,
+     lambda m, today: today + relativedelta(days=1, weekday=WEEKDAYS[m.group(1)](+1))),
+]
+
+_TIME_PATTERN = re.compile(
+    r"\b(?:a las|a la|at|sobre las)\s+(\d{1,2})(?:[:h](\d{2}))?(?:\s*(am|pm|a\.m\.|p\.m\.))?"
+    r"(?:\s+(de la manana|de la tarde|de la noche))?"
+    r"|\b(\d{1,2}):(\d{2})\b"
+    r"|\b(\d{1,2})\s*(am|pm)\b"
+)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def get_user_timezone(name: Optional[str] = None) -> tzinfo:
+    """
+    Resolve the user's timezone
+
+    Args:
+    - name (Optional[str]): IANA timezone name. Defaults to the AIGENDA_TIMEZONE
+      environment variable, then to the system local timezone.
+
+    Returns:
+    - tzinfo: The resolved timezone
+    """
+    name = name or os.getenv(TIMEZONE_ENV_VAR)
+    if name:
+        zone = tz.gettz(name)
+        if zone is not None:
+            return zone
+    return tz.tzlocal()
+
+
+def parse_date(
+    text: str,
+    now: Optional[datetime] = None,
+    timezone: Union[str, tzinfo, None] = None,
+) -> ParsedDate:
+    """
+    Find and resolve the first date expression in a user request.
+
+    Args:
+    - text (str): Free text in Spanish or English.
+    - now (Optional[datetime]): Reference instant. Defaults to the current time.
+    - timezone (Union[str, tzinfo, None]): User timezone (name or tzinfo). Defaults to get_user_timezone().
+
+    Returns:
+    - ParsedDate: The resolved date with a confidence score (value None if nothing was found).
+    """
+    if not text or not text.strip():
+        return NOT_FOUND
+
+    zone = timezone if isinstance(timezone, tzinfo) else get_user_timezone(timezone)
+    if now is None:
+        now = datetime.now(zone)
+    elif now.tzinfo is not None:
+        now = now.astimezone(zone)
+
+    return _parse_normalized(normalize_text(text), now.date())
+
+
+def parse_cache_info():
+    """
+    Hit/miss statistics of the memoized parser
+    """
+    return _parse_normalized.cache_info()
+
+
+def clear_parse_cache() -> None:
+    """
+    Drop every memoized parse result
+    """
+    _parse_normalized.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+def _to_int(token: str) -> int:
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+def _parse_explicit(fragment: str, today: date) -> Optional[date]:
+    """
+    Parse an absolute date; dates without a year roll over to the next occurrence
+    """
+    has_year = bool(re.search(r"\d{4}", fragment)) or fragment.count("/") == 2
+    try:
+        parsed = dateutil_parser.parse(
+            fragment,
+            parserinfo=_PARSER_INFO,
+            dayfirst="/" in fragment,  # 05/06 is the 5th of June
+            default=datetime.combine(today, DEFAULT_TIME),
+        ).date()
+    except (ValueError, OverflowError):
+        return None
+    if not has_year and parsed < today:
+        parsed = parsed.replace(year=parsed.year + 1)
+    return parsed
+
+
+def _parse_time(text: str) -> Optional[time]:
+    """
+    Extract the time of day ("a las 5 de la tarde", "at 17:30", "5pm", "por la noche")
+    """
+    match = _TIME_PATTERN.search(text)
+    if match:
+        if match.group(1):
+            hour, minute = int(match.group(1)), int(match.group(2) or 0)
+            meridiem, day_part = match.group(3), match.group(4)
+        elif match.group(5):
+            hour, minute, meridiem, day_part = int(match.group(5)), int(match.group(6)), None, None
+        else:
+            hour, minute, meridiem, day_part = int(match.group(7)), 0, match.group(8), None
+
+        if (meridiem and meridiem.startswith("p")) or day_part in ("de la tarde", "de la noche"):
+            if hour < 12:
+                hour += 12
+        elif meridiem and meridiem.startswith("a") and hour == 12:
+            hour = 0
+        if hour < 24 and minute < 60:
+            return time(hour, minute)
+
+    for phrase, hour in DAY_PARTS.items():
+        if phrase in text:
+            return time(hour, 0)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_normalized(text: str, today: date) -> ParsedDate:
+    """
+    Memoized core: the result only depends on the normalized text and the local date
+    """
+    for pattern, confidence, resolve in _DAY_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        day = resolve(match, today)
+        if day is None:
+            continue
+        moment = _parse_time(text) or DEFAULT_TIME
+        return ParsedDate(
+            value=datetime.combine(day, moment),
+            confidence=confidence(match) if callable(confidence) else confidence,
+            matched=match.group(0),
+        )
+
+    # A bare time ("a las 5") without a day is ambiguous: let the agent decide
+    moment = _parse_time(text)
+    if moment is not None:
+        return ParsedDate(value=datetime.combine(today, moment), confidence=0.5)
+
+    return NOT_FOUND
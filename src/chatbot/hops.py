@@ -0,0 +1,147 @@
+"""
+Per-hop latency bookkeeping for agent runs
+
+A "hop" is the time an agent owns the conversation, from the moment it
+starts until it hands off or produces the final output. HopTimingHooks
+measures every hop of a run and feeds a HopLatencyTracker, whose running
+averages let the pipeline estimate the latency saved by the hops it skips.
+Every hop is also recorded in utils.metrics: its duration, the tokens its
+model calls used, and the handoffs and tool calls it made.
+
+current_agent_name() tells model wrappers (retry policy, cassettes, the
+offline model) which agent owns the hop making a model call.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+from agents import Agent, RunContextWrapper, RunHooks
+from agents.tool import Tool
+from agents.tracing import AgentSpanData, get_current_span
+
+from utils.metrics import metrics
+
+# Weight of the newest sample in the exponential moving average
+EWMA_ALPHA = 0.2
+# Agent name of model calls made outside an agent span
+DEFAULT_AGENT = "*"
+
+metrics.describe("agent_hop_duration_ms", "histogram", "Duration of agent hops (ms)", ("agent",),
+                 buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000))
+metrics.describe("agent_hop_tokens_total", "counter", "Model tokens used by agent hops", ("agent", "kind"))
+metrics.describe("agent_handoffs_total", "counter", "Handoffs between agents", ("from_agent", "to_agent"))
+metrics.describe("agent_tool_calls_total", "counter", "Tool calls made by agents", ("agent", "tool"))
+
+
+def current_agent_name() -> Optional[str]:
+    """
+    Name of the agent running the current turn, from the active agent span
+
+    The Runner opens an agent span (a no-op one when tracing is disabled)
+    around every turn, so the span tells which agent is calling the model.
+    """
+    span = get_current_span()
+    if span is not None and isinstance(span.span_data, AgentSpanData):
+        return span.span_data.name
+    return None
+
+
+class HopLatencyTracker:
+    """
+    Exponential moving average of the duration of each agent hop (ms)
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self._averages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, agent_name: str, duration_ms: float) -> None:
+        """
+        Add one observed hop duration
+        """
+        with self._lock:
+            previous = self._averages.get(agent_name)
+            if previous is None:
+                self._averages[agent_name] = duration_ms
+            else:
+                self._averages[agent_name] = previous + self.alpha * (duration_ms - previous)
+
+    def estimate(self, agent_name: str) -> Optional[float]:
+        """
+        Average duration of a hop, or None if it was never observed
+        """
+        with self._lock:
+            return self._averages.get(agent_name)
+
+    def estimate_saved(self, skipped_hops: list[str]) -> float:
+        """
+        Estimated latency (ms) saved by skipping hops; unobserved hops count as 0
+        """
+        return sum(self.estimate(name) or 0.0 for name in skipped_hops)
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        Copy of the current averages
+        """
+        with self._lock:
+            return dict(self._averages)
+
+
+# Process-wide tracker used by the pipeline
+hop_latency_tracker = HopLatencyTracker()
+
+
+class HopTimingHooks(RunHooks):
+    """
+    RunHooks that time each agent hop of a single run
+
+    Args:
+    - tracker (HopLatencyTracker): Tracker fed with every finished hop.
+    - inner (Optional[RunHooks]): Caller hooks that keep receiving every event.
+    """
+
+    def __init__(self, tracker: HopLatencyTracker, inner: Optional[RunHooks] = None):
+        self.tracker = tracker
+        self.inner = inner
+        self.hop_latencies_ms: dict[str, float] = {}
+        self._started_at: dict[str, tuple[float, int, int]] = {}
+
+    def _finish_hop(self, context: RunContextWrapper, agent: Agent) -> None:
+        started = self._started_at.pop(agent.name, None)
+        if started is None:
+            return
+        started_at, input_tokens, output_tokens = started
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        self.hop_latencies_ms[agent.name] = self.hop_latencies_ms.get(agent.name, 0.0) + duration_ms
+        self.tracker.record(agent.name, duration_ms)
+        metrics.observe("agent_hop_duration_ms", duration_ms, (agent.name,))
+        # The run's usage is cumulative: the hop used what was added since it started
+        metrics.inc("agent_hop_tokens_total", (agent.name, "input"), context.usage.input_tokens - input_tokens)
+        metrics.inc("agent_hop_tokens_total", (agent.name, "output"), context.usage.output_tokens - output_tokens)
+
+    async def on_agent_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self._started_at[agent.name] = (time.perf_counter(), context.usage.input_tokens, context.usage.output_tokens)
+        if self.inner:
+            await self.inner.on_agent_start(context, agent)
+
+    async def on_agent_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self._finish_hop(context, agent)
+        if self.inner:
+            await self.inner.on_agent_end(context, agent, output)
+
+    async def on_handoff(self, context: RunContextWrapper, from_agent: Agent, to_agent: Agent) -> None:
+        self._finish_hop(context, from_agent)
+        metrics.inc("agent_handoffs_total", (from_agent.name, to_agent.name))
+        if self.inner:
+            await self.inner.on_handoff(context, from_agent, to_agent)
+
+    async def on_tool_start(self, context: RunContextWrapper, agent: Agent, tool: Tool) -> None:
+        metrics.inc("agent_tool_calls_total", (agent.name, tool.name))
+        if self.inner:
+            await self.inner.on_tool_start(context, agent, tool)
+
+    async def on_tool_end(self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str) -> None:
+        if self.inner:
+            await self.inner.on_tool_end(context, agent, tool, result)
@@ -0,0 +1,123 @@
+"""
+Local intent detection for the agenda chatbot
+
+Keyword rules mirroring the "TASK OPERATION MODE" triggers of the
+TranslatorAgent prompt. The pipeline uses them to decide, without a model
+call, whether a request is a task operation (and which kind) or plain
+conversation that must stay with the TranslatorAgent.
+
+Usage Example:
+   from chatbot.intent import detect_intent, Intent
+
+   detect_intent("Borrar la tarea con ID 1")  # Intent.DELETE
+"""
+
+import re
+from enum import Enum
+
+from .text import normalize_text
+
+
+class Intent(str, Enum):
+    """
+    Kind of request made by the user
+    """
+    CREATE = "create"
+    READ = "read"
+    UPDATE = "update"
+    DELETE = "delete"
+    CHAT = "chat"
+
+    @property
+    def is_task_operation(self) -> bool:
+        """
+        Whether the request must reach the DatabaseAgent
+        """
+        return self is not Intent.CHAT
+
+    @property
+    def is_write(self) -> bool:
+        """
+        Whether the request may modify the database
+        """
+        return self in (Intent.CREATE, Intent.UPDATE, Intent.DELETE)
+
+
+# Accent-free keywords (see normalize_text); write intents are checked first
+INTENT_KEYWORDS = {
+    Intent.DELETE: [
+        "borrar", "borra", "eliminar", "elimina", "quitar", "quita", "cancelar", "cancela",
+        "delete", "remove", "cancel",
+    ],
+    Intent.UPDATE: [
+        "actualizar", "actualiza", "cambiar", "cambia", "modificar", "modifica", "editar",
+        "edita", "mover", "mueve", "update", "change", "modify", "edit", "move", "reschedule",
+    ],
+    Intent.CREATE: [
+        "crear", "crea", "creame", "anadir", "anade", "agregar", "agrega", "nueva tarea",
+        "apunta", "apuntar", "recuerdame", "programar",
+        "create", "add", "new task", "remind me",
+    ],
+    Intent.READ: [
+        "mostrar", "muestra", "muestrame", "ensename", "dame", "listar", "lista", "que tareas",
+        "que tengo", "tareas pendientes", "proximas tareas", "mis tareas", "vencidas", "resumen",
+        "mi agenda", "mi horario",
+        "show", "list", "give me", "what tasks", "what do i have", "upcoming", "my tasks", "overdue", "overview",
+        "my schedule", "my agenda",
+    ],
+}
+
+# Verbs that are also nouns or too common elsewhere ("show my schedule", "el
+# programa de hoy", "I get it"): they only count as a request in imperative
+# form, at the start of a sentence or after "please" / "can you"
+# ("schedule a call", "programa una cita", "get my tasks")
+IMPERATIVE_KEYWORDS = {
+    Intent.CREATE: ["programa", "schedule"],
+    Intent.READ: ["get"],
+}
+_POLITE_PREFIX = r"please|can you|could you|por favor|puedes|podrias"
+_IMPERATIVE_START = r"(?:^|[.!?;:]\s*|\b(?:" + _POLITE_PREFIX + r"|to)\s+)"
+
+
+def _keywords(intent: Intent, keywords: list[str]) -> str:
+    return "|".join(re.escape(k) for k in keywords + IMPERATIVE_KEYWORDS.get(intent, []))
+
+
+def _intent_pattern(intent: Intent, keywords: list[str]) -> re.Pattern:
+    alternatives = [r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b"]
+    if intent in IMPERATIVE_KEYWORDS:
+        verbs = "|".join(re.escape(k) for k in IMPERATIVE_KEYWORDS[intent])
+        alternatives.append(_IMPERATIVE_START + r"(" + verbs + r")\b")
+    return re.compile("|".join(alternatives))
+
+
+def _leading_pattern(intent: Intent, keywords: list[str]) -> re.Pattern:
+    # The verb that opens the request, optionally after "please" / "can you"
+    return re.compile(r"^(?:(?:" + _POLITE_PREFIX + r"),?\s+)?(" + _keywords(intent, keywords) + r")\b")
+
+
+_LEADING_PATTERNS = [(intent, _leading_pattern(intent, keywords)) for intent, keywords in INTENT_KEYWORDS.items()]
+_INTENT_PATTERNS = [(intent, _intent_pattern(intent, keywords)) for intent, keywords in INTENT_KEYWORDS.items()]
+
+
+def detect_intent(text: str) -> Intent:
+    """
+    Classify a user request.
+
+    The verb that opens the request decides ("Create a task to cancel the gym"
+    is a CREATE); otherwise the first keyword found wins, write intents first.
+
+    Args:
+    - text (str): Raw user text in Spanish or English.
+
+    Returns:
+    - Intent: The detected task operation, or Intent.CHAT for conversation.
+    """
+    normalized = normalize_text(text or "").strip()
+    for intent, pattern in _LEADING_PATTERNS:
+        if pattern.match(normalized):
+            return intent
+    for intent, pattern in _INTENT_PATTERNS:
+        if pattern.search(normalized):
+            return intent
+    return Intent.CHAT
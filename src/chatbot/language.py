@@ -0,0 +1,131 @@
+"""
+Local language detection for the agenda chatbot
+
+Character n-gram (1 to 3) language model trained on the small corpora bundled
+in chatbot/language_data/ (one `<language>.txt` file per supported language).
+It lets the pipeline recognise English requests locally and skip the
+TranslatorAgent hop, which only exists to normalise input to English.
+
+Usage Example:
+   from chatbot.language import detect_language
+
+   guess = detect_language("Show me all my tasks")
+   print(guess.language, guess.confidence)  # en 0.99...
+"""
+
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+LANGUAGE_DATA_DIR = os.path.join(os.path.dirname(__file__), "language_data")
+
+NGRAM_SIZES = (1, 2, 3)
+
+# Minimum confidence for the pipeline to trust the detected language
+DEFAULT_LANGUAGE_THRESHOLD = 0.9
+
+# Below this many letters a guess is never trusted ("ok", "si", "no")
+MIN_LETTERS = 6
+
+UNKNOWN_LANGUAGE = "unknown"
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    """
+    Result of the language detector
+
+    Fields:
+    - language: ISO 639-1 code ("en", "es") or "unknown"
+    - confidence: Posterior probability of the detected language (0.0 to 1.0)
+    """
+    language: str
+    confidence: float
+
+    def is_confident(self, threshold: float = DEFAULT_LANGUAGE_THRESHOLD) -> bool:
+        """
+        Whether the guess can be used to skip the TranslatorAgent
+        """
+        return self.language != UNKNOWN_LANGUAGE and self.confidence >= threshold
+
+
+@dataclass(frozen=True)
+class _LanguageProfile:
+    counts: dict
+    totals: dict
+    vocabulary: dict
+
+
+def _ngrams(text: str):
+    """
+    Yield the character n-grams of a text padded with spaces at word boundaries
+    """
+    padded = f" {' '.join(text.lower().split())} "
+    for size in NGRAM_SIZES:
+        for i in range(len(padded) - size + 1):
+            gram = padded[i:i + size]
+            if gram.strip():
+                yield gram
+
+
+@lru_cache(maxsize=1)
+def load_profiles() -> dict[str, _LanguageProfile]:
+    """
+    Train one n-gram profile per corpus file in LANGUAGE_DATA_DIR (cached)
+
+    Returns:
+    - dict[str, _LanguageProfile]: Profiles keyed by language code
+    """
+    profiles = {}
+    for file_name in sorted(os.listdir(LANGUAGE_DATA_DIR)):
+        language, extension = os.path.splitext(file_name)
+        if extension != ".txt":
+            continue
+        with open(os.path.join(LANGUAGE_DATA_DIR, file_name), "r", encoding="utf-8") as f:
+            counts = Counter(_ngrams(f.read()))
+
+        totals, vocabulary = Counter(), Counter()
+        for gram, count in counts.items():
+            totals[len(gram)] += count
+            vocabulary[len(gram)] += 1
+        profiles[language] = _LanguageProfile(dict(counts), dict(totals), dict(vocabulary))
+    return profiles
+
+
+def detect_language(text: str) -> LanguageGuess:
+    """
+    Detect the language of a user request.
+
+    Args:
+    - text (str): Raw user text.
+
+    Returns:
+    - LanguageGuess: Most likely language and its posterior probability.
+    """
+    grams = list(_ngrams(text or ""))
+    profiles = load_profiles()
+    if not grams or not profiles:
+        return LanguageGuess(UNKNOWN_LANGUAGE, 0.0)
+
+    # Naive Bayes over n-grams with add-one smoothing
+    scores = {}
+    for language, profile in profiles.items():
+        score = 0.0
+        for gram in grams:
+            size = len(gram)
+            numerator = profile.counts.get(gram, 0) + 1
+            denominator = profile.totals.get(size, 0) + profile.vocabulary.get(size, 0) + 1
+            score += math.log(numerator / denominator)
+        scores[language] = score
+
+    best = max(scores, key=scores.__getitem__)
+    # Softmax of the log-likelihoods, scaled down per n-gram so that long texts
+    # do not saturate to 1.0 on a handful of shared words
+    scale = len(grams) / 10
+    exps = {lang: math.exp((score - scores[best]) / max(scale, 1.0)) for lang, score in scores.items()}
+    confidence = exps[best] / sum(exps.values())
+    if sum(c.isalpha() for c in text) < MIN_LETTERS:
+        confidence = min(confidence, 0.5)
+    return LanguageGuess(best, confidence)
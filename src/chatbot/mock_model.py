@@ -0,0 +1,516 @@
+"""
+Offline model provider for the agents SDK
+
+ScriptedModel implements the agents Model interface without any network
+access: every call returns a scripted turn (final text, tool calls and/or a
+handoff), after an optional synthetic latency. It lets the whole
+TranslatorAgent → DateParserAgent → DatabaseAgent chain run with the real
+Runner, handoffs and database tools, so orchestration and tool overhead can
+be benchmarked and tested repeatably on a machine with no API key.
+
+A script maps agent names to either a list of ScriptedTurns (turn N of the
+agent in the current run gets item N) or a responder function that builds the
+turn from a ModelCall. agenda_script() is a responder script that emulates
+the prompts of the three agenda agents.
+
+Usage Example:
+   from chatbot.mock_model import LatencyProfile, agenda_script, offline_run_config
+   from chatbot.pipeline import run_agenda_query_sync
+
+   run_config = offline_run_config(agenda_script(), LatencyProfile(first_token_ms=300, seed=7))
+   result = run_agenda_query_sync("Show me all my tasks", run_config=run_config)
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Mapping, Optional, Sequence, Union
+
+from agents import Handoff, ModelProvider, ModelResponse, ModelSettings, ModelTracing, RunConfig, Tool, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.models.interface import Model
+from agents.tracing import generation_span
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from .date_parser import DEFAULT_TIME, parse_date
+from .hops import DEFAULT_AGENT, current_agent_name
+from .intent import Intent, detect_intent
+from .text import estimate_tokens
+
+# Recent calls kept by a ScriptedModel for inspection
+MAX_RECORDED_CALLS = 1000
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """
+    Synthetic latency of a scripted model call
+
+    Fields:
+    - first_token_ms: Delay before the first output (time to first token)
+    - per_token_ms: Delay per output token after the first one
+    - jitter_ms: Maximum extra random delay per call
+    - seed: Seed of the jitter, for repeatable runs
+    """
+    first_token_ms: float = 0.0
+    per_token_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ScriptedToolCall:
+    """
+    A function tool call made by a scripted turn
+    """
+    name: str
+    arguments: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ScriptedTurn:
+    """
+    One model response
+
+    Fields:
+    - text: Assistant message (the final output when there are no calls)
+    - tool_calls: Function tools to call
+    - handoff: Name of the agent to hand off to
+    """
+    text: Optional[str] = None
+    tool_calls: tuple[ScriptedToolCall, ...] = ()
+    handoff: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ModelCall:
+    """
+    What a responder knows about the call it answers
+
+    Fields:
+    - agent_name: Agent that is calling the model
+    - turn: Turn of that agent in the current run, starting at 0
+    - query: Latest user message
+    - tool_output: Output of the last tool called by this agent, if any
+    - handoffs: Names of the agents this agent can hand off to
+    - tools: Names of the tools this agent can call
+    - input: Full input items sent to the model
+    """
+    agent_name: str
+    turn: int
+    query: str
+    tool_output: Optional[str]
+    handoffs: tuple[str, ...]
+    tools: tuple[str, ...]
+    input: list
+
+
+Responder = Callable[[ModelCall], ScriptedTurn]
+Script = Mapping[str, Union[Sequence[ScriptedTurn], Responder]]
+
+
+class ScriptError(LookupError):
+    """
+    The script has no turn for a model call
+    """
+
+
+def _get(item: Any, key: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
+def _message_text(item: Any) -> str:
+    content = _get(item, "content")
+    if isinstance(content, str):
+        return content
+    return "".join(_get(part, "text") or "" for part in content or [])
+
+
+def _is_model_output(item: Any) -> bool:
+    kind = _get(item, "type")
+    return kind == "function_call" or (kind in (None, "message") and _get(item, "role") == "assistant")
+
+
+def describe_call(
+    agent_name: str,
+    input: Union[str, list[TResponseInputItem]],
+    tools: Sequence[Tool] = (),
+    handoffs: Sequence[Handoff] = (),
+) -> ModelCall:
+    """
+    Build the ModelCall of a request from the input items the Runner sends.
+
+    The turn of the agent is the number of model responses (groups of
+    consecutive assistant messages and function calls) since the last handoff
+    or user message, so earlier turns of a conversation history do not count.
+    """
+    items = [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+
+    start = 0
+    for i, item in enumerate(items):
+        if _get(item, "type") == "function_call" and (_get(item, "name") or "").startswith("transfer_to_"):
+            start = i + 1
+        elif _get(item, "role") == "user":
+            start = i + 1
+
+    turn = 0
+    tool_output = None
+    previous_is_output = False
+    for item in items[start:]:
+        is_output = _is_model_output(item)
+        if is_output and not previous_is_output:
+            turn += 1
+        previous_is_output = is_output
+        if _get(item, "type") == "function_call_output":
+            tool_output = _get(item, "output")
+
+    query = next((_message_text(item) for item in reversed(items) if _get(item, "role") == "user"), "")
+    return ModelCall(
+        agent_name=agent_name,
+        turn=turn,
+        query=query,
+        tool_output=tool_output,
+        handoffs=tuple(handoff.agent_name for handoff in handoffs),
+        tools=tuple(tool.name for tool in tools),
+        input=items,
+    )
+
+
+def text_chunks(text: str) -> list[str]:
+    """
+    Split a text into the word-sized deltas of a simulated stream
+    """
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def text_delta_event(delta: str, item_id: str, sequence_number: int) -> ResponseTextDeltaEvent:
+    """
+    Stream event for a chunk of the first output message
+    """
+    return ResponseTextDeltaEvent(
+        content_index=0,
+        delta=delta,
+        item_id=item_id,
+        output_index=0,
+        sequence_number=sequence_number,
+        type="response.output_text.delta",
+    )
+
+
+def response_completed_event(
+    output: list,
+    usage: Usage,
+    model_name: str,
+    response_id: str,
+    sequence_number: int,
+) -> ResponseCompletedEvent:
+    """
+    Final stream event; the Runner builds the ModelResponse of a streamed turn from it
+    """
+    return ResponseCompletedEvent(
+        response=Response(
+            id=response_id,
+            created_at=time.time(),
+            model=model_name,
+            object="response",
+            output=output,
+            parallel_tool_calls=False,
+            tool_choice="auto",
+            tools=[],
+            usage=ResponseUsage(
+                input_tokens=usage.input_tokens,
+                input_tokens_details=InputTokensDetails(cached_tokens=0),
+                output_tokens=usage.output_tokens,
+                output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+                total_tokens=usage.total_tokens,
+            ),
+        ),
+        sequence_number=sequence_number,
+        type="response.completed",
+    )
+
+
+class ScriptedModel(Model):
+    """
+    agents Model that answers from a script instead of the OpenAI API
+
+    Args:
+    - script (Script): Turns or responder per agent name (DEFAULT_AGENT for the rest).
+    - latency (LatencyProfile): Synthetic latency added to every call.
+    - model_name (str): Name reported in traces.
+    - max_calls (int): Recent calls kept in `calls` (call_count counts them all), so long
+      offline load runs do not grow without bound.
+    """
+
+    def __init__(
+        self,
+        script: Script,
+        latency: LatencyProfile = LatencyProfile(),
+        model_name: str = "scripted",
+        max_calls: int = MAX_RECORDED_CALLS,
+    ):
+        self.script = script
+        self.latency = latency
+        self.model_name = model_name
+        self.calls: deque[ModelCall] = deque(maxlen=max_calls)
+        self.call_count = 0
+        self._rng = random.Random(latency.seed)
+        self._ids = itertools.count(1)
+
+    def _next_turn(self, input, tools, handoffs) -> tuple[ModelCall, ScriptedTurn]:
+        agent_name = current_agent_name() or DEFAULT_AGENT
+        call = describe_call(agent_name, input, tools, handoffs)
+        self.calls.append(call)
+        self.call_count += 1
+
+        entry = self.script.get(agent_name, self.script.get(DEFAULT_AGENT))
+        if entry is None:
+            raise ScriptError(f"No script for agent '{agent_name}'")
+        if callable(entry):
+            return call, entry(call)
+        if call.turn >= len(entry):
+            raise ScriptError(f"Script for agent '{agent_name}' has no turn {call.turn}")
+        return call, entry[call.turn]
+
+    def _output_items(self, turn: ScriptedTurn, handoffs: Sequence[Handoff]) -> list:
+        output: list = []
+        if turn.text is not None:
+            output.append(ResponseOutputMessage(
+                id=f"msg_{next(self._ids)}",
+                content=[ResponseOutputText(text=turn.text, annotations=[], type="output_text")],
+                role="assistant",
+                status="completed",
+                type="message",
+            ))
+        calls = [(tool_call.name, tool_call.arguments) for tool_call in turn.tool_calls]
+        if turn.handoff is not None:
+            handoff = next((h for h in handoffs if h.agent_name == turn.handoff), None)
+            if handoff is None:
+                raise ScriptError(f"Scripted handoff to unknown agent '{turn.handoff}'")
+            calls.append((handoff.tool_name, {}))
+        for name, arguments in calls:
+            call_id = next(self._ids)
+            output.append(ResponseFunctionToolCall(
+                id=f"fc_{call_id}",
+                call_id=f"call_{call_id}",
+                name=name,
+                arguments=json.dumps(arguments, ensure_ascii=False),
+                type="function_call",
+                status="completed",
+            ))
+        return output
+
+    def _usage(self, system_instructions: Optional[str], input, turn: ScriptedTurn) -> Usage:
+        input_text = (system_instructions or "") + json.dumps(input, default=str, ensure_ascii=False)
+        output_text = (turn.text or "") + "".join(json.dumps(c.arguments) for c in turn.tool_calls)
+        input_tokens = estimate_tokens(input_text)
+        output_tokens = estimate_tokens(output_text) + (1 if turn.handoff else 0)
+        return Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+
+    def _first_token_delay(self) -> float:
+        jitter = self._rng.uniform(0, self.latency.jitter_ms) if self.latency.jitter_ms else 0.0
+        return (self.latency.first_token_ms + jitter) / 1000
+
+    async def get_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> ModelResponse:
+        # Read the agent span before the generation span becomes the current one
+        _, turn = self._next_turn(input, tools, handoffs)
+        with generation_span(model=self.model_name, disabled=tracing.is_disabled()) as span:
+            output = self._output_items(turn, handoffs)
+            usage = self._usage(system_instructions, input, turn)
+
+            delay = self._first_token_delay() + self.latency.per_token_ms * max(usage.output_tokens - 1, 0) / 1000
+            if delay:
+                await asyncio.sleep(delay)
+
+            span.span_data.usage = {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens}
+            if tracing.include_data():
+                span.span_data.output = [item.model_dump() for item in output]
+            return ModelResponse(output=output, usage=usage, response_id=None)
+
+    async def stream_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        # Read the agent span before the generation span becomes the current one
+        _, turn = self._next_turn(input, tools, handoffs)
+        with generation_span(model=self.model_name, disabled=tracing.is_disabled()) as span:
+            output = self._output_items(turn, handoffs)
+            usage = self._usage(system_instructions, input, turn)
+            sequence = itertools.count()
+
+            delay = self._first_token_delay()
+            if delay:
+                await asyncio.sleep(delay)
+
+            if turn.text:
+                for i, chunk in enumerate(text_chunks(turn.text)):
+                    if i and self.latency.per_token_ms:
+                        await asyncio.sleep(self.latency.per_token_ms * estimate_tokens(chunk) / 1000)
+                    yield text_delta_event(chunk, output[0].id, next(sequence))
+
+            span.span_data.usage = {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens}
+            if tracing.include_data():
+                span.span_data.output = [item.model_dump() for item in output]
+
+            yield response_completed_event(output, usage, self.model_name, f"resp_{next(self._ids)}", next(sequence))
+
+
+class ScriptedModelProvider(ModelProvider):
+    """
+    ModelProvider that serves the same ScriptedModel for every model name
+    """
+
+    def __init__(self, script: Script, latency: LatencyProfile = LatencyProfile()):
+        self.model = ScriptedModel(script, latency)
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self.model
+
+
+def offline_run_config(
+    script: Optional[Script] = None,
+    latency: LatencyProfile = LatencyProfile(),
+    tracing_disabled: bool = True,
+) -> RunConfig:
+    """
+    RunConfig that runs the agents on a ScriptedModel.
+
+    Args:
+    - script (Optional[Script]): Script to replay. Defaults to agenda_script().
+    - latency (LatencyProfile): Synthetic latency of every model call.
+    - tracing_disabled (bool): Skip tracing (enable it with a local trace processor installed).
+
+    Returns:
+    - RunConfig: Configuration for Runner.run / run_agenda_query.
+    """
+    return RunConfig(
+        model_provider=ScriptedModelProvider(script if script is not None else agenda_script(), latency),
+        tracing_disabled=tracing_disabled,
+        workflow_name="AIgenda offline",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Agenda script: emulates the prompts of the three agenda agents
+# ---------------------------------------------------------------------------
+
+_RESOLVED_DATE = re.compile(r"\[Resolved due_date: '([^']+)'\]")
+_TASK_ID = re.compile(r"\b(\d+)\b")
+_TITLE = re.compile(r":\s*(.+)$", re.DOTALL)
+_TODAY_WORDS = ("today", "hoy")
+_WEEK_WORDS = ("week", "semana")
+_OVERVIEW_WORDS = ("overdue", "vencid", "overview", "resumen", "coming up")
+_EMPTY_SNAPSHOT = re.compile(r"'counts': \{'overdue': 0, 'today': 0, 'upcoming': 0\}")
+
+
+def _due_date(query: str) -> str:
+    resolved = _RESOLVED_DATE.search(query)
+    if resolved:
+        return resolved.group(1)
+    parsed = parse_date(query)
+    if parsed.value is not None:
+        return parsed.as_db_string()
+    tomorrow = datetime.now() + timedelta(days=1)
+    return datetime.combine(tomorrow.date(), DEFAULT_TIME).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _title(query: str) -> str:
+    text = _RESOLVED_DATE.sub("", query).strip()
+    match = _TITLE.search(text)
+    return (match.group(1) if match else text).strip()[:100] or "Task"
+
+
+def _translator(call: ModelCall) -> ScriptedTurn:
+    intent = detect_intent(call.query)
+    if not intent.is_task_operation:
+        return ScriptedTurn(text=f"💬 {call.query}")
+    return ScriptedTurn(handoff=call.handoffs[0])
+
+
+def _date_parser(call: ModelCall) -> ScriptedTurn:
+    return ScriptedTurn(handoff=call.handoffs[0])
+
+
+def _database(call: ModelCall) -> ScriptedTurn:
+    if call.turn == 0:
+        intent = detect_intent(call.query)
+        text = call.query.lower()
+        if intent is Intent.CREATE:
+            arguments = {"title": _title(call.query), "description": "", "due_date": _due_date(call.query)}
+            return ScriptedTurn(tool_calls=(ScriptedToolCall("create_task", arguments),))
+        if intent is Intent.DELETE:
+            task_id = _TASK_ID.search(text)
+            return ScriptedTurn(tool_calls=(ScriptedToolCall("delete_task", {"task_id": int(task_id.group(1)) if task_id else 1}),))
+        if intent is Intent.READ:
+            if any(word in text for word in _OVERVIEW_WORDS):
+                return ScriptedTurn(tool_calls=(ScriptedToolCall("agenda_snapshot", {"days": 7}),))
+            if any(word in text for word in _TODAY_WORDS):
+                return ScriptedTurn(tool_calls=(ScriptedToolCall("get_tasks_for_today"),))
+            if any(word in text for word in _WEEK_WORDS):
+                return ScriptedTurn(tool_calls=(ScriptedToolCall("get_upcoming_tasks", {"days": 7}),))
+            return ScriptedTurn(tool_calls=(ScriptedToolCall("get_all_tasks"),))
+        return ScriptedTurn(text="❌ Error: This operation is not supported")
+
+    output = call.tool_output or ""
+    if "error" in output.lower():
+        return ScriptedTurn(text=f"❌ Error: {output}")
+    if output in ("", "[]") or _EMPTY_SNAPSHOT.search(output):
+        return ScriptedTurn(text="📭 No tasks found for this criteria")
+    return ScriptedTurn(text=f"✅ {output}")
+
+
+def agenda_script() -> dict[str, Responder]:
+    """
+    Responder script that follows the agenda agent prompts
+
+    TranslatorAgent answers conversation itself and hands task operations on;
+    DateParserAgent hands off to DatabaseAgent; DatabaseAgent calls the tool
+    matching the intent and answers with the ✅ / ❌ / 📭 response format.
+    """
+    return {
+        "TranslatorAgent": _translator,
+        "DateParserAgent": _date_parser,
+        "DatabaseAgent": _database,
+    }
@@ -0,0 +1,427 @@
+"""
+Retry, timeout and hedging policy for model calls
+
+A request runs through up to three agents (translator, date parser,
+database), each hop one or more model calls, so one slow or failed response
+stalls the whole chain. PolicyModel wraps the model of every agent and
+applies a ModelCallPolicy to each call:
+   - Deadline per hop: every call is cancelled after its agent's timeout.
+   - Retries: timeouts, connection errors, 429 and 5xx are retried with
+     exponential backoff and full jitter.
+   - Hedging: if a call is still running after the hedge delay (the observed
+     p95 latency of the agent, or a fixed delay), a second identical call is
+     fired and the first to finish wins. Streamed calls are not hedged.
+   - Budget: all the calls of one request share a total time budget. The
+     pipeline opens a request_scope() per request; every call is capped at
+     what is left of it and fails with BudgetExceeded once it is spent.
+
+The OpenAI client should not retry on its own under a policy; policy_run_config()
+builds the pooled client with max_retries=0.
+
+Usage Example:
+   from chatbot.model_policy import ModelCallPolicy, policy_run_config
+
+   policy = ModelCallPolicy(hop_timeout_s=15, max_retries=2, hedge=True, total_budget_s=45)
+   result = await run_agenda_query("Show me all my tasks", run_config=policy_run_config(policy))
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Union
+
+import openai
+from agents import Handoff, ModelProvider, ModelResponse, ModelSettings, ModelTracing, RunConfig, Tool
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.models.interface import Model
+from loguru import logger
+
+from utils.stats import percentile
+
+from .hops import DEFAULT_AGENT, current_agent_name
+from .openai_client import ClientSettings, PooledOpenAIProvider
+
+# Latency samples kept per agent for the hedge delay
+MAX_SAMPLES = 1000
+
+
+class ModelCallTimeout(TimeoutError):
+    """
+    A model call exceeded its hop deadline
+    """
+
+
+class BudgetExceeded(TimeoutError):
+    """
+    The total time budget of the request is spent
+    """
+
+
+@dataclass(frozen=True)
+class ModelCallPolicy:
+    """
+    How model calls are timed out, retried and hedged
+
+    Fields:
+    - hop_timeout_s: Deadline of one model call (None for no deadline)
+    - hop_timeouts: Deadline per agent name, overriding hop_timeout_s
+    - max_retries: Retries of a call after a retryable error
+    - backoff_base_s: Delay before the first retry, doubled on every retry
+    - backoff_max_s: Upper bound of the backoff delay
+    - hedge: Fire a second request when a call is slower than the hedge delay
+    - hedge_delay_s: Fixed hedge delay; None uses the observed p95 of the agent
+    - hedge_min_samples: Calls of an agent needed before its p95 is trusted
+    - total_budget_s: Time budget of all the calls of a request (None for no budget)
+    """
+    hop_timeout_s: Optional[float] = 30.0
+    hop_timeouts: dict[str, float] = field(default_factory=dict)
+    max_retries: int = 2
+    backoff_base_s: float = 0.5
+    backoff_max_s: float = 8.0
+    hedge: bool = False
+    hedge_delay_s: Optional[float] = None
+    hedge_min_samples: int = 20
+    total_budget_s: Optional[float] = None
+
+    def timeout_for(self, agent_name: str) -> Optional[float]:
+        return self.hop_timeouts.get(agent_name, self.hop_timeout_s)
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """
+        Full-jitter exponential backoff before retry number `attempt` (1-based)
+        """
+        return rng.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1)))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed model call is worth retrying: timeouts, connection errors, 408/409/429 and 5xx
+    """
+    if isinstance(error, (ModelCallTimeout, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+@dataclass
+class RequestScope:
+    """
+    Time budget of one request, shared by the calls of all its hops
+    """
+    started: float
+    budget_s: Optional[float] = None
+
+    def remaining(self, default_budget_s: Optional[float]) -> Optional[float]:
+        budget = self.budget_s if self.budget_s is not None else default_budget_s
+        if budget is None:
+            return None
+        return budget - (time.monotonic() - self.started)
+
+
+_request_scope: ContextVar[Optional[RequestScope]] = ContextVar("request_scope", default=None)
+
+
+@contextmanager
+def request_scope(budget_s: Optional[float] = None):
+    """
+    Start the time budget of a request for the model calls made in this context
+
+    Args:
+    - budget_s (Optional[float]): Budget in seconds. None uses the total_budget_s of the policy.
+    """
+    scope = RequestScope(started=time.monotonic(), budget_s=budget_s)
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+
+
+@dataclass
+class PolicyStats:
+    """
+    Counters of the calls made under a policy
+    """
+    calls: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    hedges: int = 0
+    hedges_won: int = 0
+    budget_exceeded: int = 0
+    latencies_ms: dict[str, deque] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_latency(self, agent_name: str, latency_ms: float) -> None:
+        self.latencies_ms.setdefault(agent_name, deque(maxlen=MAX_SAMPLES)).append(latency_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won,
+            "budget_exceeded": self.budget_exceeded,
+            "p95_ms": {name: percentile(list(samples), 95) for name, samples in sorted(self.latencies_ms.items())},
+        }
+
+
+class PolicyModel(Model):
+    """
+    agents Model that applies a ModelCallPolicy to another model
+
+    Args:
+    - inner (Model): Model that makes the real calls.
+    - policy (ModelCallPolicy): Timeouts, retries, hedging and budget.
+    - stats (Optional[PolicyStats]): Counters, shared by the models of a provider.
+    - seed (Optional[int]): Seed of the backoff jitter.
+    """
+
+    def __init__(self, inner: Model, policy: ModelCallPolicy, stats: Optional[PolicyStats] = None, seed: Optional[int] = None):
+        self.inner = inner
+        self.policy = policy
+        self.stats = stats or PolicyStats()
+        self._rng = random.Random(seed)
+
+    def _deadline(self, agent_name: str) -> Optional[float]:
+        """
+        Timeout of the next call: the hop deadline capped by the request budget
+        """
+        timeout = self.policy.timeout_for(agent_name)
+        scope = _request_scope.get()
+        remaining = scope.remaining(self.policy.total_budget_s) if scope else None
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            with self.stats.lock:
+                self.stats.budget_exceeded += 1
+            raise BudgetExceeded(f"Request budget spent before calling {agent_name}")
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _hedge_delay(self, agent_name: str) -> Optional[float]:
+        if not self.policy.hedge:
+            return None
+        if self.policy.hedge_delay_s is not None:
+            return self.policy.hedge_delay_s
+        with self.stats.lock:
+            samples = list(self.stats.latencies_ms.get(agent_name, ()))
+        if len(samples) < self.policy.hedge_min_samples:
+            return None
+        return percentile(samples, 95) / 1000
+
+    async def _hedged(self, agent_name: str, call) -> ModelResponse:
+        """
+        Run the call, firing a second one if the first is slower than the hedge delay
+        """
+        delay = self._hedge_delay(agent_name)
+        if delay is None:
+            return await call()
+
+        first = asyncio.ensure_future(call())
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+
+            with self.stats.lock:
+                self.stats.hedges += 1
+            logger.info(f"🏇 Hedging {agent_name} call after {delay * 1000:.0f} ms")
+            tasks.append(asyncio.ensure_future(call()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            with self.stats.lock:
+                                self.stats.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also reached when the deadline cancels this coroutine
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _attempt(self, agent_name: str, call) -> ModelResponse:
+        timeout = self._deadline(agent_name)
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._hedged(agent_name, call), timeout)
+        except asyncio.TimeoutError:
+            with self.stats.lock:
+                self.stats.timeouts += 1
+            raise ModelCallTimeout(f"{agent_name} model call exceeded {timeout:.1f}s") from None
+        with self.stats.lock:
+            self.stats.record_latency(agent_name, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def _backoff(self, agent_name: str, attempt: int, error: BaseException) -> None:
+        delay = self.policy.backoff(attempt, self._rng)
+        scope = _request_scope.get()
+        remaining = scope.remaining(self.policy.total_budget_s) if scope else None
+        if remaining is not None and delay >= remaining:
+            with self.stats.lock:
+                self.stats.budget_exceeded += 1
+            raise BudgetExceeded(f"Request budget spent retrying {agent_name}") from error
+        with self.stats.lock:
+            self.stats.retries += 1
+        logger.warning(f"🔁 Retrying {agent_name} in {delay * 1000:.0f} ms ({attempt}/{self.policy.max_retries}): {error}")
+        await asyncio.sleep(delay)
+
+    async def get_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> ModelResponse:
+        agent_name = current_agent_name() or DEFAULT_AGENT
+
+        def call():
+            return self.inner.get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+            )
+
+        with self.stats.lock:
+            self.stats.calls += 1
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(agent_name, call)
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt > self.policy.max_retries or not is_retryable(e):
+                    with self.stats.lock:
+                        self.stats.failures += 1
+                    raise
+                await self._backoff(agent_name, attempt, e)
+
+    async def stream_response(
+        self,
+        system_instructions: Optional[str],
+        input: Union[str, list[TResponseInputItem]],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: Optional[AgentOutputSchemaBase],
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: Optional[str] = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        # Retried only until the first event is yielded; the deadline covers the whole stream
+        agent_name = current_agent_name() or DEFAULT_AGENT
+        with self.stats.lock:
+            self.stats.calls += 1
+        attempt = 0
+        while True:
+            timeout = self._deadline(agent_name)
+            ends_at = None if timeout is None else time.monotonic() + timeout
+            started = time.perf_counter()
+            stream = self.inner.stream_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+            )
+            yielded = False
+            try:
+                while True:
+                    left = None if ends_at is None else max(ends_at - time.monotonic(), 0)
+                    try:
+                        event = await asyncio.wait_for(stream.__anext__(), left)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        with self.stats.lock:
+                            self.stats.timeouts += 1
+                        raise ModelCallTimeout(f"{agent_name} model stream exceeded {timeout:.1f}s") from None
+                    yielded = True
+                    yield event
+                with self.stats.lock:
+                    self.stats.record_latency(agent_name, (time.perf_counter() - started) * 1000)
+                return
+            except Exception as e:
+                attempt += 1
+                if yielded or attempt > self.policy.max_retries or not is_retryable(e):
+                    with self.stats.lock:
+                        self.stats.failures += 1
+                    raise
+                await self._backoff(agent_name, attempt, e)
+            finally:
+                await stream.aclose()
+
+
+class PolicyModelProvider(ModelProvider):
+    """
+    ModelProvider that wraps the models of another provider in PolicyModels
+
+    Args:
+    - policy (ModelCallPolicy): Policy applied to every call.
+    - inner_provider (Optional[ModelProvider]): Real provider (a pooled OpenAI provider without client retries by default).
+    - seed (Optional[int]): Seed of the backoff jitter.
+    """
+
+    def __init__(self, policy: ModelCallPolicy, inner_provider: Optional[ModelProvider] = None, seed: Optional[int] = None):
+        self.policy = policy
+        self.inner_provider = inner_provider or PooledOpenAIProvider(ClientSettings(max_retries=0))
+        self.stats = PolicyStats()
+        self.seed = seed
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        # Models are cheap wrappers; the inner provider resolves the client of the running loop
+        return PolicyModel(self.inner_provider.get_model(model_name), self.policy, self.stats, self.seed)
+
+    def metrics(self) -> dict:
+        return self.stats.to_dict()
+
+
+def policy_run_config(
+    policy: ModelCallPolicy,
+    inner_provider: Optional[ModelProvider] = None,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> RunConfig:
+    """
+    RunConfig whose model calls follow a ModelCallPolicy.
+
+    Args:
+    - policy (ModelCallPolicy): Timeouts, retries, hedging and budget.
+    - inner_provider (Optional[ModelProvider]): Real provider.
+    - seed (Optional[int]): Seed of the backoff jitter.
+    - kwargs: Other RunConfig fields (workflow_name, tracing_disabled...).
+
+    Returns:
+    - RunConfig: Configuration for Runner.run / run_agenda_query.
+    """
+    return RunConfig(model_provider=PolicyModelProvider(policy, inner_provider, seed), **kwargs)
@@ -0,0 +1,157 @@
+"""
+Shared, pooled OpenAI client for the agenda agents
+
+A request hops through up to three agents, and each hop is one or more model
+calls. PooledOpenAIProvider gives all of them one AsyncOpenAI client per event
+loop, backed by an httpx connection pool with keep-alive and explicit
+timeouts, so consecutive hops reuse a warm connection instead of paying a new
+TCP + TLS handshake.
+
+httpx connections belong to the event loop that opened them, so the provider
+keeps one client per loop (asyncio.run() in run_agenda_query_sync creates a
+new loop per call).
+
+Usage Example:
+   from chatbot.openai_client import PooledOpenAIProvider, ClientSettings
+
+   provider = PooledOpenAIProvider(ClientSettings(max_connections=50))
+   result = await run_agenda_query("Show me all my tasks", run_config=RunConfig(model_provider=provider))
+"""
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from agents import Model, ModelProvider, OpenAIChatCompletionsModel, OpenAIResponsesModel
+from loguru import logger
+from openai import AsyncOpenAI
+
+# Same model as the agents in agent_agenda.py
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """
+    Connection pool and timeout settings of the shared client
+
+    Fields:
+    - max_connections: Open connections at most (concurrent model calls beyond this wait for one)
+    - max_keepalive_connections: Idle connections kept warm for the next call
+    - keepalive_expiry_s: Seconds an idle connection is kept
+    - connect_timeout_s: TCP + TLS handshake timeout
+    - read_timeout_s: Time allowed between bytes of the response (streams included)
+    - write_timeout_s: Time allowed to send the request
+    - pool_timeout_s: Time allowed waiting for a free connection of the pool
+    - max_retries: Retries of the OpenAI client on connection errors, 429 and 5xx
+    - base_url: API base URL (None for the OpenAI default or OPENAI_BASE_URL)
+    - api_key: API key (None for OPENAI_API_KEY)
+    """
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_s: float = 30.0
+    connect_timeout_s: float = 5.0
+    read_timeout_s: float = 60.0
+    write_timeout_s: float = 10.0
+    pool_timeout_s: float = 10.0
+    max_retries: int = 2
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout_s,
+            read=self.read_timeout_s,
+            write=self.write_timeout_s,
+            pool=self.pool_timeout_s,
+        )
+
+
+def build_openai_client(settings: ClientSettings = ClientSettings()) -> AsyncOpenAI:
+    """
+    AsyncOpenAI client over a pooled, keep-alive httpx client
+
+    Args:
+    - settings (ClientSettings): Pool, timeout and endpoint settings.
+
+    Returns:
+    - AsyncOpenAI: The client. Close it with `await client.close()`.
+    """
+    http_client = httpx.AsyncClient(limits=settings.limits(), timeout=settings.timeout())
+    return AsyncOpenAI(
+        api_key=settings.api_key,
+        base_url=settings.base_url,
+        max_retries=settings.max_retries,
+        timeout=settings.timeout(),
+        http_client=http_client,
+    )
+
+
+class PooledOpenAIProvider(ModelProvider):
+    """
+    Model provider that serves every agent from one shared client per event loop
+
+    Args:
+    - settings (ClientSettings): Settings of the clients it creates.
+    - use_responses (bool): Use the Responses API (the SDK default) or Chat Completions.
+    """
+
+    def __init__(self, settings: ClientSettings = ClientSettings(), use_responses: bool = True):
+        self.settings = settings
+        self.use_responses = use_responses
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self) -> AsyncOpenAI:
+        """
+        Client of the running event loop, created on first use
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = build_openai_client(self.settings)
+                self._clients[loop] = client
+                logger.debug(f"🔌 New pooled OpenAI client (max_connections={self.settings.max_connections})")
+            return client
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        model_name = model_name or DEFAULT_MODEL
+        if self.use_responses:
+            return OpenAIResponsesModel(model=model_name, openai_client=self.client())
+        return OpenAIChatCompletionsModel(model=model_name, openai_client=self.client())
+
+    async def aclose(self) -> None:
+        """
+        Close the client of the running event loop (its idle connections)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+
+_provider: Optional[PooledOpenAIProvider] = None
+_provider_lock = threading.Lock()
+
+
+def shared_model_provider() -> PooledOpenAIProvider:
+    """
+    Process-wide provider used by the pipeline when no run_config is given
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = PooledOpenAIProvider()
+        return _provider
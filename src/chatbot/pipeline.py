@@ -0,0 +1,411 @@
+"""
+Agent pipeline entry point
+
+Runs the pre-processing steps that can be solved locally before handing a
+request to the agents, so model hops are only spent where they are needed:
+   - Intent: chatbot.intent tells task operations from conversation, which
+     always stays with the TranslatorAgent.
+   - Language: chatbot.language detects English requests, which the
+     downstream agents handle directly, skipping the TranslatorAgent hop.
+   - Dates: resolved by chatbot.date_parser. When the local parse is confident,
+     the resolved due_date is appended to the request and the DateParserAgent
+     hop is skipped. Requests that read or delete tasks without mentioning a
+     date do not need it either.
+
+Every run records which hops were skipped and the latency that saved,
+estimated from the measured average duration of those hops.
+
+Read-only requests are answered from chatbot.cache while the database has
+not changed since the answer was produced, and identical reads that arrive
+while one is running share its run (chatbot.single_flight); writes always
+run the agents.
+
+Conversations: given a chatbot.conversations session, a run also gets the
+running summary, the recent turns within a token budget and the last listed
+tasks of that conversation, and ordinal references ("delete the second one")
+are resolved locally to a task id. Such runs depend on their history, so
+they bypass the cache and single-flight.
+
+Two entry points share that logic: run_agenda_query() returns the final
+answer, stream_agenda_query() yields AgendaEvents (text deltas, handoffs and
+tool calls) as they happen, for UIs that show progress before the end.
+
+Usage Example:
+   from chatbot.pipeline import run_agenda_query_sync
+
+   result = run_agenda_query_sync("Crea una tarea para mañana: comprar leche")
+   print(result.final_output)
+
+   async for event in stream_agenda_query("Show me all my tasks"):
+       if event.kind == "text":
+           print(event.text, end="")
+"""
+
+import asyncio
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Union
+
+from agents import Agent, Runner, RunConfig, RunHooks
+from agents.result import RunResultBase
+from agents.stream_events import AgentUpdatedStreamEvent, RawResponsesStreamEvent, RunItemStreamEvent
+from loguru import logger
+
+from database.events import data_version
+
+from .agent_agenda import agent_factory
+from .cache import CacheKey, ResponseCache, make_cache_key, response_cache
+from .context import context_database_url, context_user
+from .conversations import ConversationSession, ConversationWindow, annotate_task_reference, resolve_task_reference, tool_results
+from .date_parser import DEFAULT_CONFIDENCE_THRESHOLD, ParsedDate, get_user_timezone, parse_date
+from .hops import HopLatencyTracker, HopTimingHooks, hop_latency_tracker
+from .intent import Intent, detect_intent
+from .language import DEFAULT_LANGUAGE_THRESHOLD, LanguageGuess, detect_language
+from .model_policy import request_scope
+from .openai_client import shared_model_provider
+from .single_flight import SingleFlight, agent_single_flight
+
+DEFAULT_MAX_TURNS = 10
+
+
+@dataclass
+class RoutePlan:
+    """
+    How a request will be sent through the agents
+
+    Fields:
+    - starting_agent: First agent of the run
+    - input: Text sent to the starting agent (may carry resolved annotations)
+    - intent: Locally detected intent
+    - language: Locally detected language
+    - parsed_date: Result of the local date parser
+    - skipped_hops: Names of the agents that the plan leaves out
+    """
+    starting_agent: Agent
+    input: str
+    intent: Intent
+    language: LanguageGuess
+    parsed_date: ParsedDate
+    skipped_hops: list[str] = field(default_factory=list)
+
+
+@dataclass
+class AgendaRunResult:
+    """
+    Outcome of a pipeline run
+
+    Fields:
+    - final_output: Text answer for the user
+    - plan: Route that was used
+    - run_result: Raw result of the agents Runner
+    - hop_latencies_ms: Measured duration of each hop of this run
+    - latency_saved_ms: Estimated time saved by the skipped hops
+    - cache_hit: Whether the answer came from the response cache (no agent run)
+    - coalesced: Whether the answer was shared from an identical request in flight (no agent run)
+    - history_tokens: Estimated tokens of conversation history sent with the request
+    """
+    final_output: str
+    plan: RoutePlan
+    run_result: Optional[RunResultBase] = None
+    hop_latencies_ms: dict[str, float] = field(default_factory=dict)
+    latency_saved_ms: float = 0.0
+    cache_hit: bool = False
+    coalesced: bool = False
+    history_tokens: int = 0
+
+
+@dataclass
+class AgendaEvent:
+    """
+    Incremental event of a streamed pipeline run
+
+    Fields:
+    - kind: "agent" (new agent took over), "text" (output delta), "handoff",
+      "tool_call", "tool_output" or "final" (always the last event)
+    - agent: Name of the agent that produced the event
+    - text: Text delta, agent name, handoff target, tool call or final answer
+    - result: Complete run result (only on the "final" event)
+    """
+    kind: str
+    agent: Optional[str] = None
+    text: str = ""
+    result: Optional[AgendaRunResult] = None
+
+
+def annotate_resolved_date(query: str, parsed: ParsedDate) -> str:
+    """
+    Append the locally resolved due_date so downstream agents use it verbatim
+    """
+    return f"{query}\n\n[Resolved due_date: '{parsed.as_db_string()}']"
+
+
+def plan_route(
+    query: str,
+    now: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+    confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    language_threshold: float = DEFAULT_LANGUAGE_THRESHOLD,
+) -> RoutePlan:
+    """
+    Decide the starting agent and input for a request.
+
+    Args:
+    - query (str): Raw user request.
+    - now (Optional[datetime]): Reference time for the date parser. Defaults to now.
+    - timezone (Optional[str]): User timezone name. Defaults to the configured one.
+    - confidence_threshold (float): Minimum parse confidence to skip the DateParserAgent.
+    - language_threshold (float): Minimum language confidence to skip the TranslatorAgent.
+
+    Returns:
+    - RoutePlan: The route to run.
+    """
+    intent = detect_intent(query)
+    language = detect_language(query)
+    parsed = parse_date(query, now=now, timezone=timezone)
+    date_resolved = parsed.is_confident(confidence_threshold)
+
+    # Conversation is the TranslatorAgent's job; only task operations are routed
+    if not intent.is_task_operation:
+        return RoutePlan(agent_factory.get("translator"), query, intent, language, parsed)
+
+    skipped_hops = []
+    if date_resolved or (parsed.value is None and intent in (Intent.READ, Intent.DELETE)):
+        skipped_hops.append("DateParserAgent")
+    if language.language == "en" and language.is_confident(language_threshold):
+        skipped_hops.insert(0, "TranslatorAgent")
+
+    needs_translator = "TranslatorAgent" not in skipped_hops
+    needs_date_parser = "DateParserAgent" not in skipped_hops
+    if needs_translator:
+        starting_agent = agent_factory.get("translator" if needs_date_parser else "translator_direct")
+    else:
+        starting_agent = agent_factory.get("date_parser" if needs_date_parser else "database")
+
+    agent_input = annotate_resolved_date(query, parsed) if date_resolved else query
+    if skipped_hops:
+        logger.info(f"⏭️ Skipping {', '.join(skipped_hops)} ({intent.value}, {language.language})")
+    return RoutePlan(starting_agent, agent_input, intent, language, parsed, skipped_hops)
+
+
+def _read_key(
+    query: str,
+    plan: RoutePlan,
+    now: Optional[datetime],
+    context: Any,
+) -> Optional[CacheKey]:
+    """
+    Identity of a read-only request for the cache and single-flight (None for other intents)
+    """
+    if plan.intent != Intent.READ:
+        return None
+    today = (now or datetime.now(get_user_timezone())).date()
+    database_url = context_database_url(context)
+    return make_cache_key(query, plan.intent, today, data_version(database_url), database_url, context_user(context))
+
+
+def _conversation_input(query: str, plan: RoutePlan, window: Optional[ConversationWindow]) -> Union[str, list]:
+    """
+    Runner input: the planned input, with the resolved task reference and the conversation window
+
+    References are only resolved for requests on one existing task (DELETE, UPDATE).
+    """
+    if window is None:
+        return plan.input
+    reference = None
+    if plan.intent in (Intent.DELETE, Intent.UPDATE):
+        reference = resolve_task_reference(query, window.recent_tasks)
+    if reference is not None:
+        logger.info(f"🔗 Resolved reference in '{query}' to task #{reference['id']}")
+        plan.input = annotate_task_reference(plan.input, reference)
+    return plan.input if window.is_empty else window.input_items(plan.input)
+
+
+def _lookup_cache(read_key: Optional[CacheKey], cache: Optional[ResponseCache]) -> Optional[str]:
+    """
+    Cached answer of a read-only request, if any
+    """
+    if cache is None or read_key is None:
+        return None
+    cached_output = cache.get(read_key)
+    if cached_output is not None:
+        logger.info(f"⚡ Cache hit for '{read_key.query}'")
+    return cached_output
+
+
+def _finish_run(
+    plan: RoutePlan,
+    result: RunResultBase,
+    timing_hooks: HopTimingHooks,
+    latency_saved_ms: float,
+    cache: Optional[ResponseCache],
+    cache_key: Optional[CacheKey],
+    session: Optional[ConversationSession] = None,
+    window: Optional[ConversationWindow] = None,
+    query: str = "",
+) -> AgendaRunResult:
+    """
+    Store cacheable answers and the conversation turn, and build the result of a finished run
+    """
+    final_output = str(result.final_output)
+    if session is not None:
+        session.add_turn(query, final_output, tool_results(result))
+    # Only cache if the run really was read-only (nothing bumped the version)
+    if cache is not None and cache_key is not None \
+            and data_version(cache_key.database_url) == cache_key.data_version:
+        cache.put(cache_key, final_output)
+
+    if plan.skipped_hops:
+        logger.info(f"⏱️ Skipped {plan.skipped_hops}, saved ~{latency_saved_ms:.0f} ms")
+    return AgendaRunResult(
+        final_output=final_output,
+        plan=plan,
+        run_result=result,
+        hop_latencies_ms=timing_hooks.hop_latencies_ms,
+        latency_saved_ms=latency_saved_ms,
+        history_tokens=window.tokens if window is not None else 0,
+    )
+
+
+async def run_agenda_query(
+    query: str,
+    *,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    context: Any = None,
+    hooks: Optional[RunHooks] = None,
+    run_config: Optional[RunConfig] = None,
+    now: Optional[datetime] = None,
+    tracker: HopLatencyTracker = hop_latency_tracker,
+    cache: Optional[ResponseCache] = response_cache,
+    budget_s: Optional[float] = None,
+    single_flight: Optional[SingleFlight] = agent_single_flight,
+    session: Optional[ConversationSession] = None,
+) -> AgendaRunResult:
+    """
+    Run a user request through the agent pipeline.
+
+    Args:
+    - query (str): Raw user request.
+    - max_turns (int): Maximum number of agent turns.
+    - context (Any): Run context passed to the agents and tools (an AgendaContext selects the database).
+    - hooks (Optional[RunHooks]): Lifecycle hooks for the run.
+    - run_config (Optional[RunConfig]): Run configuration (model provider, tracing...).
+      Defaults to the shared pooled OpenAI client (chatbot.openai_client).
+    - now (Optional[datetime]): Reference time for the date parser. Defaults to now.
+    - tracker (HopLatencyTracker): Hop latency averages used to estimate the time saved.
+    - cache (Optional[ResponseCache]): Cache for read-only answers. None disables caching.
+    - budget_s (Optional[float]): Time budget of all the model calls of the request, enforced by
+      a chatbot.model_policy run_config. None uses the total_budget_s of its policy.
+    - single_flight (Optional[SingleFlight]): Shares one run among identical concurrent reads of
+      the same user. None disables coalescing. Coalesced requests do not call their own hooks.
+    - session (Optional[ConversationSession]): Conversation the request belongs to. Its history
+      window is sent with the request and the turn is stored after it.
+
+    Returns:
+    - AgendaRunResult: Final answer and routing details.
+    """
+    plan = plan_route(query, now=now)
+    window = session.window() if session is not None else None
+    agent_input = _conversation_input(query, plan, window)
+    read_key = _read_key(query, plan, now, context) if session is None else None
+    cached_output = _lookup_cache(read_key, cache)
+    if cached_output is not None:
+        return AgendaRunResult(final_output=cached_output, plan=plan, cache_hit=True)
+
+    async def run_agents() -> AgendaRunResult:
+        # Estimate before this run's samples are added to the averages
+        latency_saved_ms = tracker.estimate_saved(plan.skipped_hops)
+        timing_hooks = HopTimingHooks(tracker, inner=hooks)
+
+        with request_scope(budget_s):
+            result = await Runner.run(
+                plan.starting_agent,
+                agent_input,
+                context=context,
+                max_turns=max_turns,
+                hooks=timing_hooks,
+                run_config=run_config or RunConfig(model_provider=shared_model_provider()),
+            )
+        return _finish_run(plan, result, timing_hooks, latency_saved_ms, cache, read_key, session, window, query)
+
+    if single_flight is None or read_key is None:
+        return await run_agents()
+    result, shared = await single_flight.do(read_key, run_agents)
+    return replace(result, coalesced=True) if shared else result
+
+
+async def stream_agenda_query(
+    query: str,
+    *,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    context: Any = None,
+    hooks: Optional[RunHooks] = None,
+    run_config: Optional[RunConfig] = None,
+    now: Optional[datetime] = None,
+    tracker: HopLatencyTracker = hop_latency_tracker,
+    cache: Optional[ResponseCache] = response_cache,
+    budget_s: Optional[float] = None,
+    session: Optional[ConversationSession] = None,
+) -> AsyncIterator[AgendaEvent]:
+    """
+    Run a user request through the agent pipeline, yielding progress as it happens.
+
+    Takes the same arguments as run_agenda_query() except single_flight:
+    every stream runs its own agents. The last event is always of kind
+    "final" and carries the complete AgendaRunResult.
+
+    Yields:
+    - AgendaEvent: Agent changes, text deltas, handoffs, tool calls and the final answer.
+    """
+    plan = plan_route(query, now=now)
+    window = session.window() if session is not None else None
+    agent_input = _conversation_input(query, plan, window)
+    read_key = _read_key(query, plan, now, context) if session is None else None
+    cached_output = _lookup_cache(read_key, cache)
+    if cached_output is not None:
+        result = AgendaRunResult(final_output=cached_output, plan=plan, cache_hit=True)
+        yield AgendaEvent(kind="final", text=cached_output, result=result)
+        return
+
+    latency_saved_ms = tracker.estimate_saved(plan.skipped_hops)
+    timing_hooks = HopTimingHooks(tracker, inner=hooks)
+
+    # The run task copies the context, and the request scope with it
+    with request_scope(budget_s):
+        streamed = Runner.run_streamed(
+            plan.starting_agent,
+            agent_input,
+            context=context,
+            max_turns=max_turns,
+            hooks=timing_hooks,
+            run_config=run_config or RunConfig(model_provider=shared_model_provider()),
+        )
+    current_agent = plan.starting_agent.name
+    async for event in streamed.stream_events():
+        if isinstance(event, AgentUpdatedStreamEvent):
+            current_agent = event.new_agent.name
+            yield AgendaEvent(kind="agent", agent=current_agent, text=current_agent)
+        elif isinstance(event, RawResponsesStreamEvent):
+            if event.data.type == "response.output_text.delta":
+                yield AgendaEvent(kind="text", agent=current_agent, text=event.data.delta)
+        elif isinstance(event, RunItemStreamEvent):
+            if event.name == "handoff_occured":
+                yield AgendaEvent(kind="handoff", agent=current_agent, text=event.item.target_agent.name)
+            elif event.name == "tool_called":
+                raw = event.item.raw_item
+                yield AgendaEvent(
+                    kind="tool_call",
+                    agent=current_agent,
+                    text=f"{getattr(raw, 'name', '')}({getattr(raw, 'arguments', '')})",
+                )
+            elif event.name == "tool_output":
+                yield AgendaEvent(kind="tool_output", agent=current_agent, text=str(event.item.output))
+
+    result = _finish_run(plan, streamed, timing_hooks, latency_saved_ms, cache, read_key, session, window, query)
+    yield AgendaEvent(kind="final", agent=current_agent, text=result.final_output, result=result)
+
+
+def run_agenda_query_sync(query: str, **kwargs) -> AgendaRunResult:
+    """
+    Blocking wrapper around run_agenda_query() for scripts
+    """
+    return asyncio.run(run_agenda_query(query, **kwargs))
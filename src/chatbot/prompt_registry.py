@@ -0,0 +1,353 @@
+"""
+Prompt registry: static instructions first, run-time facts last
+
+Providers cache the longest prompt prefix they have already seen, so the
+instructions of every agent are split in two:
+   - Static prefix: the prompt file (plus fixed variants such as the note of
+     the direct translator). It never changes between runs, users or days.
+   - Dynamic context: a "## Current context" section rendered on every run
+     with the current date and time, the user's timezone and, if the run
+     context has one, the user. It always goes at the end.
+
+registry.instructions(name) is a callable for Agent(instructions=...), so
+the dynamic part is rendered when the agent runs, not when it is imported.
+Prompt files are read (next to this module) on first use; reload() or a
+reload_interval_s (AIGENDA_PROMPT_RELOAD_S) picks up edits without a restart.
+check_prefix_stability() renders every prompt for different moments, users
+and timezones and reports whether the static prefix stayed identical.
+
+Usage Example:
+   from chatbot.prompt_registry import prompt_registry
+
+   agent = Agent(name="DatabaseAgent", instructions=prompt_registry.instructions("database"))
+   print(prompt_registry.render("date_parser", now=datetime(2025, 6, 7, 10, 0)))
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Callable, Iterable, Optional
+
+from loguru import logger
+
+from .context import context_user
+from .date_parser import TIMEZONE_ENV_VAR, get_user_timezone
+from .text import estimate_tokens
+
+# Next to this module, whatever the working directory
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+# Environment variable that enables hot reload of the prompt files (seconds between checks)
+RELOAD_ENV_VAR = "AIGENDA_PROMPT_RELOAD_S"
+# Starts the dynamic part of every rendered prompt
+DYNAMIC_HEADER = "\n\n## Current context\n"
+# Shortest prefix that OpenAI prompt caching applies to
+MIN_CACHEABLE_TOKENS = 1024
+
+
+@dataclass(frozen=True)
+class PromptFacts:
+    """
+    Run-time facts rendered into the dynamic context
+
+    Fields:
+    - now: Current time in the user's timezone
+    - timezone: Name of the user's timezone
+    - user: Who is asking (None when unknown)
+    """
+    now: datetime
+    timezone: str
+    user: Optional[str] = None
+
+
+def prompt_facts(context: Any = None, now: Optional[datetime] = None, timezone: Optional[tzinfo] = None) -> PromptFacts:
+    """
+    Facts of a run: the current time in the user's timezone and the user of the run context
+    """
+    zone = timezone or get_user_timezone()
+    if now is None:
+        now = datetime.now(zone)
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=zone)
+    else:
+        now = now.astimezone(zone)
+    name = getattr(zone, "key", None) or (os.getenv(TIMEZONE_ENV_VAR) if timezone is None else None) or now.tzname() or "local"
+    offset = now.strftime("%z")
+    return PromptFacts(now=now, timezone=f"{name}, UTC{offset[:3]}:{offset[3:]}", user=context_user(context))
+
+
+def current_context(facts: PromptFacts) -> str:
+    """
+    Dynamic section shared by all the agents: date, time, timezone and user
+    """
+    lines = [
+        f"- Today: {facts.now.date().isoformat()} ({facts.now.strftime('%A')})",
+        f"- Current time: {facts.now.strftime('%H:%M')} ({facts.timezone})",
+    ]
+    if facts.user:
+        lines.append(f"- User: {facts.user}")
+    return "\n".join(lines)
+
+
+def date_references(facts: PromptFacts) -> str:
+    """
+    Dynamic section of the DateParserAgent: the general context plus the dates its rules refer to
+    """
+    today = facts.now.date()
+    next_monday = today + timedelta(days=7 - today.weekday())
+    return "\n".join([
+        current_context(facts),
+        f"- Tomorrow: {(today + timedelta(days=1)).isoformat()}",
+        f"- Next week: {(today + timedelta(days=7)).isoformat()}",
+        f"- Next Monday: {next_monday.isoformat()}",
+        f"- Current year: {today.year}",
+    ])
+
+
+DynamicSection = Callable[[PromptFacts], str]
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    Instructions of one agent
+
+    Fields:
+    - name: Registry key
+    - static: Stable prefix (prompt file and fixed additions)
+    - dynamic: Renders the run-time facts appended after the prefix (None for none)
+    """
+    name: str
+    static: str
+    dynamic: Optional[DynamicSection] = current_context
+
+    def render(self, facts: PromptFacts) -> str:
+        if self.dynamic is None:
+            return self.static
+        return f"{self.static}{DYNAMIC_HEADER}{self.dynamic(facts)}"
+
+
+def static_prefix(instructions: str) -> str:
+    """
+    Rendered instructions without their dynamic context (used to hash prompts across days)
+    """
+    return instructions.split(DYNAMIC_HEADER, 1)[0]
+
+
+@dataclass(frozen=True)
+class _PromptSpec:
+    file: Optional[str]
+    text: str
+    extends: Optional[str]
+    dynamic: Optional[DynamicSection]
+
+
+class PromptRegistry:
+    """
+    Named prompt templates of the agents, read from their files on first use
+
+    Args:
+    - prompts_dir (str): Directory of the prompt files.
+    - reload_interval_s (Optional[float]): Check the prompt files for changes at most this often
+      when rendering, and reload the changed prompts without a restart. None (default) reads
+      every file once; reload() can still be called explicitly.
+    """
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR, reload_interval_s: Optional[float] = None):
+        self.prompts_dir = prompts_dir
+        self.reload_interval_s = reload_interval_s
+        self.reloads = 0
+        self._specs: dict[str, _PromptSpec] = {}
+        self._templates: dict[str, PromptTemplate] = {}
+        # File modification times the loaded templates were read at
+        self._mtimes: dict[str, float] = {}
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        file: Optional[str] = None,
+        text: str = "",
+        extends: Optional[str] = None,
+        dynamic: Optional[DynamicSection] = current_context,
+    ) -> None:
+        """
+        Register a prompt (its file is read when first used).
+
+        Args:
+        - name (str): Registry key.
+        - file (Optional[str]): Prompt file in prompts_dir.
+        - text (str): Static text appended after the file (or after `extends`).
+        - extends (Optional[str]): Registered prompt whose static prefix comes first.
+        - dynamic (Optional[DynamicSection]): Renders the dynamic context. None for a fully static prompt.
+        """
+        with self._lock:
+            self._specs[name] = _PromptSpec(file, text, extends, dynamic)
+            self._templates.pop(name, None)
+
+    def _path(self, file: str) -> str:
+        return os.path.join(self.prompts_dir, file)
+
+    def _load(self, name: str) -> PromptTemplate:
+        # Called with the lock held
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+        spec = self._specs[name]
+        static = self._load(spec.extends).static if spec.extends else ""
+        if spec.file:
+            path = self._path(spec.file)
+            with open(path, "r", encoding="utf-8") as f:
+                static += f.read()
+            self._mtimes[spec.file] = os.path.getmtime(path)
+        template = PromptTemplate(name=name, static=static + spec.text, dynamic=spec.dynamic)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        if self.reload_interval_s is not None and time.monotonic() - self._last_check >= self.reload_interval_s:
+            self.reload_if_changed()
+        with self._lock:
+            return self._load(name)
+
+    def names(self) -> list[str]:
+        return list(self._specs)
+
+    def reload(self) -> None:
+        """
+        Forget the loaded prompts: the files are read again on next use
+        """
+        with self._lock:
+            self._templates.clear()
+            self._mtimes.clear()
+            self.reloads += 1
+        logger.info("🔄 Prompts reloaded")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the prompts if one of their files changed since it was read
+
+        Returns:
+        - bool: Whether the prompts were reloaded.
+        """
+        self._last_check = time.monotonic()
+        with self._lock:
+            mtimes = dict(self._mtimes)
+        for file, mtime in mtimes.items():
+            try:
+                changed = os.path.getmtime(self._path(file)) != mtime
+            except OSError:
+                changed = False
+            if changed:
+                logger.info(f"📝 Prompt file {file} changed")
+                self.reload()
+                return True
+        return False
+
+    def render(self, name: str, context: Any = None, now: Optional[datetime] = None, timezone: Optional[tzinfo] = None) -> str:
+        """
+        Full instructions of a prompt for a run context
+        """
+        return self.get(name).render(prompt_facts(context, now, timezone))
+
+    def instructions(self, name: str) -> Callable[[Any, Any], str]:
+        """
+        Dynamic instructions for Agent(instructions=...): rendered on every run
+        """
+        def render(run_context, agent) -> str:
+            return self.render(name, getattr(run_context, "context", None))
+        render.__name__ = f"{name}_instructions"
+        return render
+
+
+def prefix_stability(runs: dict[str, list[str]], static: Optional[dict[str, str]] = None) -> dict[str, dict]:
+    """
+    How much of the instructions of each prompt stayed identical across runs.
+
+    Args:
+    - runs (dict[str, list[str]]): Instructions sent in every run, by prompt or agent name.
+    - static (Optional[dict[str, str]]): Expected static prefix by name (default: the text before the dynamic context).
+
+    Returns:
+    - dict[str, dict]: Per name: "runs", "static_tokens", "common_prefix_tokens",
+      "stable" (every run starts with the whole static prefix) and "cacheable"
+      (stable and at least MIN_CACHEABLE_TOKENS long).
+    """
+    report = {}
+    for name, texts in runs.items():
+        prefix = (static or {}).get(name) or (static_prefix(texts[0]) if texts else "")
+        shared = os.path.commonprefix(texts) if texts else ""
+        static_tokens = estimate_tokens(prefix)
+        stable = all(text.startswith(prefix) for text in texts)
+        report[name] = {
+            "runs": len(texts),
+            "static_tokens": static_tokens,
+            "common_prefix_tokens": estimate_tokens(shared),
+            "stable": stable,
+            "cacheable": stable and static_tokens >= MIN_CACHEABLE_TOKENS,
+        }
+    return report
+
+
+def check_prefix_stability(
+    registry: "PromptRegistry",
+    samples: Iterable[tuple[Any, datetime, Optional[tzinfo]]],
+) -> dict[str, dict]:
+    """
+    Render every registered prompt for several runs and report its prefix stability.
+
+    Args:
+    - registry (PromptRegistry): Prompts to check.
+    - samples (Iterable[tuple[Any, datetime, Optional[tzinfo]]]): (run context, time, timezone) of each run.
+
+    Returns:
+    - dict[str, dict]: prefix_stability() of every prompt.
+    """
+    samples = list(samples)
+    runs = {
+        name: [registry.render(name, context, now, timezone) for context, now, timezone in samples]
+        for name in registry.names()
+    }
+    return prefix_stability(runs, {name: registry.get(name).static for name in registry.names()})
+
+
+def format_stability_report(report: dict[str, dict]) -> str:
+    """
+    Table of a prefix_stability() report
+    """
+    lines = [f"{'prompt':<20} {'runs':>5} {'static tok':>11} {'shared tok':>11}  stable  cacheable"]
+    for name, row in report.items():
+        cacheable = "✅" if row["cacheable"] else f"— (< {MIN_CACHEABLE_TOKENS} tok)"
+        lines.append(
+            f"{name:<20} {row['runs']:>5} {row['static_tokens']:>11} {row['common_prefix_tokens']:>11}  "
+            f"{'✅' if row['stable'] else '❌':<6}  {cacheable}"
+        )
+    return "\n".join(lines)
+
+
+# Appended to the translator when the pipeline does not need the DateParserAgent
+RESOLVED_DATE_NOTE = """
+
+## Pre-resolved dates
+Dates in this request are already resolved: there is no DateParserAgent in
+this flow. For task operations HANDOFF directly to DatabaseAgent, keeping any
+"[Resolved due_date: '...']" annotation verbatim at the end of the English
+translation."""
+
+
+def agenda_prompts(prompts_dir: str = PROMPTS_DIR, reload_interval_s: Optional[float] = None) -> PromptRegistry:
+    """
+    Registry with the prompts of the agenda agents (no file is read until a prompt is used)
+    """
+    registry = PromptRegistry(prompts_dir, reload_interval_s)
+    registry.register("translator", file="translator_prompt.txt")
+    registry.register("translator_direct", extends="translator", text=RESOLVED_DATE_NOTE)
+    registry.register("date_parser", file="dateParser_prompt.txt", dynamic=date_references)
+    registry.register("database", file="database_prompt.txt")
+    return registry
+
+
+_reload_s = os.getenv(RELOAD_ENV_VAR)
+prompt_registry = agenda_prompts(reload_interval_s=float(_reload_s) if _reload_s else None)
@@ -0,0 +1,264 @@
+"""
+Concurrent scenario runner for the agent workflow
+
+Runs lists of scenarios through the agent pipeline with asyncio instead of
+one blocking Runner.run_sync call after another. Each scenario is a sequence
+of requests that run in order against its own temporary SQLite database,
+registered in database.registry and selected through the run context, so
+scenarios can run side by side without seeing each other's tasks. A
+semaphore bounds how many scenarios are in flight at once.
+
+The report collects, for every step, the latency, the number of model turns
+and the outcome class of the answer (✅ success, ❌ error, 📭 empty,
+💬 conversation), plus latency percentiles, and can be written as JSON.
+
+Usage Example:
+   from chatbot.scenarios import Scenario, run_scenarios_sync
+
+   report = run_scenarios_sync(
+       [Scenario("create", ["Create a task for tomorrow: buy milk"])],
+       concurrency=4,
+   )
+   report.write_json("logs/scenario_report.json")
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from agents import RunConfig
+from loguru import logger
+
+from database.models import create_database
+from database.registry import database_registry
+from utils.stats import summarize_latencies
+
+from .context import AgendaContext
+from .pipeline import run_agenda_query
+
+DEFAULT_CONCURRENCY = 4
+
+# Outcome classes, mirroring the response format of the DatabaseAgent prompt
+SUCCESS = "success"
+ERROR = "error"
+EMPTY = "empty"
+CONVERSATION = "conversation"
+EXCEPTION = "exception"
+
+OUTCOME_ICONS = {
+    SUCCESS: "✅",
+    ERROR: "❌",
+    EMPTY: "📭",
+    CONVERSATION: "💬",
+    EXCEPTION: "💥",
+}
+
+
+def classify_output(output: str) -> str:
+    """
+    Outcome class of an agent answer (✅ / ❌ / 📭 markers, else conversation)
+    """
+    if "✅" in output:
+        return SUCCESS
+    if "❌" in output:
+        return ERROR
+    if "📭" in output:
+        return EMPTY
+    return CONVERSATION
+
+
+@dataclass
+class Scenario:
+    """
+    Requests that run in order against the same database
+
+    Fields:
+    - name: Scenario identifier used in the report
+    - steps: User requests, run one after the other
+    - category: Free label for grouping (e.g. "🇪🇸 CREATE")
+    - max_turns: Maximum agent turns per step
+    """
+    name: str
+    steps: list[str]
+    category: str = ""
+    max_turns: int = 10
+
+
+@dataclass
+class StepResult:
+    """
+    Outcome of one request of a scenario
+    """
+    scenario: str
+    category: str
+    step: int
+    query: str
+    outcome: str
+    latency_ms: float
+    turns: int = 0
+    output: Optional[str] = None
+    error: Optional[str] = None
+    skipped_hops: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ScenarioReport:
+    """
+    Results of a scenario run
+
+    Fields:
+    - steps: One StepResult per request, grouped by scenario in input order
+    - concurrency: Maximum number of scenarios in flight
+    - wall_time_s: Total elapsed time of the run
+    """
+    steps: list[StepResult]
+    concurrency: int
+    wall_time_s: float
+
+    def summary(self) -> dict:
+        """
+        Aggregated numbers: outcome counts, latency percentiles (ms) and turns
+        """
+        outcomes = {name: 0 for name in OUTCOME_ICONS}
+        for step in self.steps:
+            outcomes[step.outcome] += 1
+        turns = [step.turns for step in self.steps]
+        return {
+            "requests": len(self.steps),
+            "concurrency": self.concurrency,
+            "wall_time_s": self.wall_time_s,
+            "outcomes": outcomes,
+            "latency_ms": summarize_latencies(step.latency_ms for step in self.steps),
+            "turns": {
+                "total": sum(turns),
+                "mean": sum(turns) / len(turns) if turns else 0.0,
+                "max": max(turns, default=0),
+            },
+        }
+
+    def to_dict(self) -> dict:
+        """
+        Machine-readable form of the report
+        """
+        return {"summary": self.summary(), "steps": [asdict(step) for step in self.steps]}
+
+    def write_json(self, path: str) -> None:
+        """
+        Save the report as JSON
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+async def _run_scenario(
+    scenario: Scenario,
+    semaphore: asyncio.Semaphore,
+    isolate_databases: bool,
+    run_config: Optional[RunConfig],
+) -> list[StepResult]:
+    """
+    Run the steps of one scenario in order, on its own database if requested
+    """
+    async with semaphore:
+        if not isolate_databases:
+            return await _run_steps(scenario, run_config, AgendaContext())
+
+        temp_dir = tempfile.mkdtemp(prefix="aigenda_scenario_")
+        database_name = f"scenario:{scenario.name}:{os.path.basename(temp_dir)}"
+        try:
+            database_url = f"sqlite:///{os.path.join(temp_dir, 'tareas.db')}"
+            create_database(database_url)
+            database_registry.register(database_name, database_url)
+            return await _run_steps(scenario, run_config, AgendaContext(database=database_name))
+        finally:
+            # Also disposes of the engine: no pooled connections to the deleted file
+            database_registry.unregister(database_name)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def _run_steps(scenario: Scenario, run_config: Optional[RunConfig], context: AgendaContext) -> list[StepResult]:
+    results = []
+    for i, query in enumerate(scenario.steps, 1):
+        started = time.perf_counter()
+        try:
+            result = await run_agenda_query(
+                query,
+                max_turns=scenario.max_turns,
+                context=context,
+                run_config=run_config,
+                cache=None,  # measure real agent runs
+            )
+            output = result.final_output
+            results.append(StepResult(
+                scenario=scenario.name,
+                category=scenario.category,
+                step=i,
+                query=query,
+                outcome=classify_output(output),
+                latency_ms=(time.perf_counter() - started) * 1000,
+                turns=len(result.run_result.raw_responses) if result.run_result else 0,
+                output=output,
+                skipped_hops=result.plan.skipped_hops,
+            ))
+        except Exception as e:
+            logger.error(f"❌ Scenario '{scenario.name}' step {i} failed: {e}")
+            results.append(StepResult(
+                scenario=scenario.name,
+                category=scenario.category,
+                step=i,
+                query=query,
+                outcome=EXCEPTION,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=f"{type(e).__name__}: {e}",
+            ))
+    return results
+
+
+async def run_scenarios(
+    scenarios: list[Scenario],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    isolate_databases: bool = True,
+    run_config: Optional[RunConfig] = None,
+) -> ScenarioReport:
+    """
+    Run scenarios concurrently through the agent pipeline.
+
+    Args:
+    - scenarios (list[Scenario]): Scenarios to run.
+    - concurrency (int): Maximum number of scenarios in flight.
+    - isolate_databases (bool): Give every scenario its own temporary database.
+    - run_config (Optional[RunConfig]): Run configuration (model provider, tracing...).
+
+    Returns:
+    - ScenarioReport: Per-step results and aggregated statistics.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    per_scenario = await asyncio.gather(*(
+        _run_scenario(scenario, semaphore, isolate_databases, run_config)
+        for scenario in scenarios
+    ))
+    wall_time_s = time.perf_counter() - started
+
+    steps = [step for results in per_scenario for step in results]
+    logger.info(f"🏁 {len(steps)} requests in {wall_time_s:.2f}s (concurrency={concurrency})")
+    return ScenarioReport(steps=steps, concurrency=concurrency, wall_time_s=wall_time_s)
+
+
+def run_scenarios_sync(scenarios: list[Scenario], **kwargs) -> ScenarioReport:
+    """
+    Blocking wrapper around run_scenarios() for scripts
+    """
+    return asyncio.run(run_scenarios(scenarios, **kwargs))
@@ -0,0 +1,108 @@
+"""
+Single-flight coalescing of identical concurrent requests
+
+When several clients ask the same read question at the same moment (a
+shared UI, pollers of "what's due today"), each would start its own
+three-hop agent run. SingleFlight lets the first request (the leader) run
+and makes the identical requests that arrive while it is in flight wait for
+its result instead.
+
+Requests are identical when they have the same flight key: in the pipeline,
+the normalized query, intent, day, database, data version (see chatbot.cache)
+and the user of the run context. Only reads are coalesced; writes always run
+on their own. A leader's error is shared by its followers too.
+
+Usage Example:
+   from chatbot.single_flight import SingleFlight
+
+   flights = SingleFlight()
+   result, shared = await flights.do(key, lambda: run_the_agents())
+   flights.metrics()["coalescing_ratio"]
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with the same key
+
+    In-flight calls are tracked per event loop, since a task cannot be awaited
+    from another loop.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight: dict[tuple[int, Hashable], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Run factory() unless an identical call is already in flight.
+
+        Args:
+        - key (Hashable): Identity of the call.
+        - factory (Callable[[], Awaitable[Any]]): Starts the call; only invoked by the leader.
+
+        Returns:
+        - tuple[Any, bool]: The result, and whether it was shared from another caller's run.
+
+        Raises:
+        - Exception: Whatever the call raised (for the leader and every follower).
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.requests += 1
+            task = self._in_flight.get(flight_key)
+            shared = task is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                self.executions += 1
+                task = asyncio.ensure_future(factory())
+                self._in_flight[flight_key] = task
+                task.add_done_callback(lambda done: self._forget(flight_key, done))
+
+        if shared:
+            logger.info("🛬 Joining an identical request already in flight")
+        # shield: a caller that gives up does not cancel the run of the others
+        return await asyncio.shield(task), shared
+
+    def _forget(self, flight_key: tuple[int, Hashable], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._in_flight.get(flight_key) is task:
+                del self._in_flight[flight_key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def metrics(self) -> dict:
+        """
+        Requests seen, runs started and the share of requests that were coalesced
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": self.coalesced / self.requests if self.requests else 0.0,
+                "in_flight": len(self._in_flight),
+            }
+
+    def reset(self) -> None:
+        """
+        Reset the counters (in-flight calls are kept)
+        """
+        with self._lock:
+            self.requests = self.executions = self.coalesced = 0
+
+
+# Process-wide instance used by the pipeline
+agent_single_flight = SingleFlight()
@@ -0,0 +1,28 @@
+"""
+Text helpers shared by the local pre-processing steps of the chatbot
+"""
+
+import re
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase, strip accents and collapse whitespace so both languages share patterns
+
+    Args:
+    - text (str): Raw user text.
+
+    Returns:
+    - str: Normalized text ("¿Qué tareas tengo  mañana?" -> "¿que tareas tengo manana?").
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", stripped).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token), used for usage, latency and history budgets
+    """
+    return max(1, len(text) // 4) if text else 0
@@ -0,0 +1,263 @@
+"""
+Thread-pool execution of the synchronous database tools
+
+The operations in database.operations are plain sync functions (SQLAlchemy
+over SQLite plus loguru file writes). Called directly from a function tool
+they run on the event loop thread, so one slow disk write stalls every
+concurrent run of the process. offload() turns such a function into a
+coroutine that runs it on a bounded thread pool, with a per-tool timeout and
+queue-depth and latency metrics.
+
+Write tools (offload(write=True)) never time out: the worker thread cannot
+be interrupted, so a write reported as timed out could still commit, and the
+agent retrying it would create the task twice.
+
+The wrapped function keeps its signature and docstring, so function_tool
+builds the same schema, and the contextvars of the caller (use_database())
+are copied into the worker thread.
+
+Usage Example:
+   from chatbot.tool_executor import offload
+
+   @function_tool
+   @offload()
+   def get_all_tasks(ctx: RunContextWrapper[Any]) -> list[dict]:
+       ...
+
+   get_tool_executor().metrics()
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from utils.stats import summarize_latencies
+
+# Latency samples kept per tool for the percentiles
+MAX_SAMPLES = 10_000
+
+
+class ToolTimeout(TimeoutError):
+    """
+    A tool did not finish within its timeout
+    """
+
+
+@dataclass
+class ToolStats:
+    """
+    Counters of one tool
+
+    Fields:
+    - calls: Finished calls (including errors and timeouts)
+    - errors: Calls that raised
+    - timeouts: Calls that exceeded the timeout
+    - wait_ms: Time spent queued before a worker picked the call up
+    - run_ms: Time spent running on the worker
+    """
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    wait_ms: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+    run_ms: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "wait_ms": summarize_latencies(list(self.wait_ms)),
+            "run_ms": summarize_latencies(list(self.run_ms)),
+        }
+
+
+class ToolExecutor:
+    """
+    Bounded thread pool for synchronous tools
+
+    Args:
+    - max_workers (int): Worker threads; calls beyond this wait in the queue.
+    - default_timeout_s (Optional[float]): Timeout of tools without their own (None for no timeout).
+    - timeouts (Optional[dict[str, float]]): Timeout in seconds per tool name.
+
+    A timed out call is reported to the agent at once, but its thread cannot be
+    interrupted and keeps its worker until the function returns. A call that
+    times out or is cancelled while still queued is dropped without running.
+    Write calls (run(..., write=True)) never time out; a timeout configured in
+    `timeouts` for one of them is ignored with a warning.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        default_timeout_s: Optional[float] = 10.0,
+        timeouts: Optional[dict[str, float]] = None,
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self.default_timeout_s = default_timeout_s
+        self.timeouts = dict(timeouts or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agenda-tool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._stats: dict[str, ToolStats] = {}
+        self._ignored_timeouts: set[str] = set()
+
+    def timeout_for(self, name: str, write: bool = False) -> Optional[float]:
+        if write:
+            return None
+        return self.timeouts.get(name, self.default_timeout_s)
+
+    def _check_write_timeout(self, name: str) -> None:
+        with self._lock:
+            if name not in self.timeouts or name in self._ignored_timeouts:
+                return
+            self._ignored_timeouts.add(name)
+        logger.warning(f"⚠️ Ignoring the {self.timeouts[name]}s timeout of {name}: write tools never time out")
+
+    def _tool_stats(self, name: str) -> ToolStats:
+        # Callers hold self._lock
+        if name not in self._stats:
+            self._stats[name] = ToolStats()
+        return self._stats[name]
+
+    def _worker(self, name: str, submitted: float, state: dict, func: Callable, args, kwargs) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            if state["abandoned"]:
+                raise asyncio.CancelledError()
+            state["started"] = True
+            self._queued -= 1
+            self._running += 1
+            self._tool_stats(name).wait_ms.append((started - submitted) * 1000)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._tool_stats(name).run_ms.append((time.perf_counter() - started) * 1000)
+
+    async def run(self, name: str, func: Callable, *args, write: bool = False, **kwargs) -> Any:
+        """
+        Run a sync function on the pool and await its result.
+
+        Args:
+        - name (str): Tool name, for the timeout and the metrics.
+        - func (Callable): Synchronous function to run.
+        - write (bool): The function changes the database; it runs without a timeout.
+
+        Returns:
+        - Any: The result of the function.
+
+        Raises:
+        - ToolTimeout: If the call exceeds the tool timeout.
+        - Exception: Whatever the function raises.
+        """
+        if write:
+            self._check_write_timeout(name)
+        context = contextvars.copy_context()
+        # Who takes the call out of the queue: the worker, or run() if it gave up first
+        state = {"started": False, "abandoned": False}
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._pool, context.run, self._worker, name, time.perf_counter(), state, func, args, kwargs
+        )
+        timeout = self.timeout_for(name, write)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._tool_stats(name).timeouts += 1
+            logger.warning(f"⏰ Tool {name} timed out after {timeout}s")
+            raise ToolTimeout(f"Tool {name} timed out after {timeout}s") from None
+        except Exception:
+            with self._lock:
+                self._tool_stats(name).errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._tool_stats(name).calls += 1
+                if not state["started"] and not state["abandoned"]:
+                    state["abandoned"] = True
+                    self._queued -= 1
+
+    def metrics(self) -> dict:
+        """
+        Snapshot of the queue and per-tool metrics
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "peak_queued": self._peak_queued,
+                "tools": {name: stats.to_dict() for name, stats in sorted(self._stats.items())},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_executor: Optional[ToolExecutor] = ToolExecutor()
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> Optional[ToolExecutor]:
+    """
+    Executor used by the offloaded tools (None means they run inline)
+    """
+    return _executor
+
+
+def set_tool_executor(executor: Optional[ToolExecutor]) -> Optional[ToolExecutor]:
+    """
+    Replace the executor of the offloaded tools.
+
+    Args:
+    - executor (Optional[ToolExecutor]): New executor, or None to run the tools inline on the event loop.
+
+    Returns:
+    - Optional[ToolExecutor]: The previous executor (not shut down).
+    """
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    return previous
+
+
+def offload(name: Optional[str] = None, write: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Decorator that runs a sync function through the current tool executor
+
+    Args:
+    - name (Optional[str]): Tool name for timeouts and metrics (defaults to the function name).
+    - write (bool): The function changes the database; it runs without a timeout.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        tool_name = name or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            executor = get_tool_executor()
+            if executor is None:
+                return func(*args, **kwargs)
+            return await executor.run(tool_name, func, *args, write=write, **kwargs)
+
+        return wrapper
+
+    return decorator
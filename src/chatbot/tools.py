@@ -0,0 +1,135 @@
+"""
+Function tools of the DatabaseAgent
+
+Thin wrappers around database.operations for the agents SDK. Their schemas
+only contain the business parameters; the target database comes from the
+run context (AgendaContext.database, resolved by database.registry), so the
+model neither pays for nor can invent a connection string.
+
+The plain functions in database.operations keep their database_url
+parameter for direct use and tests. The tools run them on the thread pool
+of chatbot.tool_executor so SQLite and log I/O never block the event loop;
+create_task and delete_task are write tools there, without a timeout.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from agents import RunContextWrapper, function_tool
+
+from database import operations
+
+from .context import context_database_url
+from .tool_executor import offload
+
+
+@function_tool
+@offload(write=True)
+def create_task(ctx: RunContextWrapper[Any], title: str, description: str, due_date: datetime) -> dict:
+    """
+    Create a new task in the database.
+
+    Args:
+    - title (str): The title of the task.
+    - description (str): The description of the task.
+    - due_date (datetime): The due date of the task.
+    Returns:
+    -dict: The created task as a dictionary.
+    """
+    return operations.create_task(title, description, due_date, database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload()
+def get_all_tasks(ctx: RunContextWrapper[Any]) -> list[dict]:
+    """
+    Retrieve a list of all tasks from the database.
+
+    Returns:
+    -list[dict]: A list of dictionaries representing all tasks in the database.
+    """
+    return operations.get_all_tasks(database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload()
+def get_task_by_id(ctx: RunContextWrapper[Any], task_id: int) -> dict:
+    """
+    Retrieve a task by its ID from the database.
+
+    Args:
+    - task_id (int): The id of the task to retrieve.
+
+    Returns:
+    - dict: The task as a dictionary.
+    """
+    return operations.get_task_by_id(task_id, database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload(write=True)
+def delete_task(ctx: RunContextWrapper[Any], task_id: int) -> dict:
+    """
+    Delete a task by its ID from the database.
+
+    Args:
+    - task_id (int): The id of the task to delete.
+
+    returns:
+    - dict: A dictionary indicating the result of the deletion operation.
+    """
+    return operations.delete_task(task_id, database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload()
+def get_tasks_for_today(ctx: RunContextWrapper[Any]) -> list[dict]:
+    """
+    Retrieve tasks that are due today from the database.
+
+    Returns:
+    - list[dict]: A list of dictionaries representing tasks that are due today.
+    """
+    return operations.get_tasks_for_today(database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload()
+def get_upcoming_tasks(ctx: RunContextWrapper[Any], days: int) -> list[dict]:
+    """
+    Retrieve tasks that are due within the next specified number of days from the database.
+
+    Args:
+    - days (int): The number of days to look ahead for upcoming tasks.
+
+    Returns:
+    - list[dict]: A list of dictionaries representing tasks that are due within the next specified number of days.
+    """
+    return operations.get_upcoming_tasks(days, database_url=context_database_url(ctx.context))
+
+
+@function_tool
+@offload()
+def agenda_snapshot(ctx: RunContextWrapper[Any], days: int) -> dict:
+    """
+    Overview of the agenda in one call: overdue tasks, tasks due later today and
+    tasks due within the next specified number of days, with their counts.
+
+    Args:
+    - days (int): The number of days after today to include as upcoming (7 if the user does not say).
+
+    Returns:
+    - dict: Compact lists "overdue", "today" and "upcoming", and "counts" per group.
+    """
+    return operations.agenda_snapshot(days, database_url=context_database_url(ctx.context))
+
+
+DATABASE_TOOLS = [
+    create_task,
+    get_all_tasks,
+    get_task_by_id,
+    delete_task,
+    get_tasks_for_today,
+    get_upcoming_tasks,
+    agenda_snapshot,
+]
@@ -0,0 +1,420 @@
+"""
+Local trace processor for the agents tracing API
+
+LocalTraceProcessor receives the traces and spans of every agent run and
+writes them to a local store instead of (or besides) the OpenAI dashboard:
+agent hops, handoffs, tool calls and model calls with their token usage.
+Spans are buffered in memory and written once per finished trace, so the
+event loop does not pay a database write per span.
+
+Two stores share the same records: SQLite (any path) and JSON Lines (paths
+ending in .jsonl). build_report() aggregates them into p50/p95/p99 latency
+per hop, per tool and per model call, tokens per request and the slowest
+traces; src/trace_report.py prints that report.
+
+Usage Example:
+   from chatbot.trace_store import install_local_tracing
+
+   install_local_tracing("logs/traces.db", replace_default=True)
+   ...  # run the agents with tracing enabled
+   # python src/trace_report.py logs/traces.db
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from agents.tracing import TracingProcessor, add_trace_processor, set_trace_processors
+from agents.tracing.spans import Span
+from agents.tracing.traces import Trace
+from loguru import logger
+
+from utils.stats import summarize_latencies
+
+# Span kinds that make up the report
+AGENT = "agent"
+FUNCTION = "function"
+HANDOFF = "handoff"
+MODEL_KINDS = ("generation", "response")
+
+
+@dataclass
+class TraceRecord:
+    """
+    One agent run (a request)
+    """
+    trace_id: str
+    workflow_name: str
+    group_id: Optional[str]
+    started_at: float
+    duration_ms: float
+
+
+@dataclass
+class SpanRecord:
+    """
+    One span of a trace
+
+    Fields:
+    - kind: Span type ("agent", "function", "handoff", "generation", "response"...)
+    - name: Agent, tool or model name ("From → To" for handoffs)
+    - started_at: Epoch seconds
+    - input_tokens / output_tokens: Usage of model call spans
+    - error: Error message, if the span failed
+    """
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: str
+    name: str
+    started_at: float
+    duration_ms: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    error: Optional[str] = None
+
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+
+
+def span_record(span: Span[Any]) -> Optional[SpanRecord]:
+    """
+    Convert a finished span, or None for no-op spans
+    """
+    started, ended = _epoch(span.started_at), _epoch(span.ended_at)
+    if started is None:
+        return None
+
+    data = span.span_data
+    kind = data.type
+    name = getattr(data, "name", None) or ""
+    input_tokens = output_tokens = 0
+
+    if kind == HANDOFF:
+        name = f"{data.from_agent} → {data.to_agent}"
+    elif kind == "generation":
+        name = data.model or "model"
+        usage = data.usage or {}
+        input_tokens = usage.get("input_tokens", 0) or 0
+        output_tokens = usage.get("output_tokens", 0) or 0
+    elif kind == "response":
+        response = data.response
+        name = response.model if response is not None else "model"
+        if response is not None and response.usage is not None:
+            input_tokens = response.usage.input_tokens
+            output_tokens = response.usage.output_tokens
+
+    error = span.error
+    return SpanRecord(
+        trace_id=span.trace_id,
+        span_id=span.span_id,
+        parent_id=span.parent_id,
+        kind=kind,
+        name=str(name),
+        started_at=started,
+        duration_ms=((ended or started) - started) * 1000,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        error=error["message"] if error else None,
+    )
+
+
+class SqliteTraceStore:
+    """
+    Trace records in a SQLite database (tables traces and spans)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS traces (trace_id TEXT PRIMARY KEY, workflow_name TEXT, "
+                "group_id TEXT, started_at REAL, duration_ms REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS spans (trace_id TEXT, span_id TEXT PRIMARY KEY, parent_id TEXT, "
+                "kind TEXT, name TEXT, started_at REAL, duration_ms REAL, input_tokens INTEGER, "
+                "output_tokens INTEGER, error TEXT)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_spans_trace_id ON spans (trace_id)")
+        connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def write(self, traces: list[TraceRecord], spans: list[SpanRecord]) -> None:
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO traces VALUES (?, ?, ?, ?, ?)",
+                [tuple(asdict(trace).values()) for trace in traces],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [tuple(asdict(span).values()) for span in spans],
+            )
+        connection.close()
+
+    def load(self) -> tuple[list[TraceRecord], list[SpanRecord]]:
+        connection = self._connect()
+        try:
+            traces = [TraceRecord(*row) for row in connection.execute("SELECT * FROM traces")]
+            spans = [SpanRecord(*row) for row in connection.execute("SELECT * FROM spans")]
+        finally:
+            connection.close()
+        return traces, spans
+
+
+class JsonlTraceStore:
+    """
+    Trace records as JSON Lines ({"trace": ...} or {"span": ...} per line)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, traces: list[TraceRecord], spans: list[SpanRecord]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for trace in traces:
+                f.write(json.dumps({"trace": asdict(trace)}, ensure_ascii=False) + "\n")
+            for span in spans:
+                f.write(json.dumps({"span": asdict(span)}, ensure_ascii=False) + "\n")
+
+    def load(self) -> tuple[list[TraceRecord], list[SpanRecord]]:
+        traces, spans = [], []
+        if not os.path.exists(self.path):
+            return traces, spans
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "trace" in record:
+                    traces.append(TraceRecord(**record["trace"]))
+                else:
+                    spans.append(SpanRecord(**record["span"]))
+        return traces, spans
+
+
+TraceStore = SqliteTraceStore | JsonlTraceStore
+
+
+def open_trace_store(path: str) -> TraceStore:
+    """
+    JsonlTraceStore for .jsonl paths, SqliteTraceStore otherwise
+    """
+    return JsonlTraceStore(path) if path.endswith(".jsonl") else SqliteTraceStore(path)
+
+
+class LocalTraceProcessor(TracingProcessor):
+    """
+    TracingProcessor that writes finished traces to a local store
+
+    Args:
+    - store (TraceStore): Where the records are written.
+    """
+
+    def __init__(self, store: TraceStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._trace_starts: dict[str, float] = {}
+        self._traces: list[TraceRecord] = []
+        self._spans: dict[str, list[SpanRecord]] = {}
+
+    def on_trace_start(self, trace: Trace) -> None:
+        with self._lock:
+            self._trace_starts[trace.trace_id] = time.time()
+
+    def on_trace_end(self, trace: Trace) -> None:
+        ended = time.time()
+        exported = trace.export() or {}
+        with self._lock:
+            started = self._trace_starts.pop(trace.trace_id, ended)
+            self._traces.append(TraceRecord(
+                trace_id=trace.trace_id,
+                workflow_name=trace.name,
+                group_id=exported.get("group_id"),
+                started_at=started,
+                duration_ms=(ended - started) * 1000,
+            ))
+        self.force_flush()
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        record = span_record(span)
+        if record is None:
+            return
+        with self._lock:
+            self._spans.setdefault(record.trace_id, []).append(record)
+
+    def force_flush(self) -> None:
+        """
+        Write the finished traces with their spans
+        """
+        with self._lock:
+            traces, self._traces = self._traces, []
+            spans = [span for trace in traces for span in self._spans.pop(trace.trace_id, [])]
+        if not traces:
+            return
+        try:
+            self.store.write(traces, spans)
+        except Exception as e:
+            logger.error(f"❌ Error writing {len(traces)} traces to {self.store.path}: {e}")
+
+    def shutdown(self) -> None:
+        self.force_flush()
+
+
+def install_local_tracing(path: str, replace_default: bool = False) -> LocalTraceProcessor:
+    """
+    Send every trace to a local store.
+
+    Args:
+    - path (str): SQLite database or .jsonl file.
+    - replace_default (bool): Also stop exporting to the OpenAI dashboard (offline runs).
+
+    Returns:
+    - LocalTraceProcessor: The registered processor.
+    """
+    processor = LocalTraceProcessor(open_trace_store(path))
+    if replace_default:
+        set_trace_processors([processor])
+    else:
+        add_trace_processor(processor)
+    logger.info(f"🧭 Writing traces to {path}")
+    return processor
+
+
+def _summaries(groups: dict[str, list[float]]) -> dict[str, dict]:
+    return {name: summarize_latencies(values) for name, values in sorted(groups.items())}
+
+
+def build_report(traces: list[TraceRecord], spans: list[SpanRecord], slowest: int = 5) -> dict:
+    """
+    Aggregate trace records.
+
+    Args:
+    - traces (list[TraceRecord]): One record per request.
+    - spans (list[SpanRecord]): Their spans.
+    - slowest (int): Number of slowest traces to list.
+
+    Returns:
+    - dict: "hops", "tools" and "model_calls" latency summaries (ms) by name,
+      "tokens" per agent, "requests" token and latency summaries and "slowest" traces.
+    """
+    by_id = {span.span_id: span for span in spans}
+    hops: dict[str, list[float]] = {}
+    tools: dict[str, list[float]] = {}
+    model_calls: dict[str, list[float]] = {}
+    tokens: dict[str, dict[str, int]] = {}
+    trace_tokens: dict[str, int] = {}
+    trace_hops: dict[str, list[tuple[str, float]]] = {}
+    errors = 0
+
+    for span in spans:
+        if span.error:
+            errors += 1
+        if span.kind == AGENT:
+            hops.setdefault(span.name, []).append(span.duration_ms)
+            trace_hops.setdefault(span.trace_id, []).append((span.name, span.duration_ms))
+        elif span.kind == FUNCTION:
+            tools.setdefault(span.name, []).append(span.duration_ms)
+        elif span.kind in MODEL_KINDS:
+            parent = by_id.get(span.parent_id)
+            agent = parent.name if parent is not None and parent.kind == AGENT else "(no agent)"
+            model_calls.setdefault(agent, []).append(span.duration_ms)
+            agent_tokens = tokens.setdefault(agent, {"input_tokens": 0, "output_tokens": 0})
+            agent_tokens["input_tokens"] += span.input_tokens
+            agent_tokens["output_tokens"] += span.output_tokens
+            trace_tokens[span.trace_id] = trace_tokens.get(span.trace_id, 0) + span.input_tokens + span.output_tokens
+
+    ordered = sorted(traces, key=lambda trace: trace.duration_ms, reverse=True)
+    return {
+        "traces": len(traces),
+        "spans": len(spans),
+        "errors": errors,
+        "hops": _summaries(hops),
+        "tools": _summaries(tools),
+        "model_calls": _summaries(model_calls),
+        "tokens": tokens,
+        "requests": {
+            "latency_ms": summarize_latencies(trace.duration_ms for trace in traces),
+            "tokens": summarize_latencies(trace_tokens.get(trace.trace_id, 0) for trace in traces),
+        },
+        "slowest": [
+            {
+                "trace_id": trace.trace_id,
+                "workflow_name": trace.workflow_name,
+                "duration_ms": trace.duration_ms,
+                "tokens": trace_tokens.get(trace.trace_id, 0),
+                "hops": trace_hops.get(trace.trace_id, []),
+            }
+            for trace in ordered[:slowest]
+        ],
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Plain text version of build_report()
+    """
+    lines = [f"🧭 {report['traces']} traces, {report['spans']} spans, {report['errors']} errors"]
+
+    def table(title: str, summaries: dict[str, dict]) -> None:
+        lines.append("")
+        lines.append(f"{title:<28} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, stats in summaries.items():
+            lines.append(
+                f"{name[:28]:<28} {stats['count']:>6} {stats['p50']:>9.1f} {stats['p95']:>9.1f} "
+                f"{stats['p99']:>9.1f} {stats['max']:>9.1f}"
+            )
+
+    table("🤖 Agent hop", report["hops"])
+    table("🔧 Tool", report["tools"])
+    table("🧠 Model call (by agent)", report["model_calls"])
+
+    lines.append("")
+    lines.append(f"{'🔢 Tokens (by agent)':<28} {'input':>9} {'output':>9}")
+    for agent, usage in sorted(report["tokens"].items()):
+        lines.append(f"{agent[:28]:<28} {usage['input_tokens']:>9} {usage['output_tokens']:>9}")
+
+    requests = report["requests"]
+    if requests["latency_ms"]["count"]:
+        lines.append("")
+        lines.append(
+            f"📨 Per request: p50 {requests['latency_ms']['p50']:.1f} ms, p95 {requests['latency_ms']['p95']:.1f} ms, "
+            f"p99 {requests['latency_ms']['p99']:.1f} ms; tokens mean {requests['tokens']['mean']:.0f}, "
+            f"max {requests['tokens']['max']:.0f}"
+        )
+
+    if report["slowest"]:
+        lines.append("")
+        lines.append("🐢 Slowest traces")
+        for trace in report["slowest"]:
+            hops = " → ".join(f"{name} {duration:.0f} ms" for name, duration in trace["hops"])
+            lines.append(f"   {trace['duration_ms']:>9.1f} ms  {trace['tokens']:>6} tok  {trace['trace_id']}  {hops}")
+    return "\n".join(lines)
+
+
+def load_report(path: str, slowest: int = 5) -> dict:
+    """
+    build_report() over the records of a store
+    """
+    traces, spans = open_trace_store(path).load()
+    return build_report(traces, spans, slowest=slowest)
+
@@ -0,0 +1,98 @@
+"""
+Command line chat for the agenda assistant
+
+Streams the answer of the agent pipeline while it is produced: text appears
+as the model writes it, and handoffs and tool calls are shown as progress
+lines, so there is feedback long before the whole agent chain finishes.
+
+Usage:
+   python src/cli.py "Show me all my tasks"
+   python src/cli.py                  # interactive mode (empty line to quit)
+   python src/cli.py --quiet "..."    # only the answer, no progress lines
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import TextIO
+
+# Add src to path
+sys.path.append(os.path.dirname(__file__))
+
+from chatbot.pipeline import stream_agenda_query
+
+PROGRESS_ICONS = {
+    "agent": "🤖",
+    "handoff": "🔀",
+    "tool_call": "🔧",
+    "tool_output": "📦",
+}
+
+
+async def print_stream(query: str, verbose: bool = True, out: TextIO = sys.stdout, **kwargs) -> str:
+    """
+    Print the streamed answer of a request.
+
+    Args:
+    - query (str): User request.
+    - verbose (bool): Also print agent changes, handoffs and tool calls.
+    - out (TextIO): Where to write (default stdout).
+    - **kwargs: Extra arguments for stream_agenda_query().
+
+    Returns:
+    - str: The final answer.
+    """
+    text_streamed = False
+    async for event in stream_agenda_query(query, **kwargs):
+        if event.kind == "text":
+            out.write(event.text)
+            out.flush()
+            text_streamed = True
+        elif event.kind == "final":
+            # Cached answers arrive without text deltas
+            if not text_streamed:
+                out.write(event.text)
+            out.write("\n")
+            out.flush()
+            return event.text
+        else:
+            if event.kind == "agent":
+                text_streamed = False
+            if verbose:
+                out.write(f"{PROGRESS_ICONS[event.kind]} {event.agent}: {event.text}\n")
+                out.flush()
+    return ""
+
+
+async def interactive(verbose: bool = True) -> None:
+    """
+    Read requests from stdin until an empty line or end of input
+    """
+    while True:
+        try:
+            query = await asyncio.to_thread(input, "🗓️  > ")
+        except EOFError:
+            break
+        if not query.strip():
+            break
+        try:
+            await print_stream(query, verbose=verbose)
+        except Exception as e:
+            print(f"❌ EXCEPTION: {e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chat with the agenda assistant")
+    parser.add_argument("query", nargs="*", help="Request to send (interactive mode if omitted)")
+    parser.add_argument("--quiet", action="store_true", help="Hide agent, handoff and tool progress")
+    args = parser.parse_args()
+
+    if args.query:
+        asyncio.run(print_stream(" ".join(args.query), verbose=not args.quiet))
+    else:
+        asyncio.run(interactive(verbose=not args.quiet))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Change notifications for the tasks database
+
+Write operations report every committed change here. Each database keeps a
+monotonically increasing data version that read caches compare to know
+whether a stored answer is still valid, and listeners can subscribe to react
+to individual changes (created or deleted tasks).
+
+Versions are process-local: they track the writes made through
+database.operations in this process.
+
+Usage Example:
+   from database.events import data_version, subscribe
+
+   version = data_version()
+   unsubscribe = subscribe(lambda change: print(change.kind, change.task))
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from loguru import logger
+
+from .models import resolve_database_url
+
+
+@dataclass(frozen=True)
+class TaskChange:
+    """
+    A committed change to the tasks table
+
+    Fields:
+    - database_url: Database that changed
+    - kind: "created" or "deleted"
+    - task: Task dictionary (only "id" and "due_date" for deletions)
+    - version: Data version of the database after the change
+    """
+    database_url: str
+    kind: str
+    task: dict
+    version: int
+
+
+ChangeListener = Callable[[TaskChange], None]
+
+_lock = threading.Lock()
+_versions: dict[str, int] = {}
+_listeners: list[ChangeListener] = []
+
+
+def data_version(database_url: Optional[str] = None) -> int:
+    """
+    Current data version of a database (0 until the first write)
+
+    Args:
+    - database_url (Optional[str]): The URL of the database. Defaults to the database of the current context.
+    """
+    url = resolve_database_url(database_url)
+    with _lock:
+        return _versions.get(url, 0)
+
+
+def notify_change(database_url: Optional[str], kind: str, task: dict) -> TaskChange:
+    """
+    Bump the data version of a database and notify the listeners
+
+    Args:
+    - database_url (Optional[str]): The URL of the database that changed.
+    - kind (str): "created" or "deleted".
+    - task (dict): The affected task.
+
+    Returns:
+    - TaskChange: The recorded change.
+    """
+    url = resolve_database_url(database_url)
+    with _lock:
+        version = _versions.get(url, 0) + 1
+        _versions[url] = version
+        listeners = list(_listeners)
+
+    change = TaskChange(database_url=url, kind=kind, task=task, version=version)
+    for listener in listeners:
+        try:
+            listener(change)
+        except Exception as e:
+            logger.error(f"❌ Error in change listener {listener!r}: {e}")
+    return change
+
+
+def subscribe(listener: ChangeListener) -> Callable[[], None]:
+    """
+    Register a listener for every committed change
+
+    Returns:
+    - Callable[[], None]: Function that removes the listener.
+    """
+    with _lock:
+        _listeners.append(listener)
+
+    def unsubscribe() -> None:
+        with _lock:
+            if listener in _listeners:
+                _listeners.remove(listener)
+
+    return unsubscribe
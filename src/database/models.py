@@ -8,7 +8,9 @@ utility functions for database connection and configuration.
 Main Components:
    - Tarea: SQLAlchemy model representing a task in the database
    - create_database(): Function to create the database and tables
-   - get_session(): Function to obtain a database session
+   - get_session(): Function to obtain a database session (engines are cached per URL)
+   - dispose_engine(): Close and forget the cached engine of a database (before deleting its file)
+   - use_database(): Context manager routing operations to another database
 
 Usage Example:
    from task_models import Tarea, get_session
@@ -31,10 +33,26 @@ Dependencies:
    - datetime: Date and timestamp handling
 """
 
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
+from typing import Optional
 from sqlalchemy import Column, Integer, String, Text, DateTime, create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from .query_log import query_log
+
+# Default SQLite database, relative to the project root
+DEFAULT_DATABASE_URL = "sqlite:///data/tareas.db"
+
+# Database used by the operations when no database_url is given (see use_database)
+_database_url_override: ContextVar[Optional[str]] = ContextVar("database_url_override", default=None)
+
+# Engine and session factory by (database URL, echo), created once per process
+_sessionmakers: dict[tuple[str, bool], sessionmaker] = {}
+_sessionmakers_lock = threading.Lock()
+
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -63,7 +81,8 @@ class Tarea(Base):
         default=lambda: datetime.now(timezone.utc), 
         onupdate=lambda: datetime.now(timezone.utc)
         )   
-    due_date = Column(DateTime, nullable=False)
+    # Indexed: agenda windows and reminders read tasks by due date range
+    due_date = Column(DateTime, nullable=False, index=True)
 
     # Methods
     def __repr__(self):
@@ -87,20 +106,77 @@ class Tarea(Base):
 
         return model_instance
     
-def create_database(database_url="sqlite:///data/tareas.db", debug=False):
+def _create_engine(database_url, debug):
+    """
+    New engine with the tables and indexes created
+    """
+    engine = create_engine(database_url, echo=debug)
+    Base.metadata.create_all(engine)
+    # create_all only adds indexes with new tables: add missing ones to existing databases
+    for index in Tarea.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    return engine
+
+def create_database(database_url=DEFAULT_DATABASE_URL, debug=False):
     """
     Create the dabase and tables if the don't exist
     
+    Returns the shared engine of the database (see get_engine) rather than a
+    new one, so no extra connection pool is left behind.
+
     Args:
     - databse_url: URL for the databse connection (default: SQLite in data/tareas.db)
     - debug: If True, print SQL statements (default: False)
     """
+    return get_engine(database_url, debug)
 
-    engine = create_engine(database_url, echo=debug)
-    Base.metadata.create_all(engine)
-    return engine
+def get_engine(database_url=DEFAULT_DATABASE_URL, debug=False):
+    """
+    Shared engine of a database, created (with its tables) on first use
 
-def get_session(database_url="sqlite:///data/tareas.db", debug=False):
+    The engine keeps a connection pool, so sessions reuse connections instead
+    of opening the file and checking the schema on every operation. Its
+    statements are timed by database.query_log. Call dispose_engine() before
+    deleting or replacing the database file.
+
+    Args:
+    - database_url: URL for the database connection (default: SQLite in data/tareas.db)
+    - debug: If True, echo SQL statements (default: False)
+    """
+    return _get_sessionmaker(database_url, debug).kw["bind"]
+
+def _get_sessionmaker(database_url, debug):
+    key = (database_url, bool(debug))
+    factory = _sessionmakers.get(key)
+    if factory is None:
+        with _sessionmakers_lock:
+            factory = _sessionmakers.get(key)
+            if factory is None:
+                engine = query_log.install(_create_engine(database_url, debug))
+                factory = _sessionmakers[key] = sessionmaker(bind=engine)
+    return factory
+
+def dispose_engine(database_url):
+    """
+    Close the pooled connections of the cached engines of one database and forget them
+
+    The next operation on the database creates a new engine (and the tables,
+    if the file was removed).
+    """
+    with _sessionmakers_lock:
+        for key in [key for key in _sessionmakers if key[0] == database_url]:
+            _sessionmakers.pop(key).kw["bind"].dispose()
+
+def dispose_engines():
+    """
+    Close the pooled connections of every cached engine and forget them
+    """
+    with _sessionmakers_lock:
+        for factory in _sessionmakers.values():
+            factory.kw["bind"].dispose()
+        _sessionmakers.clear()
+
+def get_session(database_url=DEFAULT_DATABASE_URL, debug=False):
     """
     Get a new session for the databse
 
@@ -111,7 +187,29 @@ def get_session(database_url="sqlite:///data/tareas.db", debug=False):
     Retunrs:
     - Sesscion: A new SQLAlchemy session for interacting with the database
     """
-    engine = create_database(database_url, debug)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return _get_sessionmaker(database_url, debug)()
 
+def resolve_database_url(database_url: Optional[str] = None) -> str:
+    """
+    Database URL used by an operation
+
+    Args:
+    - database_url (Optional[str]): Explicit URL. If None, the URL set with use_database()
+      in the current context, or DEFAULT_DATABASE_URL.
+    """
+    return database_url or _database_url_override.get() or DEFAULT_DATABASE_URL
+
+@contextmanager
+def use_database(database_url: str):
+    """
+    Route the operations of the current context (thread or asyncio task) to another database
+
+    Usage:
+       with use_database("sqlite:///scenario.db"):
+           await run_agenda_query("Show me all my tasks")
+    """
+    token = _database_url_override.set(database_url)
+    try:
+        yield database_url
+    finally:
+        _database_url_override.reset(token)
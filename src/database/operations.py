@@ -3,16 +3,78 @@ Docstring
 """
 
 # import necessary modules
-from .models import Tarea, get_session
+from .models import Tarea, get_session, resolve_database_url
+from .events import notify_change
 from .schema import TaskCreate
 from datetime import datetime
 from loguru import logger
 from typing import Optional
 from datetime import date, timedelta
-from sqlalchemy import func
-from agents import function_tool
+from sqlalchemy import and_, case, func, or_
+from utils.metrics import metrics
+import functools
+import time
 
-@function_tool
+metrics.describe("db_operation_calls_total", "counter", "Database operations called", ("operation",))
+metrics.describe("db_operation_errors_total", "counter", "Database operations that raised", ("operation", "error"))
+metrics.describe("db_operation_rows_total", "counter", "Tasks returned or changed by database operations", ("operation",))
+metrics.describe("db_operation_duration_ms", "histogram", "Duration of database operations (ms)", ("operation",))
+
+def _rows(result) -> int:
+    """
+    Tasks in an operation result: list length, snapshot counts, 0 for an error dict, else 1
+    """
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if "error" in result:
+            return 0
+        if "counts" in result:
+            return sum(result["counts"].values())
+    return 1
+
+def _instrumented(function):
+    """
+    Record the calls, errors, duration and rows of an operation in utils.metrics
+    """
+    operation = function.__name__
+    labels = (operation,)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            metrics.inc("db_operation_errors_total", (operation, type(e).__name__))
+            raise
+        finally:
+            metrics.inc("db_operation_calls_total", labels)
+            metrics.observe("db_operation_duration_ms", (time.perf_counter() - started) * 1000, labels)
+        metrics.inc("db_operation_rows_total", labels, _rows(result))
+        return result
+
+    return wrapper
+
+def _log_operation(operation: str, started: float, rows: int, level: str = "INFO", **fields) -> None:
+    """
+    One summary record per operation instead of a line per step.
+
+    The fields land in the record's "extra" (operation, duration_ms, rows, ...),
+    so JSON sinks get them as structured data. Nothing is formatted when no
+    sink takes the level.
+    """
+    duration_ms = (time.perf_counter() - started) * 1000
+    logger.log(
+        level,
+        ("✅" if level == "INFO" else "⚠️") + " {operation}: {rows} rows in {duration_ms:.1f} ms",
+        operation=operation,
+        rows=rows,
+        duration_ms=duration_ms,
+        **fields,
+    )
+
+@_instrumented
 def create_task(title: str, description: str, due_date: datetime, database_url: Optional[str] = None) -> dict:
     """
     Create a new task in the database.
@@ -25,41 +87,32 @@ def create_task(title: str, description: str, due_date: datetime, database_url:
     -dict: The created task as a dictionary.
     """
 
-    # DEBUG: Ver exactamente qué recibimos
-    logger.error(f"🔍 DEBUG - Received due_date: {due_date}")
-    logger.error(f"🔍 DEBUG - Type: {type(due_date)}")
-    logger.error(f"🔍 DEBUG - String representation: {str(due_date)}")
-
+    started = time.perf_counter()
     # validate input data
-    logger.info("1️⃣ Validating input data for task creation")
     task_data = TaskCreate(title=title, description=description, due_date=due_date)
-    logger.success("✅ Input data validated successfully")
-    logger.debug(f"Task data: {task_data}")
+    # Lazy: only rendered when a DEBUG sink takes it (and its sampler keeps it)
+    logger.opt(lazy=True).debug("Task data: {} (due_date {!r})", lambda: task_data, lambda: due_date)
 
     # create a new task instance
     task_data_dict = task_data.model_dump()
-    
-    logger.info("2️⃣ Creating new task instance")
     new_task = Tarea(**task_data_dict)
-    logger.success("✅ New task instance created successfully")
-    logger.debug(f"New task: {new_task}")
 
     # get a new session
-    session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
+    session = get_session(resolve_database_url(database_url))
     
     # add the new task to the session
     try:
-        logger.info("3️⃣ Adding new task to the session")
         session.add(new_task)
         session.commit()
-        logger.success("✅ Task added to the session and committed successfully")
-        return new_task.to_dict()
+        task_dict = new_task.to_dict()
+        notify_change(resolve_database_url(database_url), "created", task_dict)
+        _log_operation("create_task", started, 1, task_id=task_dict["id"])
+        return task_dict
     except Exception as e:
         session.rollback()
         logger.error(f"❌ Error creating task: {e}")
         raise Exception(f"Error creating task: {e}")
     finally:
-        logger.info("4️⃣ Closing session")
         session.close()
 
 """
@@ -75,6 +128,10 @@ delete_task(id) - Borrar tarea por ID ✅
 
 get_tasks_for_today() - Tareas de hoy ✅
 get_upcoming_tasks(days=X) - Próximos X días (flexible)
+agenda_snapshot(days=X) - Vencidas + hoy + próximos X días en una sola consulta ✅
+get_tasks_due_before(end) - Tareas hasta una fecha, con rango y límite opcionales (panel de agenda) ✅
+count_tasks_due_before(end) - Número de tareas hasta una fecha, con COUNT (panel de agenda) ✅
+count_tasks_per_day(start, end) - Tareas por día de un rango, con GROUP BY (mapa de calor) ✅
 
 🥉 PRIORIDAD BAJA (Nice to have)
 
@@ -85,7 +142,7 @@ get_recent_tasks(days=7) - Tareas creadas recientemente
 get_overdue_tasks() - Tareas vencidas (¡crítico para usuarios!) -> Depends on create update_task()
 """
 
-@function_tool
+@_instrumented
 def get_all_tasks(database_url: Optional[str] = None) -> list[dict]:
     """
     Retrieve a list of all tasks from the database.
@@ -99,27 +156,24 @@ def get_all_tasks(database_url: Optional[str] = None) -> list[dict]:
     Raises:
     - Exception: In case of error during retrieval.
     """
+    started = time.perf_counter()
     try:
-        logger.info("🔗 Connecting to the database")
-        session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
-        logger.success("✅ Database connection established successfully")
+        session = get_session(resolve_database_url(database_url))
     except Exception as e:
         logger.error(f"❌ Error connecting to the database: {e}")
         raise Exception(f"Error connecting to the database: {e}")
     
     try:
-        logger.info("🔍 Retrieving all tasks from the database")
         tasks = session.query(Tarea).all()
-        logger.success(f"✅ Retrieved {len(tasks)} tasks successfully")
+        _log_operation("get_all_tasks", started, len(tasks))
         return [task.to_dict() for task in tasks]
     except Exception as e:
         logger.error(f"❌ Error retrieving tasks: {e}")
         raise Exception(f"Error retrieving tasks: {e}")
     finally:
-        logger.info("🔒 Closing session")
         session.close()
 
-@function_tool
+@_instrumented
 def get_task_by_id(task_id: int, database_url: Optional[str] = None) -> dict:
     """
     Retrieve a task by its ID from the database.
@@ -138,32 +192,29 @@ def get_task_by_id(task_id: int, database_url: Optional[str] = None) -> dict:
         logger.error(f"❌ Invalid task_id: {task_id}")
         raise ValueError(f"task_id must be a positive integer, got: {task_id}")
 
+    started = time.perf_counter()
     try:
-        logger.info("🔗 Connecting to the database")
-        session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
-        logger.success("✅ Database connection established successfully")
+        session = get_session(resolve_database_url(database_url))
     except Exception as e:
         logger.error(f"❌ Error connecting to the database: {e}")
         raise Exception(f"Error connecting to the database: {e}")
     
     try:
-        logger.info(f"🔍 Retrieving task with ID {task_id} from the database")
         task = session.query(Tarea).filter_by(id=task_id).first()
         
         if not task:
-            logger.warning(f"⚠️ Task with ID {task_id} not found")
+            _log_operation("get_task_by_id", started, 0, level="WARNING", task_id=task_id)
             return {"error": f"Task with ID {task_id} not found"}
         
-        logger.success(f"✅ Task with ID {task_id} retrieved successfully")
+        _log_operation("get_task_by_id", started, 1, task_id=task_id)
         return task.to_dict()
     except Exception as e:
         logger.error(f"❌ Error retrieving task with ID {task_id}: {e}")
         raise Exception(f"Error retrieving task with ID {task_id}: {e}")
     finally:
-        logger.info("🔒 Closing session")
         session.close()
         
-@function_tool
+@_instrumented
 def delete_task(task_id: int, database_url: Optional[str] = None) -> dict:
     """
     Delete a task by its ID from the database.
@@ -180,32 +231,33 @@ def delete_task(task_id: int, database_url: Optional[str] = None) -> dict:
         logger.error(f"Invalid task_id: {task_id}")
         raise ValueError("❌ task_id must be a positive integer")
     
+    started = time.perf_counter()
     try:
-        logger.info("🔗 Connecting to the database")
-        session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
-        logger.success("✅ Database connection established successfully")
+        session = get_session(resolve_database_url(database_url))
     except Exception as e:
         logger.error(f"❌ Error connecting to the database: {e}")
         raise Exception(f"Error connecting to the database: {e}")
     
     try:
-        logger.info(f"🔍 Deleting task with ID {task_id}")
+        # Read the due date first (primary key lookup): listeners place the deleted task with it
+        due_date = session.query(Tarea.due_date).filter_by(id=task_id).scalar()
         deleted_count = session.query(Tarea).filter_by(id=task_id).delete()
         if deleted_count == 0:
-            logger.warning(f"⚠️ task with ID {task_id} not found")
+            _log_operation("delete_task", started, 0, level="WARNING", task_id=task_id)
             return {"error": f"task with ID {task_id} not found"}
         session.commit()
-        logger.success(f"✅ Task with ID {task_id} deleted successfully")
+        notify_change(resolve_database_url(database_url), "deleted",
+                      {"id": task_id, "due_date": due_date.isoformat() if due_date else None})
+        _log_operation("delete_task", started, deleted_count, task_id=task_id)
         return {"message": f"Task with ID {task_id} deleted successfully"}
     except Exception as e:
         session.rollback()
         logger.error(f"❌ Error deleting task with ID {task_id}: {e}")
         raise Exception(f"Error deleting task with ID {task_id}: {e}")
     finally:
-        logger.info("🔒 Closing session")
         session.close()
 
-@function_tool        
+@_instrumented
 def get_tasks_for_today(database_url: Optional[str] = None) -> list[dict]:
     """
     Retrieve tasks that are due today from the databse.
@@ -216,10 +268,9 @@ def get_tasks_for_today(database_url: Optional[str] = None) -> list[dict]:
     Returns:
     - list[dict]: A list of dictionaries representing tasks that are due today.
     """
+    started = time.perf_counter()
     try:
-        logger.info("🔗 Connecting to the database")
-        session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
-        logger.success("✅ Database connection established successfully")
+        session = get_session(resolve_database_url(database_url))
     except Exception as e:
         logger.error(f"❌ Error connecting to the database: {e}")
         raise Exception(f"Error connecting to the database: {e}")
@@ -227,22 +278,17 @@ def get_tasks_for_today(database_url: Optional[str] = None) -> list[dict]:
     # Check if there is any task due today.
     try:
         today = date.today()
-        logger.info(f"Retrieving tasks due today: {today}")
         tasks = session.query(Tarea).filter(func.date(Tarea.due_date) == today).all()
         tasks_list = [task.to_dict() for task in tasks]
-        if not tasks_list:
-            logger.warning("No tasks due today")
-            return []
-        logger.success(f"✅ Retrieved {len(tasks_list)} tasks due today")
+        _log_operation("get_tasks_for_today", started, len(tasks_list))
         return tasks_list
     except Exception as e:
         logger.error(f"❌ Error retrieving tasks due today: {e}")
         raise Exception(f"❌ Error retrieving tasks due today: {e}")
     finally:
-        logger.info("🔒 Closing session")
         session.close()
         
-@function_tool
+@_instrumented
 def get_upcoming_tasks(days: int, database_url: Optional[str] = None) -> list[dict]:
     """
     Retrieve tasks that are due within the next specified number of days from the database.
@@ -258,16 +304,14 @@ def get_upcoming_tasks(days: int, database_url: Optional[str] = None) -> list[di
         logger.error(f"❌ Invalid days parameter: {days}")
         raise ValueError("❌ Days must be a non negative integer")
 
+    started = time.perf_counter()
     try:
-        logger.info("🔗 Connecting to the database")
-        session = get_session(database_url or "sqlite:///data/tareas.db", debug=True)
-        logger.success("✅ Database connection established successfully")
+        session = get_session(resolve_database_url(database_url))
     except Exception as e:
         logger.error(f"❌ Error connecting to the database: {e}")
         raise Exception(f"Error connecting to the database: {e}") 
     
     try:
-        logger.info(f"Retrieving tasks due within the next {days} days")
         today = date.today()
         upcoming_date = today + timedelta(days=days)
         tasks = session.query(Tarea).filter(
@@ -275,19 +319,254 @@ def get_upcoming_tasks(days: int, database_url: Optional[str] = None) -> list[di
             func.date(Tarea.due_date) <= upcoming_date
         ).all()
         task_list = [task.to_dict() for task in tasks]
-
-        if not task_list:
-            logger.warning(f"No upcoming tasks found for the next {days} days")
-            return []
-        logger.success(f"Retrieved {len(task_list)} upcoming tasks successfully")
+        _log_operation("get_upcoming_tasks", started, len(task_list), days=days)
         return task_list
     except Exception as e:
         logger.error(f"❌ Error retrieving upcoming tasks: {e}")
         raise Exception(f"❌ Error retrieving upcoming tasks: {e}")
     finally:
-        logger.info("🔒 Closing session")
         session.close()
 
+@_instrumented
+def get_tasks_due_before(
+    end: datetime,
+    start: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+    compact: bool = False,
+    database_url: Optional[str] = None,
+) -> list[dict]:
+    """
+    Retrieve the tasks due before a moment (overdue ones included), ordered by due date.
+
+    Args:
+    - end (datetime): Exclusive upper bound of the due date.
+    - start (Optional[datetime]): Inclusive lower bound of the due date. Defaults to None (no bound).
+    - limit (Optional[int]): Maximum number of tasks. Defaults to None (all of them).
+    - newest_first (bool): Order by descending due date, so `limit` keeps the latest tasks.
+    - compact (bool): Read only id, title and due_date, without building ORM objects (much faster on large ranges).
+    - database_url (Optional[str]): The URL of the database. Defaults to None, which uses the default SQLite database.
+
+    Returns:
+    - list[dict]: A list of dictionaries representing the tasks due before `end`.
+    """
+    started = time.perf_counter()
+    try:
+        session = get_session(resolve_database_url(database_url))
+    except Exception as e:
+        logger.error(f"❌ Error connecting to the database: {e}")
+        raise Exception(f"Error connecting to the database: {e}")
+
+    try:
+        query = session.query(*((Tarea.id, Tarea.title, Tarea.due_date) if compact else (Tarea,)))
+        query = query.filter(Tarea.due_date < end)
+        if start is not None:
+            query = query.filter(Tarea.due_date >= start)
+        if newest_first:
+            query = query.order_by(Tarea.due_date.desc(), Tarea.id.desc())
+        else:
+            query = query.order_by(Tarea.due_date, Tarea.id)
+        if limit is not None:
+            query = query.limit(limit)
+        to_dict = _task_summary if compact else Tarea.to_dict
+        task_list = [to_dict(task) for task in query.all()]
+        _log_operation("get_tasks_due_before", started, len(task_list))
+        return task_list
+    except Exception as e:
+        logger.error(f"❌ Error retrieving tasks due before {end}: {e}")
+        raise Exception(f"Error retrieving tasks due before {end}: {e}")
+    finally:
+        session.close()
+
+@_instrumented
+def count_tasks_due_before(end: datetime, start: Optional[datetime] = None, database_url: Optional[str] = None) -> int:
+    """
+    Count the tasks due before a moment with one COUNT over the due_date index (no rows are loaded).
 
+    Args:
+    - end (datetime): Exclusive upper bound of the due date.
+    - start (Optional[datetime]): Inclusive lower bound of the due date. Defaults to None (no bound).
+    - database_url (Optional[str]): The URL of the database. Defaults to None, which uses the default SQLite database.
+
+    Returns:
+    - int: Number of tasks due in [start, end).
+    """
+    started = time.perf_counter()
+    try:
+        session = get_session(resolve_database_url(database_url))
+    except Exception as e:
+        logger.error(f"❌ Error connecting to the database: {e}")
+        raise Exception(f"Error connecting to the database: {e}")
 
-        
\ No newline at end of file
+    try:
+        query = session.query(func.count(Tarea.id)).filter(Tarea.due_date < end)
+        if start is not None:
+            query = query.filter(Tarea.due_date >= start)
+        count = query.scalar()
+        _log_operation("count_tasks_due_before", started, count)
+        return count
+    except Exception as e:
+        logger.error(f"❌ Error counting tasks due before {end}: {e}")
+        raise Exception(f"Error counting tasks due before {end}: {e}")
+    finally:
+        session.close()
+
+@_instrumented
+def count_tasks_per_day(start: datetime, end: datetime, database_url: Optional[str] = None) -> dict[date, int]:
+    """
+    Count the tasks due on each day of a range with one GROUP BY over the due_date index.
+
+    Args:
+    - start (datetime): Inclusive lower bound of the due date.
+    - end (datetime): Exclusive upper bound of the due date.
+    - database_url (Optional[str]): The URL of the database. Defaults to None, which uses the default SQLite database.
+
+    Returns:
+    - dict[date, int]: Number of tasks per due day (days without tasks are left out).
+    """
+    started = time.perf_counter()
+    try:
+        session = get_session(resolve_database_url(database_url))
+    except Exception as e:
+        logger.error(f"❌ Error connecting to the database: {e}")
+        raise Exception(f"Error connecting to the database: {e}")
+
+    try:
+        day = func.date(Tarea.due_date)
+        rows = (
+            session.query(day, func.count(Tarea.id))
+            .filter(Tarea.due_date >= start, Tarea.due_date < end)
+            .group_by(day)
+            .all()
+        )
+        per_day = {date.fromisoformat(day_text): count for day_text, count in rows}
+        _log_operation("count_tasks_per_day", started, len(per_day))
+        return per_day
+    except Exception as e:
+        logger.error(f"❌ Error counting tasks per day from {start} to {end}: {e}")
+        raise Exception(f"Error counting tasks per day from {start} to {end}: {e}")
+    finally:
+        session.close()
+
+@_instrumented
+def get_tasks_due_from(start: datetime, after_id: int = 0, limit: int = 1000, database_url: Optional[str] = None) -> list[dict]:
+    """
+    Retrieve the next window of tasks by due date, starting at a (due_date, id) position.
+
+    Reads the due_date index in order (keyset pagination): a window continues
+    the previous one by passing the due date and id of its last task.
+
+    Args:
+    - start (datetime): Due date to start from. Tasks due exactly at `start` are included if their id is above `after_id`.
+    - after_id (int): Id of the last task already read at `start`. Defaults to 0 (all of them).
+    - limit (int): Maximum number of tasks in the window.
+    - database_url (Optional[str]): The URL of the database. Defaults to None, which uses the default SQLite database.
+
+    Returns:
+    - list[dict]: Up to `limit` tasks ordered by due date and id.
+    """
+    started = time.perf_counter()
+    try:
+        session = get_session(resolve_database_url(database_url))
+    except Exception as e:
+        logger.error(f"❌ Error connecting to the database: {e}")
+        raise Exception(f"Error connecting to the database: {e}")
+
+    try:
+        tasks = session.query(Tarea).filter(
+            # The first condition is a range seek on the index, the second skips what was read at `start`
+            Tarea.due_date >= start,
+            or_(Tarea.due_date > start, Tarea.id > after_id),
+        ).order_by(Tarea.due_date, Tarea.id).limit(limit).all()
+        task_list = [task.to_dict() for task in tasks]
+        _log_operation("get_tasks_due_from", started, len(task_list))
+        return task_list
+    except Exception as e:
+        logger.error(f"❌ Error retrieving tasks due from {start}: {e}")
+        raise Exception(f"Error retrieving tasks due from {start}: {e}")
+    finally:
+        session.close()
+
+def _task_summary(task: Tarea) -> dict:
+    """
+    Compact task representation for combined payloads
+    """
+    return {
+        "id": task.id,
+        "title": task.title,
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+    }
+
+@_instrumented
+def agenda_snapshot(days: int = 7, limit: int = 20, database_url: Optional[str] = None) -> dict:
+    """
+    Retrieve overdue, today's and upcoming tasks with their counts in one session.
+
+    Replaces a sequence of get_tasks_for_today() / get_upcoming_tasks() calls for
+    overview questions. The read does not grow with the overdue history: the
+    three counts come from one COUNT/CASE over the due_date index, and each
+    group is read with LIMIT `limit`, only its id, title and due_date columns.
+
+    Args:
+    - days (int): The number of days after today to include as upcoming.
+    - limit (int): Maximum number of tasks listed per group (counts are always exact).
+    - database_url (Optional[str]): The URL of the database. Defaults to None, which uses the default SQLite database.
+
+    Returns:
+    - dict: {"overdue": [...], "today": [...], "upcoming": [...], "counts": {...}, "days": days}.
+      Tasks are compact dictionaries (id, title, due_date). Overdue tasks are due
+      before now (most recent first), today's are due later today, upcoming ones
+      within the next `days` days.
+
+    Raises:
+    - Exception: In case of error during retrieval.
+    """
+    if not isinstance(days, int) or days < 0:
+        raise ValueError("❌ Days must be a non negative integer")
+    if not isinstance(limit, int) or limit <= 0:
+        raise ValueError("❌ Limit must be a positive integer")
+
+    started = time.perf_counter()
+    try:
+        session = get_session(resolve_database_url(database_url))
+    except Exception as e:
+        logger.error(f"❌ Error connecting to the database: {e}")
+        raise Exception(f"Error connecting to the database: {e}")
+
+    try:
+        now = datetime.now()
+        tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+        window_end = tomorrow + timedelta(days=days)
+
+        # One pass over the due_date index counts the three groups
+        overdue, today, upcoming = (
+            session.query(
+                func.count(case((Tarea.due_date < now, 1))),
+                func.count(case((and_(Tarea.due_date >= now, Tarea.due_date < tomorrow), 1))),
+                func.count(case((Tarea.due_date >= tomorrow, 1))),
+            )
+            .filter(Tarea.due_date < window_end)
+            .one()
+        )
+        counts = {"overdue": overdue, "today": today, "upcoming": upcoming}
+
+        columns = (Tarea.id, Tarea.title, Tarea.due_date)
+        groups = {
+            # The most recently overdue tasks are the relevant ones
+            "overdue": session.query(*columns).filter(Tarea.due_date < now)
+            .order_by(Tarea.due_date.desc(), Tarea.id.desc()),
+            "today": session.query(*columns).filter(Tarea.due_date >= now, Tarea.due_date < tomorrow)
+            .order_by(Tarea.due_date, Tarea.id),
+            "upcoming": session.query(*columns).filter(Tarea.due_date >= tomorrow, Tarea.due_date < window_end)
+            .order_by(Tarea.due_date, Tarea.id),
+        }
+        snapshot = {name: [_task_summary(task) for task in query.limit(limit)] for name, query in groups.items()}
+        snapshot["counts"] = counts
+        snapshot["days"] = days
+        _log_operation("agenda_snapshot", started, sum(len(snapshot[name]) for name in groups), days=days)
+        return snapshot
+    except Exception as e:
+        logger.error(f"❌ Error building agenda snapshot: {e}")
+        raise Exception(f"Error building agenda snapshot: {e}")
+    finally:
+        session.close()
@@ -0,0 +1,158 @@
+"""
+Statement timing and slow-query log for the database engines
+
+Replaces SQL echo (every statement printed) with SQLAlchemy cursor events
+that time each statement:
+   - Histograms: one latency histogram per statement text (the parameters
+     are bound, so every shape of query is one entry), for statement_stats().
+   - Slow queries: statements over threshold_ms are logged as a warning with
+     their parameters and, on SQLite, their EXPLAIN QUERY PLAN, and kept in a
+     short list of recent ones (slow_queries).
+
+models.get_session() installs the shared query_log on every engine it
+creates. The threshold comes from AIGENDA_SLOW_QUERY_MS (default 50 ms);
+"off" leaves the engines without hooks: any cursor event listener makes
+SQLAlchemy dispatch the engine events of every connection, which costs tens
+of µs per statement (benchmarks/sql_echo_overhead.py).
+
+Usage Example:
+   from database.query_log import query_log
+
+   query_log.threshold_ms = 10
+   ...
+   print(query_log.format_report())
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.stats import LatencyHistogram
+
+SLOW_QUERY_ENV_VAR = "AIGENDA_SLOW_QUERY_MS"
+DEFAULT_SLOW_QUERY_MS = 50.0
+# Statements with other texts are counted together beyond this many
+MAX_STATEMENTS = 500
+OTHER_STATEMENTS = "<other statements>"
+
+
+def _normalize(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+class QueryLog:
+    """
+    Per-statement latency histograms and a log of the slow statements
+
+    Args:
+    - threshold_ms (float): Statements slower than this are logged.
+    - explain (bool): Attach the EXPLAIN QUERY PLAN of slow SQLite statements.
+    - keep (int): Recent slow statements kept in slow_queries.
+    - enabled (bool): If False, install() leaves the engines untouched.
+    """
+
+    def __init__(self, threshold_ms: float = DEFAULT_SLOW_QUERY_MS, explain: bool = True, keep: int = 100, enabled: bool = True):
+        self.threshold_ms = threshold_ms
+        self.enabled = enabled
+        self.explain = explain
+        self.slow_queries: deque[dict] = deque(maxlen=keep)
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> Engine:
+        """
+        Time the statements of an engine (once per engine)
+        """
+        if self.enabled and not event.contains(engine, "before_cursor_execute", self._before):
+            event.listen(engine, "before_cursor_execute", self._before)
+            event.listen(engine, "after_cursor_execute", self._after)
+        return engine
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.record(statement, duration_ms)
+        if duration_ms >= self.threshold_ms:
+            plan = None
+            if self.explain and not executemany and conn.dialect.name == "sqlite":
+                plan = self._explain(cursor, statement, parameters)
+            self._log_slow(statement, parameters, duration_ms, plan)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(statement)
+            if histogram is None:
+                key = statement if len(self._histograms) < MAX_STATEMENTS else OTHER_STATEMENTS
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+            histogram.observe(duration_ms)
+
+    @staticmethod
+    def _explain(cursor, statement: str, parameters: Any) -> Optional[list[str]]:
+        # A separate DB-API cursor: no events, and the statement's own results stay untouched
+        try:
+            rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+            return [row[-1] for row in rows]
+        except Exception as e:
+            logger.debug(f"Could not explain slow query: {e}")
+            return None
+
+    def _log_slow(self, statement: str, parameters: Any, duration_ms: float, plan: Optional[list[str]]) -> None:
+        entry = {
+            "statement": _normalize(statement),
+            "parameters": repr(parameters),
+            "duration_ms": duration_ms,
+            "plan": plan,
+        }
+        self.slow_queries.append(entry)
+        plan_text = f" | plan: {'; '.join(plan)}" if plan else ""
+        logger.warning(
+            "🐢 Slow query ({duration_ms:.1f} ms): {statement} | parameters: {parameters}" + plan_text.replace("{", "{{").replace("}", "}}"),
+            **entry,
+        )
+
+    def statement_stats(self) -> dict[str, dict]:
+        """
+        Latency summary (count, mean, p50/p95/p99, max in ms) by statement, slowest total first
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+        histograms.sort(key=lambda item: item[1].total, reverse=True)
+        return {_normalize(statement): histogram.summary() for statement, histogram in histograms}
+
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        with self._lock:
+            return dict(self._histograms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self.slow_queries.clear()
+
+    def format_report(self, top: int = 10, width: int = 80) -> str:
+        lines = [f"{'count':>7} {'total ms':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  statement"]
+        for statement, stats in list(self.statement_stats().items())[:top]:
+            total = stats["mean"] * stats["count"]
+            text = statement if len(statement) <= width else statement[: width - 1] + "…"
+            lines.append(
+                f"{stats['count']:>7} {total:>9.1f} {stats['p50']:>7.2f} {stats['p95']:>7.2f} "
+                f"{stats['p99']:>7.2f} {stats['max']:>7.2f}  {text}"
+            )
+        return "\n".join(lines)
+
+
+_threshold = os.getenv(SLOW_QUERY_ENV_VAR, "")
+query_log = QueryLog(
+    threshold_ms=float(_threshold) if _threshold and _threshold != "off" else DEFAULT_SLOW_QUERY_MS,
+    enabled=_threshold != "off",
+)
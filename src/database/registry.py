@@ -0,0 +1,76 @@
+"""
+Registry of named databases
+
+Agent tools never receive a connection string from the model: the run
+context names the target database and this registry resolves the name to a
+URL. Unnamed requests use the database of the current context (see
+models.use_database) or the default SQLite database.
+
+Usage Example:
+   from database.registry import database_registry
+
+   database_registry.register("demo", "sqlite:///data/demo.db")
+   url = database_registry.resolve("demo")
+"""
+
+import threading
+from typing import Optional
+
+from .models import dispose_engine, resolve_database_url
+
+
+class DatabaseRegistry:
+    """
+    Thread-safe mapping of database names to URLs
+    """
+
+    def __init__(self):
+        self._urls: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, database_url: str) -> None:
+        """
+        Add or replace a named database
+        """
+        with self._lock:
+            self._urls[name] = database_url
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a named database (no error if it is unknown) and, unless another
+        name still points to it, dispose of its cached engine
+        """
+        with self._lock:
+            database_url = self._urls.pop(name, None)
+            still_used = database_url in self._urls.values()
+        if database_url is not None and not still_used:
+            dispose_engine(database_url)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._urls)
+
+    def resolve(self, name: Optional[str] = None) -> str:
+        """
+        URL of a named database.
+
+        Args:
+        - name (Optional[str]): Registered name. None means the database of the current context.
+
+        Returns:
+        - str: The database URL.
+
+        Raises:
+        - KeyError: If the name is not registered.
+        """
+        if name is None:
+            return resolve_database_url()
+        with self._lock:
+            try:
+                return self._urls[name]
+            except KeyError:
+                raise KeyError(f"Unknown database '{name}'") from None
+
+
+# Registry shared by the agent tools and the pipeline
+database_registry = DatabaseRegistry()
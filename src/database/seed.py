@@ -0,0 +1,331 @@
+"""
+Synthetic agenda generator for seeding large databases
+
+Fills the tareas table with realistic tasks, fast enough for production-scale
+tests (1M rows in well under a minute):
+   - Due dates skewed around an anchor day: most tasks in the next weeks,
+     fewer overdue ones, a thin tail over ±1 year, moved off weekends most
+     of the time, at working hours rounded to 15 minutes.
+   - Recurring series (daily, weekly, monthly) sharing a title and a time of day.
+   - Descriptions with a long-tailed length (many empty ones).
+   - Several users with skewed activity and their own working hours. The
+     tareas table has no owner column, so users only shape the distribution;
+     give each user its own database to keep them apart.
+
+Rows are generated in vectorized batches (numpy when installed, a plain
+Python loop otherwise) and bulk-inserted with executemany, one transaction
+per batch, with the due_date index dropped during the load and rebuilt
+after it. The output is reproducible from (seed, rows, batch_size, anchor).
+
+Usage Example:
+   from database.seed import SeedConfig, seed_database
+
+   seed_database("sqlite:///data/big.db", SeedConfig(rows=1_000_000, seed=42))
+
+Usage:
+   python src/database/seed.py --rows 1000000 --database sqlite:///data/big.db --reset
+   python src/database/seed.py --rows 100000 --users 20 --seed 7 --anchor 2025-06-01
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from loguru import logger
+
+# Add src to the system path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import DEFAULT_DATABASE_URL, Tarea, create_database, dispose_engine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Title vocabulary by language: (verbs, objects)
+TITLE_WORDS = {
+    "es": (
+        ["Comprar", "Revisar", "Enviar", "Preparar", "Pagar", "Reservar", "Terminar", "Confirmar"],
+        ["leche", "el informe", "la factura", "el dentista", "las entradas", "el presupuesto", "mamá", "el vuelo"],
+    ),
+    "en": (
+        ["Buy", "Review", "Send", "Prepare", "Pay", "Book", "Finish", "Call", "Schedule", "Clean"],
+        ["the groceries", "the slides", "the invoice", "the car", "the tickets", "the quarterly report",
+         "the kitchen", "the flight", "the doctor", "the contract", "the landlord"],
+    ),
+}
+# Share of the one-off tasks written in Spanish
+SPANISH_SHARE = 0.5
+RECURRING_TITLES = [
+    "Reunión semanal de equipo", "Pagar alquiler", "Gimnasio", "Regar las plantas", "Sacar la basura",
+    "Weekly team meeting", "Pay rent", "Daily standup", "Water the plants", "Monthly report",
+]
+# Recurrence periods (days) and how common each one is
+PERIODS_DAYS = (1, 7, 30)
+PERIOD_WEIGHTS = (0.2, 0.6, 0.2)
+CORPUS = (
+    "Recordar llevar los documentos firmados y confirmar la hora por correo antes de salir. "
+    "Remember to bring the signed documents and confirm the time by email before leaving. "
+    "Check the notes from the last meeting, update the shared spreadsheet and ping the team. "
+    "Revisar los pendientes de la semana anterior y priorizar lo urgente para el viernes. "
+) * 40
+# Descriptions start at a word
+WORD_STARTS = [0] + [i + 1 for i, char in enumerate(CORPUS[:-2000]) if char == " "]
+
+
+@dataclass
+class SeedConfig:
+    """
+    Shape of the synthetic agenda
+
+    Fields:
+    - rows: Tasks to insert
+    - seed: Random seed (same seed, rows, batch size and anchor give the same rows)
+    - users: Users generating tasks, with skewed activity
+    - batch_size: Rows generated and inserted per transaction
+    - anchor: Day the agenda is centred on (default: today)
+    - recurring_share: Share of the tasks that belong to recurring series
+    - empty_description_share: Share of the tasks without description
+    - future_scale_days: Mean distance of upcoming tasks from the anchor
+    - overdue_scale_days: Mean distance of overdue tasks from the anchor
+    """
+    rows: int = 1_000_000
+    seed: int = 0
+    users: int = 5
+    batch_size: int = 100_000
+    anchor: date = field(default_factory=date.today)
+    recurring_share: float = 0.15
+    empty_description_share: float = 0.3
+    future_scale_days: float = 14.0
+    overdue_scale_days: float = 30.0
+
+
+def _user_profiles(config: SeedConfig) -> tuple[list[float], list[float]]:
+    """
+    Activity weight (Zipf-like) and working-hours shift of every user
+    """
+    rng = random.Random(config.seed)
+    weights = [1 / (user + 1) for user in range(config.users)]
+    total = sum(weights)
+    shifts = [rng.choice([-2.0, -1.0, 0.0, 0.0, 1.0, 2.0]) for _ in range(config.users)]
+    return [weight / total for weight in weights], shifts
+
+
+def _generate_batch_numpy(config: SeedConfig, batch: int, size: int) -> list[tuple]:
+    rng = np.random.default_rng([config.seed, batch])
+    weights, shifts = _user_profiles(config)
+    anchor = np.datetime64(config.anchor, "D")
+    now = np.datetime64(datetime.combine(config.anchor, datetime.min.time()), "us")
+
+    users = rng.choice(config.users, size=size, p=weights)
+    recurring = int(size * config.recurring_share)
+    single = size - recurring
+
+    # One-off tasks: upcoming (60%), overdue (25%) or anywhere in ±1 year (15%)
+    kind = rng.random(single)
+    offsets = np.where(
+        kind < 0.6, rng.exponential(config.future_scale_days, single),
+        np.where(kind < 0.85, -rng.exponential(config.overdue_scale_days, single), rng.uniform(-365, 365, single)),
+    ).astype("int64")
+    hours = rng.normal(13.0, 3.0, single) + np.asarray(shifts)[users[:single]]
+
+    # Recurring series: consecutive occurrences sharing a title, period and time of day
+    lengths = rng.integers(4, 30, size=max(1, recurring // 4 + 1))
+    series = np.repeat(np.arange(len(lengths)), lengths)[:recurring]
+    first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    occurrence = np.arange(recurring) - first[series]
+    periods = rng.choice(PERIODS_DAYS, size=len(lengths), p=PERIOD_WEIGHTS)
+    starts = (-rng.exponential(config.overdue_scale_days, len(lengths))).astype("int64")
+    series_hours = rng.normal(12.0, 3.5, len(lengths))
+    offsets = np.concatenate((offsets, starts[series] + occurrence * periods[series]))
+    hours = np.concatenate((hours, series_hours[series]))
+
+    days = anchor + offsets
+    # Most weekend tasks move to the next Monday (1970-01-01 was a Thursday)
+    weekday = (days.astype("int64") + 3) % 7
+    move = (weekday >= 5) & (rng.random(size) < 0.7)
+    days = days + np.where(move, 7 - weekday, 0)
+    minutes = (np.clip(hours, 7, 22) * 4).round().astype("int64") * 15
+    due = days.astype("datetime64[us]") + minutes.astype("timedelta64[m]")
+    created = np.minimum(due - (rng.exponential(10, size) * 86400e6).astype("timedelta64[us]"), now)
+
+    spanish = rng.random(single) < SPANISH_SHARE
+    titles_by_language = {}
+    for language, (verbs, objects) in TITLE_WORDS.items():
+        titles_by_language[language] = np.char.add(
+            np.char.add(np.asarray(verbs)[rng.integers(0, len(verbs), single)], " "),
+            np.asarray(objects)[rng.integers(0, len(objects), single)],
+        )
+    titles = np.where(spanish, titles_by_language["es"], titles_by_language["en"]).tolist()
+    series_titles = np.asarray(RECURRING_TITLES)[rng.integers(0, len(RECURRING_TITLES), len(lengths))]
+    titles += series_titles[series].tolist()
+
+    lengths_chars = np.minimum(rng.lognormal(3.5, 1.0, size), 2000).astype("int64")
+    starts_chars = np.asarray(WORD_STARTS)[rng.integers(0, len(WORD_STARTS), size)]
+    empty = rng.random(size) < config.empty_description_share
+    descriptions = [
+        None if no_text else CORPUS[start:start + length]
+        for no_text, start, length in zip(empty.tolist(), starts_chars.tolist(), lengths_chars.tolist())
+    ]
+
+    due_text = np.char.replace(np.datetime_as_string(due, unit="us"), "T", " ").tolist()
+    created_text = np.char.replace(np.datetime_as_string(created, unit="us"), "T", " ").tolist()
+    return list(zip(titles, descriptions, created_text, created_text, due_text))
+
+
+def _generate_batch_python(config: SeedConfig, batch: int, size: int) -> list[tuple]:
+    rng = random.Random(f"{config.seed}-{batch}")
+    weights, shifts = _user_profiles(config)
+    anchor = datetime.combine(config.anchor, datetime.min.time())
+    recurring = int(size * config.recurring_share)
+    rows = []
+
+    def due_at(day_offset: int, hour: float) -> datetime:
+        day = anchor + timedelta(days=day_offset)
+        if day.weekday() >= 5 and rng.random() < 0.7:
+            day += timedelta(days=7 - day.weekday())
+        return day + timedelta(minutes=round(min(max(hour, 7), 22) * 4) * 15)
+
+    def add(title: str, due: datetime) -> None:
+        created = min(due - timedelta(days=rng.expovariate(1 / 10)), anchor)
+        description = None
+        if rng.random() >= config.empty_description_share:
+            start = rng.choice(WORD_STARTS)
+            description = CORPUS[start:start + min(int(rng.lognormvariate(3.5, 1.0)), 2000)]
+        rows.append((title, description, str(created), str(created), due.strftime("%Y-%m-%d %H:%M:%S.%f")))
+
+    for _ in range(size - recurring):
+        user = rng.choices(range(config.users), weights)[0]
+        kind = rng.random()
+        if kind < 0.6:
+            offset = rng.expovariate(1 / config.future_scale_days)
+        elif kind < 0.85:
+            offset = -rng.expovariate(1 / config.overdue_scale_days)
+        else:
+            offset = rng.uniform(-365, 365)
+        verbs, objects = TITLE_WORDS["es" if rng.random() < SPANISH_SHARE else "en"]
+        add(f"{rng.choice(verbs)} {rng.choice(objects)}", due_at(int(offset), rng.gauss(13.0, 3.0) + shifts[user]))
+
+    while recurring > 0:
+        length = min(rng.randint(4, 29), recurring)
+        period = rng.choices(PERIODS_DAYS, PERIOD_WEIGHTS)[0]
+        start = int(-rng.expovariate(1 / config.overdue_scale_days))
+        title, hour = rng.choice(RECURRING_TITLES), rng.gauss(12.0, 3.5)
+        for occurrence in range(length):
+            add(title, due_at(start + occurrence * period, hour))
+        recurring -= length
+    return rows
+
+
+def generate_batch(config: SeedConfig, batch: int, size: int) -> list[tuple]:
+    """
+    Rows (title, description, created_at, updated_at, due_date) of one batch, dates as SQLite text
+
+    Args:
+    - config (SeedConfig): Shape of the agenda.
+    - batch (int): Batch number (each batch has its own random stream).
+    - size (int): Rows in the batch.
+    """
+    if np is not None:
+        return _generate_batch_numpy(config, batch, size)
+    return _generate_batch_python(config, batch, size)
+
+
+def seed_database(database_url: str = DEFAULT_DATABASE_URL, config: SeedConfig = SeedConfig(), reset: bool = False) -> dict:
+    """
+    Bulk-insert a synthetic agenda
+
+    Args:
+    - database_url (str): Target database (created if needed).
+    - config (SeedConfig): Shape of the agenda.
+    - reset (bool): Delete the existing tasks first.
+
+    Returns:
+    - dict: rows, seconds, rows_per_s and the time spent generating and rebuilding the indexes.
+    """
+    started = time.perf_counter()
+    engine = create_database(database_url)
+    table = Tarea.__table__
+    columns = ("title", "description", "created_at", "updated_at", "due_date")
+    connection = engine.raw_connection()
+    marker = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+    insert = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})"
+    sqlite = engine.dialect.name == "sqlite"
+    generate_s = 0.0
+    try:
+        cursor = connection.cursor()
+        if reset:
+            cursor.execute(f"DELETE FROM {table.name}")
+            connection.commit()
+        for index in table.indexes:
+            index.drop(engine, checkfirst=True)
+        if sqlite:
+            # Only for this connection: the load can be redone if the process dies
+            cursor.execute("PRAGMA synchronous = OFF")
+            cursor.execute("PRAGMA cache_size = -200000")
+
+        for batch, offset in enumerate(range(0, config.rows, config.batch_size)):
+            generated = time.perf_counter()
+            rows = generate_batch(config, batch, min(config.batch_size, config.rows - offset))
+            generate_s += time.perf_counter() - generated
+            cursor.executemany(insert, rows)
+            connection.commit()
+            logger.debug(f"🌱 Batch {batch}: {offset + len(rows)}/{config.rows} rows")
+        cursor.close()
+    except BaseException:
+        # Do not leave the PRAGMAs of this connection in the engine's pool
+        connection.invalidate()
+        raise
+    finally:
+        connection.close()
+
+    indexed = time.perf_counter()
+    for index in table.indexes:
+        index.create(engine, checkfirst=True)
+    index_s = time.perf_counter() - indexed
+    # The cached engine's pooled connections may hold a stale schema (dropped indexes)
+    dispose_engine(database_url)
+
+    seconds = time.perf_counter() - started
+    stats = {
+        "rows": config.rows,
+        "seconds": seconds,
+        "rows_per_s": config.rows / seconds if seconds else None,
+        "generate_s": generate_s,
+        "index_s": index_s,
+        "generator": "numpy" if np is not None else "python",
+    }
+    logger.success(f"🌱 Seeded {config.rows} tasks in {seconds:.1f} s ({stats['rows_per_s']:.0f} rows/s)")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fill the tasks table with a synthetic agenda")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Tasks to insert")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_URL, help="Database URL")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--users", type=int, default=5, help="Users generating tasks")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Rows per batch and transaction")
+    parser.add_argument("--anchor", type=date.fromisoformat, default=None, help="Day the agenda is centred on (YYYY-MM-DD, default today)")
+    parser.add_argument("--recurring-share", type=float, default=0.15, help="Share of tasks in recurring series")
+    parser.add_argument("--reset", action="store_true", help="Delete the existing tasks first")
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        rows=args.rows,
+        seed=args.seed,
+        users=args.users,
+        batch_size=args.batch_size,
+        recurring_share=args.recurring_share,
+        **({"anchor": args.anchor} if args.anchor else {}),
+    )
+    seed_database(args.database, config, reset=args.reset)
+
+
+if __name__ == "__main__":
+    main()
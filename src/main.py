@@ -1,15 +1,71 @@
-from agents import Runner
-from chatbot.agent_agenda import translator_agent
-
+import argparse
+import asyncio
 import os
 import sys
-from agents import Runner, trace
+from agents import trace
+from typing import Optional
 from datetime import datetime
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from chatbot.agent_agenda import translator_agent
+from chatbot.agent_agenda import agent_factory
+from chatbot.conversations import DEFAULT_CONVERSATIONS_PATH, ConversationStore
+from chatbot.cassettes import Cassette, cassette_run_config, current_instruction_hashes, stale_entries
+from chatbot.mock_model import LatencyProfile, offline_run_config
+from chatbot.model_policy import ModelCallPolicy, policy_run_config
+from chatbot.pipeline import run_agenda_query_sync
+from chatbot.scenarios import OUTCOME_ICONS, Scenario, run_scenarios_sync
+from chatbot.trace_store import install_local_tracing
+
+# Test cases: diferentes idiomas y operaciones
+WORKFLOW_CASES = [
+    # ESPAÑOL - Crear tareas
+    ("Crea una tarea para mañana: comprar leche", "🇪🇸 CREATE"),
+    ("Crear tarea: estudiar Python para el lunes", "🇪🇸 CREATE"),
+    
+    # INGLÉS - Crear tareas  
+    ("Create a task for tomorrow: buy milk", "🇺🇸 CREATE"),
+    ("Add task: call doctor next week", "🇺🇸 CREATE"),
+    
+    # ESPAÑOL - Listar tareas
+    ("Mostrar todas mis tareas", "🇪🇸 READ ALL"),
+    ("¿Qué tareas tengo para hoy?", "🇪🇸 READ TODAY"),
+    
+    # INGLÉS - Listar tareas
+    ("Show me all my tasks", "🇺🇸 READ ALL"), 
+    ("What tasks do I have today?", "🇺🇸 READ TODAY"),
+    
+    # ESPAÑOL - Borrar
+    ("Borrar la tarea con ID 1", "🇪🇸 DELETE"),
+    
+    # INGLÉS - Borrar
+    ("Delete task with ID 2", "🇺🇸 DELETE"),
+]
+
+CONVERSATION_QUERIES = [
+    "¿Cómo estás?",
+    "Hello, how are you?", 
+    "What's the weather today?",
+    "Tell me a joke",
+    "¿Qué puedes hacer?"
+]
+
+OPERATION_QUERIES = [
+    "Crea una tarea: test",
+    "Show my tasks",
+    "Delete task 1",
+    "List upcoming tasks"
+]
+
+# Test sequence: Create → Read → Delete
+DATABASE_SEQUENCE = [
+    ("Create a task: Test task for today", "CREATE"),
+    ("Show all my tasks", "READ ALL"),
+    ("Get tasks for today", "READ TODAY"),  
+    ("Delete task with ID 1", "DELETE"),
+    ("Show all my tasks", "READ ALL (should be empty)"),
+]
 
 def test_complete_workflow():
     """Prueba el flujo completo: Translator → DateParser → Database"""
@@ -17,32 +73,7 @@ def test_complete_workflow():
     print("🧪 TESTING COMPLETE 3-AGENT WORKFLOW")
     print("="*60)
     
-    # Test cases: diferentes idiomas y operaciones
-    test_cases = [
-        # ESPAÑOL - Crear tareas
-        ("Crea una tarea para mañana: comprar leche", "🇪🇸 CREATE"),
-        ("Crear tarea: estudiar Python para el lunes", "🇪🇸 CREATE"),
-        
-        # INGLÉS - Crear tareas  
-        ("Create a task for tomorrow: buy milk", "🇺🇸 CREATE"),
-        ("Add task: call doctor next week", "🇺🇸 CREATE"),
-        
-        # ESPAÑOL - Listar tareas
-        ("Mostrar todas mis tareas", "🇪🇸 READ ALL"),
-        ("¿Qué tareas tengo para hoy?", "🇪🇸 READ TODAY"),
-        
-        # INGLÉS - Listar tareas
-        ("Show me all my tasks", "🇺🇸 READ ALL"), 
-        ("What tasks do I have today?", "🇺🇸 READ TODAY"),
-        
-        # ESPAÑOL - Borrar
-        ("Borrar la tarea con ID 1", "🇪🇸 DELETE"),
-        
-        # INGLÉS - Borrar
-        ("Delete task with ID 2", "🇺🇸 DELETE"),
-    ]
-    
-    for i, (query, description) in enumerate(test_cases, 1):
+    for i, (query, description) in enumerate(WORKFLOW_CASES, 1):
         print(f"\n{'='*60}")
         print(f"TEST {i:2d}: {description}")
         print(f"Input:  {query}")
@@ -51,8 +82,7 @@ def test_complete_workflow():
         try:
             # Ejecutar el flujo completo con tracing
             with trace(f"Test_{i:02d}_{description.replace(' ', '_')}", group_id="test_session"):
-                result = Runner.run_sync(
-                    translator_agent,
+                result = run_agenda_query_sync(
                     query,
                     max_turns=10  # Permitir múltiples handoffs
                 )
@@ -81,26 +111,11 @@ def test_conversation_vs_operations():
     print("\n\n🤖 TESTING CONVERSATION vs TASK OPERATIONS")
     print("="*60)
     
-    conversation_tests = [
-        "¿Cómo estás?",
-        "Hello, how are you?", 
-        "What's the weather today?",
-        "Tell me a joke",
-        "¿Qué puedes hacer?"
-    ]
-    
-    operation_tests = [
-        "Crea una tarea: test",
-        "Show my tasks",
-        "Delete task 1",
-        "List upcoming tasks"
-    ]
-    
     print("\n🔍 CONVERSATION MODE (should NOT handoff):")
-    for i, query in enumerate(conversation_tests, 1):
+    for i, query in enumerate(CONVERSATION_QUERIES, 1):
         try:
             with trace(f"Conversation_Test_{i}", group_id="conversation_session"):
-                result = Runner.run_sync(translator_agent, query, max_turns=3)
+                result = run_agenda_query_sync(query, max_turns=3)
                 output = result.final_output
             
             if any(word in output.lower() for word in ['handoff', 'dateparser', 'database']):
@@ -111,10 +126,10 @@ def test_conversation_vs_operations():
             print(f"❌ {query} → ERROR")
     
     print("\n🔧 OPERATION MODE (should handoff):")
-    for i, query in enumerate(operation_tests, 1):
+    for i, query in enumerate(OPERATION_QUERIES, 1):
         try:
             with trace(f"Operation_Test_{i}", group_id="operation_session"):
-                result = Runner.run_sync(translator_agent, query, max_turns=5)
+                result = run_agenda_query_sync(query, max_turns=5)
                 output = result.final_output
             
             if any(word in output for word in ['✅', '❌', '📭']) or 'task' in output.lower():
@@ -130,42 +145,190 @@ def test_database_operations():
     print("\n\n💾 TESTING DATABASE OPERATIONS")
     print("="*60)
     
-    # Test sequence: Create → Read → Delete
-    sequence = [
-        ("Create a task: Test task for today", "CREATE"),
-        ("Show all my tasks", "READ ALL"),
-        ("Get tasks for today", "READ TODAY"),  
-        ("Delete task with ID 1", "DELETE"),
-        ("Show all my tasks", "READ ALL (should be empty)"),
-    ]
-    
     with trace("Database_Operations_Sequence", group_id="db_test_session"):
-        for i, (query, operation) in enumerate(sequence, 1):
+        for i, (query, operation) in enumerate(DATABASE_SEQUENCE, 1):
             print(f"\n🔧 {operation}")
             print(f"Query: {query}")
             
             try:
                 # Cada operación en una sub-traza
                 with trace(f"DB_Step_{i}_{operation.replace(' ', '_')}"):
-                    result = Runner.run_sync(translator_agent, query, max_turns=8)
+                    result = run_agenda_query_sync(query, max_turns=8)
                     print(f"Result: {result.final_output}")
             except Exception as e:
                 print(f"Error: {e}")
 
+def all_scenarios() -> list[Scenario]:
+    """Todos los casos de prueba como escenarios independientes (una BD por escenario)"""
+    scenarios = [
+        Scenario(f"workflow_{i:02d}", [query], category=description)
+        for i, (query, description) in enumerate(WORKFLOW_CASES, 1)
+    ]
+    scenarios += [
+        Scenario(f"conversation_{i}", [query], category="CONVERSATION", max_turns=3)
+        for i, query in enumerate(CONVERSATION_QUERIES, 1)
+    ]
+    scenarios += [
+        Scenario(f"operation_{i}", [query], category="OPERATION", max_turns=5)
+        for i, query in enumerate(OPERATION_QUERIES, 1)
+    ]
+    # The database sequence depends on its own order: one scenario, sequential steps
+    scenarios.append(Scenario(
+        "database_sequence",
+        [query for query, _ in DATABASE_SEQUENCE],
+        category="DB SEQUENCE",
+        max_turns=8,
+    ))
+    return scenarios
+
+def run_concurrent(concurrency: int, report_path: Optional[str], run_config=None):
+    """Ejecuta todos los escenarios en paralelo y muestra el resumen"""
+
+    print(f"⚡ RUNNING ALL SCENARIOS CONCURRENTLY (concurrency={concurrency})")
+    print("="*60)
+
+    report = run_scenarios_sync(all_scenarios(), concurrency=concurrency, run_config=run_config)
+
+    for step in report.steps:
+        print(f"{OUTCOME_ICONS[step.outcome]} [{step.category}] {step.query} "
+              f"→ {step.latency_ms:.0f} ms, {step.turns} turns")
+        print(f"   {step.output or step.error}")
+
+    summary = report.summary()
+    latency = summary["latency_ms"]
+    print("-" * 40)
+    print(f"🏁 {summary['requests']} requests in {summary['wall_time_s']:.1f}s")
+    if latency["count"]:
+        print(f"⏱️ p50={latency['p50']:.0f} ms  p95={latency['p95']:.0f} ms  p99={latency['p99']:.0f} ms")
+    print(f"📊 Outcomes: {summary['outcomes']}")
+
+    if report_path:
+        report.write_json(report_path)
+        print(f"💾 Report written to {report_path}")
+
+def chat(session_id: str, history_db: str, run_config=None):
+    """Chat interactivo: cada mensaje lleva el historial de la sesión (resumen + turnos recientes)"""
+
+    store = ConversationStore(history_db)
+    session = store.session(session_id)
+    print(f"💬 Session '{session_id}' ({history_db}). Empty line to exit, /reset to forget the session.")
+    while True:
+        try:
+            query = input("> ").strip()
+        except EOFError:
+            break
+        if not query:
+            break
+        if query == "/reset":
+            session.clear()
+            print("🧹 Session cleared")
+            continue
+        result = run_agenda_query_sync(query, session=session, run_config=run_config)
+        print(result.final_output)
+        print(f"   ({result.history_tokens} history tokens)")
+    store.close()
+
+def check_cassette(path: str) -> int:
+    """Diff mode: muestra las entradas del cassette grabadas con prompts que ya han cambiado"""
+
+    agents = [agent_factory.get(name) for name in ("translator", "translator_direct", "date_parser", "database")]
+    stale = stale_entries(Cassette(path), asyncio.run(current_instruction_hashes(agents)))
+    if not stale:
+        print(f"✅ Cassette {path} is up to date with the current prompts")
+        return 0
+    print(f"⚠️ {len(stale)} stale entries in {path} (prompt changed, re-record with --record):")
+    for entry in stale:
+        print(f"   ❌ {entry.agent_name}: {entry.query}")
+    return 1
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agent workflow scenarios")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Run the scenarios concurrently, each on its own database, instead of the "
+                             "one-by-one tests against data/tareas.db")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Scenarios in flight at once (concurrent mode)")
+    parser.add_argument("--report", default=None,
+                        help="Path of the JSON report (concurrent mode)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use the scripted offline model instead of the OpenAI API (implies --concurrent)")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Synthetic time to first token of the offline model")
+    parser.add_argument("--record", metavar="CASSETTE", default=None,
+                        help="Record the real model responses into a cassette (implies --concurrent)")
+    parser.add_argument("--replay", metavar="CASSETTE", default=None,
+                        help="Replay the model responses of a cassette instead of calling the API (implies --concurrent)")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="Wait the recorded model latency when replaying")
+    parser.add_argument("--diff-cassette", metavar="CASSETTE", default=None,
+                        help="Only check whether a cassette is stale for the current prompts")
+    parser.add_argument("--hop-timeout", type=float, default=30.0,
+                        help="Deadline in seconds of each model call (concurrent mode)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Retries of a model call on timeouts, connection errors, 429 and 5xx")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Fire a second model request when a call is slower than the p95")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Time budget in seconds of all the model calls of a request")
+    parser.add_argument("--chat", metavar="SESSION", default=None,
+                        help="Interactive chat that keeps the history of this session id between messages and runs")
+    parser.add_argument("--history-db", default=DEFAULT_CONVERSATIONS_PATH,
+                        help="SQLite store of the chat sessions")
+    parser.add_argument("--trace-store", metavar="PATH", default=None,
+                        help="Also write traces to a local SQLite (or .jsonl) store, see src/trace_report.py")
+    args = parser.parse_args()
+
+    if args.diff_cassette:
+        sys.exit(check_cassette(args.diff_cassette))
+
+    if args.chat:
+        chat_config = offline_run_config(latency=LatencyProfile(first_token_ms=args.latency_ms)) if args.offline else None
+        chat(args.chat, args.history_db, chat_config)
+        sys.exit(0)
+
+    # Offline runs have nothing to send to the OpenAI dashboard
+    offline = args.offline or bool(args.replay)
+    concurrent = args.concurrent or offline or bool(args.record)
+    if args.report and not concurrent:
+        parser.error("--report needs --concurrent")
+
     print(f"🚀 Starting tests at {datetime.now()}")
     print("Make sure you have:")
     print("1. ✅ OPENAI_API_KEY in your .env file")
     print("2. ✅ data/ directory exists")
     print("3. ✅ All prompt files created")
-    print("4. 🔍 Traces will be visible in OpenAI Dashboard")
+    if not offline:
+        print("4. 🔍 Traces will be visible in OpenAI Dashboard")
     print()
-    
-    # Run all tests with tracing
-    with trace("Complete_Agent_Testing", group_id="main_test_session"):
-        test_complete_workflow()
-        test_conversation_vs_operations()
-        test_database_operations()
+
+    if args.trace_store:
+        install_local_tracing(args.trace_store, replace_default=offline)
+    tracing_disabled = offline and not args.trace_store
+
+    if not concurrent:
+        # Run all tests with tracing
+        with trace("Complete_Agent_Testing", group_id="main_test_session"):
+            test_complete_workflow()
+            test_conversation_vs_operations()
+            test_database_operations()
+    else:
+        # One trace per request, grouped by session
+        policy = ModelCallPolicy(hop_timeout_s=args.hop_timeout, max_retries=args.retries,
+                                 hedge=args.hedge, total_budget_s=args.budget)
+        run_config = policy_run_config(policy, workflow_name="Complete_Agent_Testing", group_id="main_test_session")
+        cassette = None
+        if args.offline:
+            latency = LatencyProfile(first_token_ms=args.latency_ms, seed=0)
+            run_config = offline_run_config(latency=latency, tracing_disabled=tracing_disabled)
+        elif args.record or args.replay:
+            cassette = Cassette(args.record or args.replay)
+            mode = "record" if args.record else "replay"
+            run_config = cassette_run_config(cassette, mode, replay_latency=args.replay_latency,
+                                             tracing_disabled=tracing_disabled)
+        run_concurrent(args.concurrency, args.report, run_config)
+        if args.record:
+            cassette.save()
     
     print(f"\n🏁 Tests completed at {datetime.now()}")
-    print("🔍 Check your traces at: https://platform.openai.com/traces")
\ No newline at end of file
+    if not offline:
+        print("🔍 Check your traces at: https://platform.openai.com/traces")
@@ -1,10 +1,9 @@
 import sys
 import os
+import asyncio
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from chatbot.agent_agenda import date_parser_agent, translator_agent
-from agents import Runner
+from cli import print_stream
 
-result = Runner.run_sync(translator_agent, "Crea una tarea para mañana: comprar leche")
-print(result.final_output)
\ No newline at end of file
+asyncio.run(print_stream("Crea una tarea para mañana: comprar leche"))
\ No newline at end of file
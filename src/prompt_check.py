@@ -0,0 +1,147 @@
+"""
+Prefix stability check of the agent prompts
+
+Provider-side prompt caching only hits when the start of the instructions is
+byte-identical between calls. This check reports, per prompt, whether the
+static prefix stays identical and how many tokens all runs share:
+   - Rendered: every registered prompt rendered for different days, times,
+     timezones and users.
+   - Runs (--runs): the system instructions actually sent to the model,
+     captured from offline pipeline runs (scripted model, no API key) of
+     different users.
+
+Exits with status 1 if a prefix is unstable.
+
+Usage:
+   python src/prompt_check.py
+   python src/prompt_check.py --runs --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from dateutil import tz
+
+# Add src to path
+sys.path.append(os.path.dirname(__file__))
+
+from agents import ModelProvider
+from agents.models.interface import Model
+from loguru import logger
+
+from chatbot.context import AgendaContext
+from chatbot.hops import current_agent_name
+from chatbot.mock_model import offline_run_config
+from chatbot.pipeline import run_agenda_query
+from chatbot.prompt_registry import (
+    check_prefix_stability,
+    format_stability_report,
+    prefix_stability,
+    prompt_registry,
+    static_prefix,
+)
+from database.models import create_database, use_database
+
+RUN_QUERIES = [
+    "Crea una tarea para mañana: comprar leche",
+    "Show me all my tasks",
+    "¿Qué tareas tengo para hoy?",
+    "Delete task with ID 1",
+    "Hello, how are you?",
+]
+
+PROMPTS_BY_STATIC = {prompt_registry.get(name).static: name for name in prompt_registry.names()}
+
+
+class RecordingModel(Model):
+    """
+    Model wrapper that keeps the system instructions of every call, by agent
+    """
+
+    def __init__(self, inner: Model, calls: dict[str, list[str]]):
+        self.inner = inner
+        self.calls = calls
+
+    def _record(self, system_instructions) -> None:
+        # Clones share the agent name (TranslatorAgent): key by the registered prompt when known
+        text = system_instructions or ""
+        name = PROMPTS_BY_STATIC.get(static_prefix(text)) or current_agent_name() or "unknown"
+        self.calls.setdefault(name, []).append(text)
+
+    async def get_response(self, system_instructions, *args, **kwargs):
+        self._record(system_instructions)
+        return await self.inner.get_response(system_instructions, *args, **kwargs)
+
+    async def stream_response(self, system_instructions, *args, **kwargs):
+        self._record(system_instructions)
+        async for event in self.inner.stream_response(system_instructions, *args, **kwargs):
+            yield event
+
+
+class RecordingProvider(ModelProvider):
+    def __init__(self, inner: ModelProvider, calls: dict[str, list[str]]):
+        self.inner = inner
+        self.calls = calls
+
+    def get_model(self, model_name):
+        return RecordingModel(self.inner.get_model(model_name), self.calls)
+
+
+def rendered_samples() -> list:
+    now = datetime.now()
+    return [
+        (None, now, None),
+        (AgendaContext(user="user_a"), now + timedelta(hours=5), None),
+        (AgendaContext(user="user_b"), now + timedelta(days=1), tz.gettz("America/New_York")),
+        (AgendaContext(user="user_c"), now + timedelta(days=40), tz.gettz("Asia/Tokyo")),
+    ]
+
+
+async def recorded_runs(users: int) -> dict[str, list[str]]:
+    """
+    Instructions sent to the model by offline runs of the scenario queries for several users
+    """
+    calls: dict[str, list[str]] = {}
+    run_config = offline_run_config()
+    run_config.model_provider = RecordingProvider(run_config.model_provider, calls)
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aigenda_prompts_'), 'tareas.db')}"
+    create_database(database_url)
+    with use_database(database_url):
+        for user in range(users):
+            for query in RUN_QUERIES:
+                await run_agenda_query(query, context=AgendaContext(user=f"user_{user}"), run_config=run_config, cache=None)
+    return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check that the static prompt prefixes stay identical across runs")
+    parser.add_argument("--runs", action="store_true", help="Also check the instructions of offline pipeline runs")
+    parser.add_argument("--users", type=int, default=3, help="Users simulated by --runs")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    report = {"rendered": check_prefix_stability(prompt_registry, rendered_samples())}
+    if args.runs:
+        static = {name: prompt_registry.get(name).static for name in prompt_registry.names()}
+        report["runs"] = prefix_stability(asyncio.run(recorded_runs(args.users)), static)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for kind, rows in report.items():
+            print(f"\n🧩 Prefix stability ({kind})")
+            print(format_stability_report(rows))
+    stable = all(row["stable"] for rows in report.values() for row in rows.values())
+    sys.exit(0 if stable else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Reminders of due tasks: a heap-based scheduler and its notification sinks.
+"""
+
+from .scheduler import ReminderScheduler
+from .sinks import DesktopSink, LogSink, MemorySink, Reminder, WebhookSink
+
+__all__ = ["DesktopSink", "LogSink", "MemorySink", "Reminder", "ReminderScheduler", "WebhookSink"]
@@ -0,0 +1,343 @@
+"""
+Reminder service: notify the sinks when tasks become due
+
+Instead of polling the table, the scheduler keeps a min-heap of the next
+reminder times and sleeps until the earliest one:
+   - Windows: tasks are read in due date order from the due_date index, a
+     window of `window_size` tasks at a time (keyset pagination). The next
+     window is only read when the heap runs out, so memory and start-up time
+     do not grow with the number of pending tasks.
+   - Changes: created and deleted tasks reach the heap through
+     database.events, without any query. A new task is pushed if it falls in
+     the loaded window (later ones will be read with their window) and wakes
+     the scheduler only if it is the new earliest deadline. Deleted tasks are
+     skipped when their entry is popped (lazy deletion).
+   - Resync: the window is read again from the current time, so tasks that
+     already fired but are not due yet (any task when lead > 0) are kept in
+     a small map of fired reminders and skipped when they are read again.
+   - Idle: the thread blocks on a condition until the next deadline (at most
+     max_sleep_s), so an idle scheduler costs no CPU whatever the table size.
+
+Change events are process-local: run the scheduler in the process that writes
+the tasks (e.g. python src/ui/interface.py --reminders), or set resync_s so a
+standalone service reloads its window from the database every few minutes.
+
+Usage Example:
+   from reminders.scheduler import ReminderScheduler
+   from reminders.sinks import LogSink, DesktopSink
+
+   scheduler = ReminderScheduler([LogSink(), DesktopSink()], lead=timedelta(minutes=10))
+   scheduler.start()
+   ...
+   scheduler.stop()
+
+Usage:
+   python src/reminders/scheduler.py --lead-minutes 10 --desktop --resync-minutes 5
+   python src/reminders/scheduler.py --webhook http://127.0.0.1:8080/reminders
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from loguru import logger
+
+# Add src to the system path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from database import operations
+from database.events import TaskChange, subscribe
+from database.models import resolve_database_url
+from reminders.sinks import DesktopSink, LogSink, Reminder, ReminderSink, WebhookSink
+
+DEFAULT_WINDOW_SIZE = 1000
+# Upper bound of one sleep, so clock changes or a suspended machine are noticed
+DEFAULT_MAX_SLEEP_S = 300.0
+
+
+class ReminderScheduler:
+    """
+    Min-heap of upcoming reminders of one database, served by a background thread
+
+    Args:
+    - sinks (Iterable[ReminderSink]): Callables notified of every due reminder, in order.
+    - database_url (Optional[str]): The URL of the database. Defaults to the database of the current context.
+    - window_size (int): Tasks read from the due_date index at a time.
+    - lead (timedelta): How long before the due date to remind.
+    - max_sleep_s (float): Longest time the thread sleeps without checking the clock.
+    - resync_s (Optional[float]): Reload the window from the database this often, to pick up
+      writes made by other processes. None relies on the change events only.
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[ReminderSink],
+        database_url: Optional[str] = None,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        lead: timedelta = timedelta(0),
+        max_sleep_s: float = DEFAULT_MAX_SLEEP_S,
+        resync_s: Optional[float] = None,
+    ):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.sinks = list(sinks)
+        self.database_url = resolve_database_url(database_url)
+        self.window_size = window_size
+        self.lead = lead
+        self.max_sleep_s = max_sleep_s
+        self.resync_s = resync_s
+
+        # (remind_at, task_id); an entry is live only if _pending holds the same reminder
+        self._heap: list[tuple[datetime, int]] = []
+        self._pending: dict[int, Reminder] = {}
+        # Last (due_date, id) read from the index; tasks after it are not loaded yet
+        self._cursor: tuple[datetime, int] = (datetime.min, 0)
+        # Task id -> due date of the reminders already sent for tasks not due yet
+        self._fired_ahead: dict[int, datetime] = {}
+        self._exhausted = False
+        self._next_resync = 0.0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._unsubscribe = None
+        self._stopping = False
+
+        self.loads = 0
+        self.loaded = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.wakeups = 0
+        self.sink_errors = 0
+
+    # -- Heap maintenance (called with the condition held) ---------------------
+
+    def _reminder(self, task: dict) -> Reminder:
+        due_date = datetime.fromisoformat(task["due_date"])
+        return Reminder(task_id=task["id"], title=task["title"], due_date=due_date, remind_at=due_date - self.lead)
+
+    def _push(self, reminder: Reminder) -> bool:
+        if reminder.task_id in self._pending or self._fired_ahead.get(reminder.task_id) == reminder.due_date:
+            return False
+        self._pending[reminder.task_id] = reminder
+        heapq.heappush(self._heap, (reminder.remind_at, reminder.task_id))
+        return True
+
+    def _reset(self, now: datetime) -> None:
+        """
+        Forget the heap and read again from the first task not due yet
+        """
+        self._heap = []
+        self._pending = {}
+        self._cursor = (now, 0)
+        self._exhausted = False
+        self._forget_fired(now)
+        if self.resync_s is not None:
+            self._next_resync = time.monotonic() + self.resync_s
+
+    def _forget_fired(self, now: datetime) -> None:
+        self._fired_ahead = {task_id: due_date for task_id, due_date in self._fired_ahead.items() if due_date >= now}
+
+    def _load_window(self) -> None:
+        start, after_id = self._cursor
+        tasks = operations.get_tasks_due_from(start, after_id=after_id, limit=self.window_size, database_url=self.database_url)
+        for task in tasks:
+            self._push(self._reminder(task))
+        if tasks:
+            self._cursor = (datetime.fromisoformat(tasks[-1]["due_date"]), tasks[-1]["id"])
+        self._exhausted = len(tasks) < self.window_size
+        self.loads += 1
+        self.loaded += len(tasks)
+        logger.debug(f"⏰ Loaded {len(tasks)} reminders up to {self._cursor[0]}")
+
+    def _fill(self) -> None:
+        while not self._pending and not self._exhausted:
+            self._heap = []
+            self._load_window()
+
+    def _compact(self) -> None:
+        # Drop the entries of deleted tasks once they outnumber the live ones
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._pending):
+            self._heap = [(remind_at, task_id) for remind_at, task_id in self._heap
+                          if self._is_live(remind_at, task_id)]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, remind_at: datetime, task_id: int) -> bool:
+        # Ids can be reused after a deletion: the reminder time must match too
+        reminder = self._pending.get(task_id)
+        return reminder is not None and reminder.remind_at == remind_at
+
+    def _on_change(self, change: TaskChange) -> None:
+        if change.database_url != self.database_url:
+            return
+        with self._condition:
+            if change.kind == "created":
+                task = change.task
+                if not task.get("due_date"):
+                    return
+                reminder = self._reminder(task)
+                position = (reminder.due_date, reminder.task_id)
+                if reminder.due_date < datetime.now():
+                    return
+                if not self._exhausted and position > self._cursor:
+                    # Read later with its window
+                    return
+                earliest = self._heap[0][0] if self._heap else None
+                if self._push(reminder) and (earliest is None or reminder.remind_at < earliest):
+                    self._condition.notify()
+            elif change.kind == "deleted":
+                self._fired_ahead.pop(change.task["id"], None)
+                if self._pending.pop(change.task["id"], None) is not None:
+                    self.cancelled += 1
+                    self._compact()
+
+    # -- Thread ----------------------------------------------------------------
+
+    def _due_reminders(self) -> list[Reminder]:
+        """
+        Pop the reminders that are due, or sleep until the next one (condition held)
+        """
+        if self.resync_s is not None and time.monotonic() >= self._next_resync:
+            self._reset(datetime.now())
+        self._fill()
+        now = datetime.now()
+        reminders = []
+        while self._heap and self._heap[0][0] <= now:
+            remind_at, task_id = heapq.heappop(self._heap)
+            if self._is_live(remind_at, task_id):
+                reminder = self._pending.pop(task_id)
+                if reminder.due_date > now:
+                    self._fired_ahead[task_id] = reminder.due_date
+                    if len(self._fired_ahead) > self.window_size:
+                        self._forget_fired(now)
+                reminders.append(reminder)
+            self._fill()
+        if reminders:
+            return reminders
+
+        timeout = self.max_sleep_s
+        if self._heap:
+            timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+        if self.resync_s is not None:
+            timeout = min(timeout, self._next_resync - time.monotonic())
+        self._condition.wait(max(timeout, 0.0))
+        self.wakeups += 1
+        return []
+
+    def _dispatch(self, reminder: Reminder) -> None:
+        for sink in self.sinks:
+            try:
+                sink(reminder)
+            except Exception as e:
+                self.sink_errors += 1
+                logger.error(f"❌ Reminder sink {type(sink).__name__} failed for task #{reminder.task_id}: {e}")
+        self.fired += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                try:
+                    reminders = self._due_reminders()
+                except Exception as e:
+                    # Database unavailable: try again later instead of dying
+                    logger.error(f"❌ Error loading reminders: {e}")
+                    self._condition.wait(min(self.max_sleep_s, 30.0))
+                    continue
+            for reminder in reminders:
+                self._dispatch(reminder)
+
+    def start(self) -> "ReminderScheduler":
+        """
+        Load the first window and start the background thread
+        """
+        if self._thread is not None:
+            raise RuntimeError("Reminder scheduler already started")
+        # Subscribe before loading: a task created meanwhile is pushed by the event or read by the query
+        self._unsubscribe = subscribe(self._on_change)
+        with self._condition:
+            self._reset(datetime.now())
+            self._fill()
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"⏰ Reminder scheduler started ({len(self._pending)} reminders loaded, lead {self.lead})")
+        return self
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        """
+        Stop following the changes and wait for the thread
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+        logger.info("🛑 Reminder scheduler stopped")
+
+    def next_reminder(self) -> Optional[Reminder]:
+        """
+        Earliest reminder still pending in the heap
+        """
+        with self._condition:
+            for remind_at, task_id in sorted(self._heap):
+                if self._is_live(remind_at, task_id):
+                    return self._pending[task_id]
+        return None
+
+    def metrics(self) -> dict:
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "heap_size": len(self._heap),
+                "exhausted": self._exhausted,
+                "loads": self.loads,
+                "loaded": self.loaded,
+                "fired": self.fired,
+                "cancelled": self.cancelled,
+                "fired_ahead": len(self._fired_ahead),
+                "wakeups": self.wakeups,
+                "sink_errors": self.sink_errors,
+            }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AIgenda reminder service")
+    parser.add_argument("--database", default=None, help="Database URL (default: data/tareas.db)")
+    parser.add_argument("--lead-minutes", type=float, default=0.0, help="Remind this many minutes before the due date")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_SIZE, help="Tasks read from the index at a time")
+    parser.add_argument("--desktop", action="store_true", help="Show desktop notifications")
+    parser.add_argument("--webhook", default=None, help="POST every reminder as JSON to this URL")
+    parser.add_argument("--resync-minutes", type=float, default=5.0,
+                        help="Reload from the database this often to see tasks created by other processes (0 disables)")
+    args = parser.parse_args()
+
+    sinks: list[ReminderSink] = [LogSink()]
+    if args.desktop:
+        sinks.append(DesktopSink())
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+
+    scheduler = ReminderScheduler(
+        sinks,
+        database_url=args.database,
+        window_size=args.window,
+        lead=timedelta(minutes=args.lead_minutes),
+        resync_s=args.resync_minutes * 60 if args.resync_minutes > 0 else None,
+    ).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
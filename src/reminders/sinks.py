@@ -0,0 +1,141 @@
+"""
+Notification sinks of the reminder service
+
+A sink is any callable that takes a Reminder. The scheduler calls every sink
+from its own thread, one reminder at a time, and logs (without stopping) the
+sinks that fail.
+
+Usage Example:
+   from reminders.sinks import LogSink, DesktopSink, WebhookSink
+
+   sinks = [LogSink(), DesktopSink(), WebhookSink("http://127.0.0.1:8080/reminders")]
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class Reminder:
+    """
+    A task that became due
+
+    Fields:
+    - task_id: Id of the task
+    - title: Title of the task
+    - due_date: When the task is due
+    - remind_at: When the reminder was scheduled (due_date minus the lead time)
+    """
+    task_id: int
+    title: str
+    due_date: datetime
+    remind_at: datetime
+
+    def to_dict(self) -> dict:
+        return {
+            "task_id": self.task_id,
+            "title": self.title,
+            "due_date": self.due_date.isoformat(),
+            "remind_at": self.remind_at.isoformat(),
+        }
+
+
+ReminderSink = Callable[[Reminder], None]
+
+
+class LogSink:
+    """
+    Write every reminder to the log
+    """
+
+    def __call__(self, reminder: Reminder) -> None:
+        logger.info(f"⏰ Reminder: task #{reminder.task_id} '{reminder.title}' is due at {reminder.due_date:%Y-%m-%d %H:%M}")
+
+
+class DesktopSink:
+    """
+    Show a desktop notification (notify-send on Linux, osascript on macOS).
+
+    Falls back to the log when no notifier is available (servers, containers).
+
+    Args:
+    - timeout_s (float): Maximum time to wait for the notifier command.
+    """
+
+    def __init__(self, timeout_s: float = 5.0):
+        self.timeout_s = timeout_s
+        self._fallback = LogSink()
+        if sys.platform == "darwin":
+            self.command = shutil.which("osascript")
+        else:
+            self.command = shutil.which("notify-send")
+        if self.command is None:
+            logger.warning("⚠️ No desktop notifier found, reminders will only be logged")
+
+    def __call__(self, reminder: Reminder) -> None:
+        if self.command is None:
+            self._fallback(reminder)
+            return
+        title = "AIgenda"
+        body = f"{reminder.title} — {reminder.due_date:%H:%M}"
+        if sys.platform == "darwin":
+            script = f"display notification {json.dumps(body)} with title {json.dumps(title)}"
+            args = [self.command, "-e", script]
+        else:
+            args = [self.command, title, body]
+        subprocess.run(args, check=True, timeout=self.timeout_s, capture_output=True)
+
+
+class WebhookSink:
+    """
+    POST every reminder as JSON to a local endpoint (stand-in for a push service)
+
+    Args:
+    - url (str): Endpoint receiving the reminders.
+    - timeout_s (float): Request timeout.
+    """
+
+    def __init__(self, url: str, timeout_s: float = 5.0):
+        self.url = url
+        self.timeout_s = timeout_s
+
+    def __call__(self, reminder: Reminder) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(reminder.to_dict()).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+            response.read()
+
+
+class MemorySink:
+    """
+    Keep the reminders in a list (tests and benchmarks)
+    """
+
+    def __init__(self):
+        self.reminders: list[Reminder] = []
+        self._condition = threading.Condition()
+
+    def __call__(self, reminder: Reminder) -> None:
+        with self._condition:
+            self.reminders.append(reminder)
+            self._condition.notify_all()
+
+    def wait_for(self, count: int, timeout_s: float = 5.0) -> bool:
+        """
+        Wait until at least `count` reminders were received
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self.reminders) >= count, timeout=timeout_s)
@@ -0,0 +1,43 @@
+"""
+Report of the locally stored agent traces
+
+Reads the SQLite or JSON Lines store written by chatbot.trace_store and
+prints p50/p95/p99 latency per agent hop, per tool and per model call,
+tokens per agent and per request, and the slowest traces.
+
+Usage:
+   python src/main.py --offline --trace-store logs/traces.db
+   python src/trace_report.py logs/traces.db
+   python src/trace_report.py logs/traces.jsonl --slowest 10 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.dirname(__file__))
+
+from chatbot.trace_store import format_report, load_report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency and token report of local agent traces")
+    parser.add_argument("store", help="SQLite database or .jsonl file written by --trace-store")
+    parser.add_argument("--slowest", type=int, default=5, help="Number of slowest traces to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.store):
+        parser.error(f"trace store not found: {args.store}")
+
+    report = load_report(args.store, slowest=args.slowest)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Agenda dashboard that reads the database directly, without the agents
+
+Viewing the agenda needs no model round trip, and its cost does not grow with
+the overdue history or the number of tasks: the dashboard only ever reads
+counts and the rows it lists.
+   - View (per database and day): tasks per day of the heatmap weeks (one
+     GROUP BY) and the number of tasks due before today (one COUNT), both
+     over the due_date index.
+   - Snapshot (per view and minute): the latest MAX_ROWS overdue tasks, the
+     first MAX_ROWS of today and of the upcoming window (LIMIT queries) and
+     the overdue tasks of today (COUNT). Grouping follows the clock, so tasks
+     move to "overdue" as their time passes.
+
+The cached view follows the data version of database.events: writes made
+through database.operations are applied to its counts incrementally, and it
+is only reloaded if a change was missed or the day changed. Snapshots are
+kept for the view's version and minute, so every browser polling the same
+database shares one.
+
+Usage Example:
+   from ui.dashboard import dashboard_cache, render_lists, render_heatmap
+
+   snapshot = dashboard_cache.snapshot()
+   html = render_lists(snapshot) + render_heatmap(snapshot)
+"""
+
+import html
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+
+# Add src to the system path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from database import operations
+from database.events import TaskChange, data_version, subscribe
+from database.models import resolve_database_url
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_HEATMAP_WEEKS = 5
+# Rows listed per group; the counts are always complete
+MAX_ROWS = 25
+
+
+def _due(task: dict) -> datetime:
+    return datetime.fromisoformat(task["due_date"])
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+@dataclass
+class AgendaView:
+    """
+    Cached counts of one database
+
+    Fields:
+    - database_url: Database the counts come from
+    - version: Data version the view is up to date with
+    - day: Day the view was loaded (the range moves every day)
+    - range_start: Inclusive start of the counted days (Monday of the heatmap)
+    - range_end: Exclusive end of the counted days
+    - per_day: Tasks per due day of the range
+    - earlier_count: Tasks due before the start of `day`
+    - stale: A change could not be applied; the view must be loaded again
+    - snapshot: Last snapshot built, with the (version, now) it was built for
+    """
+    database_url: str
+    version: int
+    day: date
+    range_start: datetime
+    range_end: datetime
+    per_day: dict[date, int] = field(default_factory=dict)
+    earlier_count: int = 0
+    stale: bool = False
+    snapshot: Optional[tuple[tuple[int, datetime], dict]] = None
+
+    def apply(self, change: TaskChange) -> None:
+        """
+        Apply a committed change to the cached counts
+        """
+        if change.kind in ("created", "deleted"):
+            if change.task.get("due_date"):
+                step = 1 if change.kind == "created" else -1
+                due = _due(change.task)
+                if due < _midnight(self.day):
+                    self.earlier_count += step
+                if self.range_start <= due < self.range_end:
+                    self.per_day[due.date()] = self.per_day.get(due.date(), 0) + step
+            elif change.kind == "deleted":
+                # Unknown due date: it cannot be placed in the counts
+                self.stale = True
+        self.version = change.version
+
+
+def heatmap_start(today: date) -> date:
+    """
+    First day of the heatmap: Monday of the current week
+    """
+    return today - timedelta(days=today.weekday())
+
+
+class DashboardCache:
+    """
+    Per-database cache of AgendaViews, kept up to date by the change events
+
+    Args:
+    - window_days (int): Days after today listed as upcoming.
+    - heatmap_weeks (int): Weeks shown in the calendar heatmap, from the current one.
+    """
+
+    def __init__(self, window_days: int = DEFAULT_WINDOW_DAYS, heatmap_weeks: int = DEFAULT_HEATMAP_WEEKS):
+        self.window_days = window_days
+        self.heatmap_weeks = heatmap_weeks
+        self.loads = 0
+        self.hits = 0
+        self.incremental_updates = 0
+        self.snapshots = 0
+        self._views: dict[str, AgendaView] = {}
+        self._lock = threading.Lock()
+        self._unsubscribe = subscribe(self._on_change)
+
+    def _range_end(self, today: date) -> datetime:
+        last_day = max(today + timedelta(days=self.window_days), heatmap_start(today) + timedelta(weeks=self.heatmap_weeks, days=-1))
+        return _midnight(last_day + timedelta(days=1))
+
+    def _on_change(self, change: TaskChange) -> None:
+        with self._lock:
+            view = self._views.get(change.database_url)
+            if view is None:
+                return
+            if change.version == view.version + 1:
+                view.apply(change)
+                self.incremental_updates += 1
+            if change.version != view.version or view.stale:
+                # A change was missed (e.g. made before the view finished loading): reload next time
+                del self._views[change.database_url]
+
+    def view(self, database_url: Optional[str] = None, today: Optional[date] = None) -> AgendaView:
+        """
+        Cached view of a database, loaded with two indexed queries when missing or outdated
+        """
+        url = resolve_database_url(database_url)
+        today = today or date.today()
+        with self._lock:
+            view = self._views.get(url)
+            if view is not None and view.day == today and view.version == data_version(url):
+                self.hits += 1
+                return view
+
+        # Read the version first: a write during the queries makes the next call reload
+        version = data_version(url)
+        range_start, range_end = _midnight(heatmap_start(today)), self._range_end(today)
+        view = AgendaView(
+            url, version, today, range_start, range_end,
+            per_day=operations.count_tasks_per_day(range_start, range_end, database_url=url),
+            earlier_count=operations.count_tasks_due_before(_midnight(today), database_url=url),
+        )
+        with self._lock:
+            self._views[url] = view
+            self.loads += 1
+        logger.info(f"🗓️ Dashboard counted {sum(view.per_day.values())} tasks in range, {view.earlier_count} earlier (version {version})")
+        return view
+
+    def snapshot(self, database_url: Optional[str] = None, now: Optional[datetime] = None) -> dict:
+        """
+        Dashboard data of a database.
+
+        Args:
+        - database_url (Optional[str]): The URL of the database. Defaults to the database of the current context.
+        - now (Optional[datetime]): Reference time. Defaults to now.
+
+        Returns:
+        - dict: "overdue", "today" and "upcoming" task lists (at most MAX_ROWS each, by due date,
+          overdue most recent first), their complete "counts", the "heatmap" as (day, count) pairs
+          from Monday of this week, and the "version".
+        """
+        now = now or datetime.now()
+        today = now.date()
+        view = self.view(database_url, today)
+        with self._lock:
+            if view.snapshot is not None and view.snapshot[0] == (view.version, now):
+                return view.snapshot[1]
+            version, earlier_count, per_day = view.version, view.earlier_count, dict(view.per_day)
+
+        url = view.database_url
+        tomorrow = _midnight(today + timedelta(days=1))
+        window_end = tomorrow + timedelta(days=self.window_days)
+        overdue_today = operations.count_tasks_due_before(now, start=_midnight(today), database_url=url)
+        groups = {
+            "overdue": operations.get_tasks_due_before(now, limit=MAX_ROWS, newest_first=True, compact=True, database_url=url),
+            "today": operations.get_tasks_due_before(tomorrow, start=now, limit=MAX_ROWS, compact=True, database_url=url),
+            "upcoming": operations.get_tasks_due_before(window_end, start=tomorrow, limit=MAX_ROWS, compact=True, database_url=url),
+        }
+        counts = {
+            "overdue": earlier_count + overdue_today,
+            "today": per_day.get(today, 0) - overdue_today,
+            "upcoming": sum(per_day.get(today + timedelta(days=i), 0) for i in range(1, self.window_days + 1)),
+        }
+        start = heatmap_start(today)
+        heatmap = [(day, per_day.get(day, 0)) for day in (start + timedelta(days=i) for i in range(self.heatmap_weeks * 7))]
+        snapshot = {
+            **groups,
+            "counts": counts,
+            "heatmap": heatmap,
+            "today_date": today,
+            "window_days": self.window_days,
+            "version": version,
+        }
+        with self._lock:
+            self.snapshots += 1
+            if view.version == version:
+                view.snapshot = ((version, now), snapshot)
+        return snapshot
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"loads": self.loads, "hits": self.hits, "incremental_updates": self.incremental_updates,
+                    "snapshots": self.snapshots}
+
+    def close(self) -> None:
+        """
+        Stop following the change events
+        """
+        self._unsubscribe()
+
+
+# ---------------------------------------------------------------------------
+# HTML rendering
+# ---------------------------------------------------------------------------
+
+_HEAT_COLORS = ["#ebedf0", "#c6e48b", "#7bc96f", "#239a3b", "#196127"]
+
+
+def _task_rows(tasks: list[dict], count: int, time_format: str) -> str:
+    if not tasks:
+        return "<li><em>📭 Nothing here</em></li>"
+    rows = [
+        f"<li><code>#{task['id']}</code> {_due(task).strftime(time_format)} — {html.escape(task['title'])}</li>"
+        for task in tasks[:MAX_ROWS]
+    ]
+    if count > len(rows):
+        rows.append(f"<li><em>… and {count - len(rows)} more</em></li>")
+    return "".join(rows)
+
+
+def render_lists(snapshot: dict) -> str:
+    """
+    HTML of the overdue, today and upcoming task lists
+    """
+    counts = snapshot["counts"]
+    sections = [
+        ("⚠️ Overdue", "overdue", "%Y-%m-%d %H:%M"),
+        ("📌 Today", "today", "%H:%M"),
+        (f"📅 Next {snapshot['window_days']} days", "upcoming", "%a %d %b %H:%M"),
+    ]
+    columns = "".join(
+        f"<div style='flex:1;min-width:220px'><h3>{title} ({counts[name]})</h3>"
+        f"<ul>{_task_rows(snapshot[name], counts[name], time_format)}</ul></div>"
+        for title, name, time_format in sections
+    )
+    return f"<div style='display:flex;gap:24px;flex-wrap:wrap'>{columns}</div>"
+
+
+def render_heatmap(snapshot: dict) -> str:
+    """
+    HTML calendar heatmap: one row per week, one cell per day, darker for more tasks
+    """
+    today = snapshot["today_date"]
+    header = "".join(f"<th style='font-weight:normal'>{name}</th>" for name in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+    rows = []
+    heatmap = snapshot["heatmap"]
+    for week in range(0, len(heatmap), 7):
+        cells = []
+        for day, count in heatmap[week:week + 7]:
+            color = _HEAT_COLORS[min(count, len(_HEAT_COLORS) - 1)]
+            border = "2px solid #0366d6" if day == today else "1px solid #d0d7de"
+            label = f"{day.isoformat()}: {count} task{'s' if count != 1 else ''}"
+            cells.append(
+                f"<td title='{label}' style='background:{color};border:{border};width:38px;height:30px;"
+                f"text-align:center;font-size:11px'>{day.day}</td>"
+            )
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    return f"<table style='border-collapse:separate;border-spacing:3px'><tr>{header}</tr>{''.join(rows)}</table>"
+
+
+# Process-wide cache used by the interface
+dashboard_cache = DashboardCache()
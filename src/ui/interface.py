@@ -0,0 +1,331 @@
+"""
+Chat interface for the agenda assistant
+
+Adapts the streamed agent pipeline to chat widgets, which redraw the whole
+message on every update: stream_reply() yields the growing answer text,
+preceded by one progress line per handoff or tool call.
+
+build_interface() wires it into a Gradio app:
+   - Queue: requests wait in Gradio's queue (max_queue_size) and at most
+     concurrency_limit of them run at once. The handlers are async and the
+     database tools run on a thread pool (chatbot.tool_executor), so one slow
+     model call never blocks the other users.
+   - Streaming: partial answers are pushed to the browser as they are written.
+   - Sessions: every browser session keeps its own ChatSession (gr.State) with
+     a user id for the pipeline (part of the cache and single-flight keys,
+     so answers are never shared between users)
+     and a conversation id that groups its traces and, with a
+     ConversationStore, keys its history so follow-ups see earlier turns.
+   - Agenda tab: today, the next days, overdue tasks and a calendar heatmap,
+     read straight from the database through ui.dashboard (no model call).
+     A timer polls the cached view, which only changes when tasks do, so
+     browsers are only sent new HTML after a write or when time moves a task.
+
+Usage:
+   python src/ui/interface.py
+   python src/ui/interface.py --concurrency 16 --queue-size 128 --port 7860
+   python src/ui/interface.py --offline --latency-ms 300   # scripted model, no API key
+   python src/ui/interface.py --reminders --reminder-lead 10  # notify due tasks
+   python src/ui/interface.py --json-logs  # structured logs, warnings only on the console
+   python src/ui/interface.py --metrics-port 9464  # Prometheus text on /metrics
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+import gradio as gr
+from agents import RunConfig
+from loguru import logger
+
+# Add src to the system path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from chatbot.context import AgendaContext
+from chatbot.conversations import DEFAULT_CONVERSATIONS_PATH, ConversationStore
+from chatbot.openai_client import shared_model_provider
+from chatbot.pipeline import stream_agenda_query
+from database.events import data_version
+from database.registry import database_registry
+from ui.dashboard import dashboard_cache, render_heatmap, render_lists
+
+PROGRESS_TEMPLATES = {
+    "handoff": "🔀 {agent} → {text}",
+    "tool_call": "🔧 {text}",
+}
+
+
+async def stream_reply(message: str, show_progress: bool = True, **kwargs) -> AsyncIterator[str]:
+    """
+    Yield the message to display after every pipeline event.
+
+    Args:
+    - message (str): User request.
+    - show_progress (bool): Prepend handoff and tool call lines to the answer.
+    - **kwargs: Extra arguments for stream_agenda_query().
+
+    Yields:
+    - str: Full text to display so far (progress lines followed by the partial answer).
+    """
+    progress: list[str] = []
+    answer = ""
+    async for event in stream_agenda_query(message, **kwargs):
+        if event.kind == "text":
+            answer += event.text
+        elif event.kind == "agent":
+            # A new agent starts a new answer; earlier text was intermediate
+            answer = ""
+            continue
+        elif event.kind == "final":
+            answer = event.text
+        elif show_progress and event.kind in PROGRESS_TEMPLATES:
+            progress.append(PROGRESS_TEMPLATES[event.kind].format(agent=event.agent, text=event.text))
+        else:
+            continue
+
+        header = "\n".join(progress)
+        yield f"{header}\n\n{answer}" if header else answer
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+
+
+@dataclass
+class ChatSession:
+    """
+    State of one browser session
+
+    Fields:
+    - user_id: Identifies the session for the pipeline (AgendaContext.user)
+    - conversation_id: Current conversation, used as trace group id
+    - turns: Messages sent in the current conversation
+    """
+    user_id: str = field(default_factory=lambda: _new_id("user"))
+    conversation_id: str = field(default_factory=lambda: _new_id("conv"))
+    turns: int = 0
+
+    def new_conversation(self) -> None:
+        self.conversation_id = _new_id("conv")
+        self.turns = 0
+
+
+@dataclass
+class UIConfig:
+    """
+    Settings of the chat app
+
+    Fields:
+    - concurrency_limit: Chat requests processed at the same time
+    - max_queue_size: Requests allowed to wait in the queue (more are rejected)
+    - database: Name of the target database in database.registry (None for the default one)
+    - run_config: Base run configuration (None for the shared pooled OpenAI client)
+    - show_progress: Show handoff and tool call lines above the answer
+    - dashboard_refresh_s: Seconds between checks of the agenda tab for changes
+    - conversations: Store of the conversation histories (None: every message stands alone)
+    """
+    concurrency_limit: int = 8
+    max_queue_size: int = 64
+    database: Optional[str] = None
+    run_config: Optional[RunConfig] = None
+    show_progress: bool = True
+    dashboard_refresh_s: float = 5.0
+    conversations: Optional[ConversationStore] = None
+
+    def run_config_for(self, session: ChatSession) -> RunConfig:
+        """
+        Run configuration of a request: the base one, grouped by conversation
+        """
+        base = self.run_config or RunConfig(model_provider=shared_model_provider())
+        return replace(base, group_id=session.conversation_id)
+
+
+async def respond(
+    message: str,
+    history: Optional[list[dict]],
+    session: Optional[ChatSession],
+    config: UIConfig,
+) -> AsyncIterator[tuple[list[dict], ChatSession, str]]:
+    """
+    Chat handler: stream the answer to a message into the history.
+
+    Args:
+    - message (str): User message.
+    - history (Optional[list[dict]]): Chat history in Gradio "messages" format.
+    - session (Optional[ChatSession]): State of the browser session (created on the first message).
+    - config (UIConfig): App settings.
+
+    Yields:
+    - tuple[list[dict], ChatSession, str]: Updated history, session and the new (empty) textbox value.
+    """
+    session = session or ChatSession()
+    history = list(history or [])
+    message = (message or "").strip()
+    if not message:
+        yield history, session, ""
+        return
+
+    session.turns += 1
+    history += [{"role": "user", "content": message}, {"role": "assistant", "content": "⏳"}]
+    yield history, session, ""
+
+    context = AgendaContext(database=config.database, user=session.user_id)
+    try:
+        async for text in stream_reply(
+            message,
+            show_progress=config.show_progress,
+            context=context,
+            run_config=config.run_config_for(session),
+            session=config.conversations.session(session.conversation_id) if config.conversations else None,
+        ):
+            history = history[:-1] + [{"role": "assistant", "content": text}]
+            yield history, session, ""
+    except Exception as e:
+        logger.error(f"❌ Error answering {session.conversation_id}: {e}")
+        history = history[:-1] + [{"role": "assistant", "content": f"❌ Error: {e}"}]
+        yield history, session, ""
+
+
+def new_conversation(session: Optional[ChatSession]) -> tuple[list[dict], ChatSession]:
+    """
+    Clear the chat and start a new conversation id (same user)
+    """
+    session = session or ChatSession()
+    session.new_conversation()
+    return [], session
+
+
+def refresh_dashboard(last_key: Optional[tuple], config: UIConfig) -> tuple:
+    """
+    Agenda tab update: new HTML only if the tasks or the current minute changed.
+
+    Args:
+    - last_key (Optional[tuple]): Key of what this browser session shows.
+    - config (UIConfig): App settings (target database).
+
+    Returns:
+    - tuple: Lists HTML, heatmap HTML (gr.skip() when unchanged) and the new key.
+    """
+    database_url = database_registry.resolve(config.database)
+    now = datetime.now().replace(second=0, microsecond=0)
+    # Compared before building anything: most ticks of most browsers stop here
+    key = (database_url, data_version(database_url), now.strftime("%Y-%m-%d %H:%M"))
+    if key == last_key:
+        return gr.skip(), gr.skip(), last_key
+    snapshot = dashboard_cache.snapshot(database_url, now)
+    return render_lists(snapshot), render_heatmap(snapshot), (database_url, snapshot["version"], key[2])
+
+
+def build_interface(config: UIConfig = UIConfig()) -> gr.Blocks:
+    """
+    Build the Gradio app.
+
+    Args:
+    - config (UIConfig): Queue, database and model settings.
+
+    Returns:
+    - gr.Blocks: The app, with its queue configured. Start it with .launch().
+    """
+
+    async def on_message(message, history, session):
+        async for update in respond(message, history, session, config):
+            yield update
+
+    def on_refresh(last_key):
+        return refresh_dashboard(last_key, config)
+
+    with gr.Blocks(title="AIgenda") as demo:
+        gr.Markdown("# 🗓️ AIgenda\nManage your tasks in natural language (English or Spanish).")
+        session = gr.State(None)
+        dashboard_key = gr.State(None)
+        with gr.Tabs():
+            with gr.Tab("💬 Chat"):
+                chatbot = gr.Chatbot(type="messages", height=480, label="AIgenda")
+                with gr.Row():
+                    textbox = gr.Textbox(placeholder="Crea una tarea para mañana: comprar leche", show_label=False, scale=8)
+                    send = gr.Button("Send", variant="primary", scale=1)
+                clear = gr.Button("🆕 New conversation")
+            with gr.Tab("🗓️ Agenda"):
+                agenda_lists = gr.HTML()
+                agenda_heatmap = gr.HTML()
+                refresh = gr.Button("🔄 Refresh")
+        timer = gr.Timer(config.dashboard_refresh_s)
+
+        chat_io = dict(fn=on_message, inputs=[textbox, chatbot, session], outputs=[chatbot, session, textbox],
+                       concurrency_limit=config.concurrency_limit, concurrency_id="chat")
+        dashboard_io = dict(fn=on_refresh, inputs=[dashboard_key], outputs=[agenda_lists, agenda_heatmap, dashboard_key],
+                            concurrency_id="dashboard", api_name=False, show_progress="hidden")
+        # Chat edits show up in the agenda right after the answer
+        textbox.submit(api_name="chat", **chat_io).then(**dashboard_io)
+        send.click(api_name=False, **chat_io).then(**dashboard_io)
+        clear.click(new_conversation, inputs=[session], outputs=[chatbot, session], queue=False, api_name=False)
+        demo.load(**dashboard_io)
+        timer.tick(**dashboard_io)
+        refresh.click(**{**dashboard_io, "inputs": [], "fn": lambda: on_refresh(None)})
+
+    demo.queue(max_size=config.max_queue_size, default_concurrency_limit=config.concurrency_limit)
+    return demo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AIgenda chat interface")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=7860, help="Port to listen on")
+    parser.add_argument("--concurrency", type=int, default=8, help="Chat requests processed at the same time")
+    parser.add_argument("--queue-size", type=int, default=64, help="Requests allowed to wait in the queue")
+    parser.add_argument("--offline", action="store_true", help="Use the scripted offline model instead of the OpenAI API")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Synthetic time to first token of the offline model")
+    parser.add_argument("--no-progress", action="store_true", help="Hide handoff and tool call lines")
+    parser.add_argument("--history-db", default=DEFAULT_CONVERSATIONS_PATH, help="SQLite store of the conversation histories")
+    parser.add_argument("--no-history", action="store_true", help="Answer every message without the earlier turns")
+    parser.add_argument("--reminders", action="store_true", help="Log and show desktop notifications when tasks become due")
+    parser.add_argument("--reminder-lead", type=float, default=0.0, help="Minutes before the due date to remind")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", default=None, help="Write Prometheus metrics to this file every 15 s")
+    parser.add_argument("--json-logs", action="store_true", help="Production logging: JSON lines in logs/app.jsonl written in the background")
+    args = parser.parse_args()
+
+    if args.json_logs:
+        from utils.logger import production_logs_config
+        production_logs_config(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    run_config = None
+    if args.offline:
+        from chatbot.mock_model import LatencyProfile, offline_run_config
+        run_config = offline_run_config(latency=LatencyProfile(first_token_ms=args.latency_ms))
+
+    config = UIConfig(
+        concurrency_limit=args.concurrency,
+        max_queue_size=args.queue_size,
+        run_config=run_config,
+        show_progress=not args.no_progress,
+        conversations=None if args.no_history else ConversationStore(args.history_db),
+    )
+    scheduler = None
+    if args.reminders:
+        # Same process as the chat: tasks it creates reach the scheduler through the change events
+        from reminders import DesktopSink, LogSink, ReminderScheduler
+        scheduler = ReminderScheduler([LogSink(), DesktopSink()], lead=timedelta(minutes=args.reminder_lead)).start()
+
+    from utils.metrics import MetricsDumper, metrics, serve_metrics
+    metrics_server = serve_metrics(metrics, args.metrics_port) if args.metrics_port is not None else None
+    dumper = MetricsDumper(metrics, args.metrics_file).start() if args.metrics_file else None
+
+    logger.info(f"🚀 Starting AIgenda UI on {args.host}:{args.port} (concurrency={args.concurrency})")
+    try:
+        build_interface(config).launch(server_name=args.host, server_port=args.port)
+    finally:
+        if scheduler is not None:
+            scheduler.stop()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if dumper is not None:
+            dumper.stop()
+
+
+if __name__ == "__main__":
+    main()
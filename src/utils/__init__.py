@@ -2,6 +2,8 @@
 Shared utility fucntions for the project.
 """
 
-from .logger import logs_config
+from .logger import debug_sampler, logs_config, production_logs_config
+from .metrics import MetricsRegistry, metrics
+from .stats import LatencyHistogram, percentile, summarize_latencies
 
-__all__ = ["logs_config"]
\ No newline at end of file
+__all__ = ["debug_sampler", "logs_config", "production_logs_config", "LatencyHistogram", "MetricsRegistry", "metrics", "percentile", "summarize_latencies"]
\ No newline at end of file
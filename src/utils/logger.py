@@ -1,17 +1,44 @@
 """
 Module to configure logging using loguru.
 This module sets up loguru to log messages to both the console and a file.
+
+Two profiles:
+   - logs_config(): development, readable lines on the console and in a
+     rotating file, written synchronously, DEBUG included.
+   - production_logs_config(): a JSON lines file written by a background
+     thread (BackgroundJsonSink), so callers never wait on the disk; the
+     operation, duration_ms and rows of the database operations are fields of
+     each record. Warnings only on the console, and only one DEBUG record out
+     of every `debug_sample_every` is kept.
+
+loguru's own enqueue=True goes through a multiprocessing queue: it is meant
+for several processes sharing a file and costs the caller more than a direct
+file write (benchmarks/logging_overhead.py), so the production profile only
+uses it on request.
+
+Usage Example:
+   from utils.logger import production_logs_config
+
+   production_logs_config(root_project, "app.jsonl", debug_sample_every=100)
 """
 
+import itertools
+import json
+import queue
 import sys
 import os
+import threading
+from typing import Callable
 from loguru import logger
 
+DEBUG_LEVEL_NO = logger.level("DEBUG").no
+INFO_LEVEL_NO = logger.level("INFO").no
+
 
 def logs_config(root_project:str, file_name:str ="app.log"):
     """
     configure loguru with the correct paths
-   
+
     Args:
     - root_project (str): Root path of the project
     - file_name (str): Name of the lof file (default "app.log")
@@ -27,4 +54,135 @@ def logs_config(root_project:str, file_name:str ="app.log"):
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}",
         level="DEBUG",
         rotation="1 MB"
-    )
\ No newline at end of file
+    )
+
+
+def debug_sampler(every: int) -> Callable[[dict], bool]:
+    """
+    Sink filter that keeps one DEBUG (or TRACE) record out of `every`; other levels always pass
+
+    Args:
+    - every (int): Sampling period. 1 keeps every record.
+    """
+    counter = itertools.count()
+
+    def keep(record) -> bool:
+        if record["level"].no >= INFO_LEVEL_NO:
+            return True
+        return next(counter) % every == 0
+
+    return keep
+
+
+class BackgroundJsonSink:
+    """
+    loguru sink that hands the records to a writer thread, which appends them to a file as JSON lines
+
+    Each line has time, level and message plus the extra fields of the record
+    (bound or passed as keyword arguments). The file is rotated when it grows
+    past max_bytes, keeping `backups` old files (app.jsonl.1 is the newest).
+
+    Args:
+    - path (str): Path of the log file.
+    - max_bytes (int): Size that triggers a rotation.
+    - backups (int): Rotated files kept.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message) -> None:
+        # Called by loguru on the logging thread: only a queue put
+        self._queue.put(message.record)
+
+    @staticmethod
+    def to_json(record: dict) -> str:
+        line = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            **record["extra"],
+        }
+        if record["exception"] is not None:
+            line["exception"] = repr(record["exception"].value)
+        return json.dumps(line, ensure_ascii=False, default=str)
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            lines = [self.to_json(record)]
+            # Write whatever else is already waiting in one go
+            while True:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._queue.put(None)
+                    break
+                lines.append(self.to_json(record))
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def stop(self) -> None:
+        """
+        Write the pending records and close the file (called by logger.remove())
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+
+def production_logs_config(
+    root_project: str,
+    file_name: str = "app.jsonl",
+    level: str = "INFO",
+    debug_sample_every: int = 100,
+    console_level: str = "WARNING",
+    enqueue: bool = False,
+):
+    """
+    configure loguru for production: background JSON lines file and a quiet console
+
+    Args:
+    - root_project (str): Root path of the project
+    - file_name (str): Name of the JSON lines log file (default "app.jsonl")
+    - level (str): Minimum level written to the file. "DEBUG" enables the sampled debug records.
+    - debug_sample_every (int): Keep one DEBUG record out of this many.
+    - console_level (str): Minimum level shown on the console.
+    - enqueue (bool): Use loguru's multiprocessing queue instead (several processes writing the same file).
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
+        level=console_level,
+    )
+    path = os.path.join(root_project, "logs", file_name)
+    sampler = debug_sampler(debug_sample_every) if logger.level(level).no <= DEBUG_LEVEL_NO else None
+    if enqueue:
+        logger.add(path, level=level, serialize=True, enqueue=True, filter=sampler, rotation="50 MB", retention=5)
+    else:
+        logger.add(BackgroundJsonSink(path), level=level, format="{message}", filter=sampler)
@@ -0,0 +1,227 @@
+"""
+In-process metrics registry with Prometheus text output
+
+Counters and fixed-bucket histograms (utils.stats.LatencyHistogram) kept in
+memory, identified by a metric name and a tuple of label values. Recording
+is a dictionary lookup and an increment under a lock (about a microsecond),
+so it can stay on in production. No external service is needed to read them:
+   - render_prometheus(): the Prometheus text exposition format
+   - write_prometheus(path): the same text written atomically to a file
+     (node_exporter's textfile collector can pick it up), also periodically
+     with MetricsDumper
+   - serve_metrics(port): a stdlib HTTP server answering GET /metrics
+
+Usage Example:
+   from utils.metrics import metrics
+
+   metrics.describe("jobs_total", "counter", "Jobs processed", ("queue",))
+   metrics.inc("jobs_total", ("emails",))
+   metrics.observe("job_duration_ms", 12.5, ("emails",))
+   print(metrics.render_prometheus())
+"""
+
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+from .stats import DEFAULT_BUCKETS_MS, LatencyHistogram
+
+PREFIX = "aigenda_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms, labelled by position
+
+    Args:
+    - prefix (str): Prepended to every metric name in the exposition.
+    """
+
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        # name -> (type, help, label names, buckets)
+        self._meta: dict[str, tuple[str, str, tuple[str, ...], Sequence[float]]] = {}
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def describe(
+        self,
+        name: str,
+        kind: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS_MS,
+    ) -> None:
+        """
+        Declare a metric (its type, help text and label names) for the exposition
+
+        Args:
+        - name (str): Metric name without the prefix.
+        - kind (str): "counter" or "histogram".
+        - help (str): One-line description.
+        - labels (Sequence[str]): Names of the label values passed when recording.
+        - buckets (Sequence[float]): Histogram bucket upper bounds.
+        """
+        if kind not in ("counter", "histogram"):
+            raise ValueError(f"Unknown metric type: {kind}")
+        self._meta[name] = (kind, help, tuple(labels), tuple(buckets))
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1.0) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: tuple = ()) -> None:
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                meta = self._meta.get(name)
+                histogram = self._histograms[key] = LatencyHistogram(meta[3] if meta else DEFAULT_BUCKETS_MS)
+            histogram.observe(value)
+
+    def counter(self, name: str, labels: tuple = ()) -> float:
+        with self._lock:
+            return self._counters.get((name, labels), 0.0)
+
+    def histogram(self, name: str, labels: tuple = ()) -> Optional[LatencyHistogram]:
+        with self._lock:
+            return self._histograms.get((name, labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _labels(self, name: str, values: tuple, extra: str = "") -> str:
+        names = self._meta[name][2] if name in self._meta else tuple(f"label{i}" for i in range(len(values)))
+        pairs = [f'{label}="{_escape(value)}"' for label, value in zip(names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render_prometheus(self) -> str:
+        """
+        Every metric in the Prometheus text exposition format
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (tuple(h.counts), h.count, h.total, h.buckets)) for key, h in self._histograms.items()
+            )
+
+        lines: list[str] = []
+        described: set[str] = set()
+
+        def header(name: str, kind: str) -> None:
+            if name in described:
+                return
+            described.add(name)
+            help_text = self._meta[name][1] if name in self._meta else name
+            lines.append(f"# HELP {self.prefix}{name} {_escape(help_text)}")
+            lines.append(f"# TYPE {self.prefix}{name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{self.prefix}{name}{self._labels(name, labels)} {_format_value(value)}")
+
+        for (name, labels), (counts, count, total, buckets) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + [math.inf], counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.prefix}{name}_bucket{self._labels(name, labels, le)} {cumulative}")
+            lines.append(f"{self.prefix}{name}_sum{self._labels(name, labels)} {_format_value(total)}")
+            lines.append(f"{self.prefix}{name}_count{self._labels(name, labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the exposition to a file, replacing it atomically
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temporary, path)
+
+
+class MetricsDumper:
+    """
+    Background thread that writes the registry to a file every interval_s seconds (and once on stop)
+
+    Args:
+    - registry (MetricsRegistry): Metrics to dump.
+    - path (str): Target file (e.g. logs/metrics.prom).
+    - interval_s (float): Seconds between dumps.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval_s: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dumper", daemon=True)
+
+    def start(self) -> "MetricsDumper":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.registry.write_prometheus(self.path)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.registry.write_prometheus(self.path)
+
+
+def serve_metrics(registry: "MetricsRegistry", port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics from a daemon thread; call shutdown() on the returned server to stop it
+
+    Args:
+    - registry (MetricsRegistry): Metrics to expose.
+    - port (int): Port to listen on (0 picks a free one, see server.server_address).
+    - host (str): Address to listen on.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,105 @@
+"""
+Small statistics helpers for latency reports (no numpy required)
+"""
+
+import bisect
+import math
+from typing import Iterable, Sequence
+
+# Upper bounds (ms) of the latency histogram buckets, roughly 2.5x apart
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks
+
+    Args:
+    - values (Sequence[float]): Samples (any order).
+    - q (float): Percentile between 0 and 100.
+
+    Returns:
+    - float: The percentile, or NaN for an empty sample.
+    """
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_latencies(values: Iterable[float]) -> dict:
+    """
+    Count, mean, max and p50/p95/p99 of a latency sample (same unit as the input)
+    """
+    samples = list(values)
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram: constant memory and O(log buckets) per sample, for
+    latencies recorded on hot paths where keeping every sample is too costly
+
+    Not thread-safe on its own: callers that share one serialize observe().
+
+    Args:
+    - buckets (Sequence[float]): Upper bounds of the buckets; larger values go to an overflow bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated percentile (0-100), interpolated inside its bucket; NaN when empty
+        """
+        if not self.count:
+            return math.nan
+        rank = self.count * q / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.buckets[index - 1] if index > 0 else 0.0
+                high = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(low + (high - low) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict:
+        """
+        Same keys as summarize_latencies(), from the buckets
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "p50": self.quantile(50),
+            "p95": self.quantile(95),
+            "p99": self.quantile(99),
+            "max": self.max,
+        }
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from database.models import create_database, get_session, Base # type: ignore
+from database.models import create_database, dispose_engine, get_session, Base # type: ignore
 
 
 @pytest.fixture(scope='function')
@@ -32,7 +32,8 @@ def test_db():
 
     yield db_url
 
-    # Clean up the temporary database 
+    # Clean up the temporary database (and the engines pooling connections to it)
+    dispose_engine(db_url)
     try:
         import time
         time.sleep(0.1)  
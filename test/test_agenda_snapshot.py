@@ -0,0 +1,138 @@
+"""
+Unit tests for the agenda_snapshot operation
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+from agents import ToolCallItem
+from sqlalchemy import event
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.mock_model import offline_run_config  # type: ignore
+from chatbot.pipeline import run_agenda_query  # type: ignore
+from database.models import Tarea, get_engine, get_session, use_database  # type: ignore
+from database.operations import agenda_snapshot  # type: ignore
+
+
+def _add_tasks(database_url, *due_dates):
+    session = get_session(database_url)
+    session.add_all([
+        Tarea(title=f"Task {index}", description="", due_date=due_date)
+        for index, due_date in enumerate(due_dates, start=1)
+    ])
+    session.commit()
+    session.close()
+
+
+def test_agenda_snapshot_empty_database(test_db):
+    """
+    Test the snapshot of an empty database
+    Should return empty groups and zero counts
+    """
+    result = agenda_snapshot(days=7, database_url=test_db)
+
+    assert result == {
+        "overdue": [],
+        "today": [],
+        "upcoming": [],
+        "counts": {"overdue": 0, "today": 0, "upcoming": 0},
+        "days": 7,
+    }
+
+
+def test_agenda_snapshot_groups_tasks(test_db):
+    """
+    Test that tasks are split into overdue, today and upcoming
+    Tasks beyond the window are left out
+    """
+    now = datetime.now()
+    end_of_today = datetime.combine(date.today(), datetime.max.time()).replace(microsecond=0)
+    _add_tasks(
+        test_db,
+        now - timedelta(days=3),   # overdue
+        now - timedelta(minutes=1),  # overdue
+        end_of_today,              # today
+        now + timedelta(days=2),   # upcoming
+        now + timedelta(days=30),  # outside the window
+    )
+
+    result = agenda_snapshot(days=7, database_url=test_db)
+
+    assert result["counts"] == {"overdue": 2, "today": 1, "upcoming": 1}
+    assert [task["title"] for task in result["overdue"]] == ["Task 2", "Task 1"]
+    assert [task["title"] for task in result["today"]] == ["Task 3"]
+    assert [task["title"] for task in result["upcoming"]] == ["Task 4"]
+    assert set(result["upcoming"][0]) == {"id", "title", "due_date"}
+
+
+def test_agenda_snapshot_limit_keeps_exact_counts(test_db):
+    """
+    Test that the limit truncates the lists but not the counts
+    """
+    now = datetime.now()
+    _add_tasks(test_db, *[now + timedelta(days=1, minutes=minutes) for minutes in range(5)])
+
+    result = agenda_snapshot(days=3, limit=2, database_url=test_db)
+
+    assert result["counts"]["upcoming"] == 5
+    assert len(result["upcoming"]) == 2
+
+
+@pytest.mark.parametrize("days", [-1, "7", 1.5])
+def test_agenda_snapshot_invalid_days(test_db, days):
+    """
+    Test that invalid days are rejected
+    """
+    with pytest.raises(ValueError):
+        agenda_snapshot(days=days, database_url=test_db)
+
+
+def test_overview_question_takes_one_tool_call(test_db):
+    """
+    Test that an overview question is answered with a single agenda_snapshot call
+    """
+    _add_tasks(test_db, datetime.now() - timedelta(days=1))
+
+    async def scenario():
+        with use_database(test_db):
+            return await run_agenda_query(
+                "What do I have coming up, and is anything overdue?",
+                run_config=offline_run_config(),
+                cache=None,
+            )
+
+    result = asyncio.run(scenario())
+    tool_calls = [item for item in result.run_result.new_items if isinstance(item, ToolCallItem)]
+
+    assert [item.raw_item.name for item in tool_calls] == ["agenda_snapshot"]
+    assert result.final_output.startswith("✅")
+
+
+def test_agenda_snapshot_reads_only_the_listed_rows(test_db):
+    """
+    Test that a long overdue history is counted in SQL and only `limit` rows per group are read
+    """
+    now = datetime.now()
+    _add_tasks(test_db, *[now - timedelta(days=400 - day) for day in range(300)])
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine(test_db)
+    event.listen(engine, "after_cursor_execute", record_statement)
+    try:
+        result = agenda_snapshot(days=7, limit=5, database_url=test_db)
+    finally:
+        event.remove(engine, "after_cursor_execute", record_statement)
+
+    assert result["counts"]["overdue"] == 300
+    assert [task["title"] for task in result["overdue"]] == [f"Task {n}" for n in range(300, 295, -1)]
+    assert sum("LIMIT" in statement for statement in statements) == 3
+    assert all("tareas.description" not in statement for statement in statements)
@@ -0,0 +1,68 @@
+"""
+Unit tests for the lazily built agents and the hot reload of their prompts
+"""
+
+import os
+import sys
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.agent_agenda import AgentFactory  # type: ignore
+from chatbot.prompt_registry import DYNAMIC_HEADER, PromptRegistry, agenda_prompts  # type: ignore
+
+
+def _registry(tmp_path, reload_interval_s=None) -> PromptRegistry:
+    for name in ("translator", "dateParser", "database"):
+        (tmp_path / f"{name}_prompt.txt").write_text(f"You are the {name} agent.", encoding="utf-8")
+    return agenda_prompts(str(tmp_path), reload_interval_s=reload_interval_s)
+
+
+def test_agents_are_built_on_first_use_and_cached(tmp_path):
+    factory = AgentFactory(_registry(tmp_path))
+
+    assert not any(factory.is_built(name) for name in factory.names())
+    translator = factory.get("translator")
+
+    assert factory.get("translator") is translator
+    # The handoff targets are built on the way and shared with the other agents
+    assert factory.is_built("date_parser") and factory.is_built("database")
+    assert not factory.is_built("translator_direct")
+    assert translator.handoffs[0] is factory.get("date_parser")
+    assert factory.get("translator_direct").handoffs[0] is factory.get("database")
+
+
+def test_reload_picks_up_edited_prompts_without_rebuilding(tmp_path):
+    registry = _registry(tmp_path)
+    factory = AgentFactory(registry)
+    agent = factory.get("database")
+    assert registry.render("database").startswith("You are the database agent.")
+
+    (tmp_path / "database_prompt.txt").write_text("Edited database prompt.", encoding="utf-8")
+    os.utime(tmp_path / "database_prompt.txt", (0, 0))
+    assert registry.reload_if_changed()
+
+    assert factory.get("database") is agent
+    rendered = agent.instructions(None, agent)
+    assert rendered.startswith("Edited database prompt." + DYNAMIC_HEADER)
+    assert not registry.reload_if_changed()
+
+
+def test_auto_reload_checks_the_files_when_rendering(tmp_path):
+    registry = _registry(tmp_path, reload_interval_s=0)
+    assert "translator agent" in registry.get("translator_direct").static
+
+    (tmp_path / "translator_prompt.txt").write_text("New translator.", encoding="utf-8")
+    os.utime(tmp_path / "translator_prompt.txt", (0, 0))
+
+    assert registry.get("translator_direct").static.startswith("New translator.")
+    assert registry.reloads == 1
+
+
+def test_prompt_files_are_read_lazily_and_package_relative(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = agenda_prompts()  # default directory, from an unrelated working directory
+
+    assert registry._templates == {}
+    assert registry.get("database").static.strip()
+    assert list(registry._templates) == ["database"]
@@ -0,0 +1,174 @@
+"""
+Unit tests for the record/replay cassettes of model traffic
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents import Agent, ModelProvider, Runner, function_tool  # type: ignore
+
+from chatbot.cassettes import (  # type: ignore
+    Cassette,
+    CassetteMiss,
+    CassetteModelProvider,
+    StaleCassette,
+    cassette_run_config,
+    current_instruction_hashes,
+    input_hash,
+    instructions_hash,
+    stale_entries,
+)
+from chatbot.mock_model import ScriptedModelProvider, ScriptedToolCall, ScriptedTurn, agenda_script  # type: ignore
+from chatbot.pipeline import run_agenda_query, stream_agenda_query  # type: ignore
+from database.models import create_database, use_database  # type: ignore
+
+
+@function_tool
+def add(a: int, b: int) -> int:
+    """
+    Add two numbers
+    """
+    return a + b
+
+
+calculator = Agent(name="Calculator", instructions="Add numbers", tools=[add])
+router = Agent(name="Router", instructions="Route", handoffs=[calculator])
+
+SCRIPT = {
+    "Router": [ScriptedTurn(handoff="Calculator")],
+    "Calculator": [
+        ScriptedTurn(tool_calls=(ScriptedToolCall("add", {"a": 2, "b": 3}),)),
+        ScriptedTurn(text="The result is 5"),
+    ],
+}
+
+
+def record(path):
+    """
+    Record a run of the scripted model into a cassette file
+    """
+    cassette = Cassette(str(path))
+    run_config = cassette_run_config(cassette, "record", inner_provider=ScriptedModelProvider(SCRIPT))
+    result = asyncio.run(Runner.run(router, "add 2 and 3", run_config=run_config))
+    cassette.save()
+    return result
+
+
+def test_hashes_ignore_dates_and_ids():
+    """
+    Test that dates and call ids do not change the cassette key
+    """
+    assert instructions_hash("Today is 2025-06-07 (Saturday)") == instructions_hash("Today is 2025-06-09 (Monday)")
+    assert instructions_hash("Today is 2025-06-07") != instructions_hash("Hoy es 2025-06-07")
+
+    first = [{"role": "user", "content": "buy milk"}, {"type": "function_call", "name": "create_task", "call_id": "call_1", "arguments": '{"due_date": "2025-06-08 09:00:00"}'}]
+    second = [{"role": "user", "content": "buy milk"}, {"type": "function_call", "name": "create_task", "call_id": "call_9", "arguments": '{"due_date": "2025-06-10 09:00:00"}'}]
+    assert input_hash(first) == input_hash(second)
+
+
+def test_record_then_replay(tmp_path):
+    """
+    Test that a replay returns the recorded responses without the real model
+    """
+    path = tmp_path / "cassette.json"
+    recorded = record(path)
+
+    cassette = Cassette(str(path))
+    replayed = asyncio.run(Runner.run(router, "add 2 and 3", run_config=cassette_run_config(cassette)))
+
+    assert len(cassette) == 3
+    assert replayed.final_output == recorded.final_output == "The result is 5"
+    assert replayed.last_agent.name == "Calculator"
+    assert sum(r.usage.output_tokens for r in replayed.raw_responses) == sum(r.usage.output_tokens for r in recorded.raw_responses)
+
+
+def test_replay_miss_and_stale_prompt(tmp_path):
+    """
+    Test that unknown calls miss and changed prompts are reported as stale
+    """
+    path = tmp_path / "cassette.json"
+    record(path)
+    cassette = Cassette(str(path))
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(Runner.run(router, "add 4 and 5", run_config=cassette_run_config(cassette)))
+
+    changed_router = router.clone(instructions="Route every request")
+    with pytest.raises(StaleCassette):
+        asyncio.run(Runner.run(changed_router, "add 2 and 3", run_config=cassette_run_config(cassette)))
+
+
+def test_diff_mode_lists_stale_entries(tmp_path):
+    """
+    Test stale_entries against the current instructions of the agents
+    """
+    path = tmp_path / "cassette.json"
+    record(path)
+    cassette = Cassette(str(path))
+
+    assert stale_entries(cassette, asyncio.run(current_instruction_hashes([router, calculator]))) == []
+
+    changed_calculator = calculator.clone(instructions="Add numbers carefully")
+    stale = stale_entries(cassette, asyncio.run(current_instruction_hashes([router, changed_calculator])))
+    assert {entry.agent_name for entry in stale} == {"Calculator"}
+    assert len(stale) == 2
+
+
+def test_agenda_replay_on_a_fresh_database(tmp_path):
+    """
+    Test a recorded agenda scenario replayed (also streamed) on a new database
+    """
+    path = tmp_path / "cassette.json"
+    queries = ["Crea una tarea para mañana: comprar leche", "Show me all my tasks"]
+
+    async def run(run_config, database_url):
+        create_database(database_url)
+        with use_database(database_url):
+            return [(await run_agenda_query(q, run_config=run_config, cache=None)).final_output for q in queries]
+
+    cassette = Cassette(str(path))
+    record_config = cassette_run_config(cassette, "record", inner_provider=ScriptedModelProvider(agenda_script()))
+    recorded = asyncio.run(run(record_config, f"sqlite:///{tmp_path / 'recorded.db'}"))
+    cassette.save()
+
+    replay_config = cassette_run_config(Cassette(str(path)))
+    replayed = asyncio.run(run(replay_config, f"sqlite:///{tmp_path / 'replayed.db'}"))
+
+    assert [output[0] for output in replayed] == [output[0] for output in recorded] == ["✅", "✅"]
+    assert "comprar leche" in replayed[1]
+
+    async def stream():
+        database_url = f"sqlite:///{tmp_path / 'streamed.db'}"
+        create_database(database_url)
+        with use_database(database_url):
+            return [event async for event in stream_agenda_query(queries[0], run_config=replay_config, cache=None)]
+
+    events = asyncio.run(stream())
+    assert any(event.kind == "text" for event in events)
+    assert events[-1].kind == "final"
+
+
+def test_models_are_built_per_event_loop():
+    """
+    Test that a provider reused across asyncio.run calls does not hand out models of a closed loop
+    """
+    class LoopBoundProvider(ModelProvider):
+        def get_model(self, model_name):
+            return ScriptedModelProvider(SCRIPT).get_model(model_name)
+
+    provider = CassetteModelProvider(Cassette(None), "record", inner_provider=LoopBoundProvider())
+
+    async def models():
+        return provider.get_model("m"), provider.get_model("m")
+
+    first, same_loop = asyncio.run(models())
+    second, _ = asyncio.run(models())
+
+    assert first is same_loop
+    assert second is not first and second.inner is not first.inner
@@ -0,0 +1,142 @@
+"""
+Unit tests for the SQLite conversation sessions
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.conversations import ConversationStore, resolve_task_reference, tasks_in_output  # type: ignore
+from chatbot.mock_model import offline_run_config  # type: ignore
+from chatbot.pipeline import run_agenda_query_sync  # type: ignore
+from database import operations  # type: ignore
+from database.models import use_database  # type: ignore
+
+TASKS = [{"id": 4, "title": "Buy milk"}, {"id": 9, "title": "Call mom"}, {"id": 12, "title": "Pay rent"}]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ConversationStore(str(tmp_path / "conversations.db"), history_budget=60, summary_budget=40)
+    yield store
+    store.close()
+
+
+def test_window_keeps_recent_turns_and_compacts_the_rest(store):
+    """
+    Test that old turns are folded into the summary and the window stays within budget
+    """
+    session = store.session("conv")
+    for i in range(20):
+        session.add_turn(f"Question number {i} about my agenda", f"Answer number {i} with some details")
+
+    window = session.window()
+    stats = store.stats("conv")
+
+    assert window.turns[-1].user == "Question number 19 about my agenda"
+    # The latest compacted turn is in the summary, the oldest ones fell off its budget
+    assert f"Question number {stats['compacted_turns'] - 1} " in window.summary
+    assert "Question number 0 " not in window.summary
+    assert window.tokens <= store.history_budget + store.summary_budget
+    assert stats["stored_tokens"] <= store.history_budget
+    assert stats["compacted_turns"] + stats["stored_turns"] == 20
+
+
+def test_sessions_are_isolated_and_persistent(store, tmp_path):
+    store.session("a").add_turn("Show my tasks", "✅ Found 3 tasks", [("get_all_tasks", TASKS)])
+    store.session("b").add_turn("Hello", "💬 Hi")
+
+    reopened = ConversationStore(store.path)
+    try:
+        window = reopened.session("a").window()
+        assert [turn.user for turn in window.turns] == ["Show my tasks"]
+        assert [task["id"] for task in window.recent_tasks] == [4, 9, 12]
+        assert reopened.session("b").window().recent_tasks == []
+    finally:
+        reopened.close()
+
+    store.session("a").clear()
+    assert store.session("a").window().is_empty
+
+
+def test_only_the_latest_tool_results_are_kept(store):
+    session = store.session("conv")
+    for i in range(8):
+        session.add_turn("Show my tasks", "✅", [("get_all_tasks", [{"id": i, "title": f"Task {i}"}])])
+
+    rows = store._connection.execute("SELECT COUNT(*) FROM tool_results").fetchone()[0]
+    assert rows == store.max_tool_results
+    assert session.window().recent_tasks[0]["id"] == 7
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Delete the second one", 9),
+    ("Borra la segunda", 9),
+    ("delete the last one", 12),
+    ("Elimina la última tarea", 12),
+    ("Show me the 1st task", 4),
+    ("Delete task 2", None),
+    ("Delete the fifth one", None),
+    ("Show me all my tasks", None),
+    ("Borra la número 3", 12),
+    ("Delete the second one please", 9),
+    ("Quita el primero de la lista", 4),
+    ("Remind me first thing tomorrow to call mom", None),
+    ("What did I have last week?", None),
+    ("Remind me about the last reminder", None),
+    ("Muéstrame la última semana", None),
+])
+def test_ordinal_references(query, expected):
+    task = resolve_task_reference(query, TASKS)
+
+    assert (task["id"] if task else None) == expected
+
+
+def test_references_only_annotate_single_task_operations(test_db, store):
+    """
+    Test that an ordinal in a create or read request is not turned into a task reference
+    """
+    session = store.session("conv")
+    session.add_turn("Show my tasks", "✅", [("get_all_tasks", TASKS)])
+    run_config = offline_run_config()
+
+    with use_database(test_db):
+        created = run_agenda_query_sync("Add a task: call the bank first thing tomorrow", session=session, run_config=run_config)
+        read = run_agenda_query_sync("Show me the last one", session=session, run_config=run_config)
+
+    assert "Resolved task reference" not in created.plan.input
+    assert "Resolved task reference" not in read.plan.input
+
+
+def test_tasks_in_output_reads_lists_and_snapshots():
+    snapshot = {"overdue": [TASKS[0]], "today": [], "upcoming": TASKS[1:], "counts": {}}
+
+    assert tasks_in_output(TASKS) == TASKS
+    assert tasks_in_output(snapshot) == TASKS
+    assert tasks_in_output(TASKS[0]) == []  # a single task is not a listing
+
+
+def test_follow_up_deletes_the_referenced_task(test_db, store):
+    """
+    Test that "delete the second one" after a listing deletes the second task shown
+    """
+    due = datetime.now() + timedelta(days=1)
+    created = [operations.create_task(title, "", due + timedelta(hours=i), database_url=test_db)
+               for i, title in enumerate(["Buy milk", "Call mom", "Pay rent"])]
+    session = store.session("conv")
+    run_config = offline_run_config()
+
+    with use_database(test_db):
+        listing = run_agenda_query_sync("Show me all my tasks", session=session, run_config=run_config)
+        follow_up = run_agenda_query_sync("Delete the second one", session=session, run_config=run_config)
+
+    remaining = [task["id"] for task in operations.get_all_tasks(database_url=test_db)]
+    assert not listing.cache_hit
+    assert f"[Resolved task reference: ID {created[1]['id']}" in follow_up.plan.input
+    assert follow_up.history_tokens > 0
+    assert remaining == [created[0]["id"], created[2]["id"]]
@@ -0,0 +1,169 @@
+"""
+Unit tests for the agenda dashboard (direct database reads, no agents)
+"""
+
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import gradio as gr
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import operations  # type: ignore
+from database.registry import database_registry  # type: ignore
+from ui.dashboard import DashboardCache, heatmap_start, render_heatmap, render_lists  # type: ignore
+from ui.interface import UIConfig, refresh_dashboard  # type: ignore
+
+
+@pytest.fixture
+def cache():
+    cache = DashboardCache(window_days=7, heatmap_weeks=5)
+    yield cache
+    cache.close()
+
+
+def _create(database_url, title, due_date):
+    return operations.create_task(title, "", due_date, database_url=database_url)
+
+
+def test_snapshot_groups_tasks_and_fills_the_heatmap(test_db, cache):
+    """
+    Test the overdue / today / upcoming groups and the per-day heatmap counts
+    """
+    now = datetime.now().replace(second=0, microsecond=0)
+    tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+    _create(test_db, "Overdue", now - timedelta(days=2))
+    _create(test_db, "Later today", datetime.combine(date.today(), datetime.max.time()).replace(microsecond=0))
+    _create(test_db, "Tomorrow", tomorrow + timedelta(hours=9))
+    _create(test_db, "Tomorrow too", tomorrow + timedelta(hours=11))
+    _create(test_db, "Far away", now + timedelta(days=90))
+
+    snapshot = cache.snapshot(test_db)
+
+    assert snapshot["counts"] == {"overdue": 1, "today": 1, "upcoming": 2}
+    assert [task["title"] for task in snapshot["upcoming"]] == ["Tomorrow", "Tomorrow too"]
+    heatmap = dict(snapshot["heatmap"])
+    assert len(heatmap) == 35 and min(heatmap) == heatmap_start(date.today())
+    assert heatmap[tomorrow.date()] == 2
+
+
+def test_writes_are_applied_incrementally(test_db, cache):
+    """
+    Test that creations and deletions update the cached view without reloading it
+    """
+    cache.snapshot(test_db)
+    created = _create(test_db, "Call the dentist", datetime.now() + timedelta(days=1))
+    snapshot = cache.snapshot(test_db)
+
+    assert [task["title"] for task in snapshot["upcoming"]] == ["Call the dentist"]
+
+    operations.delete_task(created["id"], database_url=test_db)
+    snapshot = cache.snapshot(test_db)
+
+    assert snapshot["counts"]["upcoming"] == 0
+    metrics = cache.metrics()
+    assert metrics["loads"] == 1
+    assert metrics["incremental_updates"] == 2
+    assert metrics["hits"] == 2
+
+
+def test_missed_change_triggers_a_reload(test_db, cache):
+    """
+    Test that a view that fell behind the data version is loaded again
+    """
+    cache.snapshot(test_db)
+    cache.close()  # stop following the events: the next write is missed
+    _create(test_db, "Missed", datetime.now() + timedelta(days=1))
+
+    snapshot = cache.snapshot(test_db)
+
+    assert snapshot["counts"]["upcoming"] == 1
+    assert cache.metrics()["loads"] == 2
+
+
+def test_rendering_escapes_titles(test_db, cache):
+    """
+    Test that task titles are HTML-escaped and the heatmap has one cell per day
+    """
+    _create(test_db, "<script>alert(1)</script>", datetime.now() + timedelta(days=1))
+
+    snapshot = cache.snapshot(test_db)
+    lists_html, heatmap_html = render_lists(snapshot), render_heatmap(snapshot)
+
+    assert "<script>" not in lists_html and "&lt;script&gt;" in lists_html
+    assert heatmap_html.count("<td") == 35
+
+
+def test_refresh_skips_unchanged_dashboards(test_db):
+    """
+    Test that the UI refresh only sends new HTML after a change
+    """
+    database_registry.register("dashboard_test", test_db)
+    config = UIConfig(database="dashboard_test")
+    try:
+        lists_html, _, key = refresh_dashboard(None, config)
+        unchanged = refresh_dashboard(key, config)
+        _create(test_db, "New task", datetime.now() + timedelta(days=2))
+        changed_html, _, new_key = refresh_dashboard(key, config)
+    finally:
+        database_registry.unregister("dashboard_test")
+
+    assert "Nothing here" in lists_html
+    assert unchanged[2] == key and isinstance(unchanged[0], dict) and unchanged[0] == gr.skip()
+    assert "New task" in changed_html and new_key != key
+
+
+def test_old_tasks_are_counted_not_loaded(test_db, cache, monkeypatch):
+    """
+    Test that the overdue history is only counted and the latest overdue tasks are listed
+    """
+    monkeypatch.setattr("ui.dashboard.MAX_ROWS", 3)
+    long_ago = datetime.now() - timedelta(days=400)
+    old = [_create(test_db, f"Old {i}", long_ago + timedelta(days=i)) for i in range(6)]
+    _create(test_db, "Midnight", datetime.combine(date.today(), datetime.min.time()))
+
+    view = cache.view(test_db)
+    snapshot = cache.snapshot(test_db)
+
+    assert view.earlier_count == 6 and sum(view.per_day.values()) == 1
+    assert snapshot["counts"]["overdue"] == 7
+    assert [task["title"] for task in snapshot["overdue"]] == ["Midnight", "Old 5", "Old 4"]
+    assert "… and 4 more" in render_lists(snapshot)
+
+    operations.delete_task(old[5]["id"], database_url=test_db)
+    snapshot = cache.snapshot(test_db)
+
+    assert snapshot["counts"]["overdue"] == 6
+    assert [task["title"] for task in snapshot["overdue"]] == ["Midnight", "Old 4", "Old 3"]
+    assert cache.metrics()["loads"] == 1
+
+
+def test_snapshots_are_shared_within_a_minute(test_db, cache):
+    now = datetime.now().replace(second=0, microsecond=0)
+
+    first = cache.snapshot(test_db, now)
+    second = cache.snapshot(test_db, now)
+    _create(test_db, "New task", now + timedelta(days=1))
+    third = cache.snapshot(test_db, now)
+
+    assert second is first and third is not first
+    assert cache.metrics()["snapshots"] == 2
+
+
+def test_refresh_does_not_build_unchanged_snapshots(test_db, monkeypatch):
+    """
+    Test that an unchanged tick is answered from the key alone
+    """
+    database_registry.register("dashboard_test", test_db)
+    config = UIConfig(database="dashboard_test")
+    try:
+        _, _, key = refresh_dashboard(None, config)
+        monkeypatch.setattr("ui.interface.dashboard_cache.snapshot", lambda *args: pytest.fail("snapshot built"))
+        unchanged = refresh_dashboard(key, config)
+    finally:
+        database_registry.unregister("dashboard_test")
+
+    assert unchanged[2] == key
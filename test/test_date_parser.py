@@ -0,0 +1,155 @@
+"""
+Unit tests for the local natural-language date parser
+"""
+
+import pytest
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.date_parser import (  # type: ignore
+    parse_date,
+    parse_cache_info,
+    clear_parse_cache,
+    get_user_timezone,
+)
+
+# Saturday 2025-06-07, the reference date of the original prompts
+NOW = datetime(2025, 6, 7, 15, 30)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Crea una tarea para mañana: comprar leche", datetime(2025, 6, 8, 9, 0)),
+    ("Create a task for tomorrow: buy milk", datetime(2025, 6, 8, 9, 0)),
+    ("¿Qué tareas tengo para hoy?", datetime(2025, 6, 7, 9, 0)),
+    ("pasado mañana a las 5 de la tarde", datetime(2025, 6, 9, 17, 0)),
+    ("Add task: call doctor next week", datetime(2025, 6, 14, 9, 0)),
+    ("Recordar pagar en 3 días", datetime(2025, 6, 10, 9, 0)),
+    ("in two weeks", datetime(2025, 6, 21, 9, 0)),
+    ("Crear tarea: estudiar Python para el lunes", datetime(2025, 6, 9, 9, 0)),
+    ("next Monday at 17:30", datetime(2025, 6, 9, 17, 30)),
+    ("el sábado por la noche", datetime(2025, 6, 14, 20, 0)),
+    ("15 de junio a las 10", datetime(2025, 6, 15, 10, 0)),
+    ("June 20th at 5pm", datetime(2025, 6, 20, 17, 0)),
+    ("2025-07-01", datetime(2025, 7, 1, 9, 0)),
+])
+def test_parse_date_relative_expressions(text, expected):
+    """
+    Test Spanish and English expressions against a fixed reference date
+    """
+    result = parse_date(text, now=NOW)
+
+    assert result.value == expected
+    assert result.is_confident()
+
+
+def test_parse_date_morning_is_not_tomorrow():
+    """
+    Test that "mañana" meaning "morning" does not move the date
+    """
+    result = parse_date("hoy por la mañana", now=NOW)
+
+    assert result.value == datetime(2025, 6, 7, 9, 0)
+
+
+def test_parse_date_without_year_rolls_over():
+    """
+    Test that a day/month already past this year resolves to next year
+    """
+    result = parse_date("01/03", now=NOW)
+
+    assert result.value == datetime(2026, 3, 1, 9, 0)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Dentista el 25/06", datetime(2025, 6, 25, 9, 0)),
+    ("Pay rent on 13/07/2025", datetime(2025, 7, 13, 9, 0)),
+    ("Revisión el 07/07", datetime(2025, 7, 7, 9, 0)),
+])
+def test_parse_date_unambiguous_slash_dates_are_confident(text, expected):
+    """
+    Test that a slash date only readable one way (or the same both ways) is used directly
+    """
+    result = parse_date(text, now=NOW)
+
+    assert result.value == expected
+    assert result.confidence == 0.85
+    assert result.is_confident()
+
+
+@pytest.mark.parametrize("text", ["Dentista el 05/06", "Meeting on 11/12/2025", "01/03"])
+def test_parse_date_ambiguous_slash_dates_are_left_to_the_agent(text):
+    """
+    Test that a slash date valid as day/month and month/day stays below the threshold
+    """
+    result = parse_date(text, now=NOW)
+
+    assert result.value is not None
+    assert not result.is_confident()
+
+
+@pytest.mark.parametrize("text", [
+    "Show me all my tasks",
+    "Borrar la tarea con ID 1",
+    "Delete task with ID 2",
+    "",
+])
+def test_parse_date_no_expression(text):
+    """
+    Test that requests without dates return an empty, non-confident result
+    """
+    result = parse_date(text, now=NOW)
+
+    assert result.value is None
+    assert result.confidence == 0.0
+    assert not result.is_confident()
+
+
+def test_parse_date_bare_time_is_low_confidence():
+    """
+    Test that a time without a day is left to the DateParserAgent
+    """
+    result = parse_date("llamar a las 5", now=NOW)
+
+    assert result.value is not None
+    assert not result.is_confident()
+
+
+def test_parse_date_uses_user_timezone():
+    """
+    Test that the reference date is taken in the user's timezone
+    """
+    # 23:30 UTC on June 7th is already June 8th in Madrid
+    now_utc = datetime(2025, 6, 7, 23, 30, tzinfo=timezone.utc)
+
+    result = parse_date("hoy", now=now_utc, timezone="Europe/Madrid")
+
+    assert result.value == datetime(2025, 6, 8, 9, 0)
+
+
+def test_get_user_timezone_from_environment(monkeypatch):
+    """
+    Test that AIGENDA_TIMEZONE selects the user's timezone
+    """
+    monkeypatch.setenv("AIGENDA_TIMEZONE", "America/New_York")
+
+    zone = get_user_timezone()
+
+    assert datetime(2025, 1, 1, tzinfo=zone).utcoffset().total_seconds() == -5 * 3600
+
+
+def test_parse_date_is_memoized():
+    """
+    Test that repeated parses of the same text and day hit the cache
+    """
+    clear_parse_cache()
+
+    parse_date("mañana", now=NOW)
+    parse_date("Mañana", now=NOW)
+
+    info = parse_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
@@ -0,0 +1,57 @@
+"""
+Unit tests for the local intent detector
+"""
+
+import pytest
+import os
+import sys
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.intent import Intent, detect_intent  # type: ignore
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Crea una tarea para mañana: comprar leche", Intent.CREATE),
+    ("Add task: call doctor next week", Intent.CREATE),
+    ("Añadir a la agenda: dentista el viernes", Intent.CREATE),
+    ("Mostrar todas mis tareas", Intent.READ),
+    ("¿Qué tareas tengo para hoy?", Intent.READ),
+    ("List upcoming tasks", Intent.READ),
+    ("Cambia la tarea 3 al lunes", Intent.UPDATE),
+    ("Borrar la tarea con ID 1", Intent.DELETE),
+    ("Delete task with ID 2", Intent.DELETE),
+    ("Schedule a call with Ana on Friday", Intent.CREATE),
+    ("Can you schedule a meeting tomorrow?", Intent.CREATE),
+    ("Programa una reunión el lunes", Intent.CREATE),
+    ("Show my schedule for today", Intent.READ),
+    ("What's on my schedule?", Intent.READ),
+    ("¿Qué hay en mi agenda esta semana?", Intent.READ),
+    ("Create a task to cancel the gym membership", Intent.CREATE),
+    ("Add a reminder to remove the old files", Intent.CREATE),
+    ("Crea una tarea para borrar el coche", Intent.CREATE),
+    ("Please add a task to delete old emails", Intent.CREATE),
+    ("Get tasks for today", Intent.READ),
+    ("Dame las tareas de mañana", Intent.READ),
+    ("Muéstrame qué tengo que cancelar", Intent.READ),
+    ("I want to cancel task 4", Intent.DELETE),
+    ("¿Cómo estás?", Intent.CHAT),
+    ("Tell me a joke", Intent.CHAT),
+    ("What's the weather today?", Intent.CHAT),
+])
+def test_detect_intent(text, expected):
+    """
+    Test intent detection in both languages
+    """
+    assert detect_intent(text) == expected
+
+
+def test_intent_write_flags():
+    """
+    Test which intents count as writes and task operations
+    """
+    assert Intent.CREATE.is_write and Intent.DELETE.is_write and Intent.UPDATE.is_write
+    assert not Intent.READ.is_write
+    assert Intent.READ.is_task_operation
+    assert not Intent.CHAT.is_task_operation
@@ -0,0 +1,126 @@
+"""
+Unit tests for the Gradio chat interface handlers
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot import pipeline  # type: ignore
+from chatbot.mock_model import LatencyProfile, offline_run_config  # type: ignore
+from database.models import create_database  # type: ignore
+from database.registry import database_registry  # type: ignore
+from ui.interface import ChatSession, UIConfig, build_interface, new_conversation, respond  # type: ignore
+
+
+@pytest.fixture
+def offline_config(tmp_path):
+    """
+    UI settings with the offline model on a temporary registered database
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    database_registry.register("ui_test", database_url)
+    yield UIConfig(database="ui_test", run_config=offline_run_config(latency=LatencyProfile(first_token_ms=100)))
+    database_registry.unregister("ui_test")
+
+
+def _collect(message, history, session, config):
+    async def run():
+        return [update async for update in respond(message, history, session, config)]
+    return asyncio.run(run())
+
+
+def test_respond_streams_into_the_history(offline_config):
+    """
+    Test that the answer is streamed into the last history message
+    """
+    updates = _collect("Show me all my tasks", [], None, offline_config)
+    history, session, textbox = updates[-1]
+
+    assert len(updates) > 2
+    assert updates[0][0][-1]["content"] == "⏳"
+    assert history[0] == {"role": "user", "content": "Show me all my tasks"}
+    assert history[-1]["content"].endswith("📭 No tasks found for this criteria")
+    assert isinstance(session, ChatSession) and session.turns == 1
+    assert textbox == ""
+
+
+def test_session_keeps_its_ids_and_user(offline_config, monkeypatch):
+    """
+    Test that the session user reaches the pipeline and the conversation groups the run
+    """
+    seen = []
+    original = pipeline.stream_agenda_query
+
+    def spy(message, **kwargs):
+        seen.append((kwargs["context"].user, kwargs["run_config"].group_id))
+        return original(message, **kwargs)
+
+    monkeypatch.setattr("ui.interface.stream_agenda_query", spy)
+    session = ChatSession()
+    _collect("Show me all my tasks", [], session, offline_config)
+    _, session = new_conversation(session)
+    _collect("Show me all my tasks", [], session, offline_config)
+
+    assert seen[0][0] == seen[1][0] == session.user_id
+    assert seen[0][1] != seen[1][1] == session.conversation_id
+    assert session.turns == 1
+
+
+def test_sessions_are_served_concurrently(offline_config):
+    """
+    Test that slow model calls of one session do not hold the others back
+    """
+    async def user(i):
+        return [update async for update in respond("Show me all my tasks", [], None, offline_config)]
+
+    async def scenario():
+        return await asyncio.gather(*(user(i) for i in range(8)))
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    # One request is 2 model calls of 100 ms; 8 in a row would take 1.6 s
+    assert elapsed < 1.0
+    assert len({updates[-1][1].user_id for updates in results}) == 8
+
+
+def test_error_is_shown_in_the_chat(offline_config, monkeypatch):
+    """
+    Test that a failed run ends with an error message instead of breaking the app
+    """
+    async def failing(message, **kwargs):
+        raise RuntimeError("model unavailable")
+        yield
+
+    monkeypatch.setattr("ui.interface.stream_agenda_query", failing)
+    history, _, _ = _collect("Show me all my tasks", [], None, offline_config)[-1]
+
+    assert history[-1]["content"] == "❌ Error: model unavailable"
+
+
+def test_empty_message_is_ignored(offline_config):
+    updates = _collect("   ", [], None, offline_config)
+
+    assert len(updates) == 1 and updates[0][0] == []
+
+
+def test_queue_and_concurrency_settings():
+    """
+    Test that the chat events share one concurrency group and the queue is bounded
+    """
+    demo = build_interface(UIConfig(concurrency_limit=3, max_queue_size=10))
+    chat_events = [fn for fn in demo.fns.values() if fn.concurrency_id == "chat"]
+
+    assert len(chat_events) == 2
+    assert all(fn.concurrency_limit == 3 and fn.queue for fn in chat_events)
+    assert [fn.api_name for fn in chat_events].count("chat") == 1
+    assert demo._queue.max_size == 10
@@ -0,0 +1,51 @@
+"""
+Unit tests for the local language detector
+"""
+
+import pytest
+import os
+import sys
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.language import detect_language, load_profiles  # type: ignore
+
+
+def test_load_profiles_bundled_languages():
+    """
+    Test that the bundled corpora provide Spanish and English profiles
+    """
+    profiles = load_profiles()
+
+    assert set(profiles) == {"en", "es"}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Show me all my tasks", "en"),
+    ("What tasks do I have today?", "en"),
+    ("Delete task with ID 2", "en"),
+    ("Add task: call doctor next week", "en"),
+    ("Mostrar todas mis tareas", "es"),
+    ("¿Qué tareas tengo para hoy?", "es"),
+    ("Borrar la tarea con ID 1", "es"),
+    ("Crear tarea: estudiar Python para el lunes", "es"),
+])
+def test_detect_language_task_requests(text, expected):
+    """
+    Test detection on the requests used by the workflow scenarios
+    """
+    guess = detect_language(text)
+
+    assert guess.language == expected
+    assert guess.is_confident()
+
+
+@pytest.mark.parametrize("text", ["", "ok", "sí", "1 2 3"])
+def test_detect_language_too_short_is_not_confident(text):
+    """
+    Test that very short inputs never skip the TranslatorAgent
+    """
+    guess = detect_language(text)
+
+    assert not guess.is_confident()
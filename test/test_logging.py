@@ -0,0 +1,70 @@
+"""
+Unit tests for the production logging profile
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from loguru import logger
+
+from database import operations  # type: ignore
+from utils.logger import BackgroundJsonSink, debug_sampler  # type: ignore
+
+
+def _records(path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_operations_log_one_structured_summary(test_db, tmp_path):
+    """
+    Test that an operation writes a single record with its name, duration and row count
+    """
+    path = str(tmp_path / "app.jsonl")
+    sink_id = logger.add(BackgroundJsonSink(path), level="INFO", format="{message}",
+                         filter=lambda record: "operation" in record["extra"])
+    try:
+        task = operations.create_task("Buy milk", "", datetime.now() + timedelta(days=1), database_url=test_db)
+        operations.get_all_tasks(database_url=test_db)
+        operations.get_task_by_id(task["id"] + 1, database_url=test_db)
+    finally:
+        logger.remove(sink_id)  # writes what is still queued
+
+    records = _records(path)
+    assert [record["operation"] for record in records] == ["create_task", "get_all_tasks", "get_task_by_id"]
+    assert records[0]["task_id"] == task["id"] and records[0]["rows"] == 1
+    assert records[1]["rows"] == 1 and records[1]["duration_ms"] >= 0
+    assert records[2]["level"] == "WARNING" and records[2]["rows"] == 0
+
+
+def test_debug_records_are_sampled(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink_id = logger.add(BackgroundJsonSink(path), level="DEBUG", format="{message}", filter=debug_sampler(10))
+    try:
+        for i in range(100):
+            logger.debug("event {i}", i=i)
+        logger.info("summary")
+    finally:
+        logger.remove(sink_id)
+
+    messages = [record["message"] for record in _records(path)]
+    assert messages == [f"event {i}" for i in range(0, 100, 10)] + ["summary"]
+
+
+def test_background_sink_rotates(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink = BackgroundJsonSink(path, max_bytes=200, backups=2)
+    sink_id = logger.add(sink, level="INFO", format="{message}")
+    try:
+        for i in range(30):
+            logger.info("line {i}", i=i)
+    finally:
+        logger.remove(sink_id)
+
+    assert os.path.exists(f"{path}.1")
+    assert not os.path.exists(f"{path}.3")
@@ -0,0 +1,85 @@
+"""
+Unit tests for the metrics registry and the instrumented operations
+"""
+
+import os
+import sys
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import operations  # type: ignore
+from utils.metrics import MetricsRegistry, metrics, serve_metrics  # type: ignore
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(prefix="test_")
+    registry.describe("requests_total", "counter", "Requests", ("route",))
+    registry.describe("latency_ms", "histogram", "Latency", ("route",), buckets=(1, 10))
+    return registry
+
+
+def test_prometheus_exposition(registry):
+    registry.inc("requests_total", ("/tasks",))
+    registry.inc("requests_total", ("/tasks",), 2)
+    for value in (0.5, 5, 50):
+        registry.observe("latency_ms", value, ("/tasks",))
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/tasks"} 3' in text
+    assert 'test_latency_ms_bucket{route="/tasks",le="1"} 1' in text
+    assert 'test_latency_ms_bucket{route="/tasks",le="10"} 2' in text
+    assert 'test_latency_ms_bucket{route="/tasks",le="+Inf"} 3' in text
+    assert 'test_latency_ms_sum{route="/tasks"} 55.5' in text
+    assert 'test_latency_ms_count{route="/tasks"} 3' in text
+
+
+def test_file_dump_and_http_endpoint(registry, tmp_path):
+    registry.inc("requests_total", ('say "hi"',))
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    assert 'route="say \\"hi\\""' in path.read_text(encoding="utf-8")
+
+    server = serve_metrics(registry, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert response.read().decode("utf-8") == registry.render_prometheus()
+    finally:
+        server.shutdown()
+
+
+def test_operations_are_instrumented(test_db):
+    labels = ("get_all_tasks",)
+    calls, rows = metrics.counter("db_operation_calls_total", labels), metrics.counter("db_operation_rows_total", labels)
+    for title in ("Buy milk", "Call mom"):
+        operations.create_task(title, "", datetime.now() + timedelta(days=1), database_url=test_db)
+
+    operations.get_all_tasks(database_url=test_db)
+    with pytest.raises(ValueError):
+        operations.get_task_by_id(-1, database_url=test_db)
+
+    assert metrics.counter("db_operation_calls_total", labels) == calls + 1
+    assert metrics.counter("db_operation_rows_total", labels) == rows + 2
+    assert metrics.counter("db_operation_errors_total", ("get_task_by_id", "ValueError")) >= 1
+    assert metrics.histogram("db_operation_duration_ms", labels).count >= 1
+
+
+def test_recording_overhead_is_microseconds(registry):
+    calls = 20000
+    started = time.perf_counter()
+    for _ in range(calls):
+        registry.inc("requests_total", ("/tasks",))
+        registry.observe("latency_ms", 3.0, ("/tasks",))
+    per_call_us = (time.perf_counter() - started) / calls * 1e6
+
+    assert per_call_us < 50
@@ -0,0 +1,145 @@
+"""
+Unit tests for the offline scripted model provider
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents import Agent, Runner, function_tool  # type: ignore
+
+from chatbot.mock_model import (  # type: ignore
+    LatencyProfile,
+    ScriptedModel,
+    ScriptedToolCall,
+    ScriptedTurn,
+    describe_call,
+    offline_run_config,
+)
+from chatbot.pipeline import run_agenda_query, stream_agenda_query  # type: ignore
+from database.models import create_database, use_database  # type: ignore
+
+
+@function_tool
+def add(a: int, b: int) -> int:
+    """
+    Add two numbers
+    """
+    return a + b
+
+
+calculator = Agent(name="Calculator", instructions="Add numbers", tools=[add])
+router = Agent(name="Router", instructions="Route", handoffs=[calculator])
+
+SCRIPT = {
+    "Router": [ScriptedTurn(handoff="Calculator")],
+    "Calculator": [
+        ScriptedTurn(tool_calls=(ScriptedToolCall("add", {"a": 2, "b": 3}),)),
+        ScriptedTurn(text="The result is 5"),
+    ],
+}
+
+
+def test_describe_call_counts_turns_since_last_handoff():
+    """
+    Test that the turn of an agent restarts after a handoff
+    """
+    items = [
+        {"role": "user", "content": "add 2 and 3"},
+        {"type": "function_call", "name": "transfer_to_calculator", "call_id": "1", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "1", "output": "{}"},
+    ]
+    assert describe_call("Calculator", items).turn == 0
+
+    items += [
+        {"type": "function_call", "name": "add", "call_id": "2", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "2", "output": "5"},
+    ]
+    call = describe_call("Calculator", items)
+    assert call.turn == 1
+    assert call.tool_output == "5"
+    assert call.query == "add 2 and 3"
+
+
+def test_scripted_run_with_handoff_and_tool():
+    """
+    Test a scripted run through the real Runner, handoff and tool
+    """
+    run_config = offline_run_config(SCRIPT)
+
+    result = asyncio.run(Runner.run(router, "add 2 and 3", run_config=run_config))
+
+    assert result.final_output == "The result is 5"
+    assert result.last_agent.name == "Calculator"
+    assert len(result.raw_responses) == 3
+    assert all(response.usage.output_tokens > 0 for response in result.raw_responses)
+
+
+def test_recorded_calls_are_bounded():
+    """
+    Test that the model keeps only its most recent calls, and counts them all
+    """
+    run_config = offline_run_config(SCRIPT)
+    model = run_config.model_provider.model = ScriptedModel(SCRIPT, max_calls=2)
+
+    for _ in range(3):
+        asyncio.run(Runner.run(router, "add 2 and 3", run_config=run_config))
+
+    assert model.call_count == 9
+    assert [call.agent_name for call in model.calls] == ["Calculator", "Calculator"]
+
+
+def test_synthetic_latency_is_applied():
+    """
+    Test that every model call waits for the configured time to first token
+    """
+    run_config = offline_run_config(SCRIPT, LatencyProfile(first_token_ms=30))
+
+    started = time.perf_counter()
+    asyncio.run(Runner.run(router, "add 2 and 3", run_config=run_config))
+
+    assert time.perf_counter() - started >= 0.09
+
+
+def test_agenda_script_runs_the_pipeline_offline(tmp_path):
+    """
+    Test create and read requests through the agenda agents with no network
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    run_config = offline_run_config()
+
+    async def scenario():
+        with use_database(database_url):
+            created = await run_agenda_query("Crea una tarea para mañana: comprar leche", run_config=run_config, cache=None)
+            listed = await run_agenda_query("Show me all my tasks", run_config=run_config, cache=None)
+        return created, listed
+
+    created, listed = asyncio.run(scenario())
+
+    assert created.final_output.startswith("✅")
+    assert "comprar leche" in listed.final_output
+
+
+def test_agenda_script_streams_text_deltas(tmp_path):
+    """
+    Test that the streamed offline run yields text deltas and the final answer
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    run_config = offline_run_config()
+
+    async def collect():
+        with use_database(database_url):
+            return [event async for event in stream_agenda_query("Show me all my tasks", run_config=run_config, cache=None)]
+
+    events = asyncio.run(collect())
+    kinds = [event.kind for event in events]
+
+    assert "tool_call" in kinds
+    assert "".join(event.text for event in events if event.kind == "text") == events[-1].text
+    assert events[-1].text == "📭 No tasks found for this criteria"
@@ -0,0 +1,262 @@
+"""
+Unit tests for the model call policy (timeouts, retries, hedging, budget)
+
+A local HTTP server stands in for the Responses API and follows a script of
+delays and error statuses, one entry per request it receives.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+from agents import Agent, RunConfig, Runner
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.mock_model import LatencyProfile, ScriptedModelProvider, agenda_script  # type: ignore
+from chatbot.model_policy import (  # type: ignore
+    BudgetExceeded,
+    ModelCallPolicy,
+    ModelCallTimeout,
+    PolicyModelProvider,
+    is_retryable,
+    request_scope,
+)
+from chatbot.openai_client import ClientSettings, PooledOpenAIProvider  # type: ignore
+from chatbot.pipeline import run_agenda_query  # type: ignore
+from database.models import create_database, use_database  # type: ignore
+
+
+def _response_body(text: str) -> bytes:
+    return json.dumps({
+        "id": "resp_local",
+        "object": "response",
+        "created_at": 0,
+        "model": "gpt-4o-mini",
+        "output": [{
+            "type": "message",
+            "id": "msg_local",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": 10,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": 2,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": 12,
+        },
+    }).encode()
+
+
+class FaultyServer(ThreadingHTTPServer):
+    """
+    Responses API stand-in: request N gets script[N] as (delay seconds, status)
+
+    Requests beyond the script are answered at once with 200.
+    """
+    daemon_threads = True
+
+    def __init__(self, script):
+        super().__init__(("127.0.0.1", 0), FaultyHandler)
+        self.script = list(script)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def next_action(self):
+        with self.lock:
+            index = self.requests
+            self.requests += 1
+        return self.script[index] if index < len(self.script) else (0.0, 200)
+
+
+class FaultyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        delay, status = self.server.next_action()
+        time.sleep(delay)
+        if status == 200:
+            body = _response_body("pong")
+        else:
+            body = json.dumps({"error": {"message": f"injected {status}", "type": "server_error"}}).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            # The client gave up on this request (timeout or lost hedge)
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def faulty_server():
+    servers = []
+
+    def start(*script):
+        server = FaultyServer(script)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _provider(server, policy: ModelCallPolicy) -> PolicyModelProvider:
+    inner = PooledOpenAIProvider(ClientSettings(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        api_key="test-key",
+        max_retries=0,
+    ))
+    return PolicyModelProvider(policy, inner, seed=0)
+
+
+def _run(provider: PolicyModelProvider, budget_s=None) -> str:
+    agent = Agent(name="EchoAgent", instructions="Answer pong", model="gpt-4o-mini")
+
+    async def scenario():
+        with request_scope(budget_s):
+            result = await Runner.run(agent, "ping", run_config=RunConfig(model_provider=provider, tracing_disabled=True))
+        return result.final_output
+
+    return asyncio.run(scenario())
+
+
+FAST_RETRIES = dict(max_retries=2, backoff_base_s=0.01, backoff_max_s=0.02)
+
+
+def test_server_error_is_retried(faulty_server):
+    """
+    Test that a 500 is retried and the next answer is used
+    """
+    server = faulty_server((0.0, 500))
+    provider = _provider(server, ModelCallPolicy(**FAST_RETRIES))
+
+    assert _run(provider) == "pong"
+    assert server.requests == 2
+    assert provider.metrics()["retries"] == 1
+
+
+def test_slow_call_hits_the_hop_deadline_and_is_retried(faulty_server):
+    """
+    Test that a call slower than the hop timeout is cancelled and retried
+    """
+    server = faulty_server((1.0, 200))
+    provider = _provider(server, ModelCallPolicy(hop_timeout_s=0.2, **FAST_RETRIES))
+
+    started = time.perf_counter()
+    assert _run(provider) == "pong"
+
+    assert time.perf_counter() - started < 0.8
+    assert provider.metrics()["timeouts"] == 1
+
+
+def test_client_errors_are_not_retried(faulty_server):
+    """
+    Test that a 400 fails at once
+    """
+    server = faulty_server((0.0, 400))
+    provider = _provider(server, ModelCallPolicy(**FAST_RETRIES))
+
+    with pytest.raises(openai.BadRequestError):
+        _run(provider)
+    assert server.requests == 1
+    assert provider.metrics()["failures"] == 1
+
+
+def test_hedged_request_wins_over_a_slow_one(faulty_server):
+    """
+    Test that a second request is fired after the hedge delay and the fastest answer wins
+    """
+    server = faulty_server((1.0, 200), (0.0, 200))
+    provider = _provider(server, ModelCallPolicy(hedge=True, hedge_delay_s=0.1, **FAST_RETRIES))
+
+    started = time.perf_counter()
+    assert _run(provider) == "pong"
+
+    assert time.perf_counter() - started < 0.8
+    metrics = provider.metrics()
+    assert metrics["hedges"] == 1 and metrics["hedges_won"] == 1
+    assert metrics["retries"] == 0
+
+
+def test_hedge_delay_follows_the_observed_p95(faulty_server):
+    """
+    Test that without a fixed delay the hedge waits for enough samples
+    """
+    server = faulty_server()
+    provider = _provider(server, ModelCallPolicy(hedge=True, hedge_min_samples=3))
+
+    for _ in range(3):
+        _run(provider)
+
+    async def get_model():
+        return provider.get_model("gpt-4o-mini")
+
+    model = asyncio.run(get_model())
+
+    assert model._hedge_delay("EchoAgent") is not None
+    assert model._hedge_delay("DatabaseAgent") is None
+
+
+def test_request_budget_stops_retries(faulty_server):
+    """
+    Test that the request budget caps the call and stops further retries
+    """
+    server = faulty_server((1.0, 200), (1.0, 200), (1.0, 200))
+    provider = _provider(server, ModelCallPolicy(hop_timeout_s=5.0, **FAST_RETRIES))
+
+    started = time.perf_counter()
+    with pytest.raises(BudgetExceeded):
+        _run(provider, budget_s=0.3)
+
+    assert time.perf_counter() - started < 0.8
+    assert provider.metrics()["budget_exceeded"] == 1
+
+
+def test_budget_is_shared_by_all_hops(tmp_path):
+    """
+    Test that the pipeline budget covers every model call of the request
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    # DatabaseAgent needs two calls (tool call + answer) of 100 ms each
+    scripted = ScriptedModelProvider(agenda_script(), LatencyProfile(first_token_ms=100))
+    run_config = RunConfig(
+        model_provider=PolicyModelProvider(ModelCallPolicy(**FAST_RETRIES), scripted, seed=0),
+        tracing_disabled=True,
+    )
+
+    async def query(budget_s):
+        with use_database(database_url):
+            return await run_agenda_query("Show me all my tasks", run_config=run_config, cache=None, budget_s=budget_s)
+
+    assert asyncio.run(query(1.0)).final_output.startswith("📭")
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(query(0.15))
+
+
+def test_retryable_errors():
+    assert is_retryable(ModelCallTimeout("slow"))
+    assert not is_retryable(ValueError("bad"))
+    assert not is_retryable(BudgetExceeded("spent"))
@@ -0,0 +1,175 @@
+"""
+Unit tests for the shared pooled OpenAI client
+
+A local HTTP/1.1 server stands in for the Responses API and counts the TCP
+connections it accepts, so connection reuse is checked without network.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from agents import Agent, RunConfig, Runner
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.openai_client import ClientSettings, PooledOpenAIProvider, shared_model_provider  # type: ignore
+
+
+def _response_body(text: str) -> bytes:
+    return json.dumps({
+        "id": "resp_local",
+        "object": "response",
+        "created_at": 0,
+        "model": "gpt-4o-mini",
+        "output": [{
+            "type": "message",
+            "id": "msg_local",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": 10,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": 2,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": 12,
+        },
+    }).encode()
+
+
+class CountingServer(ThreadingHTTPServer):
+    """
+    HTTP server that counts accepted connections and requests
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ResponsesHandler)
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def get_request(self):
+        request = super().get_request()
+        with self.lock:
+            self.connections += 1
+        return request
+
+
+class ResponsesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests += 1
+        body = _response_body("pong")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = CountingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _settings(server, **overrides) -> ClientSettings:
+    return ClientSettings(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        api_key="test-key",
+        max_retries=0,
+        **overrides,
+    )
+
+
+def _run_hops(provider: PooledOpenAIProvider, hops: int) -> list[str]:
+    agent = Agent(name="EchoAgent", instructions="Answer pong", model="gpt-4o-mini")
+    run_config = RunConfig(model_provider=provider, tracing_disabled=True)
+
+    async def scenario():
+        outputs = []
+        for _ in range(hops):
+            result = await Runner.run(agent, "ping", run_config=run_config)
+            outputs.append(result.final_output)
+        await provider.aclose()
+        return outputs
+
+    return asyncio.run(scenario())
+
+
+def test_consecutive_hops_reuse_one_connection(server):
+    """
+    Test that sequential model calls share a single keep-alive connection
+    """
+    outputs = _run_hops(PooledOpenAIProvider(_settings(server)), hops=3)
+
+    assert outputs == ["pong"] * 3
+    assert server.requests == 3
+    assert server.connections == 1
+
+
+def test_without_keepalive_every_hop_connects(server):
+    """
+    Test the baseline: with no idle connections kept, every call opens a new one
+    """
+    _run_hops(PooledOpenAIProvider(_settings(server, max_keepalive_connections=0)), hops=3)
+
+    assert server.requests == 3
+    assert server.connections == 3
+
+
+def test_all_agents_share_the_client_of_the_loop(server):
+    """
+    Test that models of different agents get the same client within a loop
+    and a fresh one in another loop
+    """
+    provider = PooledOpenAIProvider(_settings(server))
+
+    async def clients():
+        first, second = provider.get_model("gpt-4o-mini"), provider.get_model(None)
+        return first._client, second._client
+
+    first, second = asyncio.run(clients())
+    other, _ = asyncio.run(clients())
+
+    assert first is second
+    assert other is not first
+
+
+def test_pool_settings_are_applied():
+    """
+    Test the timeouts, retries and pool limits of the built client
+    """
+    settings = ClientSettings(max_connections=7, connect_timeout_s=1.5, max_retries=4, api_key="test-key")
+    provider = PooledOpenAIProvider(settings)
+
+    async def client():
+        return provider.client()
+
+    client = asyncio.run(client())
+
+    assert client.max_retries == 4
+    assert client.timeout.connect == 1.5
+    assert client._client._transport._pool._max_connections == 7
+    assert shared_model_provider() is shared_model_provider()
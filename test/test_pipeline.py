@@ -0,0 +1,108 @@
+"""
+Unit tests for the agent pipeline routing
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.pipeline import plan_route  # type: ignore
+from chatbot.intent import Intent  # type: ignore
+from chatbot.hops import HopLatencyTracker  # type: ignore
+
+NOW = datetime(2025, 6, 7, 15, 30)
+
+
+def _handoff_names(agent):
+    return [handoff.name for handoff in agent.handoffs]
+
+
+def test_plan_route_english_with_resolved_date_goes_to_database():
+    """
+    Test that an English create request with a confident date skips both hops
+    """
+    plan = plan_route("Create a task for tomorrow: buy milk", now=NOW)
+
+    assert plan.intent == Intent.CREATE
+    assert plan.skipped_hops == ["TranslatorAgent", "DateParserAgent"]
+    assert plan.starting_agent.name == "DatabaseAgent"
+    assert "[Resolved due_date: '2025-06-08 09:00:00']" in plan.input
+
+
+def test_plan_route_spanish_with_resolved_date_skips_date_parser():
+    """
+    Test that Spanish requests keep the translator but skip the DateParserAgent
+    """
+    plan = plan_route("Crea una tarea para mañana: comprar leche", now=NOW)
+
+    assert plan.skipped_hops == ["DateParserAgent"]
+    assert plan.starting_agent.name == "TranslatorAgent"
+    assert _handoff_names(plan.starting_agent) == ["DatabaseAgent"]
+    assert "[Resolved due_date: '2025-06-08 09:00:00']" in plan.input
+
+
+def test_plan_route_uses_date_parser_when_unsure():
+    """
+    Test that low-confidence parses keep the DateParserAgent hop
+    """
+    plan = plan_route("Crea una tarea a las 5: llamar", now=NOW)
+
+    assert plan.skipped_hops == []
+    assert plan.input == "Crea una tarea a las 5: llamar"
+    assert plan.starting_agent.name == "TranslatorAgent"
+    assert _handoff_names(plan.starting_agent) == ["DateParserAgent"]
+
+
+@pytest.mark.parametrize("query", ["Show me all my tasks", "Delete task with ID 2"])
+def test_plan_route_english_without_date_goes_to_database(query):
+    """
+    Test that English reads and deletes need neither translation nor date parsing
+    """
+    plan = plan_route(query, now=NOW)
+
+    assert plan.starting_agent.name == "DatabaseAgent"
+    assert plan.input == query
+
+
+def test_plan_route_conversation_stays_with_translator():
+    """
+    Test that chat messages are never routed past the TranslatorAgent
+    """
+    plan = plan_route("Hello, how are you?", now=NOW)
+
+    assert plan.intent == Intent.CHAT
+    assert plan.skipped_hops == []
+    assert plan.starting_agent.name == "TranslatorAgent"
+    assert _handoff_names(plan.starting_agent) == ["DateParserAgent"]
+
+
+def test_hop_latency_tracker_estimates_saved_time():
+    """
+    Test the moving averages used to report the latency saved
+    """
+    tracker = HopLatencyTracker(alpha=0.5)
+    tracker.record("TranslatorAgent", 1000.0)
+    tracker.record("TranslatorAgent", 2000.0)
+
+    assert tracker.estimate("TranslatorAgent") == 1500.0
+    assert tracker.estimate_saved(["TranslatorAgent", "DateParserAgent"]) == 1500.0
+
+
+def test_date_parser_instructions_use_current_date():
+    """
+    Test that the DateParserAgent prompt gets the current date at the end, after its static prefix
+    """
+    from chatbot.agent_agenda import DATEPARSER_INSTRUCTIONS, date_parser_instructions  # type: ignore
+    from chatbot.date_parser import get_user_timezone  # type: ignore
+
+    instructions = date_parser_instructions(None, None)
+
+    today = datetime.now(get_user_timezone()).date().isoformat()
+    assert instructions.startswith(DATEPARSER_INSTRUCTIONS)
+    assert f"- Today: {today}" in instructions[len(DATEPARSER_INSTRUCTIONS):]
+    assert today not in DATEPARSER_INSTRUCTIONS and "{today}" not in instructions
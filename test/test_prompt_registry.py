@@ -0,0 +1,87 @@
+"""
+Unit tests for the prompt registry (static prefix + dynamic context)
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+from dateutil import tz
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.cassettes import instructions_hash  # type: ignore
+from chatbot.context import AgendaContext  # type: ignore
+from chatbot.prompt_registry import (  # type: ignore
+    DYNAMIC_HEADER,
+    PromptRegistry,
+    check_prefix_stability,
+    prefix_stability,
+    prompt_registry,
+)
+
+NOW = datetime(2025, 6, 7, 10, 30)
+
+
+def test_dynamic_context_goes_after_the_static_prefix():
+    """
+    Test that the date, timezone and user are appended at the end of the instructions
+    """
+    static = prompt_registry.get("date_parser").static
+    rendered = prompt_registry.render("date_parser", AgendaContext(user="user_a"), NOW, tz.gettz("Europe/Madrid"))
+
+    assert rendered.startswith(static + DYNAMIC_HEADER)
+    assert "2025-06-07" not in static
+    dynamic = rendered[len(static):]
+    assert "- Today: 2025-06-07 (Saturday)" in dynamic
+    assert "- Tomorrow: 2025-06-08" in dynamic and "- Next Monday: 2025-06-09" in dynamic
+    assert "UTC+02:00" in dynamic and "- User: user_a" in dynamic
+
+
+def test_agent_instructions_are_rendered_per_run():
+    instructions = prompt_registry.instructions("database")
+
+    class RunContext:
+        context = AgendaContext(user="user_b")
+
+    assert "- User: user_b" in instructions(RunContext(), None)
+    assert "- User:" not in instructions(None, None)
+
+
+def test_prefixes_are_stable_across_days_users_and_timezones():
+    samples = [
+        (None, NOW, None),
+        (AgendaContext(user="user_a"), NOW + timedelta(days=1), tz.gettz("America/New_York")),
+        (AgendaContext(user="user_b"), NOW + timedelta(days=40), tz.gettz("Asia/Tokyo")),
+    ]
+
+    report = check_prefix_stability(prompt_registry, samples)
+
+    assert set(report) == {"translator", "translator_direct", "date_parser", "database"}
+    assert all(row["stable"] and row["runs"] == 3 for row in report.values())
+    assert all(row["common_prefix_tokens"] >= row["static_tokens"] for row in report.values())
+
+
+def test_unstable_prefix_is_reported(tmp_path):
+    """
+    Test that a date inside the static part (the old "TODAY IS ..." header) is caught
+    """
+    (tmp_path / "agent.txt").write_text("You are an agent.", encoding="utf-8")
+    registry = PromptRegistry(str(tmp_path))
+    registry.register("agent", file="agent.txt")
+    registry.register("direct", extends="agent", text="\nNo handoffs.")
+
+    runs = {"old": [f"TODAY IS {day}. You are an agent." for day in ("2025-06-07", "2025-06-08")]}
+
+    assert registry.get("direct").static == "You are an agent.\nNo handoffs."
+    assert prefix_stability(runs, {"old": "TODAY IS 2025-06-07. You are an agent."})["old"]["stable"] is False
+    assert check_prefix_stability(registry, [(None, NOW, None), (None, NOW + timedelta(days=1), None)])["agent"]["stable"]
+
+
+def test_cassette_hash_ignores_the_dynamic_context():
+    first = prompt_registry.render("database", AgendaContext(user="user_a"), NOW)
+    second = prompt_registry.render("database", None, NOW + timedelta(days=3, hours=4), tz.gettz("Asia/Tokyo"))
+
+    assert first != second
+    assert instructions_hash(first) == instructions_hash(second)
@@ -0,0 +1,106 @@
+"""
+Unit tests for the statement timing and the slow-query log
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import operations  # type: ignore
+from database.models import create_database, get_engine, get_session  # type: ignore
+from database.registry import DatabaseRegistry  # type: ignore
+from database.query_log import QueryLog, query_log  # type: ignore
+from utils.stats import LatencyHistogram  # type: ignore
+
+
+@pytest.fixture
+def slow_log():
+    """
+    The shared query log with every statement counted as slow, restored afterwards
+    """
+    threshold = query_log.threshold_ms
+    query_log.reset()
+    query_log.threshold_ms = 0
+    yield query_log
+    query_log.threshold_ms = threshold
+    query_log.reset()
+
+
+def test_engines_are_cached_without_echo(test_db):
+    assert get_engine(test_db) is get_engine(test_db)
+    assert get_session(test_db).get_bind() is get_engine(test_db)
+    assert get_engine(test_db).echo is False
+
+
+def test_engines_are_disposed_with_their_database(tmp_path):
+    """
+    Test that create_database reuses the cached engine and unregistering a database drops it
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    registry = DatabaseRegistry()
+    registry.register("a", database_url)
+    registry.register("b", database_url)
+    engine = create_database(database_url)
+
+    assert get_engine(database_url) is engine
+    registry.unregister("a")
+    assert get_engine(database_url) is engine  # still registered as "b"
+    registry.unregister("b")
+    os.remove(tmp_path / "tareas.db")
+
+    # A database recreated at the same path gets a new engine with its tables
+    recreated = get_engine(database_url)
+    assert recreated is not engine
+    assert operations.get_all_tasks(database_url=database_url) == []
+    registry.register("c", database_url)
+    registry.unregister("c")
+
+
+def test_slow_statements_are_logged_with_their_plan(test_db, slow_log):
+    start = datetime.now() + timedelta(days=1)
+    operations.create_task("Buy milk", "", start, database_url=test_db)
+
+    operations.get_tasks_due_from(start, database_url=test_db)
+
+    entry = slow_log.slow_queries[-1]
+    assert entry["statement"].startswith("SELECT")
+    assert str(start) in entry["parameters"]
+    assert any("ix_tareas_due_date" in step for step in entry["plan"])
+
+
+def test_statement_histograms(test_db, slow_log):
+    slow_log.threshold_ms = 1e9
+    for _ in range(5):
+        operations.get_all_tasks(database_url=test_db)
+
+    stats = slow_log.statement_stats()
+    select = next(stats[statement] for statement in stats if statement.startswith("SELECT tareas.id"))
+    assert select["count"] == 5
+    assert 0 < select["p50"] <= select["max"]
+    assert not slow_log.slow_queries
+    assert "SELECT tareas.id" in slow_log.format_report()
+
+
+def test_statements_are_capped(monkeypatch):
+    monkeypatch.setattr("database.query_log.MAX_STATEMENTS", 2)
+    log = QueryLog()
+    for i in range(4):
+        log.record(f"SELECT {i}", 1.0)
+
+    assert list(log.statement_stats()) == ["<other statements>", "SELECT 0", "SELECT 1"]
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for value in [0.2] * 90 + [40.0] * 10:
+        histogram.observe(value)
+
+    assert histogram.quantile(50) <= 0.25
+    assert 25 <= histogram.quantile(95) <= 40.0
+    assert histogram.summary()["max"] == 40.0
+    assert histogram.summary()["count"] == 100
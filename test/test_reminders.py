@@ -0,0 +1,180 @@
+"""
+Unit tests for the heap-based reminder scheduler and its sinks
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from sqlalchemy import text
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import operations  # type: ignore
+from database.models import create_database  # type: ignore
+from reminders import MemorySink, Reminder, ReminderScheduler, WebhookSink  # type: ignore
+
+
+def _create(database_url, title, seconds):
+    return operations.create_task(title, "", datetime.now() + timedelta(seconds=seconds), database_url=database_url)
+
+
+@pytest.fixture
+def sink():
+    return MemorySink()
+
+
+@pytest.fixture
+def start_scheduler():
+    schedulers = []
+
+    def start(*args, **kwargs):
+        scheduler = ReminderScheduler(*args, **kwargs).start()
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield start
+    for scheduler in schedulers:
+        scheduler.stop()
+
+
+def test_reminders_fire_in_due_order(test_db, sink, start_scheduler):
+    """
+    Test that loaded tasks are notified in due date order and past ones are skipped
+    """
+    _create(test_db, "Second", 0.4)
+    _create(test_db, "First", 0.2)
+    _create(test_db, "Already overdue", -60)
+
+    start_scheduler([sink], database_url=test_db)
+
+    assert sink.wait_for(2)
+    assert [reminder.title for reminder in sink.reminders] == ["First", "Second"]
+    assert all(reminder.due_date <= datetime.now() for reminder in sink.reminders)
+
+
+def test_new_earlier_task_wakes_the_scheduler(test_db, sink, start_scheduler):
+    """
+    Test that a task created after start is pushed without a query and fires before the later ones
+    """
+    _create(test_db, "Next week", 7 * 24 * 3600)
+    scheduler = start_scheduler([sink], database_url=test_db)
+    loads = scheduler.metrics()["loads"]
+
+    _create(test_db, "Soon", 0.2)
+
+    assert sink.wait_for(1)
+    assert sink.reminders[0].title == "Soon"
+    metrics = scheduler.metrics()
+    assert metrics["loads"] == loads
+    assert metrics["pending"] == 1
+
+
+def test_deleted_task_is_not_notified(test_db, sink, start_scheduler):
+    deleted = _create(test_db, "Cancelled", 0.2)
+    _create(test_db, "Kept", 0.3)
+    scheduler = start_scheduler([sink], database_url=test_db)
+
+    operations.delete_task(deleted["id"], database_url=test_db)
+
+    assert sink.wait_for(1)
+    assert not sink.wait_for(2, timeout_s=0.3)
+    assert [reminder.title for reminder in sink.reminders] == ["Kept"]
+    assert scheduler.metrics()["cancelled"] == 1
+
+
+def test_windows_are_read_as_the_heap_runs_out(test_db, sink, start_scheduler):
+    """
+    Test keyset windows: tasks beyond the loaded window are read later, in order
+    """
+    for i in range(5):
+        _create(test_db, f"Task {i}", 0.1 + i * 0.05)
+    scheduler = start_scheduler([sink], database_url=test_db, window_size=2)
+
+    assert scheduler.metrics()["pending"] == 2
+    assert sink.wait_for(5)
+    assert [reminder.title for reminder in sink.reminders] == [f"Task {i}" for i in range(5)]
+    assert scheduler.metrics()["loads"] == 3
+
+
+def test_lead_time_and_failing_sink(test_db, sink, start_scheduler):
+    """
+    Test that reminders come `lead` before the due date and a failing sink does not stop the others
+    """
+    def broken(reminder):
+        raise RuntimeError("offline")
+
+    _create(test_db, "Meeting", 3600)
+    scheduler = start_scheduler([broken, sink], database_url=test_db, lead=timedelta(hours=1))
+
+    assert sink.wait_for(1)
+    assert sink.reminders[0].remind_at == sink.reminders[0].due_date - timedelta(hours=1)
+    assert scheduler.metrics()["sink_errors"] == 1
+
+
+def test_resync_does_not_repeat_fired_reminders(test_db, sink, start_scheduler):
+    """
+    Test that reloading the window does not notify again tasks reminded ahead of their due date
+    """
+    _create(test_db, "Meeting", 600)
+    scheduler = start_scheduler([sink], database_url=test_db, lead=timedelta(minutes=20), resync_s=0.1)
+
+    assert sink.wait_for(1)
+    assert not sink.wait_for(2, timeout_s=0.6)
+    metrics = scheduler.metrics()
+    assert metrics["fired"] == 1
+    assert metrics["loads"] >= 3
+    assert metrics["fired_ahead"] == 1
+
+
+def test_idle_scheduler_sleeps_until_the_deadline(test_db, sink, start_scheduler):
+    _create(test_db, "Tomorrow", 24 * 3600)
+    scheduler = start_scheduler([sink], database_url=test_db)
+
+    assert not sink.wait_for(1, timeout_s=0.5)
+    assert scheduler.metrics()["wakeups"] == 0
+    assert scheduler.next_reminder().title == "Tomorrow"
+
+
+def test_window_query_uses_the_due_date_index(test_db):
+    """
+    Test that the window query (as written by get_tasks_due_from) seeks the due_date index
+    """
+    engine = create_database(test_db)
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM tareas WHERE due_date >= :start AND (due_date > :start OR id > 0) "
+            "ORDER BY due_date, id LIMIT 10"
+        ), {"start": str(datetime.now())}).fetchall()
+
+    # A range search on the index, not a scan of the whole table
+    assert any("SEARCH" in row[-1] and "ix_tareas_due_date" in row[-1] for row in plan)
+
+
+def test_webhook_sink_posts_json():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        due = datetime(2025, 6, 15, 10, 0)
+        WebhookSink(f"http://127.0.0.1:{server.server_port}/reminders")(Reminder(7, "Call", due, due))
+    finally:
+        server.shutdown()
+
+    assert received == [{"task_id": 7, "title": "Call", "due_date": "2025-06-15T10:00:00", "remind_at": "2025-06-15T10:00:00"}]
@@ -0,0 +1,176 @@
+"""
+Unit tests for the read-only response cache and the database data version
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date, datetime
+from types import SimpleNamespace
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.cache import ResponseCache, make_cache_key, normalize_query  # type: ignore
+from chatbot.context import AgendaContext  # type: ignore
+from chatbot.intent import Intent  # type: ignore
+from chatbot import pipeline  # type: ignore
+from database.events import data_version, notify_change, subscribe  # type: ignore
+
+TODAY = date(2025, 6, 7)
+
+
+def test_normalize_query_ignores_case_accents_and_punctuation():
+    """
+    Test that trivially different spellings share a cache entry
+    """
+    assert normalize_query("¿Qué tareas tengo HOY?") == normalize_query("que tareas tengo hoy")
+
+
+def test_cache_hit_and_miss():
+    """
+    Test basic get/put behaviour and statistics
+    """
+    cache = ResponseCache()
+    key = make_cache_key("Show me all my tasks", Intent.READ, TODAY, 0)
+
+    assert cache.get(key) is None
+    cache.put(key, "📭 No tasks found for this criteria")
+
+    assert cache.get(key) == "📭 No tasks found for this criteria"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test LRU eviction when the cache is full
+    """
+    cache = ResponseCache(max_entries=2)
+    first = make_cache_key("first", Intent.READ, TODAY, 0)
+    second = make_cache_key("second", Intent.READ, TODAY, 0)
+    third = make_cache_key("third", Intent.READ, TODAY, 0)
+
+    cache.put(first, "1")
+    cache.put(second, "2")
+    cache.get(first)  # first becomes the most recently used
+    cache.put(third, "3")
+
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert cache.get(first) == "1"
+    assert cache.get(third) == "3"
+
+
+def test_cache_never_stores_writes():
+    """
+    Test that write intents bypass the cache
+    """
+    cache = ResponseCache()
+    key = make_cache_key("Delete task with ID 2", Intent.DELETE, TODAY, 0)
+
+    cache.put(key, "✅ deleted")
+
+    assert len(cache) == 0
+
+
+def test_cache_key_changes_with_data_version_and_day():
+    """
+    Test that a new data version or a new day invalidates entries
+    """
+    key = make_cache_key("Show me all my tasks", Intent.READ, TODAY, 3)
+
+    assert key != make_cache_key("Show me all my tasks", Intent.READ, TODAY, 4)
+    assert key != make_cache_key("Show me all my tasks", Intent.READ, date(2025, 6, 8), 3)
+    assert key != make_cache_key("Show me all my tasks", Intent.READ, TODAY, 3, user="alice")
+
+
+def test_notify_change_bumps_version_and_calls_listeners():
+    """
+    Test the data version and listeners of database.events
+    """
+    url = "sqlite:///version-test.db"
+    changes = []
+    unsubscribe = subscribe(changes.append)
+
+    before = data_version(url)
+    notify_change(url, "created", {"id": 1})
+    unsubscribe()
+    notify_change(url, "deleted", {"id": 1})
+
+    assert data_version(url) == before + 2
+    assert len(changes) == 1
+    assert changes[0].kind == "created"
+    assert changes[0].version == before + 1
+
+
+def test_pipeline_serves_repeated_reads_from_cache(monkeypatch):
+    """
+    Test that a repeated read question only runs the agents once
+    """
+    calls = []
+
+    async def fake_run(starting_agent, input, **kwargs):
+        calls.append(input)
+        return SimpleNamespace(final_output="✅ Found 0 tasks")
+
+    monkeypatch.setattr(pipeline.Runner, "run", fake_run)
+    cache = ResponseCache()
+    now = datetime(2025, 6, 7, 10, 0)
+
+    first = asyncio.run(pipeline.run_agenda_query("Show me all my tasks", cache=cache, now=now))
+    second = asyncio.run(pipeline.run_agenda_query("show me all my tasks!", cache=cache, now=now))
+
+    assert len(calls) == 1
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert second.final_output == "✅ Found 0 tasks"
+
+
+def test_pipeline_does_not_share_cached_answers_between_users(monkeypatch):
+    """
+    Test that a cached read of one user is not served to another
+    """
+    calls = []
+
+    async def fake_run(starting_agent, input, context=None, **kwargs):
+        calls.append(context.user)
+        return SimpleNamespace(final_output=f"✅ Tasks of {context.user}")
+
+    monkeypatch.setattr(pipeline.Runner, "run", fake_run)
+    cache = ResponseCache()
+    now = datetime(2025, 6, 7, 10, 0)
+
+    def ask(user):
+        return asyncio.run(pipeline.run_agenda_query("Show me all my tasks", cache=cache, now=now,
+                                                     context=AgendaContext(user=user)))
+
+    alice, bob, alice_again = ask("alice"), ask("bob"), ask("alice")
+
+    assert calls == ["alice", "bob"]
+    assert not alice.cache_hit and alice.final_output == "✅ Tasks of alice"
+    assert bob.final_output == "✅ Tasks of bob"
+    assert alice_again.cache_hit and alice_again.final_output == "✅ Tasks of alice"
+
+
+def test_pipeline_does_not_cache_writes_or_changed_data(monkeypatch):
+    """
+    Test that writes always run and a data change invalidates cached reads
+    """
+    calls = []
+
+    async def fake_run(starting_agent, input, **kwargs):
+        calls.append(input)
+        return SimpleNamespace(final_output="✅ done")
+
+    monkeypatch.setattr(pipeline.Runner, "run", fake_run)
+    cache = ResponseCache()
+    now = datetime(2025, 6, 7, 10, 0)
+
+    asyncio.run(pipeline.run_agenda_query("Delete task with ID 2", cache=cache, now=now))
+    asyncio.run(pipeline.run_agenda_query("Delete task with ID 2", cache=cache, now=now))
+    asyncio.run(pipeline.run_agenda_query("Show me all my tasks", cache=cache, now=now))
+    notify_change(None, "created", {"id": 99})
+    result = asyncio.run(pipeline.run_agenda_query("Show me all my tasks", cache=cache, now=now))
+
+    assert len(calls) == 4
+    assert not result.cache_hit
@@ -0,0 +1,137 @@
+"""
+Unit tests for the concurrent scenario runner
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot import pipeline  # type: ignore
+from chatbot.context import context_database_url  # type: ignore
+from chatbot.scenarios import (  # type: ignore
+    Scenario,
+    classify_output,
+    run_scenarios_sync,
+)
+from utils.stats import percentile  # type: ignore
+
+
+@pytest.fixture
+def fake_runner(monkeypatch):
+    """
+    Replace the agents Runner with a 50 ms stub that records the database in use
+    """
+    calls = []
+
+    async def fake_run(starting_agent, input, **kwargs):
+        database_url = context_database_url(kwargs.get("context"))
+        calls.append((input, database_url))
+        await asyncio.sleep(0.05)
+        if "boom" in input:
+            raise RuntimeError("model unavailable")
+        output = "📭 No tasks found for this criteria" if "Show" in input else "✅ Task created"
+        return SimpleNamespace(final_output=output, raw_responses=[object(), object()])
+
+    monkeypatch.setattr(pipeline.Runner, "run", fake_run)
+    return calls
+
+
+@pytest.mark.parametrize("output, expected", [
+    ("✅ Task created: buy milk", "success"),
+    ("❌ Error: Task with ID 9 not found", "error"),
+    ("📭 No tasks found for this criteria", "empty"),
+    ("¡Hola! Estoy bien, gracias.", "conversation"),
+])
+def test_classify_output(output, expected):
+    """
+    Test the outcome classes used by the report
+    """
+    assert classify_output(output) == expected
+
+
+def test_percentile_interpolates():
+    """
+    Test the latency percentile helper
+    """
+    values = [10.0, 20.0, 30.0, 40.0]
+
+    assert percentile(values, 50) == 25.0
+    assert percentile(values, 100) == 40.0
+    assert percentile([5.0], 99) == 5.0
+
+
+def test_run_scenarios_runs_concurrently(fake_runner):
+    """
+    Test that scenarios overlap in time when concurrency allows it
+    """
+    scenarios = [Scenario(f"s{i}", ["Create task: buy milk"]) for i in range(8)]
+
+    started = time.perf_counter()
+    report = run_scenarios_sync(scenarios, concurrency=8)
+    elapsed = time.perf_counter() - started
+
+    assert len(report.steps) == 8
+    # Sequentially this would take at least 8 x 50 ms
+    assert elapsed < 0.3
+
+
+def test_run_scenarios_isolates_databases(fake_runner):
+    """
+    Test that each scenario gets its own database and keeps step order
+    """
+    scenarios = [
+        Scenario("a", ["Create task: one", "Show my tasks"]),
+        Scenario("b", ["Create task: two", "Show my tasks"]),
+    ]
+
+    report = run_scenarios_sync(scenarios, concurrency=2)
+
+    urls_by_scenario = {}
+    for query, url in fake_runner:
+        urls_by_scenario.setdefault(query.split(": ")[-1], set()).add(url)
+    assert urls_by_scenario["one"] != urls_by_scenario["two"]
+    assert all("aigenda_scenario_" in url for _, url in fake_runner)
+    assert [(step.scenario, step.step) for step in report.steps] == [("a", 1), ("a", 2), ("b", 1), ("b", 2)]
+
+
+def test_run_scenarios_report(fake_runner, tmp_path):
+    """
+    Test outcome counts, turns, exceptions and the JSON report
+    """
+    scenarios = [
+        Scenario("create", ["Create task: buy milk"]),
+        Scenario("read", ["Show my tasks"]),
+        Scenario("broken", ["Create task: boom"]),
+    ]
+
+    report = run_scenarios_sync(scenarios, concurrency=1)
+    summary = report.summary()
+
+    assert summary["outcomes"]["success"] == 1
+    assert summary["outcomes"]["empty"] == 1
+    assert summary["outcomes"]["exception"] == 1
+    assert summary["turns"]["total"] == 4
+    assert summary["latency_ms"]["count"] == 3
+    assert "RuntimeError" in report.steps[2].error
+
+    path = tmp_path / "report.json"
+    report.write_json(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["summary"]["requests"] == 3
+    assert len(data["steps"]) == 3
+
+
+def test_run_scenarios_rejects_invalid_concurrency():
+    """
+    Test that concurrency must be positive
+    """
+    with pytest.raises(ValueError):
+        run_scenarios_sync([], concurrency=0)
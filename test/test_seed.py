@@ -0,0 +1,75 @@
+"""
+Unit tests for the synthetic agenda generator
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import date, datetime
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import database.seed as seed  # type: ignore
+from database import operations  # type: ignore
+from database.seed import SeedConfig, generate_batch, seed_database  # type: ignore
+
+ANCHOR = date(2025, 6, 2)
+
+
+def _rows(database_url: str) -> list[tuple]:
+    with sqlite3.connect(database_url[len("sqlite:///"):]) as connection:
+        return connection.execute("SELECT title, description, due_date FROM tareas ORDER BY id").fetchall()
+
+
+def test_seeding_is_reproducible_and_readable(test_db, tmp_path):
+    config = SeedConfig(rows=2500, seed=7, batch_size=1000, anchor=ANCHOR)
+    stats = seed_database(test_db, config)
+    other = f"sqlite:///{tmp_path / 'other.db'}"
+    seed_database(other, config)
+
+    rows = _rows(test_db)
+    assert stats["rows"] == len(rows) == 2500
+    assert rows == _rows(other)
+    reseeded = f"sqlite:///{tmp_path / 'seed8.db'}"
+    seed_database(reseeded, SeedConfig(rows=2500, seed=8, batch_size=1000, anchor=ANCHOR))
+    assert rows != _rows(reseeded)
+
+    # The ORM reads the generated dates, and the index is back
+    window = operations.get_tasks_due_from(datetime(2025, 6, 2), limit=10, database_url=test_db)
+    assert len(window) == 10 and all(task["due_date"] >= "2025-06-02" for task in window)
+    with sqlite3.connect(test_db[len("sqlite:///"):]) as connection:
+        indexes = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert "ix_tareas_due_date" in indexes
+
+
+def test_reset_replaces_the_tasks(test_db):
+    seed_database(test_db, SeedConfig(rows=300, anchor=ANCHOR))
+    seed_database(test_db, SeedConfig(rows=200, anchor=ANCHOR), reset=True)
+
+    assert len(_rows(test_db)) == 200
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_generated_agenda_shape(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(seed, "np", None)
+    elif seed.np is None:
+        pytest.skip("numpy is not installed")
+    config = SeedConfig(rows=5000, recurring_share=0.2, anchor=ANCHOR)
+
+    rows = generate_batch(config, 0, config.rows)
+    due_dates = [datetime.strptime(row[4], "%Y-%m-%d %H:%M:%S.%f") for row in rows]
+    upcoming = sum(due.date() >= ANCHOR for due in due_dates) / len(rows)
+    weekend = sum(due.weekday() >= 5 for due in due_dates) / len(rows)
+    empty = sum(row[1] is None for row in rows) / len(rows)
+
+    assert len(rows) == 5000
+    assert 0.5 < upcoming < 0.85
+    assert weekend < 2 / 7 * 0.6
+    assert 0.2 < empty < 0.4
+    assert all(due.minute % 15 == 0 and 7 <= due.hour <= 22 for due in due_dates)
+    # Recurring series repeat their titles
+    assert any(row[0] in seed.RECURRING_TITLES for row in rows)
@@ -0,0 +1,132 @@
+"""
+Unit tests for single-flight coalescing of identical requests
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot import pipeline  # type: ignore
+from chatbot.context import AgendaContext  # type: ignore
+from chatbot.single_flight import SingleFlight  # type: ignore
+from database.models import create_database, use_database  # type: ignore
+
+
+@pytest.fixture
+def fake_runner(monkeypatch):
+    """
+    Replace the agents Runner with a 50 ms stub that counts its runs
+    """
+    calls = []
+
+    async def fake_run(starting_agent, input, **kwargs):
+        calls.append(input)
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(final_output=f"✅ {input}", raw_responses=[])
+
+    monkeypatch.setattr(pipeline.Runner, "run", fake_run)
+    return calls
+
+
+@pytest.fixture
+def database(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    with use_database(database_url):
+        yield database_url
+
+
+def _gather(*requests, flights):
+    async def scenario():
+        return await asyncio.gather(*(
+            pipeline.run_agenda_query(query, context=context, cache=None, single_flight=flights)
+            for query, context in requests
+        ))
+    return asyncio.run(scenario())
+
+
+def test_identical_calls_share_one_execution():
+    """
+    Test that concurrent calls with the same key run once
+    """
+    flights = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert [result for result, _ in results] == ["answer"] * 5
+    assert sum(shared for _, shared in results) == 4
+    assert len(runs) == 1
+    assert flights.metrics()["coalescing_ratio"] == 0.8
+    assert flights.in_flight() == 0
+
+
+def test_errors_are_shared_and_not_cached():
+    """
+    Test that followers get the leader's error and a later call runs again
+    """
+    flights = SingleFlight()
+    runs = []
+
+    async def failing():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+        raise RuntimeError("model unavailable")
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(runs) == 2
+
+
+def test_identical_reads_share_one_agent_run(fake_runner, database):
+    """
+    Test that the pipeline coalesces identical reads of the same user
+    """
+    flights = SingleFlight()
+    context = AgendaContext(user="alice")
+
+    results = _gather(*[("Show me my tasks for today", context), ("show me my tasks for TODAY!", context)] * 2, flights=flights)
+
+    assert len(fake_runner) == 1
+    assert [result.coalesced for result in results].count(True) == 3
+    assert len({result.final_output for result in results}) == 1
+    assert flights.metrics()["coalescing_ratio"] == 0.75
+
+
+def test_writes_and_other_users_are_not_coalesced(fake_runner, database):
+    """
+    Test that writes always run and that users do not share runs
+    """
+    flights = SingleFlight()
+    create = "Create a task for tomorrow: buy milk"
+
+    results = _gather(
+        (create, AgendaContext(user="alice")),
+        (create, AgendaContext(user="alice")),
+        ("Show me all my tasks", AgendaContext(user="alice")),
+        ("Show me all my tasks", AgendaContext(user="bob")),
+        flights=flights,
+    )
+
+    assert len(fake_runner) == 4
+    assert not any(result.coalesced for result in results)
+    assert flights.metrics()["requests"] == 2
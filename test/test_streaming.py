@@ -0,0 +1,112 @@
+"""
+Unit tests for the streamed pipeline entry point and its consumers
+"""
+
+import asyncio
+import io
+import os
+import sys
+from types import SimpleNamespace
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.stream_events import (  # type: ignore
+    AgentUpdatedStreamEvent,
+    RawResponsesStreamEvent,
+    RunItemStreamEvent,
+)
+
+from chatbot import pipeline  # type: ignore
+from chatbot.agent_agenda import database_agent  # type: ignore
+from chatbot.cache import ResponseCache  # type: ignore
+from cli import print_stream  # type: ignore
+from ui.interface import stream_reply  # type: ignore
+
+
+def _fake_streamed_run(final_output="✅ Found 1 tasks: buy milk"):
+    """
+    Build a stand-in for RunResultStreaming emitting a typical DatabaseAgent turn
+    """
+    events = [
+        AgentUpdatedStreamEvent(new_agent=database_agent),
+        RunItemStreamEvent(
+            name="tool_called",
+            item=SimpleNamespace(raw_item=SimpleNamespace(name="get_all_tasks", arguments="{}")),
+        ),
+        RunItemStreamEvent(name="tool_output", item=SimpleNamespace(output=[{"id": 1}])),
+        RawResponsesStreamEvent(data=SimpleNamespace(type="response.output_text.delta", delta="✅ Found 1 tasks")),
+        RawResponsesStreamEvent(data=SimpleNamespace(type="response.output_text.delta", delta=": buy milk")),
+    ]
+
+    class FakeStreamedRun:
+        def __init__(self):
+            self.final_output = final_output
+
+        async def stream_events(self):
+            for event in events:
+                yield event
+
+    return FakeStreamedRun()
+
+
+def _collect(async_iterator):
+    async def collect():
+        return [item async for item in async_iterator]
+    return asyncio.run(collect())
+
+
+def test_stream_agenda_query_event_order(monkeypatch):
+    """
+    Test that agent, tool and text events arrive before the final event
+    """
+    monkeypatch.setattr(pipeline.Runner, "run_streamed", lambda *args, **kwargs: _fake_streamed_run())
+
+    events = _collect(pipeline.stream_agenda_query("Show me all my tasks", cache=None))
+
+    kinds = [event.kind for event in events]
+    assert kinds == ["agent", "tool_call", "tool_output", "text", "text", "final"]
+    assert events[1].text == "get_all_tasks({})"
+    assert events[-1].result.final_output == "✅ Found 1 tasks: buy milk"
+    assert events[-1].result.plan.starting_agent.name == "DatabaseAgent"
+
+
+def test_stream_agenda_query_cache_hit_has_single_event(monkeypatch):
+    """
+    Test that a cached answer is streamed as one final event
+    """
+    monkeypatch.setattr(pipeline.Runner, "run_streamed", lambda *args, **kwargs: _fake_streamed_run())
+    cache = ResponseCache()
+
+    _collect(pipeline.stream_agenda_query("Show me all my tasks", cache=cache))
+    events = _collect(pipeline.stream_agenda_query("Show me all my tasks", cache=cache))
+
+    assert [event.kind for event in events] == ["final"]
+    assert events[0].result.cache_hit
+
+
+def test_print_stream_writes_progress_and_answer(monkeypatch):
+    """
+    Test the CLI consumer output
+    """
+    monkeypatch.setattr(pipeline.Runner, "run_streamed", lambda *args, **kwargs: _fake_streamed_run())
+    out = io.StringIO()
+
+    answer = asyncio.run(print_stream("Show me all my tasks", out=out, cache=None))
+
+    assert answer == "✅ Found 1 tasks: buy milk"
+    assert "🔧 DatabaseAgent: get_all_tasks({})" in out.getvalue()
+    assert out.getvalue().endswith("✅ Found 1 tasks: buy milk\n")
+
+
+def test_stream_reply_yields_growing_message(monkeypatch):
+    """
+    Test the chat UI consumer: every update contains the previous text
+    """
+    monkeypatch.setattr(pipeline.Runner, "run_streamed", lambda *args, **kwargs: _fake_streamed_run())
+
+    updates = _collect(stream_reply("Show me all my tasks", cache=None))
+
+    assert updates[0] == "🔧 get_all_tasks({})\n\n"
+    assert updates[-1] == "🔧 get_all_tasks({})\n\n✅ Found 1 tasks: buy milk"
+    assert any(update.endswith("✅ Found 1 tasks") for update in updates)
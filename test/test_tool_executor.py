@@ -0,0 +1,265 @@
+"""
+Unit tests for the thread-pool tool executor
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+import pytest
+from agents import RunContextWrapper, function_tool
+from loguru import logger
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from chatbot.tool_executor import ToolExecutor, ToolTimeout, get_tool_executor, offload, set_tool_executor  # type: ignore
+from chatbot.tools import DATABASE_TOOLS  # type: ignore
+from database.models import resolve_database_url, use_database  # type: ignore
+
+
+@pytest.fixture
+def executor():
+    """
+    Swap in a fresh executor and restore the previous one
+    """
+    executor = ToolExecutor(max_workers=2, default_timeout_s=1.0)
+    previous = set_tool_executor(executor)
+    yield executor
+    set_tool_executor(previous)
+    executor.shutdown()
+
+
+def test_offloaded_tool_keeps_its_schema():
+    """
+    Test that function_tool builds the same schema over an offloaded function
+    """
+    def lookup(ctx: RunContextWrapper[Any], task_id: int) -> dict:
+        """
+        Look a task up.
+
+        Args:
+        - task_id (int): The id of the task.
+        """
+        return {"id": task_id}
+
+    plain, offloaded = function_tool(lookup), function_tool(offload()(lookup))
+
+    assert offloaded.params_json_schema == plain.params_json_schema
+    assert offloaded.description == plain.description
+    assert all("database_url" not in tool.params_json_schema["properties"] for tool in DATABASE_TOOLS)
+
+
+def test_runs_off_the_event_loop_with_caller_context(executor):
+    """
+    Test that the function runs on a worker thread and sees use_database()
+    """
+    @offload()
+    def where():
+        return threading.current_thread().name, resolve_database_url()
+
+    async def call():
+        with use_database("sqlite:///elsewhere.db"):
+            return await where()
+
+    thread_name, database_url = asyncio.run(call())
+
+    assert thread_name.startswith("agenda-tool")
+    assert database_url == "sqlite:///elsewhere.db"
+
+
+def test_slow_tools_do_not_block_the_loop(executor):
+    """
+    Test that two blocking calls overlap and the loop keeps running meanwhile
+    """
+    @offload()
+    def slow():
+        time.sleep(0.2)
+        return "done"
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(slow(), slow())
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(scenario())
+
+    assert results == ["done", "done"]
+    assert elapsed < 0.35
+    assert ticks >= 10
+
+
+def test_timeout_is_raised_and_counted(executor):
+    """
+    Test the per-tool timeout
+    """
+    executor.timeouts["stuck"] = 0.05
+
+    @offload("stuck")
+    def stuck():
+        time.sleep(0.3)
+
+    with pytest.raises(ToolTimeout):
+        asyncio.run(stuck())
+
+    stats = executor.metrics()["tools"]["stuck"]
+    assert stats["timeouts"] == 1
+    assert stats["calls"] == 1
+
+
+def test_queue_depth_and_errors_are_measured():
+    """
+    Test queue metrics with a single worker, and error counting
+    """
+    executor = ToolExecutor(max_workers=1, default_timeout_s=None)
+    previous = set_tool_executor(executor)
+
+    @offload("slow")
+    def slow():
+        time.sleep(0.05)
+
+    @offload("broken")
+    def broken():
+        raise ValueError("boom")
+
+    async def scenario():
+        await asyncio.gather(*(slow() for _ in range(4)))
+        with pytest.raises(ValueError):
+            await broken()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        set_tool_executor(previous)
+        executor.shutdown()
+
+    metrics = executor.metrics()
+    assert metrics["peak_queued"] >= 3
+    assert metrics["queued"] == 0 and metrics["running"] == 0
+    assert metrics["tools"]["slow"]["calls"] == 4
+    assert metrics["tools"]["slow"]["wait_ms"]["max"] >= 100
+    assert metrics["tools"]["broken"]["errors"] == 1
+
+
+def test_without_executor_the_tool_runs_inline():
+    """
+    Test that set_tool_executor(None) runs the functions on the loop thread
+    """
+    previous = set_tool_executor(None)
+
+    @offload()
+    def where():
+        return threading.current_thread() is threading.main_thread()
+
+    try:
+        assert get_tool_executor() is None
+        assert asyncio.run(where()) is True
+    finally:
+        set_tool_executor(previous)
+
+
+def test_calls_timed_out_in_the_queue_leave_it():
+    """
+    Test that calls that time out before a worker picks them up are dropped and not counted as queued
+    """
+    executor = ToolExecutor(max_workers=1, default_timeout_s=None, timeouts={"queued": 0.05})
+    previous = set_tool_executor(executor)
+    ran = []
+
+    @offload("busy")
+    def busy():
+        time.sleep(0.2)
+
+    @offload("queued")
+    def queued():
+        ran.append(True)
+
+    async def scenario():
+        blocker = asyncio.create_task(busy())
+        await asyncio.sleep(0.01)
+        results = await asyncio.gather(queued(), queued(), return_exceptions=True)
+        await blocker
+        return results
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        set_tool_executor(previous)
+        executor.shutdown()
+
+    assert all(isinstance(result, ToolTimeout) for result in results)
+    assert ran == []
+    metrics = executor.metrics()
+    assert metrics["queued"] == 0 and metrics["running"] == 0
+    assert metrics["tools"]["queued"]["timeouts"] == 2
+
+
+def test_write_tools_are_not_timed_out(executor):
+    """
+    Test that a write tool finishes (and reports its result) even past the default timeout
+    """
+    executor.default_timeout_s = 0.05
+
+    @offload("slow_write", write=True)
+    def slow_write():
+        time.sleep(0.15)
+        return "committed"
+
+    assert executor.timeout_for("slow_write", write=True) is None
+    assert asyncio.run(slow_write()) == "committed"
+    assert executor.metrics()["tools"]["slow_write"]["timeouts"] == 0
+
+
+def test_write_flag_is_per_registration(executor):
+    """
+    Test that write=True belongs to the decorated function, not to every tool sharing its name
+    """
+    executor.default_timeout_s = 0.05
+
+    @offload("shared_name", write=True)
+    def write():
+        return "written"
+
+    @offload("shared_name")
+    def slow_read():
+        time.sleep(0.15)
+
+    assert asyncio.run(write()) == "written"
+    with pytest.raises(ToolTimeout):
+        asyncio.run(slow_read())
+
+
+def test_configured_timeout_of_a_write_tool_is_reported(executor):
+    """
+    Test that a timeout configured for a write tool is logged as ignored instead of silently dropped
+    """
+    executor.timeouts["slow_write"] = 0.05
+    messages = []
+    handler = logger.add(messages.append, level="WARNING")
+
+    @offload("slow_write", write=True)
+    def slow_write():
+        time.sleep(0.1)
+        return "committed"
+
+    try:
+        assert asyncio.run(slow_write()) == "committed"
+        assert asyncio.run(slow_write()) == "committed"
+    finally:
+        logger.remove(handler)
+
+    assert len([m for m in messages if "Ignoring the 0.05s timeout of slow_write" in m]) == 1
@@ -0,0 +1,76 @@
+"""
+Unit tests for the DatabaseAgent function tools and the database registry
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents import RunContextWrapper  # type: ignore
+
+from chatbot.context import AgendaContext, context_database_url  # type: ignore
+from chatbot.tools import DATABASE_TOOLS, create_task, get_all_tasks  # type: ignore
+from database.models import resolve_database_url, use_database  # type: ignore
+from database.registry import DatabaseRegistry, database_registry  # type: ignore
+
+
+def invoke(tool, context, **arguments):
+    """
+    Call a function tool the way the Runner does
+    """
+    return asyncio.run(tool.on_invoke_tool(RunContextWrapper(context=context), json.dumps(arguments, default=str)))
+
+
+def test_tool_schemas_only_contain_business_parameters():
+    """
+    Test that no tool exposes the database to the model
+    """
+    for tool in DATABASE_TOOLS:
+        properties = tool.params_json_schema["properties"]
+        assert "database_url" not in properties
+        assert "ctx" not in properties
+
+    assert set(create_task.params_json_schema["properties"]) == {"title", "description", "due_date"}
+    assert get_all_tasks.params_json_schema["properties"] == {}
+
+
+def test_registry_resolves_names():
+    """
+    Test registered names, the default database and unknown names
+    """
+    registry = DatabaseRegistry()
+    registry.register("demo", "sqlite:///demo.db")
+
+    assert registry.resolve("demo") == "sqlite:///demo.db"
+    assert registry.resolve(None) == resolve_database_url()
+    with use_database("sqlite:///other.db"):
+        assert registry.resolve() == "sqlite:///other.db"
+
+    registry.unregister("demo")
+    with pytest.raises(KeyError):
+        registry.resolve("demo")
+
+
+def test_tools_use_the_database_of_the_run_context(test_db):
+    """
+    Test that the tools write to and read from the database named in the context
+    """
+    database_registry.register("tools-test", test_db)
+    try:
+        context = AgendaContext(database="tools-test")
+        due_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+
+        invoke(create_task, context, title="buy milk", description="", due_date=due_date)
+        output = invoke(get_all_tasks, context)
+
+        assert context_database_url(context) == test_db
+        assert [task["title"] for task in output] == ["buy milk"]
+    finally:
+        database_registry.unregister("tools-test")
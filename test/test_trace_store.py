@@ -0,0 +1,110 @@
+"""
+Unit tests for the local trace processor and its report
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add src to the system path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.tracing import default_processor, set_trace_processors  # type: ignore
+
+from chatbot.mock_model import offline_run_config  # type: ignore
+from chatbot.pipeline import run_agenda_query  # type: ignore
+from chatbot.trace_store import (  # type: ignore
+    JsonlTraceStore,
+    LocalTraceProcessor,
+    SpanRecord,
+    SqliteTraceStore,
+    TraceRecord,
+    build_report,
+    format_report,
+    load_report,
+    open_trace_store,
+)
+from database.models import create_database, use_database  # type: ignore
+
+
+@pytest.fixture
+def local_tracing(tmp_path):
+    """
+    Replace the trace processors with a local one for the duration of a test
+    """
+    processor = LocalTraceProcessor(SqliteTraceStore(str(tmp_path / "traces.db")))
+    set_trace_processors([processor])
+    yield processor
+    set_trace_processors([default_processor()])
+
+
+def test_open_trace_store_by_extension(tmp_path):
+    """
+    Test that .jsonl paths use JSON Lines and the rest SQLite
+    """
+    assert isinstance(open_trace_store(str(tmp_path / "traces.jsonl")), JsonlTraceStore)
+    assert isinstance(open_trace_store(str(tmp_path / "traces.db")), SqliteTraceStore)
+
+
+@pytest.mark.parametrize("filename", ["traces.db", "traces.jsonl"])
+def test_store_round_trip(tmp_path, filename):
+    """
+    Test that both stores load what they wrote
+    """
+    store = open_trace_store(str(tmp_path / filename))
+    trace = TraceRecord("trace_1", "AIgenda", None, 1000.0, 42.0)
+    span = SpanRecord("trace_1", "span_1", None, "agent", "DatabaseAgent", 1000.0, 40.0)
+
+    store.write([trace], [span])
+
+    assert store.load() == ([trace], [span])
+
+
+def test_build_report_aggregates_hops_tools_and_tokens():
+    """
+    Test per-hop and per-tool percentiles, tokens by agent and slowest traces
+    """
+    traces = [TraceRecord("t1", "w", None, 0.0, 100.0), TraceRecord("t2", "w", None, 0.0, 300.0)]
+    spans = [
+        SpanRecord("t1", "a1", None, "agent", "DatabaseAgent", 0.0, 90.0),
+        SpanRecord("t1", "g1", "a1", "generation", "gpt-4o-mini", 0.0, 60.0, 100, 10),
+        SpanRecord("t1", "f1", "a1", "function", "get_all_tasks", 0.0, 20.0),
+        SpanRecord("t2", "a2", None, "agent", "DatabaseAgent", 0.0, 290.0),
+        SpanRecord("t2", "g2", "a2", "generation", "gpt-4o-mini", 0.0, 250.0, 200, 20, "timeout"),
+    ]
+
+    report = build_report(traces, spans, slowest=1)
+
+    assert report["hops"]["DatabaseAgent"]["count"] == 2
+    assert report["hops"]["DatabaseAgent"]["max"] == 290.0
+    assert report["tools"]["get_all_tasks"]["p50"] == 20.0
+    assert report["tokens"]["DatabaseAgent"] == {"input_tokens": 300, "output_tokens": 30}
+    assert report["requests"]["tokens"]["max"] == 220
+    assert report["errors"] == 1
+    assert [trace["trace_id"] for trace in report["slowest"]] == ["t2"]
+    assert "DatabaseAgent" in format_report(report)
+
+
+def test_processor_records_offline_pipeline_runs(local_tracing, tmp_path):
+    """
+    Test that agent hops, tool calls and model usage of real runs are stored
+    """
+    database_url = f"sqlite:///{tmp_path / 'tareas.db'}"
+    create_database(database_url)
+    run_config = offline_run_config(tracing_disabled=False)
+
+    async def scenario():
+        with use_database(database_url):
+            await run_agenda_query("Crea una tarea para mañana: comprar leche", run_config=run_config, cache=None)
+            await run_agenda_query("Show me all my tasks", run_config=run_config, cache=None)
+
+    asyncio.run(scenario())
+    report = load_report(local_tracing.store.path)
+
+    assert report["traces"] == 2
+    assert "DatabaseAgent" in report["hops"]
+    assert set(report["tools"]) == {"create_task", "get_all_tasks"}
+    assert report["tokens"]["DatabaseAgent"]["input_tokens"] > 0
+    assert all(len(trace["hops"]) >= 1 for trace in report["slowest"])